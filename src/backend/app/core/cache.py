@@ -3,12 +3,23 @@
 
 提供内存缓存、Redis缓存和缓存装饰器
 """
-from typing import Optional, Any, Callable, Dict, List
+from typing import Optional, Any, Awaitable, Callable, Dict, List, NamedTuple
+from collections import OrderedDict
 from functools import wraps, lru_cache
 from datetime import datetime, timedelta
+import asyncio
 import hashlib
+import heapq
+import inspect
 import json
+import os
+import pickle
+import socket
+import sys
+import threading
 import time
+import uuid
+import zlib
 
 from redis import Redis
 from app.core.config import settings
@@ -90,15 +101,51 @@ init_redis_client()
 # ============================================================================
 
 class MemoryCache:
-    """内存缓存管理器（使用字典存储）"""
+    """
+    内存缓存管理器（有界 LRU + TTL）
 
-    def __init__(self):
-        self._cache: Dict[str, tuple] = {}
-        self._stats = {
+    - OrderedDict 维护访问顺序，命中时移到末尾，O(1) 淘汰最久未使用的键
+    - 同时限制条目数（max_entries）和估算字节数（max_bytes）
+    - 过期时间基于单调时钟，写入时压入最小堆，由后台线程定期清扫
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        """
+        初始化内存缓存
+
+        Args:
+            max_entries: 最大条目数，0 或 None 表示不限制
+            max_bytes: 最大估算字节数，0 或 None 表示不限制
+            sweep_interval: 后台清扫过期键的间隔（秒），0 表示不启动后台线程
+        """
+        self.max_entries = max_entries or 0
+        self.max_bytes = max_bytes or 0
+        self.sweep_interval = sweep_interval or 0
+
+        # key -> (value, expire_at, size)，expire_at 为 time.monotonic() 时间戳
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # (expire_at, key) 最小堆，键被覆盖或删除后留下的旧记录在弹出时惰性跳过
+        self._expiry_heap: List[tuple] = []
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
             "hits": 0,
             "misses": 0,
             "sets": 0,
-            "deletes": 0
+            "deletes": 0,
+            "evictions": 0,
+            "expirations": 0,
         }
 
     def get(self, key: str) -> Optional[Any]:
@@ -111,19 +158,23 @@ class MemoryCache:
         Returns:
             缓存的数据，如果不存在或已过期则返回None
         """
-        if key in self._cache:
-            value, expire_time = self._cache[key]
-            # 检查是否过期
-            if expire_time is None or datetime.now() < expire_time:
-                self._stats["hits"] += 1
-                return value
-            else:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, expire_at, _ = entry
+            if expire_at is not None and time.monotonic() >= expire_at:
                 # 过期，删除
-                del self._cache[key]
+                self._remove(key)
+                self._stats["expirations"] += 1
                 self._stats["misses"] += 1
                 return None
-        self._stats["misses"] += 1
-        return None
+
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """
@@ -134,12 +185,33 @@ class MemoryCache:
             value: 缓存值
             ttl: 过期时间（秒），None表示永不过期
         """
-        expire_time = None
+        size = _estimate_size(value)
+        if self.max_bytes and size > self.max_bytes:
+            # 旧值已过时，先删除，避免之后继续读到
+            with self._lock:
+                if key in self._cache:
+                    self._remove(key)
+            log.warning(f"缓存值过大，跳过写入: {key} ({size} bytes)")
+            return
+
+        expire_at = None
         if ttl is not None:
-            expire_time = datetime.now() + timedelta(seconds=ttl)
+            expire_at = time.monotonic() + ttl
 
-        self._cache[key] = (value, expire_time)
-        self._stats["sets"] += 1
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+
+            self._cache[key] = (value, expire_at, size)
+            self._bytes += size
+            if expire_at is not None:
+                heapq.heappush(self._expiry_heap, (expire_at, key))
+            self._stats["sets"] += 1
+
+            self._evict_if_needed()
+
+        if expire_at is not None:
+            self._ensure_sweeper()
 
     def delete(self, *keys: str) -> int:
         """
@@ -152,44 +224,616 @@ class MemoryCache:
             删除的数量
         """
         count = 0
-        for key in keys:
-            if key in self._cache:
-                del self._cache[key]
-                count += 1
-        self._stats["deletes"] += count
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._remove(key)
+                    count += 1
+            self._stats["deletes"] += count
         return count
 
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        删除指定前缀的所有缓存键
+
+        Returns:
+            删除的数量
+        """
+        with self._lock:
+            keys = [key for key in self._cache if key.startswith(prefix)]
+            return self.delete(*keys) if keys else 0
+
+    def keys(self) -> List[str]:
+        """获取当前所有缓存键的快照"""
+        with self._lock:
+            return list(self._cache.keys())
+
     def clear(self):
         """清空所有缓存"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._expiry_heap.clear()
+            self._bytes = 0
         log.info("内存缓存已清空")
 
     def get_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
-        total_requests = self._stats["hits"] + self._stats["misses"]
-        hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._cache)
+            bytes_used = self._bytes
+
+        total_requests = stats["hits"] + stats["misses"]
+        hit_rate = (stats["hits"] / total_requests * 100) if total_requests > 0 else 0
 
         return {
-            **self._stats,
-            "size": len(self._cache),
+            **stats,
+            "size": size,
+            "bytes": bytes_used,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
             "hit_rate": round(hit_rate, 2)
         }
 
-    def cleanup_expired(self):
-        """清理过期的缓存项"""
-        now = datetime.now()
-        expired_keys = [
-            key for key, (_, expire_time) in self._cache.items()
-            if expire_time is not None and now >= expire_time
+    def reset_stats(self):
+        """重置统计计数（不影响缓存内容）"""
+        with self._lock:
+            self._stats = self._empty_stats()
+
+    def cleanup_expired(self) -> int:
+        """
+        清理过期的缓存项
+
+        Returns:
+            清理的数量
+        """
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expire_at, key = heapq.heappop(self._expiry_heap)
+                entry = self._cache.get(key)
+                # 堆中的旧记录（键已被覆盖或删除）直接丢弃
+                if entry is None or entry[1] != expire_at:
+                    continue
+                self._remove(key)
+                removed += 1
+            self._stats["expirations"] += removed
+
+            # 旧记录过多时重建堆，避免堆无限增长
+            if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+                self._rebuild_heap()
+
+        if removed:
+            log.info(f"清理了 {removed} 个过期缓存项")
+        return removed
+
+    def stop_sweeper(self):
+        """停止后台清扫线程"""
+        self._stop_event.set()
+        sweeper = self._sweeper
+        if sweeper and sweeper.is_alive() and sweeper is not threading.current_thread():
+            sweeper.join(timeout=1)
+        self._sweeper = None
+
+    def _remove(self, key: str):
+        """删除单个键（调用方需持有锁）"""
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def _evict_if_needed(self):
+        """超出条目数或字节数上限时按 LRU 顺序淘汰（调用方需持有锁）"""
+        while self._cache and (
+            (self.max_entries and len(self._cache) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._cache))
+            self._remove(key)
+            self._stats["evictions"] += 1
+
+    def _rebuild_heap(self):
+        """根据当前存活的键重建过期堆（调用方需持有锁）"""
+        self._expiry_heap = [
+            (expire_at, key)
+            for key, (_, expire_at, _) in self._cache.items()
+            if expire_at is not None
         ]
-        if expired_keys:
-            for key in expired_keys:
-                del self._cache[key]
-            log.info(f"清理了 {len(expired_keys)} 个过期缓存项")
+        heapq.heapify(self._expiry_heap)
+
+    def _ensure_sweeper(self):
+        """按需启动后台清扫线程"""
+        if not self.sweep_interval:
+            return
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop_event.clear()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop,
+                name="memory-cache-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                log.error(f"清理过期缓存失败: {e}")
+
+
+def _estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    估算缓存值占用的字节数
+
+    对常见容器递归累加（限制深度），其他对象使用 sys.getsizeof，
+    只用于容量控制，不追求精确。
+    """
+    size = sys.getsizeof(value, 64)
+    if _depth >= 4:
+        return size
+
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += _estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _estimate_size(item, _depth + 1)
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        size += _estimate_size(vars(value), _depth + 1)
+    return size
 
 
 # 全局内存缓存实例
-memory_cache = MemoryCache()
+memory_cache = MemoryCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    sweep_interval=settings.CACHE_SWEEP_INTERVAL,
+)
+
+
+# ============================================================================
+# Redis 缓存（L2）和两级缓存
+# ============================================================================
+
+class CacheCodec:
+    """
+    缓存值编解码器（pickle + 按需 zlib 压缩）
+
+    首字节标记格式：b"p" 为原始 pickle，b"z" 为压缩后的 pickle。
+    Redis 仅在内网使用，不存放不可信数据。
+    """
+
+    RAW = b"p"
+    COMPRESSED = b"z"
+
+    def __init__(self, compress_threshold: int = 1024, compress_level: int = 1):
+        """
+        Args:
+            compress_threshold: 超过该字节数才尝试压缩
+            compress_level: zlib 压缩级别（1 最快）
+        """
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def dumps(self, value: Any) -> bytes:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.compress_threshold:
+            compressed = zlib.compress(data, self.compress_level)
+            if len(compressed) < len(data):
+                return self.COMPRESSED + compressed
+        return self.RAW + data
+
+    def loads(self, data: bytes) -> Any:
+        marker, payload = data[:1], data[1:]
+        if marker == self.COMPRESSED:
+            payload = zlib.decompress(payload)
+        elif marker != self.RAW:
+            raise ValueError(f"未知的缓存编码标记: {marker!r}")
+        return pickle.loads(payload)
+
+
+class RedisCache:
+    """Redis 缓存（L2），跨 worker / 跨进程共享"""
+
+    def __init__(self, client: Redis, namespace: str = "contenthub:cache:", codec: Optional[CacheCodec] = None):
+        """
+        Args:
+            client: 二进制模式（decode_responses=False）的 Redis 客户端
+            namespace: 键前缀，用于和其他 Redis 数据隔离
+            codec: 值编解码器
+        """
+        self.client = client
+        self.namespace = namespace
+        self.codec = codec or CacheCodec()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"hits": 0, "misses": 0, "sets": 0, "deletes": 0, "errors": 0}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}{key}"
+
+    def get_with_ttl(self, key: str) -> tuple:
+        """
+        获取缓存值及剩余有效期（一次往返）
+
+        Returns:
+            (value, ttl_seconds)，未命中时 value 为 None；永不过期时 ttl 为 None
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(self._key(key))
+            pipe.pttl(self._key(key))
+            data, pttl = pipe.execute()
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.warning(f"读取 Redis 缓存失败: {key}: {e}")
+            return None, None
+
+        if data is None:
+            self._stats["misses"] += 1
+            return None, None
+
+        try:
+            value = self.codec.loads(data)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.warning(f"解码 Redis 缓存失败: {key}: {e}")
+            return None, None
+
+        self._stats["hits"] += 1
+        ttl = pttl / 1000 if pttl is not None and pttl > 0 else None
+        return value, ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_with_ttl(key)[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        try:
+            data = self.codec.dumps(value)
+        except Exception as e:
+            # 不可序列化的值（如绑定会话的 ORM 对象）只保留在 L1
+            log.debug(f"缓存值无法序列化，跳过 L2: {key}: {e}")
+            return False
+
+        try:
+            if ttl:
+                self.client.set(self._key(key), data, px=int(ttl * 1000))
+            else:
+                self.client.set(self._key(key), data)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.warning(f"写入 Redis 缓存失败: {key}: {e}")
+            return False
+
+        self._stats["sets"] += 1
+        return True
+
+    def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        try:
+            count = self.client.delete(*[self._key(k) for k in keys])
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.warning(f"删除 Redis 缓存失败: {e}")
+            return 0
+        self._stats["deletes"] += count
+        return count
+
+    def delete_prefix(self, prefix: str) -> int:
+        """删除指定前缀的所有键（使用 SCAN，避免 KEYS 阻塞 Redis）"""
+        count = 0
+        try:
+            batch = []
+            for raw_key in self.client.scan_iter(match=f"{self._key(prefix)}*", count=500):
+                batch.append(raw_key)
+                if len(batch) >= 500:
+                    count += self.client.delete(*batch)
+                    batch = []
+            if batch:
+                count += self.client.delete(*batch)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.warning(f"批量删除 Redis 缓存失败: {prefix}: {e}")
+        self._stats["deletes"] += count
+        return count
+
+    def clear(self) -> int:
+        return self.delete_prefix("")
+
+    def get_stats(self) -> Dict[str, Any]:
+        total_requests = self._stats["hits"] + self._stats["misses"]
+        hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+        return {**self._stats, "hit_rate": round(hit_rate, 2)}
+
+    def reset_stats(self):
+        self._stats = self._empty_stats()
+
+
+class CacheInvalidationBus:
+    """
+    跨 worker 缓存失效广播（Redis pub/sub）
+
+    每个进程订阅同一频道；本进程执行的失效操作会广播出去，
+    其他进程收到后只清理自己的 L1（L2 为共享存储，已由发起方删除）。
+    订阅连接断开后会重连，并清空本地 L1，避免错过的失效消息导致脏读。
+    Redis 不可用（MockRedisClient）时所有操作均为空操作。
+    """
+
+    def __init__(self, client: Any, channel: str = "contenthub:cache:invalidate"):
+        """
+        Args:
+            client: 文本模式的 Redis 客户端，None 或 MockRedisClient 时禁用广播
+            channel: pub/sub 频道名
+        """
+        self.client = None if isinstance(client, MockRedisClient) else client
+        self.channel = channel
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handler: Optional[Callable[[str, List[str]], None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = {"published": 0, "received": 0, "errors": 0, "reconnects": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def publish(self, op: str, keys: List[str]):
+        """
+        广播失效消息
+
+        Args:
+            op: 操作类型（delete / delete_prefix / clear）
+            keys: 缓存键或键前缀列表
+        """
+        if not self.enabled:
+            return
+        message = json.dumps({"origin": self.origin, "op": op, "keys": list(keys)})
+        try:
+            self.client.publish(self.channel, message)
+            self._stats["published"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            log.warning(f"广播缓存失效消息失败: {op} {keys}: {e}")
+
+    def start(self, handler: Callable[[str, List[str]], None]):
+        """启动订阅线程，收到其他进程的消息时调用 handler(op, keys)"""
+        self._handler = handler
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._listen_loop,
+            name="cache-invalidation-bus",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """停止订阅线程"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "enabled": self.enabled, "channel": self.channel}
+
+    def _handle_message(self, data: Any):
+        """处理一条 pub/sub 消息，忽略本进程发出的消息"""
+        if isinstance(data, bytes):
+            data = data.decode()
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            log.warning(f"忽略无法解析的缓存失效消息: {data!r}")
+            return
+
+        if message.get("origin") == self.origin or self._handler is None:
+            return
+        self._stats["received"] += 1
+        self._handler(message.get("op"), message.get("keys") or [])
+
+    def _listen_loop(self):
+        backoff = 1
+        first_connect = True
+        while not self._stop_event.is_set():
+            pubsub = None
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if not first_connect:
+                    # 断线期间可能错过失效消息，保守地清空本地缓存
+                    self._stats["reconnects"] += 1
+                    if self._handler is not None:
+                        self._handler("clear", [])
+                first_connect = False
+                backoff = 1
+
+                while not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._handle_message(message.get("data"))
+            except Exception as e:
+                self._stats["errors"] += 1
+                log.warning(f"缓存失效订阅连接异常，{backoff} 秒后重连: {e}")
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+class TieredCache:
+    """
+    两级缓存：先读进程内 L1，再读 Redis L2，L2 命中时回填 L1
+
+    L1 的 TTL 不超过 l1_max_ttl，以限制各 worker 之间数据不一致的时间窗口。
+    配置 bus 时，删除操作会广播给其他 worker 同步清理各自的 L1。
+    未配置 L2 时等价于单独使用 L1。
+    """
+
+    def __init__(
+        self,
+        l1: MemoryCache,
+        l2: Optional[RedisCache] = None,
+        l1_max_ttl: Optional[int] = None,
+        bus: Optional[CacheInvalidationBus] = None,
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_max_ttl = l1_max_ttl
+        self.bus = bus
+
+    def _l1_ttl(self, ttl: Optional[float]) -> Optional[float]:
+        if not self.l1_max_ttl:
+            return ttl
+        if ttl is None:
+            return self.l1_max_ttl
+        return min(ttl, self.l1_max_ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.l1.get(key)
+        if value is not None or self.l2 is None:
+            return value
+
+        value, remaining_ttl = self.l2.get_with_ttl(key)
+        if value is not None:
+            self.l1.set(key, value, ttl=self._l1_ttl(remaining_ttl))
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        self.l1.set(key, value, ttl=self._l1_ttl(ttl))
+        if self.l2 is not None:
+            self.l2.set(key, value, ttl=ttl)
+
+    def delete(self, *keys: str) -> int:
+        count = self.l1.delete(*keys)
+        if self.l2 is not None:
+            count = max(count, self.l2.delete(*keys))
+        if self.bus is not None:
+            self.bus.publish("delete", list(keys))
+        return count
+
+    def delete_prefix(self, prefix: str) -> int:
+        count = self.l1.delete_prefix(prefix)
+        if self.l2 is not None:
+            count = max(count, self.l2.delete_prefix(prefix))
+        if self.bus is not None:
+            self.bus.publish("delete_prefix", [prefix])
+        return count
+
+    def clear(self):
+        self.l1.clear()
+        if self.l2 is not None:
+            self.l2.clear()
+        if self.bus is not None:
+            self.bus.publish("clear", [])
+
+    def apply_invalidation(self, op: str, keys: List[str]):
+        """应用其他 worker 广播的失效操作（只清理本地 L1，不再广播）"""
+        if op == "delete":
+            self.l1.delete(*keys)
+        elif op == "delete_prefix":
+            for prefix in keys:
+                self.l1.delete_prefix(prefix)
+        elif op == "clear":
+            self.l1.clear()
+        else:
+            log.warning(f"未知的缓存失效操作: {op}")
+
+    def cleanup_expired(self) -> int:
+        # Redis 自行处理过期，只需清理 L1
+        return self.l1.cleanup_expired()
+
+    def get_stats(self) -> Dict[str, Any]:
+        l1_stats = self.l1.get_stats()
+        invalidation = self.bus.get_stats() if self.bus is not None else {"enabled": False}
+        if self.l2 is None:
+            return {**l1_stats, "tiers": {"l1": l1_stats}, "invalidation": invalidation}
+
+        l2_stats = self.l2.get_stats()
+        hits = l1_stats["hits"] + l2_stats["hits"]
+        # L1 未命中后会继续查 L2，最终的未命中以 L2 为准
+        misses = l2_stats["misses"] + l2_stats["errors"]
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            **l1_stats,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hit_rate, 2),
+            "tiers": {"l1": l1_stats, "l2": l2_stats},
+            "invalidation": invalidation,
+        }
+
+    def reset_stats(self):
+        self.l1.reset_stats()
+        if self.l2 is not None:
+            self.l2.reset_stats()
+
+
+def _create_cache_backend() -> TieredCache:
+    """根据配置创建缓存后端，Redis 不可用时降级为仅 L1"""
+    l2 = None
+    if settings.REDIS_ENABLED and settings.CACHE_L2_ENABLED:
+        try:
+            client = Redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+            )
+            client.ping()
+            l2 = RedisCache(client, namespace=settings.CACHE_KEY_NAMESPACE)
+            log.info("已启用 Redis 二级缓存")
+        except Exception as e:
+            log.warning(f"Redis 二级缓存不可用，仅使用内存缓存: {e}")
+
+    bus = None
+    if settings.REDIS_ENABLED and settings.CACHE_INVALIDATION_BUS_ENABLED:
+        bus = CacheInvalidationBus(redis_client, channel=settings.CACHE_INVALIDATION_CHANNEL)
+
+    backend = TieredCache(
+        memory_cache,
+        l2,
+        l1_max_ttl=settings.CACHE_L1_MAX_TTL if l2 is not None else None,
+        bus=bus,
+    )
+    if bus is not None:
+        bus.start(backend.apply_invalidation)
+    return backend
+
+
+# 全局缓存后端（cache_query / cache_config 使用）
+cache_backend = _create_cache_backend()
+
+
+def shutdown_cache():
+    """停止缓存相关的后台线程（应用关闭时调用）"""
+    if cache_backend.bus is not None:
+        cache_backend.bus.stop()
+    memory_cache.stop_sweeper()
+
+
+def resolve_cache_ttl(key_prefix: str, default: Optional[int]) -> Optional[int]:
+    """
+    获取缓存前缀对应的 TTL
+
+    优先使用 settings.CACHE_PREFIX_TTLS 中的配置，未配置时使用装饰器的默认值。
+    """
+    return settings.CACHE_PREFIX_TTLS.get(key_prefix, default)
 
 
 # ============================================================================
@@ -245,27 +889,258 @@ def generate_user_cache_key(user_id: int, prefix: str, *args, **kwargs) -> str:
     return generate_cache_key(f"user:{user_id}:{prefix}", *args, **kwargs)
 
 
+# ============================================================================
+# 请求合并（single-flight）
+# ============================================================================
+
+# 哨兵值：区分"没有可用的旧值"和"旧值为 None"
+_MISSING = object()
+
+
+class _StaleEntry(NamedTuple):
+    """带软过期时间的缓存值（用于 stale-while-revalidate）"""
+
+    value: Any
+    fresh_until: float  # time.time() 时间戳，跨进程共享，不能用单调时钟
+
+
+class _Call:
+    """一次进行中的计算"""
+
+    __slots__ = ("event", "result", "error", "owner")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.owner = threading.get_ident()
+
+
+class SingleFlight:
+    """
+    线程间的请求合并
+
+    同一个键同时只有一个线程执行计算，其余线程等待并共享结果（含异常）。
+    提供 stale 值时，其他线程不等待，直接返回旧值。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"executions": 0, "coalesced": 0, "stale_served": 0}
+
+    def do(self, key: str, fn: Callable[[], Any], stale: Any = _MISSING) -> Any:
+        """
+        执行 fn，同一键的并发调用只执行一次
+
+        Args:
+            key: 合并键
+            fn: 计算函数
+            stale: 已过期的旧值；有其他线程在计算时直接返回它
+
+        Returns:
+            计算结果（或旧值）
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            elif call.owner == threading.get_ident():
+                # 同一线程重入，直接计算，避免自己等待自己
+                leader = None
+            else:
+                leader = False
+
+        if leader is None:
+            return fn()
+
+        if not leader:
+            if stale is not _MISSING:
+                self._stats["stale_served"] += 1
+                return stale
+            self._stats["coalesced"] += 1
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        self._stats["executions"] += 1
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._calls)}
+
+    def reset_stats(self):
+        self._stats = self._empty_stats()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio 任务间的请求合并
+
+    Future 绑定在事件循环上，因此按 (事件循环, 键) 区分进行中的计算。
+    """
+
+    def __init__(self):
+        self._futures: Dict[tuple, asyncio.Future] = {}
+        self._stats = SingleFlight._empty_stats()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], stale: Any = _MISSING) -> Any:
+        """异步版本的 SingleFlight.do，fn 为返回协程的函数"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+
+        future = self._futures.get(flight_key)
+        if future is not None:
+            if stale is not _MISSING:
+                self._stats["stale_served"] += 1
+                return stale
+            self._stats["coalesced"] += 1
+            # shield：等待方被取消时不影响正在进行的计算
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        # 没有等待方时也要取走异常，避免 "exception was never retrieved" 警告
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._futures[flight_key] = future
+        self._stats["executions"] += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+            raise
+        finally:
+            self._futures.pop(flight_key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._futures)}
+
+    def reset_stats(self):
+        self._stats = SingleFlight._empty_stats()
+
+
+# 全局请求合并实例
+single_flight = SingleFlight()
+async_single_flight = AsyncSingleFlight()
+
+
+def _read_cached(cache_key: str) -> tuple:
+    """
+    读取缓存并判断是否新鲜
+
+    Returns:
+        (value, is_fresh)，未命中时 value 为 _MISSING
+    """
+    entry = cache_backend.get(cache_key)
+    if entry is None:
+        return _MISSING, False
+    if isinstance(entry, _StaleEntry):
+        return entry.value, time.time() < entry.fresh_until
+    return entry, True
+
+
+def _write_cached(cache_key: str, value: Any, ttl: Optional[int], stale_ttl: int):
+    """写入缓存；启用 stale_ttl 时额外保留一段可供返回旧值的时间"""
+    if value is None:
+        return
+    if stale_ttl and ttl:
+        entry = _StaleEntry(value, time.time() + ttl)
+        cache_backend.set(cache_key, entry, ttl=ttl + stale_ttl)
+    else:
+        cache_backend.set(cache_key, value, ttl=ttl)
+
+
+# ============================================================================
+# 快照（snapshot）模式
+# ============================================================================
+
+def _to_snapshot(value: Any, schema: type) -> Any:
+    """
+    把查询结果转换为与会话无关的纯数据
+
+    支持单个 ORM 对象、列表以及 (列表, 总数) 这类元组；
+    标量原样保留，ORM 对象/字典按 schema 校验后转为 dict。
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, list):
+        return [_to_snapshot(item, schema) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_to_snapshot(item, schema) for item in value)
+    if isinstance(value, dict):
+        return schema.model_validate(value).model_dump()
+    return schema.model_validate(value, from_attributes=True).model_dump()
+
+
+def _from_snapshot(data: Any, schema: type) -> Any:
+    """从纯数据重建 schema 实例，每次读取都返回新对象，调用方修改不会影响缓存"""
+    if data is None or isinstance(data, (str, int, float, bool)):
+        return data
+    if isinstance(data, list):
+        return [_from_snapshot(item, schema) for item in data]
+    if isinstance(data, tuple):
+        return tuple(_from_snapshot(item, schema) for item in data)
+    return schema.model_validate(data)
+
+
 # ============================================================================
 # 缓存装饰器
 # ============================================================================
 
-def cache_query(ttl: int = 300, key_prefix: str = "query", use_user_id: bool = False):
+def cache_query(
+    ttl: int = 300,
+    key_prefix: str = "query",
+    use_user_id: bool = False,
+    stale_ttl: int = 0,
+    coalesce: bool = True,
+    snapshot: Optional[type] = None,
+):
     """
     查询结果缓存装饰器
 
+    同一个键的并发未命中只执行一次查询（single-flight），其余调用等待结果。
+    设置 stale_ttl 后，过期后的 stale_ttl 秒内仍返回旧值，由一个调用方负责刷新。
+    同时支持普通函数和协程函数。
+
+    设置 snapshot（Pydantic schema）后，缓存中保存按 schema 转换的纯数据而不是
+    ORM 对象，读取时返回新的 schema 实例：不依赖已关闭的会话，也可以写入 Redis。
+    转换失败时不缓存，直接返回原始结果。
+
     Args:
         ttl: 缓存过期时间（秒），默认300秒（5分钟）
         key_prefix: 缓存键前缀
         use_user_id: 是否在缓存键中包含用户ID（从kwargs中获取user_id）
+        stale_ttl: 过期后继续返回旧值的时间（秒），0 表示不启用
+        coalesce: 是否合并同一个键的并发未命中
+        snapshot: 快照 schema（需支持 from_attributes）
 
     Examples:
-        >>> @cache_query(ttl=600, key_prefix="accounts")
+        >>> @cache_query(ttl=600, key_prefix="accounts", stale_ttl=60)
         >>> def get_accounts(db: Session, user_id: int):
         ...     return db.query(Account).all()
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        def build_key(args, kwargs) -> str:
             # 提取 user_id（如果需要）
             user_id = None
             if use_user_id:
@@ -275,51 +1150,101 @@ def cache_query(ttl: int = 300, key_prefix: str = "query", use_user_id: bool = F
 
             # 生成缓存键
             if user_id:
-                cache_key = generate_user_cache_key(
+                return generate_user_cache_key(
                     user_id,
                     key_prefix,
                     *args[1:],  # 跳过 self/db 参数
                     **kwargs
                 )
-            else:
-                cache_key = generate_cache_key(
-                    key_prefix,
-                    *args[1:],  # 跳过 self/db 参数
-                    **kwargs
-                )
-
-            # 尝试从缓存获取
-            cached_value = memory_cache.get(cache_key)
-            if cached_value is not None:
-                log.debug(f"缓存命中: {cache_key}")
-                return cached_value
-
-            # 缓存未命中，执行函数
-            log.debug(f"缓存未命中: {cache_key}")
-            result = func(*args, **kwargs)
-
-            # 存入缓存
-            memory_cache.set(cache_key, result, ttl=ttl)
-
-            return result
+            return generate_cache_key(
+                key_prefix,
+                *args[1:],  # 跳过 self/db 参数
+                **kwargs
+            )
+
+        def store(cache_key: str, result: Any, effective_ttl: Optional[int]) -> tuple:
+            """
+            写入缓存
+
+            Returns:
+                (cached_data, ok)，ok 为 False 表示快照转换失败、未写入缓存
+            """
+            if snapshot is not None:
+                try:
+                    result = _to_snapshot(result, snapshot)
+                except Exception as e:
+                    log.warning(f"缓存快照转换失败，跳过缓存: {cache_key}: {e}")
+                    return result, False
+            _write_cached(cache_key, result, effective_ttl, stale_ttl)
+            return result, True
+
+        def restore(data: Any) -> Any:
+            if snapshot is None:
+                return data
+            return _from_snapshot(data, snapshot)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache_key = build_key(args, kwargs)
+                effective_ttl = resolve_cache_ttl(key_prefix, ttl)
+
+                value, is_fresh = _read_cached(cache_key)
+                if is_fresh:
+                    log.debug(f"缓存命中: {cache_key}")
+                    return restore(value)
+
+                async def load():
+                    # 等待期间可能已被其他调用方写入
+                    current, fresh = _read_cached(cache_key)
+                    if fresh:
+                        return current, True
+                    log.debug(f"缓存未命中: {cache_key}")
+                    result = await func(*args, **kwargs)
+                    return store(cache_key, result, effective_ttl)
+
+                if not coalesce:
+                    data, ok = await load()
+                else:
+                    data, ok = await async_single_flight.do(
+                        cache_key, load, stale=(value, True) if value is not _MISSING else _MISSING
+                    )
+                return restore(data) if ok else data
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                cache_key = build_key(args, kwargs)
+                effective_ttl = resolve_cache_ttl(key_prefix, ttl)
+
+                # 尝试从缓存获取
+                value, is_fresh = _read_cached(cache_key)
+                if is_fresh:
+                    log.debug(f"缓存命中: {cache_key}")
+                    return restore(value)
+
+                def load():
+                    # 等待锁期间可能已被其他线程写入
+                    current, fresh = _read_cached(cache_key)
+                    if fresh:
+                        return current, True
+                    # 缓存未命中，执行函数并存入缓存
+                    log.debug(f"缓存未命中: {cache_key}")
+                    result = func(*args, **kwargs)
+                    return store(cache_key, result, effective_ttl)
+
+                if not coalesce:
+                    data, ok = load()
+                else:
+                    data, ok = single_flight.do(
+                        cache_key, load, stale=(value, True) if value is not _MISSING else _MISSING
+                    )
+                return restore(data) if ok else data
 
         # 添加缓存失效方法
         def invalidate(*args, **kwargs):
             """失效缓存"""
-            if user_id:
-                cache_key = generate_user_cache_key(
-                    user_id,
-                    key_prefix,
-                    *args[1:],
-                    **kwargs
-                )
-            else:
-                cache_key = generate_cache_key(
-                    key_prefix,
-                    *args[1:],
-                    **kwargs
-                )
-            memory_cache.delete(cache_key)
+            cache_key = build_key(args, kwargs)
+            cache_backend.delete(cache_key)
             log.info(f"缓存已失效: {cache_key}")
 
         wrapper.cache_key_prefix = key_prefix
@@ -330,20 +1255,33 @@ def cache_query(ttl: int = 300, key_prefix: str = "query", use_user_id: bool = F
     return decorator
 
 
-def cache_config(ttl: int = 3600, key_prefix: str = "config"):
+def cache_config(
+    ttl: int = 3600,
+    key_prefix: str = "config",
+    stale_ttl: int = 0,
+    snapshot: Optional[type] = None,
+):
     """
     系统配置缓存装饰器（长期缓存）
 
     Args:
         ttl: 缓存过期时间（秒），默认3600秒（1小时）
         key_prefix: 缓存键前缀
+        stale_ttl: 过期后继续返回旧值的时间（秒）
+        snapshot: 快照 schema，见 cache_query
 
     Examples:
         >>> @cache_config(ttl=3600, key_prefix="writing_style")
         >>> def get_writing_styles(db: Session):
         ...     return db.query(WritingStyle).all()
     """
-    return cache_query(ttl=ttl, key_prefix=key_prefix, use_user_id=False)
+    return cache_query(
+        ttl=ttl,
+        key_prefix=key_prefix,
+        use_user_id=False,
+        stale_ttl=stale_ttl,
+        snapshot=snapshot,
+    )
 
 
 def invalidate_cache_pattern(pattern: str):
@@ -356,14 +1294,9 @@ def invalidate_cache_pattern(pattern: str):
     if not pattern.endswith("*"):
         pattern = f"{pattern}*"
 
-    keys_to_delete = [
-        key for key in memory_cache._cache.keys()
-        if key.startswith(pattern.rstrip("*"))
-    ]
-
-    if keys_to_delete:
-        memory_cache.delete(*keys_to_delete)
-        log.info(f"批量失效缓存: {pattern} ({len(keys_to_delete)} 个键)")
+    count = cache_backend.delete_prefix(pattern.rstrip("*"))
+    if count:
+        log.info(f"批量失效缓存: {pattern} ({count} 个键)")
 
 
 # ============================================================================
@@ -371,16 +1304,17 @@ def invalidate_cache_pattern(pattern: str):
 # ============================================================================
 
 def get_cache_stats() -> Dict[str, Any]:
-    """获取缓存统计信息"""
-    return memory_cache.get_stats()
+    """获取缓存统计信息（含各级缓存明细和请求合并统计）"""
+    return {
+        **cache_backend.get_stats(),
+        "single_flight": single_flight.get_stats(),
+        "async_single_flight": async_single_flight.get_stats(),
+    }
 
 
 def reset_cache_stats():
     """重置缓存统计"""
-    memory_cache._stats = {
-        "hits": 0,
-        "misses": 0,
-        "sets": 0,
-        "deletes": 0
-    }
+    cache_backend.reset_stats()
+    single_flight.reset_stats()
+    async_single_flight.reset_stats()
     log.info("缓存统计已重置")
@@ -2,7 +2,7 @@
 ContentHub 配置文件
 """
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,8 +31,20 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     API_STR: str = "/api/v1"
 
+    # 分页配置
+    DEFAULT_PAGE_SIZE: int = 20  # 默认每页数量
+    MAX_PAGE_SIZE: int = 100  # 每页最大数量
+    PAGINATION_COUNT_CACHE_TTL: int = 60  # 游标分页总数的缓存时间（秒，0 表示每次精确统计）
+
     # 数据库配置
     DATABASE_URL: Optional[str] = f"sqlite:///{os.path.join(data_dir, 'contenthub.db')}"
+    DB_POOL_SIZE: int = 5  # 连接池常驻连接数
+    DB_MAX_OVERFLOW: int = 10  # 连接池允许的额外连接数
+    DB_POOL_TIMEOUT: int = 30  # 获取连接的最长等待时间（秒）
+    DB_POOL_RECYCLE: int = 3600  # 连接回收时间（秒）
+    SQLITE_WAL_ENABLED: bool = True  # SQLite 是否启用 WAL 模式
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # SQLite 同步级别：OFF | NORMAL | FULL
+    SQLITE_BUSY_TIMEOUT: int = 5000  # SQLite 等待写锁的时间（毫秒）
 
     # 安全配置
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
@@ -47,6 +59,14 @@ class Settings(BaseSettings):
     # Content-Publisher 服务配置
     PUBLISHER_API_URL: str = "http://150.158.88.23:3010"
     PUBLISHER_API_KEY: str = ""
+    PUBLISHER_HTTP_POOL_SIZE: int = 10  # 每个主机保持的 keep-alive 连接数（并发发布数）
+    PUBLISHER_HTTP_POOL_CONNECTIONS: int = 4  # 缓存连接池的主机数
+    PUBLISHER_UPLOAD_CHUNK_SIZE: int = 65536  # 上传图片时每次从磁盘读取并发送的字节数
+    PUBLISHER_MEDIA_CACHE_ENABLED: bool = True  # 按 (账号, 文件 sha256) 缓存已上传的图片，再次发布时直接引用
+    PUBLISHER_MEDIA_CACHE_TTL: int = 259200  # 上传接口未返回过期时间时，缓存的有效期（秒，默认 3 天）
+    PUBLISH_MAX_CONCURRENCY: int = 8  # 发布池/批量发布同时进行的发布数（同一账号同时只发布一篇）
+    PUBLISH_ACCOUNT_RATE_PER_MINUTE: float = 10  # 每个账号每分钟最多发布数（0 表示不限速）
+    PUBLISH_ACCOUNT_BURST: int = 3  # 每个账号允许的突发发布数（令牌桶容量）
 
     # Content-Creator API 配置（HTTP API）
     CREATOR_API_BASE_URL: str = "http://localhost:18100"  # content-creator API 基础地址
@@ -68,6 +88,25 @@ class Settings(BaseSettings):
     # 任务调度配置
     SCHEDULER_ENABLED: bool = True
     SCHEDULER_TIMEZONE: str = "Asia/Shanghai"
+    SCHEDULER_POOL_SIZE: int = 4  # 每种执行器类型默认的工作线程数（即该类型任务的并发上限）
+    SCHEDULER_EXECUTOR_POOLS: Dict[str, int] = {}  # 按执行器类型覆盖工作线程数，如 {"async_content_generation": 2}
+    SCHEDULER_MAX_INSTANCES: int = 1  # 同一定时任务允许同时运行的实例数
+    SCHEDULER_COALESCE: bool = True  # 错过的多次执行是否合并为一次
+    SCHEDULER_MISFIRE_GRACE_TIME: int = 300  # 错过执行时间的宽限时间（秒）
+    SCHEDULER_HISTORY_BATCH_SIZE: int = 50  # 执行记录缓冲达到该条数时立即批量写入
+    SCHEDULER_HISTORY_FLUSH_INTERVAL: int = 5  # 执行记录缓冲的最长写入间隔（秒）
+    SCHEDULER_HISTORY_RESULT_MAX_CHARS: int = 2000  # 执行结果 JSON 超过该长度时只保存摘要
+    SCHEDULER_HISTORY_RETENTION_DAYS: int = 7  # 执行明细保留天数，更早的记录压缩为小时汇总
+    SCHEDULER_SYNC_INTERVAL: int = 10  # 按 updated_at 增量同步定时任务的间隔（秒，0 表示不同步）
+    SCHEDULER_LOCK_ENABLED: bool = True  # 多副本部署时通过数据库锁保证每次触发只在一个副本执行
+    SCHEDULER_LOCK_TTL: int = 300  # 运行锁租期（秒），运行期间自动续期
+    SCHEDULER_INSTANCE_ID: str = ""  # 副本标识，为空时使用 主机名:进程号
+    SCHEDULER_PROFILING_ENABLED: bool = True  # 统计各执行器的耗时分布、数据库/外部 API 耗时和排队时间
+    SCHEDULER_WORKFLOW_MAX_CONCURRENCY: int = 4  # DAG 工作流同时执行的步骤数上限（任务参数 max_concurrency 可覆盖）
+    SCHEDULER_WORKFLOW_STEP_TIMEOUT: int = 0  # 工作流单个步骤的默认超时（秒，0 表示不限制）
+    SCHEDULER_WORKFLOW_RESUME_ENABLED: bool = True  # 工作流失败后再次触发时从失败的步骤续跑（任务参数 resume 可覆盖）
+    SCHEDULER_WORKFLOW_RESUME_WINDOW_HOURS: int = 24  # 超过该时长的失败运行不再续跑，重新开始
+    STATS_ROLLUP_DAYS: int = 3  # 统计汇总任务每次重算的天数（含今天）
 
     # 文件存储配置
     STORAGE_ROOT: str = os.path.join(data_dir, "accounts")
@@ -93,7 +132,12 @@ class Settings(BaseSettings):
     ASYNC_TASK_TIMEOUT: int = 1800  # 任务超时时间（秒）30分钟
     ASYNC_POLL_INTERVAL: int = 30  # 状态轮询间隔（秒）30秒
     ASYNC_AUTO_APPROVE: bool = True  # 是否自动审核通过
-    ASYNC_WORKER_COUNT: int = 3  # Worker 进程数
+    ASYNC_WORKER_COUNT: int = 3  # 启用 ASYNC_SUBMIT_VIA_QUEUE 时随调度器模块启动的任务队列 Worker 线程数
+    TASK_QUEUE_BACKEND: str = "database"  # 任务队列：database（持久化，多 Worker/多副本共享）/memory（仅单进程）
+    TASK_QUEUE_VISIBILITY_TIMEOUT: int = 300  # 领取后未确认的任务重新可见的时间（秒）
+    TASK_QUEUE_RETRY_DELAY: int = 30  # 处理失败后重新入队的基础延迟（秒），按领取次数指数增长
+    TASK_QUEUE_POLL_INTERVAL: int = 60  # Worker 没有收到入队通知时兜底轮询数据库的间隔（秒）
+    ASYNC_SUBMIT_VIA_QUEUE: bool = False  # 提交生成任务时只入队并唤醒 Worker，由 Worker 提交到 content-creator（Worker 池随调度器模块启动）
 
     # Webhook 配置（可选）
     WEBHOOK_ENABLED: bool = False  # 是否启用 Webhook 通知
@@ -107,6 +151,17 @@ class Settings(BaseSettings):
     REDIS_ENABLED: bool = False  # 是否启用 Redis
     REDIS_URL: str = "redis://localhost:6379/0"  # Redis 连接 URL
 
+    # 内存缓存配置
+    CACHE_MAX_ENTRIES: int = 10000  # 最大缓存条目数（0 表示不限制）
+    CACHE_MAX_BYTES: int = 67108864  # 最大估算占用字节数，默认 64MB（0 表示不限制）
+    CACHE_SWEEP_INTERVAL: int = 60  # 后台清理过期缓存的间隔（秒，0 表示不启动）
+    CACHE_L2_ENABLED: bool = True  # REDIS_ENABLED 时是否使用 Redis 作为二级缓存
+    CACHE_L1_MAX_TTL: int = 60  # 启用二级缓存时，进程内缓存的最长 TTL（秒）
+    CACHE_KEY_NAMESPACE: str = "contenthub:cache:"  # Redis 缓存键前缀
+    CACHE_PREFIX_TTLS: Dict[str, int] = {}  # 按缓存前缀覆盖 TTL，如 {"accounts": 600}
+    CACHE_INVALIDATION_BUS_ENABLED: bool = True  # REDIS_ENABLED 时是否跨 worker 广播缓存失效
+    CACHE_INVALIDATION_CHANNEL: str = "contenthub:cache:invalidate"  # 缓存失效广播频道
+
     model_config = SettingsConfigDict(
         env_file=env_file,
         validate_by_name=True,
@@ -1,42 +1,15 @@
 """
-数据库配置和会话管理
-"""
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from app.core.config import settings
-
-# 创建数据库引擎
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG
-)
-
-# 创建会话工厂
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+数据库配置和会话管理（兼容旧导入路径）
 
-# 创建基础模型类
-Base = declarative_base()
-
-
-def get_db() -> Session:
-    """
-    获取数据库会话（依赖注入）
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+引擎、会话工厂和 Base 统一由 app.db.sql_db 提供，
+这里只做转发，保证整个进程只有一个引擎和连接池。
+"""
+from app.db.sql_db import Base, get_async_db, get_db, get_engine, get_session_local, init_db
 
+# 数据库引擎（与 sql_db 共用）
+engine = get_engine()
 
-def init_db():
-    """
-    初始化数据库（创建所有表）
-    """
-    from app.models import (
-        user, customer, platform, theme, account, content, scheduler, publisher, audit_log
-    )  # noqa
+# 会话工厂（与 sql_db 共用）
+SessionLocal = get_session_local()
 
-    Base.metadata.create_all(bind=engine)
+__all__ = ["Base", "engine", "SessionLocal", "get_db", "get_async_db", "init_db"]
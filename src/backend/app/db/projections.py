@@ -0,0 +1,95 @@
+"""
+列表查询的列投影注册表
+
+列表接口只展示少量字段，但 Content.content（完整 Markdown）、summary、
+review_comment 以及 ContentGenerationTask.result（JSON）等大字段默认会随每一行加载。
+这里按响应 schema（或命名的 profile）登记需要加载的列，查询时通过
+load_only 只取这些列，其余列在真正访问时才按需加载。
+
+用法:
+    query = db.query(Content).options(projection(ContentListRead, Content))
+    stmt = select(ContentGenerationTask).options(projection("task_polling"))
+"""
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.strategy_options import Load
+
+ProjectionKey = Union[type, str]
+
+# key -> (模型类, 列名)
+_projections: Dict[ProjectionKey, Tuple[type, Tuple[str, ...]]] = {}
+
+
+def _column_names(model: type) -> Tuple[str, ...]:
+    return tuple(attr.key for attr in inspect(model).column_attrs)
+
+
+def _schema_fields(schema: type) -> Iterable[str]:
+    # pydantic v2 使用 model_fields，v1 使用 __fields__
+    fields = getattr(schema, "model_fields", None) or getattr(schema, "__fields__", {})
+    return fields.keys()
+
+
+def register_projection(
+    key: ProjectionKey,
+    model: type,
+    columns: Optional[Iterable[str]] = None,
+    exclude: Optional[Iterable[str]] = None,
+) -> Tuple[str, ...]:
+    """
+    登记列投影
+
+    Args:
+        key: 响应 schema 类或 profile 名称
+        model: ORM 模型类
+        columns: 需要加载的列；为空时取 schema 字段与模型列的交集
+        exclude: 从模型全部列中排除的列（与 columns 互斥，用于非 schema 的 profile）
+
+    Returns:
+        实际登记的列名（主键总会包含在内）
+    """
+    model_columns = _column_names(model)
+
+    if columns is not None:
+        selected = [name for name in columns if name in model_columns]
+    elif exclude is not None:
+        excluded = set(exclude)
+        selected = [name for name in model_columns if name not in excluded]
+    elif isinstance(key, type):
+        fields = set(_schema_fields(key))
+        selected = [name for name in model_columns if name in fields]
+    else:
+        raise ValueError(f"profile {key!r} 需要指定 columns 或 exclude")
+
+    for pk in inspect(model).primary_key:
+        if pk.key not in selected:
+            selected.insert(0, pk.key)
+
+    _projections[key] = (model, tuple(selected))
+    return _projections[key][1]
+
+
+def get_projection(key: ProjectionKey, model: Optional[type] = None) -> Tuple[str, ...]:
+    """
+    获取登记的列名；schema 未登记且给出了模型时自动按字段推导并登记
+    """
+    if key not in _projections:
+        if model is None or not isinstance(key, type):
+            raise KeyError(f"未登记的列投影: {key!r}")
+        register_projection(key, model)
+    return _projections[key][1]
+
+
+def projection(key: ProjectionKey, model: Optional[type] = None) -> Load:
+    """
+    生成 load_only 加载选项，可用于 Query.options() 和 select().options()
+
+    Args:
+        key: 响应 schema 类或 profile 名称
+        model: ORM 模型类（schema 首次使用时需要）
+    """
+    columns = get_projection(key, model)
+    registered_model = _projections[key][0]
+    return load_only(*(getattr(registered_model, name) for name in columns))
@@ -1,22 +1,59 @@
+"""
+数据库引擎和会话管理
+
+进程内唯一的引擎注册表：所有服务、API 依赖和 CLI 共用同一个引擎和连接池。
+app.db.database 仅为兼容旧导入路径而保留，内部同样使用这里的引擎。
+
+另外提供基于 create_async_engine 的异步引擎（aiosqlite/asyncpg），
+供高频只读接口通过 get_async_db 使用，避免同步查询阻塞事件循环。
+"""
 import os
 import time
 from contextlib import contextmanager
-from typing import Any, Generator, Optional
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 from app.utils.custom_logger import log
 
-_engine = None
+_engine: Optional[Engine] = None
 _session_local: Optional[sessionmaker] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_local: Optional[async_sessionmaker] = None
+
+# 同步驱动到异步驱动的映射
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+# 连接池事件计数
+_pool_stats: Dict[str, int] = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "invalidated": 0,
+}
 
 # 创建基类
 Base = declarative_base()
 
 
+def _is_sqlite(db_url: str) -> bool:
+    return db_url.startswith("sqlite")
+
+
+def _is_sqlite_memory(db_url: str) -> bool:
+    return _is_sqlite(db_url) and (db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url)
+
+
 def _ensure_sqlite_dir(db_url: str) -> dict:
     """
     如果是 sqlite，确保父目录存在并设置必要的连接参数。
@@ -31,23 +68,79 @@ def _ensure_sqlite_dir(db_url: str) -> dict:
     return connect_args
 
 
-def get_engine():
+def _engine_options(db_url: str) -> Dict[str, Any]:
+    """根据数据库类型生成连接池参数"""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # 内存 SQLite 使用 SingletonThreadPool，不支持池大小相关参数
+    if not _is_sqlite_memory(db_url):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def _register_sqlite_pragmas(engine: Engine, db_url: str) -> None:
+    """为每个新建的 SQLite 连接设置 WAL、同步级别和 busy_timeout"""
+    use_wal = settings.SQLITE_WAL_ENABLED and not _is_sqlite_memory(db_url)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if use_wal:
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+        finally:
+            cursor.close()
+
+
+def _register_pool_metrics(engine: Engine) -> None:
+    """统计新建连接、checkout/checkin 和失效连接的次数"""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        _pool_stats["connects"] += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _pool_stats["checkouts"] += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        _pool_stats["checkins"] += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        _pool_stats["invalidated"] += 1
+
+
+def get_engine() -> Engine:
     global _engine
     if _engine is not None:
         return _engine
-    
+
     if not settings.DATABASE_URL:
         raise RuntimeError("DATABASE_URL is not configured")
 
-    connect_args = _ensure_sqlite_dir(settings.DATABASE_URL)
+    db_url = settings.DATABASE_URL
+    connect_args = _ensure_sqlite_dir(db_url)
     _engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=3600,
+        db_url,
         echo=settings.LOG_SQL_QUERIES and settings.DEBUG,
         connect_args=connect_args,
+        **_engine_options(db_url),
     )
 
+    if _is_sqlite(db_url):
+        _register_sqlite_pragmas(_engine, db_url)
+    _register_pool_metrics(_engine)
+
     if settings.LOG_SQL_QUERIES:
 
         @event.listens_for(_engine, "before_cursor_execute")
@@ -68,6 +161,30 @@ def get_engine():
     return _engine
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    获取连接池指标
+
+    Returns:
+        包含池容量、当前借出数量和累计事件计数的字典
+    """
+    engine = get_engine()
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        "pool_class": type(pool).__name__,
+        "connects": _pool_stats["connects"],
+        "checkouts": _pool_stats["checkouts"],
+        "checkins": _pool_stats["checkins"],
+        "invalidated": _pool_stats["invalidated"],
+    }
+    # 只有 QueuePool 提供容量相关的信息
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+
 def get_session_local() -> sessionmaker:
     global _session_local
     if _session_local is not None:
@@ -78,6 +195,77 @@ def get_session_local() -> sessionmaker:
     return _session_local
 
 
+def get_async_database_url(db_url: str) -> str:
+    """
+    将同步数据库 URL 转换为对应的异步驱动 URL
+
+    Args:
+        db_url: 同步数据库 URL，例如 sqlite:///./data/contenthub.db
+
+    Returns:
+        异步驱动 URL，例如 sqlite+aiosqlite:///./data/contenthub.db
+    """
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    async_driver = _ASYNC_DRIVERS.get(backend)
+    if async_driver is None:
+        raise RuntimeError(f"不支持的异步数据库类型: {backend}")
+    if url.drivername == async_driver:
+        return db_url
+    return db_url.replace(url.drivername, async_driver, 1)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is not None:
+        return _async_engine
+
+    if not settings.DATABASE_URL:
+        raise RuntimeError("DATABASE_URL is not configured")
+
+    db_url = settings.DATABASE_URL
+    options = _engine_options(db_url)
+    if _is_sqlite(db_url):
+        _ensure_sqlite_dir(db_url)
+        # aiosqlite 默认不使用队列池，文件数据库显式启用以复用连接
+        if not _is_sqlite_memory(db_url):
+            options["poolclass"] = AsyncAdaptedQueuePool
+
+    _async_engine = create_async_engine(
+        get_async_database_url(db_url),
+        echo=settings.LOG_SQL_QUERIES and settings.DEBUG,
+        **options,
+    )
+    if _is_sqlite(db_url):
+        _register_sqlite_pragmas(_async_engine.sync_engine, db_url)
+    return _async_engine
+
+
+def get_async_session_local() -> async_sessionmaker:
+    global _async_session_local
+    if _async_session_local is not None:
+        return _async_session_local
+
+    _async_session_local = async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    return _async_session_local
+
+
+async def dispose_async_engine() -> None:
+    """
+    关闭异步引擎并释放连接池
+    """
+    global _async_engine, _async_session_local
+    if _async_engine is None:
+        return
+    await _async_engine.dispose()
+    _async_engine = None
+    _async_session_local = None
+
+
 def init_db() -> None:
     """
     初始化数据库
@@ -116,5 +304,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
 
 
-
-
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    获取异步数据库会话
+    """
+    async with get_async_session_local()() as db:
+        yield db
@@ -0,0 +1,46 @@
+"""
+数据库列类型与绑定值工具
+
+SQLite 以字符串保存时间：server_default=func.now() 写入的是 "YYYY-MM-DD HH:MM:SS"，
+而 SQLAlchemy 绑定参数总会带上 ".ffffff"。按字符串比较时两者不相等，
+与时间列比较的绑定值需要按服务端默认值一致的格式生成。
+
+用法:
+    query.filter(TaskExecution.start_time < timestamp_literal(cutoff))
+"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, literal
+from sqlalchemy.types import TypeDecorator
+
+
+class _ServerDateTime(TypeDecorator):
+    """
+    与时间列比较时使用的绑定类型
+
+    SQLite 上按与服务端默认值一致的格式绑定（有微秒时才带 ".ffffff"），
+    其他数据库按带时区的 DateTime 绑定
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return text
+
+
+def timestamp_literal(value: datetime):
+    """
+    生成与时间列比较用的绑定值（SQLite 上按服务端默认值的格式绑定）
+    """
+    return literal(value, type_=_ServerDateTime())
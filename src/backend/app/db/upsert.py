@@ -0,0 +1,64 @@
+"""
+插入或累加汇总行
+
+汇总表（daily_stats、task_execution_hourly_stats 等）按唯一键累加计数，多个事务同时写入
+同一键的第一条记录时都会尝试插入。SQLite / PostgreSQL 使用 INSERT ... ON CONFLICT DO UPDATE
+原子地插入或更新；其他数据库先更新，行不存在时在 SAVEPOINT 中插入，插入冲突说明并发事务已插入，改为更新。
+
+用法:
+    upsert(connection, table, {"task_id": 1, "hour": hour}, row,
+           lambda new: {"total_count": table.c.total_count + new["total_count"]})
+"""
+from typing import Any, Callable, Dict
+
+from sqlalchemy import Table, insert, update
+from sqlalchemy.exc import IntegrityError
+
+
+def dialect_insert(connection):
+    """返回支持 ON CONFLICT 的 insert 构造函数，不支持的数据库返回 None"""
+    if connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def upsert(
+    connection,
+    table: Table,
+    keys: Dict[str, Any],
+    row: Dict[str, Any],
+    updates: Callable[[Any], Dict[str, Any]]
+) -> None:
+    """
+    插入一行，唯一键已存在时更新该行
+
+    Args:
+        connection: 数据库连接（Session.connection() 或 Connection）
+        table: 目标表，keys 中的列须有唯一约束
+        keys: 唯一键列 -> 值
+        row: 插入时的其他列 -> 值
+        updates: 接收本次要写入的值（按列名取值），返回已有行需要更新的列 -> 表达式
+    """
+    insert_dialect = dialect_insert(connection)
+    if insert_dialect is not None:
+        statement = insert_dialect(table).values(**keys, **row)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c[name] for name in keys],
+            set_=updates(statement.excluded),
+        ))
+        return
+
+    increment = update(table).where(
+        *(table.c[name] == value for name, value in keys.items())
+    ).values(updates(row))
+    if connection.execute(increment).rowcount:
+        return
+    try:
+        with connection.begin_nested():
+            connection.execute(insert(table).values(**keys, **row))
+    except IntegrityError:
+        connection.execute(increment)
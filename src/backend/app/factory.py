@@ -135,6 +135,16 @@ def create_app() -> FastAPI:
         # 运行模块关闭钩子
         await run_shutdown(modules, app)
 
+        # 停止缓存后台线程
+        from app.core.cache import shutdown_cache
+
+        shutdown_cache()
+
+        # 释放异步数据库连接池
+        from app.db.sql_db import dispose_async_engine
+
+        await dispose_async_engine()
+
         log.info("✅ 应用已关闭")
 
     # 健康检查接口
@@ -8,9 +8,12 @@ from app.models.theme import ContentTheme
 from app.models.account import Account, WritingStyle, ContentSection, DataSource, PublishConfig, AccountConfig
 from app.models.content import Content, TopicHistory
 from app.models.content_generation_task import ContentGenerationTask
-from app.models.scheduler import ScheduledTask, TaskExecution
-from app.models.publisher import PublishLog, PublishPool
+from app.models.scheduler import (
+    ScheduledTask, TaskExecution, TaskExecutionHourlyStat, SchedulerJobLock, WorkflowRun, WorkflowStepRun
+)
+from app.models.publisher import PublishLog, PublishPool, MediaAsset
 from app.models.audit_log import AuditLog
+from app.models.stats import DailyStat
 
 __all__ = [
     "User",
@@ -28,7 +31,13 @@ __all__ = [
     "ContentGenerationTask",
     "ScheduledTask",
     "TaskExecution",
+    "TaskExecutionHourlyStat",
+    "SchedulerJobLock",
+    "WorkflowRun",
+    "WorkflowStepRun",
     "PublishLog",
     "PublishPool",
+    "MediaAsset",
     "AuditLog",
+    "DailyStat",
 ]
@@ -46,6 +46,7 @@ class AuditLog(Base):
     __table_args__ = (
         Index("ix_audit_logs_timestamp_event_type", "timestamp", "event_type"),
         Index("ix_audit_logs_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
     )
 
     def __repr__(self):
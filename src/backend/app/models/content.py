@@ -1,7 +1,7 @@
 """
 内容相关数据模型
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.sql_db import Base
@@ -32,7 +32,7 @@ class Content(Base):
 
     # 审核相关字段
     review_mode = Column(String(20), default="auto", comment="审核模式：auto/manual")
-    review_status = Column(String(20), default="pending", comment="审核状态：pending/approved/rejected")
+    review_status = Column(String(20), default="pending", index=True, comment="审核状态：pending/approved/rejected")
     review_comment = Column(Text, comment="审核意见")
 
     # 发布相关字段
@@ -56,6 +56,12 @@ class Content(Base):
     pool_entry = relationship("PublishPool", back_populates="content", uselist=False, cascade="all, delete-orphan")
     generation_tasks = relationship("ContentGenerationTask", back_populates="content")
 
+    # 复合索引，支持按 (created_at, id) 的游标分页
+    __table_args__ = (
+        Index("ix_contents_created_at_id", "created_at", "id"),
+        Index("ix_contents_account_id_created_at_id", "account_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<Content(id={self.id}, title={self.title}, publish_status={self.publish_status})>"
 
@@ -30,11 +30,17 @@ class ContentGenerationTask(Base):
     tone = Column(String(50), comment="语气风格")
 
     # 任务状态
-    status = Column(String(50), default="pending", index=True, comment="任务状态：pending/processing/completed/failed/timeout")
+    status = Column(String(50), default="pending", index=True, comment="任务状态：pending/claimed/submitted/processing/completed/failed/timeout")
     priority = Column(Integer, default=5, comment="优先级（1-10）")
     retry_count = Column(Integer, default=0, comment="重试次数")
     max_retries = Column(Integer, default=3, comment="最大重试次数")
 
+    # 任务队列（pending 的任务即为队列中的任务）
+    claimed_by = Column(String(100), nullable=True, comment="领取任务的 Worker 标识")
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, comment="领取租约到期时间，到期未确认时重新可被领取")
+    available_at = Column(DateTime(timezone=True), nullable=True, comment="可被领取的时间（失败重试的延迟）")
+    delivery_count = Column(Integer, default=0, comment="被 Worker 领取的次数")
+
     # 时间戳
     submitted_at = Column(DateTime(timezone=True), server_default=func.now(), comment="提交时间")
     started_at = Column(DateTime(timezone=True), comment="开始执行时间")
@@ -65,6 +71,7 @@ class ContentGenerationTask(Base):
         Index('idx_task_account', 'account_id'),
         Index('idx_task_submitted', 'submitted_at'),
         Index('idx_task_content', 'content_id'),
+        Index('idx_task_queue', 'status', 'priority', 'created_at'),
     )
 
     def __repr__(self):
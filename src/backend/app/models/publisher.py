@@ -1,7 +1,7 @@
 """
 发布相关数据模型
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.sql_db import Base
@@ -38,6 +38,12 @@ class PublishLog(Base):
     content = relationship("Content", back_populates="publish_log")
     pool_entry = relationship("PublishPool", back_populates="published_log")
 
+    # 复合索引，支持按 (created_at, id) 的游标分页
+    __table_args__ = (
+        Index("ix_publish_logs_created_at_id", "created_at", "id"),
+        Index("ix_publish_logs_account_id_created_at_id", "account_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<PublishLog(id={self.id}, content_id={self.content_id}, status={self.status})>"
 
@@ -77,3 +83,38 @@ class PublishPool(Base):
 
     def __repr__(self):
         return f"<PublishPool(id={self.id}, content_id={self.content_id}, priority={self.priority}, status={self.status})>"
+
+
+class MediaAsset(Base):
+    """
+    已上传到微信的媒体文件缓存
+
+    按 (账号, 文件内容 sha256) 记录上传返回的 media_id / URL，
+    相同文件再次发布到同一账号时直接引用，不再重复上传
+    """
+
+    __tablename__ = "media_assets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, comment="账号ID")
+    sha256 = Column(String(64), nullable=False, comment="文件内容 sha256")
+
+    # 上传结果
+    media_id = Column(String(255), comment="微信 media_id")
+    url = Column(Text, comment="微信图片 URL")
+    filename = Column(String(255), comment="上传时的文件名")
+    file_size = Column(Integer, comment="文件大小（字节）")
+    expires_at = Column(DateTime(timezone=True), comment="过期时间（为空表示永久有效）")
+
+    # 使用统计
+    hit_count = Column(Integer, default=0, comment="命中次数")
+    last_used_at = Column(DateTime(timezone=True), comment="最近一次命中时间")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    __table_args__ = (
+        UniqueConstraint("account_id", "sha256", name="uq_media_assets_account_sha256"),
+    )
+
+    def __repr__(self):
+        return f"<MediaAsset(id={self.id}, account_id={self.account_id}, sha256={self.sha256[:12]})>"
@@ -1,7 +1,7 @@
 """
 定时任务相关数据模型
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.sql_db import Base
@@ -38,6 +38,8 @@ class ScheduledTask(Base):
 
     # 执行记录
     executions = relationship("TaskExecution", back_populates="task", cascade="all, delete-orphan")
+    hourly_stats = relationship("TaskExecutionHourlyStat", back_populates="task", cascade="all, delete-orphan")
+    workflow_runs = relationship("WorkflowRun", back_populates="task", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<ScheduledTask(id={self.id}, name={self.name}, task_type={self.task_type})>"
@@ -64,3 +66,123 @@ class TaskExecution(Base):
 
     def __repr__(self):
         return f"<TaskExecution(id={self.id}, task_id={self.task_id}, status={self.status})>"
+
+
+class TaskExecutionHourlyStat(Base):
+    """
+    任务执行小时汇总
+
+    超过保留天数的执行明细被压缩为按小时汇总的计数后删除
+    """
+
+    __tablename__ = "task_execution_hourly_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("scheduled_tasks.id"), nullable=False, index=True)
+    hour = Column(DateTime(timezone=True), nullable=False, comment="统计小时（整点）")
+
+    # 计数
+    total_count = Column(Integer, nullable=False, default=0, comment="执行次数")
+    success_count = Column(Integer, nullable=False, default=0, comment="成功次数")
+    failed_count = Column(Integer, nullable=False, default=0, comment="失败次数")
+    total_duration = Column(Integer, nullable=False, default=0, comment="累计执行时长（秒）")
+    max_duration = Column(Integer, nullable=False, default=0, comment="最长执行时长（秒）")
+
+    # 关系
+    task = relationship("ScheduledTask", back_populates="hourly_stats")
+
+    __table_args__ = (
+        UniqueConstraint("task_id", "hour", name="uq_task_execution_hourly_stats_task_hour"),
+    )
+
+    def __repr__(self):
+        return f"<TaskExecutionHourlyStat(task_id={self.task_id}, hour={self.hour})>"
+
+
+class SchedulerJobLock(Base):
+    """
+    定时任务运行锁
+
+    多个副本同时运行调度器时，同一任务的每次触发只有取得锁的副本执行。
+    每次取得锁时 fencing_token 递增，持有旧令牌的副本无法续期或释放锁。
+    """
+
+    __tablename__ = "scheduler_job_locks"
+
+    job_id = Column(String(100), primary_key=True, comment="调度任务ID，如 task_1")
+    owner = Column(String(255), comment="持有者（副本标识）")
+    fencing_token = Column(Integer, nullable=False, default=0, comment="防护令牌，每次取得锁时递增")
+    locked_until = Column(DateTime, comment="锁到期时间（UTC）")
+    acquired_at = Column(DateTime, comment="最近一次取得锁的时间（UTC）")
+
+    def __repr__(self):
+        return f"<SchedulerJobLock(job_id={self.job_id}, owner={self.owner}, token={self.fencing_token})>"
+
+
+class WorkflowRun(Base):
+    """
+    工作流运行记录
+
+    保存每次工作流运行及各步骤的状态和输出。运行失败后再次触发（或手动续跑）时，
+    从失败的步骤继续执行，已成功的步骤直接复用保存的输出。
+    """
+
+    __tablename__ = "workflow_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("scheduled_tasks.id"), nullable=False, index=True)
+
+    # 运行信息
+    status = Column(String(50), nullable=False, default="running", comment="状态：running/success/failed")
+    mode = Column(String(20), comment="执行模式：sequential/dag")
+    params = Column(JSON, comment="工作流参数")
+    params_hash = Column(String(64), nullable=False, comment="工作流参数摘要，参数修改后不再续跑之前的运行")
+    attempts = Column(Integer, nullable=False, default=1, comment="执行次数（含续跑）")
+    failed_step = Column(String(100), comment="失败的步骤 id")
+    error_message = Column(Text, comment="错误信息")
+    context = Column(JSON, comment="运行结束时的上下文")
+    started_at = Column(DateTime(timezone=True), comment="首次开始时间")
+    finished_at = Column(DateTime(timezone=True), comment="最近一次结束时间")
+
+    # 关系
+    task = relationship("ScheduledTask", back_populates="workflow_runs")
+    steps = relationship(
+        "WorkflowStepRun", back_populates="run", cascade="all, delete-orphan",
+        order_by="WorkflowStepRun.position"
+    )
+
+    def __repr__(self):
+        return f"<WorkflowRun(id={self.id}, task_id={self.task_id}, status={self.status})>"
+
+
+class WorkflowStepRun(Base):
+    """工作流步骤的运行状态和输出（检查点）"""
+
+    __tablename__ = "workflow_step_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("workflow_runs.id"), nullable=False, index=True)
+    step_key = Column(String(100), nullable=False, comment="步骤 id（未声明时为 step1、step2 ...）")
+    position = Column(Integer, nullable=False, default=0, comment="步骤序号（从 1 开始）")
+    step_type = Column(String(50), comment="执行器类型")
+
+    # 运行状态
+    status = Column(String(50), nullable=False, default="running", comment="状态：running/success/failed")
+    attempts = Column(Integer, nullable=False, default=0, comment="执行次数")
+    output = Column(JSON, comment="步骤输出，续跑时直接复用")
+    item_outputs = Column(JSON, comment="for_each 中已成功元素的输出 {序号: {item, output}}")
+    message = Column(Text, comment="执行消息")
+    error = Column(Text, comment="错误信息")
+    duration = Column(Float, comment="执行时长（秒）")
+    started_at = Column(DateTime(timezone=True), comment="开始时间")
+    finished_at = Column(DateTime(timezone=True), comment="结束时间")
+
+    # 关系
+    run = relationship("WorkflowRun", back_populates="steps")
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "step_key", name="uq_workflow_step_runs_run_step"),
+    )
+
+    def __repr__(self):
+        return f"<WorkflowStepRun(run_id={self.run_id}, step_key={self.step_key}, status={self.status})>"
@@ -0,0 +1,180 @@
+"""
+统计汇总数据模型
+
+daily_stats 按 (日期, 平台) 汇总内容创建数和发布数，仪表盘直接读取汇总行，
+查询开销与历史数据量无关。
+
+汇总行在写入时增量维护：每次 flush 根据新增/删除的 Content、PublishLog
+以及 PublishLog 状态/平台的变更计算增量并累加到对应行。批量 update/delete
+等绕过 ORM 事件的写入由定时汇总任务（stats_rollup 执行器）按天重算修正。
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import Column, Date, DateTime, Integer, String, UniqueConstraint, event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+from sqlalchemy.sql import func
+
+from app.db.sql_db import Base
+from app.db.upsert import upsert
+from app.models.content import Content
+from app.models.publisher import PublishLog
+
+# 内容计数所在行的平台值（内容本身不区分平台）
+CONTENT_PLATFORM = ""
+
+# 发布状态到计数列的映射
+PUBLISH_STATUS_COLUMNS = {
+    "success": "publish_success",
+    "failed": "publish_failed",
+}
+
+
+class DailyStat(Base):
+    """每日统计汇总"""
+
+    __tablename__ = "daily_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stat_date = Column(Date, nullable=False, comment="统计日期")
+    platform = Column(String(50), nullable=False, default=CONTENT_PLATFORM, comment="发布平台（内容计数行为空字符串）")
+
+    # 计数
+    content_created = Column(Integer, nullable=False, default=0, comment="新建内容数")
+    publish_total = Column(Integer, nullable=False, default=0, comment="发布记录数")
+    publish_success = Column(Integer, nullable=False, default=0, comment="发布成功数")
+    publish_failed = Column(Integer, nullable=False, default=0, comment="发布失败数")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    __table_args__ = (
+        UniqueConstraint("stat_date", "platform", name="uq_daily_stats_date_platform"),
+    )
+
+    def __repr__(self):
+        return f"<DailyStat(stat_date={self.stat_date}, platform={self.platform!r})>"
+
+
+# ==================== 写入时增量维护 ====================
+
+StatKey = Tuple[date, str]
+_COUNTER_COLUMNS = ("content_created", "publish_total", "publish_success", "publish_failed")
+
+
+def stat_date_of(value: Any) -> date:
+    """记录所属的统计日期；created_at 由数据库默认值生成时取当前 UTC 日期"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.utcnow().date()
+
+
+def _publish_counters(status: Any, sign: int) -> Dict[str, int]:
+    counters = {"publish_total": sign}
+    column = PUBLISH_STATUS_COLUMNS.get(status)
+    if column:
+        counters[column] = sign
+    return counters
+
+
+def _add(deltas: Dict[StatKey, Dict[str, int]], key: StatKey, counters: Dict[str, int]) -> None:
+    for name, value in counters.items():
+        deltas[key][name] += value
+
+
+def _loaded(obj: Any, key: str) -> Any:
+    """读取已加载的属性值，不触发数据库加载"""
+    return inspect(obj).dict.get(key, NO_VALUE)
+
+
+def _previous(obj: Any, key: str) -> Any:
+    """属性在本次 flush 前的值；未加载时返回 NO_VALUE"""
+    history = inspect(obj).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return NO_VALUE
+
+
+def collect_deltas(session: Session) -> Dict[StatKey, Dict[str, int]]:
+    """根据 session 中待 flush 的变更计算各汇总行的增量"""
+    deltas: Dict[StatKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    for obj, sign in [(obj, 1) for obj in session.new] + [(obj, -1) for obj in session.deleted]:
+        created_at = _loaded(obj, "created_at")
+        if sign < 0 and created_at is NO_VALUE:
+            # 未能加载创建时间，无法定位汇总行，交给定时重算
+            continue
+        if isinstance(obj, Content):
+            _add(deltas, (stat_date_of(created_at), CONTENT_PLATFORM), {"content_created": sign})
+        elif isinstance(obj, PublishLog):
+            key = (stat_date_of(created_at), _loaded(obj, "platform") or CONTENT_PLATFORM)
+            _add(deltas, key, _publish_counters(_loaded(obj, "status"), sign))
+
+    for obj in session.dirty:
+        if not isinstance(obj, PublishLog):
+            continue
+        state = inspect(obj)
+        if not (state.attrs.status.history.has_changes() or state.attrs.platform.history.has_changes()):
+            continue
+        created_at = _loaded(obj, "created_at")
+        old_status, old_platform = _previous(obj, "status"), _previous(obj, "platform")
+        if NO_VALUE in (created_at, old_status, old_platform):
+            continue
+        stat_date = stat_date_of(created_at)
+        _add(deltas, (stat_date, old_platform or CONTENT_PLATFORM), _publish_counters(old_status, -1))
+        _add(deltas, (stat_date, _loaded(obj, "platform") or CONTENT_PLATFORM),
+             _publish_counters(_loaded(obj, "status"), 1))
+
+    return deltas
+
+
+def apply_deltas(connection, deltas: Dict[StatKey, Dict[str, int]]) -> None:
+    """
+    将增量累加到汇总行，行不存在时插入
+
+    多个事务同时写入某天/某平台的第一条记录时都会尝试插入同一汇总行，
+    使用 INSERT ... ON CONFLICT DO UPDATE 原子地插入或累加，避免唯一约束冲突
+    导致用户本身的内容/发布写入失败
+    """
+    table = DailyStat.__table__
+    for (stat_date, platform), counters in deltas.items():
+        values = {name: value for name, value in counters.items() if value}
+        if not values:
+            continue
+        upsert(
+            connection, table, {"stat_date": stat_date, "platform": platform},
+            {name: values.get(name, 0) for name in _COUNTER_COLUMNS},
+            lambda new: {name: table.c[name] + new[name] for name in values}
+        )
+
+
+def _track_previous_value(target, value, oldvalue, initiator):
+    # 仅用于开启 active_history，本身不做处理
+    pass
+
+
+# 状态或平台变更时需要旧值来扣减原汇总行，开启 active_history 后
+# 对已过期的属性赋值也会先加载旧值
+for _attribute in (PublishLog.status, PublishLog.platform):
+    event.listen(_attribute, "set", _track_previous_value, active_history=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_dates(session: Session, flush_context, instances) -> None:
+    # after_flush 时记录已被删除，需在删除前加载创建时间以定位汇总行
+    for obj in session.deleted:
+        if isinstance(obj, (Content, PublishLog)):
+            obj.created_at
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_daily_stats(session: Session, flush_context) -> None:
+    # after_flush 中 new/dirty/deleted 仍保持 flush 前的状态，且 Python 端默认值已填充
+    deltas = collect_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
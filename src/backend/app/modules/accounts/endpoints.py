@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.modules.accounts.services import account_service
 from app.modules.accounts.schemas import (
@@ -6,7 +7,7 @@ from app.modules.accounts.schemas import (
     WritingStyleUpdate, WritingStyleRead,
     PublishConfigUpdate, PublishConfigRead
 )
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.core.permissions import require_permission, Permission
 from app.modules.shared.deps import get_current_user
 
@@ -15,11 +16,11 @@ router = APIRouter(tags=["accounts"])
 @router.get("/")
 @require_permission(Permission.ACCOUNT_READ)
 async def get_account_list(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     """获取账号列表"""
-    items = account_service.get_account_list(db)
+    items = await account_service.get_account_list_async(db)
     return {"items": items, "total": len(items)}
 
 @router.get("/{id}", response_model=AccountDetailRead)
@@ -2,12 +2,15 @@
 账号管理服务
 负责账号的创建、查询、更新、删除等操作
 """
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.db.database import get_db
 from app.models.account import Account
 from app.services.account_config_service import account_config_service
 from app.core.cache import cache_query, invalidate_cache_pattern
+from app.modules.accounts.schemas import AccountDetailRead
 from app.core.config import settings
 from app.utils.custom_logger import log
 
@@ -16,65 +19,84 @@ class AccountService:
     """账号管理服务"""
 
     @staticmethod
-    @cache_query(ttl=300, key_prefix="accounts")
+    @cache_query(ttl=300, key_prefix="accounts", stale_ttl=60)
     def get_account_list(db: Session) -> List[dict]:
         """获取账号列表（兼容前端字段，包含关联信息）"""
         accounts = db.query(Account).options(
+            *AccountService._account_list_options()
+        ).order_by(Account.created_at.desc()).all()
+        return [AccountService._serialize_account_list_item(account) for account in accounts]
+
+    @staticmethod
+    @cache_query(ttl=300, key_prefix="accounts", stale_ttl=60)
+    async def get_account_list_async(db: AsyncSession) -> List[dict]:
+        """获取账号列表（异步会话版本，与 get_account_list 共用缓存）"""
+        result = await db.execute(
+            select(Account).options(
+                *AccountService._account_list_options()
+            ).order_by(Account.created_at.desc())
+        )
+        accounts = result.unique().scalars().all()
+        return [AccountService._serialize_account_list_item(account) for account in accounts]
+
+    @staticmethod
+    def _account_list_options() -> list:
+        """账号列表需要预加载的关联（异步会话不支持懒加载，必须一次取全）"""
+        return [
             joinedload(Account.platform),
             joinedload(Account.customer),
             joinedload(Account.writing_style),
             joinedload(Account.publish_config).joinedload(Account.publish_config.property.mapper.class_.theme)
-        ).order_by(Account.created_at.desc()).all()
+        ]
 
-        result = []
-        for account in accounts:
-            account_dict = {
-                "id": account.id,
-                "name": account.name,
-                "directory_name": account.directory_name,
-                "description": account.description,
-                # 基础字段
-                "customer_id": account.customer_id,
-                "platform_id": account.platform_id,
-                "owner_id": account.owner_id,
-                "created_by": account.created_by,
-                "updated_by": account.updated_by,
-                # 兼容前端字段
-                "platform_name": account.platform.name if account.platform else None,
-                "account_id": account.directory_name,
-                "status": "active" if account.is_active else "inactive",
-                "created_at": account.created_at,
-                "updated_at": account.updated_at,
-                # 关联信息 - 写作风格
-                "writing_style": {
-                    "id": account.writing_style.id,
-                    "name": account.writing_style.name,
-                    "tone": account.writing_style.tone,
-                    "min_words": account.writing_style.min_words,
-                    "max_words": account.writing_style.max_words,
-                    "persona": account.writing_style.persona,
-                    "emoji_usage": account.writing_style.emoji_usage
-                } if account.writing_style else None,
-                # 关联信息 - 发布配置
-                "publish_config": {
-                    "id": account.publish_config.id,
-                    "theme_id": account.publish_config.theme_id,
-                    "auto_publish": account.publish_config.auto_publish,
-                    "review_mode": account.publish_config.review_mode
-                } if account.publish_config else None,
-                # 关联信息 - 客户和所有者
-                "customer": {
-                    "id": account.customer.id,
-                    "name": account.customer.name
-                } if account.customer else None
-            }
-            result.append(account_dict)
-        return result
+    @staticmethod
+    def _serialize_account_list_item(account: Account) -> dict:
+        """将账号转换为列表项字典"""
+        return {
+            "id": account.id,
+            "name": account.name,
+            "directory_name": account.directory_name,
+            "description": account.description,
+            # 基础字段
+            "customer_id": account.customer_id,
+            "platform_id": account.platform_id,
+            "owner_id": account.owner_id,
+            "created_by": account.created_by,
+            "updated_by": account.updated_by,
+            # 兼容前端字段
+            "platform_name": account.platform.name if account.platform else None,
+            "account_id": account.directory_name,
+            "status": "active" if account.is_active else "inactive",
+            "created_at": account.created_at,
+            "updated_at": account.updated_at,
+            # 关联信息 - 写作风格
+            "writing_style": {
+                "id": account.writing_style.id,
+                "name": account.writing_style.name,
+                "tone": account.writing_style.tone,
+                "min_words": account.writing_style.min_words,
+                "max_words": account.writing_style.max_words,
+                "persona": account.writing_style.persona,
+                "emoji_usage": account.writing_style.emoji_usage
+            } if account.writing_style else None,
+            # 关联信息 - 发布配置
+            "publish_config": {
+                "id": account.publish_config.id,
+                "theme_id": account.publish_config.theme_id,
+                "auto_publish": account.publish_config.auto_publish,
+                "review_mode": account.publish_config.review_mode
+            } if account.publish_config else None,
+            # 关联信息 - 客户和所有者
+            "customer": {
+                "id": account.customer.id,
+                "name": account.customer.name
+            } if account.customer else None
+        }
 
     @staticmethod
-    @cache_query(ttl=300, key_prefix="account_by_id")
-    def get_account_detail(db: Session, account_id: int) -> Optional[Account]:
-        """获取账号详情（含所有配置，使用 eager loading）"""
+    @cache_query(ttl=300, key_prefix="account_by_id", snapshot=AccountDetailRead)
+    def get_account_detail(db: Session, account_id: int) -> Optional[AccountDetailRead]:
+        """获取账号详情（含所有配置，使用 eager loading，缓存为只读快照）"""
         return db.query(Account).options(
             joinedload(Account.platform),
             joinedload(Account.customer),
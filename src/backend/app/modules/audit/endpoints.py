@@ -4,9 +4,10 @@ Audit module endpoints
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.modules.shared.deps import get_current_user
 from app.modules.shared.schemas.user import UserRead
 from app.modules.audit.services import AuditService
@@ -19,6 +20,7 @@ from app.modules.audit.schemas import (
 )
 from app.core.permissions import require_permission, Permission, has_permission
 from app.utils.custom_logger import log
+from app.utils.pagination import InvalidCursorError
 
 router = APIRouter()
 
@@ -33,7 +35,9 @@ async def get_audit_logs(
     search: Optional[str] = Query(None, description="搜索关键字"),
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="游标分页：首页传空字符串，之后传上一页的 next_cursor"),
+    with_total: bool = Query(False, description="游标分页时是否返回总数（带缓存）"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserRead = Depends(get_current_user),
 ):
     """
@@ -73,7 +77,12 @@ async def get_audit_logs(
             filters["search"] = search
 
         # 查询日志
-        result_data = AuditService.get_audit_logs(db, filters, page, page_size)
+        try:
+            result_data = await AuditService.get_audit_logs_async(
+                db, filters, page, page_size, cursor=cursor, with_total=with_total
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         # 转换为响应格式
         logs_response = []
@@ -94,9 +103,11 @@ async def get_audit_logs(
         return AuditLogListResponse(
             logs=logs_response,
             total=result_data["total"],
-            page=page,
+            page=result_data["page"],
             page_size=page_size,
-            total_pages=result_data["total_pages"]
+            total_pages=result_data["total_pages"],
+            next_cursor=result_data.get("next_cursor"),
+            has_more=result_data.get("has_more")
         )
 
     except HTTPException:
@@ -62,10 +62,12 @@ class AuditLogResponse(BaseModel):
 class AuditLogListResponse(BaseModel):
     """审计日志列表响应模型"""
     logs: List[AuditLogResponse] = Field(..., description="日志列表")
-    total: int = Field(..., description="总数")
-    page: int = Field(..., description="当前页码")
+    total: Optional[int] = Field(None, description="总数（游标分页时仅在 with_total 时返回）")
+    page: Optional[int] = Field(None, description="当前页码（游标分页时为空）")
     page_size: int = Field(..., description="每页数量")
-    total_pages: int = Field(..., description="总页数")
+    total_pages: Optional[int] = Field(None, description="总页数（游标分页时为空）")
+    next_cursor: Optional[str] = Field(None, description="下一页游标")
+    has_more: Optional[bool] = Field(None, description="是否还有下一页（仅游标分页）")
 
     class Config:
         schema_extra = {
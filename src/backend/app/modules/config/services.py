@@ -7,26 +7,27 @@ from typing import List, Optional
 from app.models.account import WritingStyle
 from app.models.theme import ContentTheme
 from app.core.cache import cache_config, invalidate_cache_pattern
+from app.modules.config.schemas import WritingStyleResponse, ContentThemeResponse
 
 
 class WritingStyleService:
     """写作风格管理服务"""
 
     @staticmethod
-    @cache_config(ttl=3600, key_prefix="writing_styles")
-    def get_writing_styles(db: Session, skip: int = 0, limit: int = 100) -> List[WritingStyle]:
+    @cache_config(ttl=3600, key_prefix="writing_styles", snapshot=WritingStyleResponse)
+    def get_writing_styles(db: Session, skip: int = 0, limit: int = 100) -> List[WritingStyleResponse]:
         """获取写作风格列表"""
         return db.query(WritingStyle).order_by(WritingStyle.created_at.desc()).offset(skip).limit(limit).all()
 
     @staticmethod
-    @cache_config(ttl=3600, key_prefix="writing_style_by_id")
-    def get_writing_style_by_id(db: Session, style_id: int) -> Optional[WritingStyle]:
+    @cache_config(ttl=3600, key_prefix="writing_style_by_id", snapshot=WritingStyleResponse)
+    def get_writing_style_by_id(db: Session, style_id: int) -> Optional[WritingStyleResponse]:
         """根据 ID 获取写作风格"""
         return db.query(WritingStyle).filter(WritingStyle.id == style_id).first()
 
     @staticmethod
-    @cache_config(ttl=3600, key_prefix="writing_style_by_code")
-    def get_writing_style_by_code(db: Session, code: str) -> Optional[WritingStyle]:
+    @cache_config(ttl=3600, key_prefix="writing_style_by_code", snapshot=WritingStyleResponse)
+    def get_writing_style_by_code(db: Session, code: str) -> Optional[WritingStyleResponse]:
         """根据代码获取写作风格"""
         return db.query(WritingStyle).filter(WritingStyle.code == code).first()
 
@@ -34,7 +35,7 @@ class WritingStyleService:
     def create_writing_style(db: Session, style_data: dict) -> WritingStyle:
         """创建写作风格"""
         # 检查代码是否已存在
-        existing = WritingStyleService.get_writing_style_by_code(db, style_data.get("code"))
+        existing = db.query(WritingStyle).filter(WritingStyle.code == style_data.get("code")).first()
         if existing:
             raise ValueError(f"写作风格代码 '{style_data.get('code')}' 已存在")
 
@@ -52,13 +53,14 @@ class WritingStyleService:
     @staticmethod
     def update_writing_style(db: Session, style_id: int, style_data: dict) -> Optional[WritingStyle]:
         """更新写作风格"""
-        writing_style = WritingStyleService.get_writing_style_by_id(db, style_id)
+        # 修改操作需要会话内的 ORM 对象，不能使用缓存快照
+        writing_style = db.query(WritingStyle).filter(WritingStyle.id == style_id).first()
         if not writing_style:
             return None
 
         # 如果要更新代码，检查新代码是否已存在
         if "code" in style_data and style_data["code"] != writing_style.code:
-            existing = WritingStyleService.get_writing_style_by_code(db, style_data["code"])
+            existing = db.query(WritingStyle).filter(WritingStyle.code == style_data["code"]).first()
             if existing:
                 raise ValueError(f"写作风格代码 '{style_data['code']}' 已存在")
 
@@ -77,7 +79,8 @@ class WritingStyleService:
     @staticmethod
     def delete_writing_style(db: Session, style_id: int) -> bool:
         """删除写作风格"""
-        writing_style = WritingStyleService.get_writing_style_by_id(db, style_id)
+        # 修改操作需要会话内的 ORM 对象，不能使用缓存快照
+        writing_style = db.query(WritingStyle).filter(WritingStyle.id == style_id).first()
         if not writing_style:
             return False
 
@@ -109,20 +112,20 @@ class ContentThemeService:
     """内容主题管理服务"""
 
     @staticmethod
-    @cache_config(ttl=3600, key_prefix="content_themes")
-    def get_content_themes(db: Session, skip: int = 0, limit: int = 100) -> List[ContentTheme]:
+    @cache_config(ttl=3600, key_prefix="content_themes", snapshot=ContentThemeResponse)
+    def get_content_themes(db: Session, skip: int = 0, limit: int = 100) -> List[ContentThemeResponse]:
         """获取内容主题列表"""
         return db.query(ContentTheme).order_by(ContentTheme.created_at.desc()).offset(skip).limit(limit).all()
 
     @staticmethod
-    @cache_config(ttl=3600, key_prefix="content_theme_by_id")
-    def get_content_theme_by_id(db: Session, theme_id: int) -> Optional[ContentTheme]:
+    @cache_config(ttl=3600, key_prefix="content_theme_by_id", snapshot=ContentThemeResponse)
+    def get_content_theme_by_id(db: Session, theme_id: int) -> Optional[ContentThemeResponse]:
         """根据 ID 获取内容主题"""
         return db.query(ContentTheme).filter(ContentTheme.id == theme_id).first()
 
     @staticmethod
-    @cache_config(ttl=3600, key_prefix="content_theme_by_code")
-    def get_content_theme_by_code(db: Session, code: str) -> Optional[ContentTheme]:
+    @cache_config(ttl=3600, key_prefix="content_theme_by_code", snapshot=ContentThemeResponse)
+    def get_content_theme_by_code(db: Session, code: str) -> Optional[ContentThemeResponse]:
         """根据代码获取内容主题"""
         return db.query(ContentTheme).filter(ContentTheme.code == code).first()
 
@@ -130,7 +133,7 @@ class ContentThemeService:
     def create_content_theme(db: Session, theme_data: dict) -> ContentTheme:
         """创建内容主题"""
         # 检查代码是否已存在
-        existing = ContentThemeService.get_content_theme_by_code(db, theme_data.get("code"))
+        existing = db.query(ContentTheme).filter(ContentTheme.code == theme_data.get("code")).first()
         if existing:
             raise ValueError(f"内容主题代码 '{theme_data.get('code')}' 已存在")
 
@@ -148,13 +151,14 @@ class ContentThemeService:
     @staticmethod
     def update_content_theme(db: Session, theme_id: int, theme_data: dict) -> Optional[ContentTheme]:
         """更新内容主题"""
-        content_theme = ContentThemeService.get_content_theme_by_id(db, theme_id)
+        # 修改操作需要会话内的 ORM 对象，不能使用缓存快照
+        content_theme = db.query(ContentTheme).filter(ContentTheme.id == theme_id).first()
         if not content_theme:
             return None
 
         # 如果要更新代码，检查新代码是否已存在
         if "code" in theme_data and theme_data["code"] != content_theme.code:
-            existing = ContentThemeService.get_content_theme_by_code(db, theme_data["code"])
+            existing = db.query(ContentTheme).filter(ContentTheme.code == theme_data["code"]).first()
             if existing:
                 raise ValueError(f"内容主题代码 '{theme_data['code']}' 已存在")
 
@@ -173,7 +177,8 @@ class ContentThemeService:
     @staticmethod
     def delete_content_theme(db: Session, theme_id: int) -> bool:
         """删除内容主题"""
-        content_theme = ContentThemeService.get_content_theme_by_id(db, theme_id)
+        # 修改操作需要会话内的 ORM 对象，不能使用缓存快照
+        content_theme = db.query(ContentTheme).filter(ContentTheme.id == theme_id).first()
         if not content_theme:
             return False
 
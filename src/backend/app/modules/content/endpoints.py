@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, Dict
 from app.modules.content.services import content_service
@@ -7,7 +8,7 @@ from app.modules.content.schemas import (
     SubmitReviewRequest, ApproveRequest, RejectRequest, ReviewStatistics,
     PaginatedContentList
 )
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 from app.core.permissions import require_permission, Permission
 from app.modules.shared.deps import get_current_user
 from app.models import ContentGenerationTask
@@ -15,6 +16,7 @@ from app.services.webhook_handler import WebhookHandler, get_webhook_handler
 from app.utils.webhook_signature import create_verifier
 from app.core.config import settings
 from app.utils.custom_logger import log
+from app.utils.pagination import InvalidCursorError
 
 router = APIRouter(tags=["content"])
 
@@ -23,11 +25,16 @@ router = APIRouter(tags=["content"])
 async def get_content_list(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页数量"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="游标分页：首页传空字符串，之后传上一页的 nextCursor"),
+    with_total: bool = Query(False, description="游标分页时是否返回总数（带缓存）"),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     """获取内容列表（分页）"""
-    return content_service.get_content_list(db, page, page_size)
+    try:
+        return await content_service.get_content_list_async(db, page, page_size, cursor, with_total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{id}", response_model=ContentRead)
 @require_permission(Permission.CONTENT_READ)
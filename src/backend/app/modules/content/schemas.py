@@ -137,11 +137,13 @@ class ReviewStatistics(BaseModel):
 
 
 class PaginatedContentList(BaseModel):
-    """分页内容列表响应模型"""
+    """分页内容列表响应模型（游标分页时 page 为空，total 仅在 with_total 时返回）"""
     items: List[ContentListRead]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     pageSize: int
+    nextCursor: Optional[str] = None
+    hasMore: Optional[bool] = None
 
     class Config:
         schema_extra = {
@@ -2,11 +2,16 @@
 内容管理服务
 负责内容的创建、查询、更新、删除、审核等操作
 """
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from app.db.database import get_db
+from app.db.projections import projection
 from app.models.content import Content
+from app.modules.content.schemas import ContentListRead
+from app.utils.pagination import apply_keyset, build_cursor_page, cached_count_async
 from app.services.content_creator_service import content_creator_service
 from app.services.content_review_service import content_review_service
 
@@ -23,7 +28,9 @@ class ContentService:
         """获取内容列表（分页）"""
         query = db.query(Content)
         total = query.count()
-        contents = query.order_by(Content.created_at.desc())\
+        # 列表只加载 ContentListRead 需要的列，正文等大字段延迟加载
+        contents = query.options(projection(ContentListRead, Content))\
+            .order_by(Content.created_at.desc())\
             .offset((page - 1) * page_size)\
             .limit(page_size)\
             .all()
@@ -34,6 +41,50 @@ class ContentService:
             "pageSize": page_size
         }
 
+    @staticmethod
+    async def get_content_list_async(
+        db: AsyncSession,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        with_total: bool = False
+    ) -> dict:
+        """
+        获取内容列表（分页，异步会话版本）
+
+        cursor 为 None 时按页码分页；传入游标（首页为空字符串）时按
+        (created_at, id) 游标分页，此时只有 with_total=True 才返回（带缓存的）总数。
+        """
+        list_stmt = select(Content).options(projection(ContentListRead, Content))
+        if cursor is not None:
+            result = await db.execute(
+                apply_keyset(list_stmt, Content.created_at, Content.id, cursor, page_size)
+            )
+            page_data = build_cursor_page(result.scalars().all(), page_size)
+            total = await cached_count_async(db, select(Content), "contents") if with_total else None
+            return {
+                "items": page_data["items"],
+                "total": total,
+                "page": None,
+                "pageSize": page_size,
+                "nextCursor": page_data["next_cursor"],
+                "hasMore": page_data["has_more"]
+            }
+
+        total = await db.scalar(select(func.count()).select_from(Content))
+        result = await db.execute(
+            list_stmt
+            .order_by(Content.created_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        return {
+            "items": result.scalars().all(),
+            "total": total or 0,
+            "page": page,
+            "pageSize": page_size
+        }
+
     @staticmethod
     def get_content_detail(db: Session, content_id: int) -> Optional[Content]:
         """获取内容详情"""
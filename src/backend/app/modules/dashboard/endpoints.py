@@ -1,17 +1,18 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.modules.dashboard.services import dashboard_service
 from app.modules.dashboard.schemas import DashboardStats, ContentTrend, PublishStats
-from app.db.database import get_db
-from app.core.cache import get_cache_stats, reset_cache_stats, memory_cache
+from app.db.database import get_async_db, get_db
+from app.core.cache import get_cache_stats, reset_cache_stats, cache_backend
 from typing import Optional, List
 
 router = APIRouter(tags=["dashboard"])
 
 @router.get("/stats", response_model=DashboardStats)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """获取仪表盘统计数据"""
-    return dashboard_service.get_dashboard_stats(db)
+    return await dashboard_service.get_dashboard_stats_async(db)
 
 @router.get("/activities")
 async def get_recent_activities(limit: int = 5, db: Session = Depends(get_db)):
@@ -20,14 +21,14 @@ async def get_recent_activities(limit: int = 5, db: Session = Depends(get_db)):
     return {"items": [], "total": 0}
 
 @router.get("/content-trend", response_model=ContentTrend)
-async def get_content_trend(days: Optional[int] = 30, db: Session = Depends(get_db)):
+async def get_content_trend(days: Optional[int] = 30, db: AsyncSession = Depends(get_async_db)):
     """获取内容生成趋势"""
-    return dashboard_service.get_content_trend(db, days)
+    return await dashboard_service.get_content_trend_async(db, days)
 
 @router.get("/publish-stats", response_model=PublishStats)
-async def get_publish_stats(db: Session = Depends(get_db)):
+async def get_publish_stats(db: AsyncSession = Depends(get_async_db)):
     """获取发布统计"""
-    return dashboard_service.get_publish_stats(db)
+    return await dashboard_service.get_publish_stats_async(db)
 
 
 @router.get("/cache-stats")
@@ -46,12 +47,12 @@ async def reset_cache_statistics():
 @router.post("/cache/clear")
 async def clear_all_cache():
     """清空所有缓存"""
-    memory_cache.clear()
+    cache_backend.clear()
     return {"message": "所有缓存已清空"}
 
 
 @router.post("/cache/cleanup")
 async def cleanup_expired_cache():
     """清理过期的缓存"""
-    memory_cache.cleanup_expired()
+    cache_backend.cleanup_expired()
     return {"message": "过期缓存已清理"}
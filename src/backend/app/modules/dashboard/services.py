@@ -1,137 +1,203 @@
 """
 仪表盘服务
 负责仪表盘数据的统计和展示
+
+历史累计类的统计（内容数、发布数、趋势、平台分布）读取 daily_stats 每日汇总，
+用条件聚合（SUM(CASE ...)）在一条语句中得到所有计数，开销只与汇总的天数有关，
+与内容和发布记录的总量无关。账号数、待审核数等当前状态计数合并为一条子查询语句。
+
+每个统计都提供同步（Session）和异步（AsyncSession）两个版本，
+查询语句由同一组构造函数生成，保证两者结果一致。
 """
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Dict, Any
+from sqlalchemy import case, func, select
+from sqlalchemy.sql import Select
+from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from app.db.database import get_db
 from app.models.content import Content
-from app.models.publisher import PublishLog
 from app.models.account import Account
 from app.models.scheduler import ScheduledTask
+from app.models.stats import CONTENT_PLATFORM, DailyStat
+
+
+def _count(model, *conditions) -> Select:
+    """构造 SELECT COUNT(*) 语句"""
+    return select(func.count()).select_from(model).where(*conditions)
+
+
+def _sum(column):
+    """SUM 聚合，无数据时返回 0"""
+    return func.coalesce(func.sum(column), 0)
+
+
+def _sum_if(condition, column):
+    """条件聚合：SUM(CASE WHEN condition THEN column ELSE 0 END)"""
+    return _sum(case((condition, column), else_=0))
 
 
 class DashboardService:
     """仪表盘服务"""
 
+    # ==================== 查询语句 ====================
+
     @staticmethod
-    def get_dashboard_stats(db: Session) -> Dict[str, Any]:
-        """获取仪表盘统计数据"""
-        # 账号总数
-        account_count = db.query(Account).count()
+    def _dashboard_stats_statements() -> List[Select]:
+        """仪表盘各项计数对应的查询语句，每条语句返回一行"""
+        today = datetime.utcnow().date()
+        week_start = today - timedelta(days=7)
+        return [
+            # 当前状态计数
+            select(
+                # 账号总数
+                _count(Account).scalar_subquery().label("account_count"),
+                # 待审核内容数
+                _count(Content, Content.review_status == "pending").scalar_subquery().label("pending_review_count"),
+                # 定时任务数
+                _count(ScheduledTask, ScheduledTask.is_active == True).scalar_subquery().label("scheduled_task_count"),
+            ),
+            # 历史累计计数
+            select(
+                # 内容总数
+                _sum(DailyStat.content_created).label("content_count"),
+                # 发布成功数
+                _sum(DailyStat.publish_success).label("published_count"),
+                # 今日发布数
+                _sum_if(DailyStat.stat_date == today, DailyStat.publish_success).label("today_published_count"),
+                # 本周发布数
+                _sum_if(DailyStat.stat_date >= week_start, DailyStat.publish_success).label("week_published_count"),
+            ),
+        ]
 
-        # 内容总数
-        content_count = db.query(Content).count()
+    @staticmethod
+    def _content_trend_statement(days: int) -> Select:
+        """按天统计内容创建数量"""
+        start_date = datetime.utcnow().date() - timedelta(days=days)
+        return select(
+            DailyStat.stat_date.label("date"),
+            DailyStat.content_created.label("count")
+        ).where(
+            DailyStat.platform == CONTENT_PLATFORM,
+            DailyStat.stat_date >= start_date,
+            DailyStat.content_created > 0
+        ).order_by(
+            DailyStat.stat_date
+        )
 
-        # 待审核内容数
-        pending_review_count = db.query(Content).filter(
-            Content.review_status == "pending"
-        ).count()
+    @staticmethod
+    def _publish_stats_statement() -> Select:
+        """发布统计对应的计数语句"""
+        return select(
+            # 总发布数
+            _sum(DailyStat.publish_total).label("total_publish"),
+            # 成功发布数
+            _sum(DailyStat.publish_success).label("success_publish"),
+            # 失败发布数
+            _sum(DailyStat.publish_failed).label("failed_publish"),
+        )
 
-        # 发布成功数
-        published_count = db.query(PublishLog).filter(
-            PublishLog.status == "success"
-        ).count()
+    @staticmethod
+    def _platform_stats_statement() -> Select:
+        """按平台统计发布数量"""
+        return select(
+            DailyStat.platform,
+            _sum(DailyStat.publish_total).label("count")
+        ).group_by(
+            DailyStat.platform
+        ).having(
+            func.sum(DailyStat.publish_total) > 0
+        )
 
-        # 今日发布数
-        today = datetime.utcnow().date()
-        today_published_count = db.query(PublishLog).filter(
-            func.date(PublishLog.created_at) == today,
-            PublishLog.status == "success"
-        ).count()
-
-        # 本周发布数
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        week_published_count = db.query(PublishLog).filter(
-            PublishLog.created_at >= week_ago,
-            PublishLog.status == "success"
-        ).count()
-
-        # 定时任务数
-        scheduled_task_count = db.query(ScheduledTask).filter(
-            ScheduledTask.is_active == True
-        ).count()
+    # ==================== 结果组装 ====================
 
+    @staticmethod
+    def _build_counts(rows: List[Any]) -> Dict[str, int]:
+        """合并单行计数结果（PostgreSQL 的 SUM 返回 Decimal，统一转为 int）"""
         return {
-            "account_count": account_count,
-            "content_count": content_count,
-            "pending_review_count": pending_review_count,
-            "published_count": published_count,
-            "today_published_count": today_published_count,
-            "week_published_count": week_published_count,
-            "scheduled_task_count": scheduled_task_count
+            name: int(value or 0)
+            for row in rows
+            for name, value in row._mapping.items()
         }
 
     @staticmethod
-    def get_content_trend(db: Session, days: int = 30) -> Dict[str, Any]:
-        """获取内容生成趋势"""
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-
-        # 按天统计内容创建数量
-        content_trend = db.query(
-            func.date(Content.created_at).label("date"),
-            func.count(Content.id).label("count")
-        ).filter(
-            Content.created_at >= start_date
-        ).group_by(
-            func.date(Content.created_at)
-        ).all()
-
+    def _build_content_trend(days: int, rows: List[Any]) -> Dict[str, Any]:
         return {
             "period_days": days,
             "trend": [
                 {
                     "date": str(item.date),
-                    "count": item.count
+                    "count": int(item.count)
                 }
-                for item in content_trend
+                for item in rows
             ]
         }
 
     @staticmethod
-    def get_publish_stats(db: Session) -> Dict[str, Any]:
-        """获取发布统计"""
-        # 总发布数
-        total_publish = db.query(PublishLog).count()
-
-        # 成功发布数
-        success_publish = db.query(PublishLog).filter(
-            PublishLog.status == "success"
-        ).count()
-
-        # 失败发布数
-        failed_publish = db.query(PublishLog).filter(
-            PublishLog.status == "failed"
-        ).count()
-
+    def _build_publish_stats(counts: Dict[str, int], rows: List[Any]) -> Dict[str, Any]:
+        total_publish = counts["total_publish"]
         # 发布成功率
-        success_rate = success_publish / total_publish if total_publish > 0 else 0
-
-        # 按平台统计
-        platform_stats = db.query(
-            PublishLog.platform,
-            func.count(PublishLog.id).label("count")
-        ).group_by(
-            PublishLog.platform
-        ).all()
-
+        success_rate = counts["success_publish"] / total_publish if total_publish > 0 else 0
         return {
-            "total_publish": total_publish,
-            "success_publish": success_publish,
-            "failed_publish": failed_publish,
+            **counts,
             "success_rate": success_rate,
             "platform_stats": [
                 {
-                    "platform": item.platform,
-                    "count": item.count
+                    # 未记录平台的发布记录汇总在空字符串平台下
+                    "platform": item.platform or None,
+                    "count": int(item.count)
                 }
-                for item in platform_stats
+                for item in rows
             ]
         }
 
+    # ==================== 同步接口 ====================
+
+    @staticmethod
+    def get_dashboard_stats(db: Session) -> Dict[str, Any]:
+        """获取仪表盘统计数据"""
+        rows = [db.execute(statement).one() for statement in DashboardService._dashboard_stats_statements()]
+        return DashboardService._build_counts(rows)
+
+    @staticmethod
+    def get_content_trend(db: Session, days: int = 30) -> Dict[str, Any]:
+        """获取内容生成趋势"""
+        rows = db.execute(DashboardService._content_trend_statement(days)).all()
+        return DashboardService._build_content_trend(days, rows)
+
+    @staticmethod
+    def get_publish_stats(db: Session) -> Dict[str, Any]:
+        """获取发布统计"""
+        counts = DashboardService._build_counts([db.execute(DashboardService._publish_stats_statement()).one()])
+        rows = db.execute(DashboardService._platform_stats_statement()).all()
+        return DashboardService._build_publish_stats(counts, rows)
+
+    # ==================== 异步接口 ====================
+
+    @staticmethod
+    async def get_dashboard_stats_async(db: AsyncSession) -> Dict[str, Any]:
+        """获取仪表盘统计数据（异步会话版本）"""
+        rows = [
+            (await db.execute(statement)).one()
+            for statement in DashboardService._dashboard_stats_statements()
+        ]
+        return DashboardService._build_counts(rows)
+
+    @staticmethod
+    async def get_content_trend_async(db: AsyncSession, days: int = 30) -> Dict[str, Any]:
+        """获取内容生成趋势（异步会话版本）"""
+        rows = (await db.execute(DashboardService._content_trend_statement(days))).all()
+        return DashboardService._build_content_trend(days, rows)
+
+    @staticmethod
+    async def get_publish_stats_async(db: AsyncSession) -> Dict[str, Any]:
+        """获取发布统计（异步会话版本）"""
+        counts = DashboardService._build_counts(
+            [(await db.execute(DashboardService._publish_stats_statement())).one()]
+        )
+        rows = (await db.execute(DashboardService._platform_stats_statement())).all()
+        return DashboardService._build_publish_stats(counts, rows)
+
 
 # 全局服务实例
 dashboard_service = DashboardService()
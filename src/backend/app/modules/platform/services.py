@@ -6,14 +6,15 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.platform import Platform
 from app.core.cache import cache_query, invalidate_cache_pattern
+from app.modules.platform.schemas import PlatformResponse
 
 
 class PlatformService:
     """平台管理服务"""
 
     @staticmethod
-    @cache_query(ttl=1800, key_prefix="platforms")
-    def get_all(db: Session, skip: int = 0, limit: int = 20, search: Optional[str] = None) -> tuple[List[Platform], int]:
+    @cache_query(ttl=1800, key_prefix="platforms", stale_ttl=300, snapshot=PlatformResponse)
+    def get_all(db: Session, skip: int = 0, limit: int = 20, search: Optional[str] = None) -> tuple[List[PlatformResponse], int]:
         """
         获取平台列表
 
@@ -24,7 +25,7 @@ class PlatformService:
             search: 搜索关键词（搜索平台名称、代码、类型）
 
         Returns:
-            (平台列表, 总数)
+            (平台快照列表, 总数)
         """
         query = db.query(Platform)
 
@@ -46,8 +47,8 @@ class PlatformService:
         return platforms, total
 
     @staticmethod
-    @cache_query(ttl=1800, key_prefix="platform_by_id")
-    def get_by_id(db: Session, platform_id: int) -> Optional[Platform]:
+    @cache_query(ttl=1800, key_prefix="platform_by_id", snapshot=PlatformResponse)
+    def get_by_id(db: Session, platform_id: int) -> Optional[PlatformResponse]:
         """
         获取单个平台
 
@@ -56,13 +57,13 @@ class PlatformService:
             platform_id: 平台ID
 
         Returns:
-            平台对象或None
+            平台快照或None
         """
         return db.query(Platform).filter(Platform.id == platform_id).first()
 
     @staticmethod
-    @cache_query(ttl=1800, key_prefix="platform_by_code")
-    def get_by_code(db: Session, code: str) -> Optional[Platform]:
+    @cache_query(ttl=1800, key_prefix="platform_by_code", snapshot=PlatformResponse)
+    def get_by_code(db: Session, code: str) -> Optional[PlatformResponse]:
         """
         根据代码获取平台
 
@@ -71,7 +72,7 @@ class PlatformService:
             code: 平台代码
 
         Returns:
-            平台对象或None
+            平台快照或None
         """
         return db.query(Platform).filter(Platform.code == code).first()
 
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.modules.publisher.services import publisher_service
 from app.modules.publisher.schemas import (
@@ -10,6 +11,7 @@ from app.modules.publisher.schemas import (
 from app.db.database import get_db
 from app.core.permissions import require_permission, Permission
 from app.modules.shared.deps import get_current_user
+from app.utils.pagination import InvalidCursorError
 
 router = APIRouter(tags=["publisher"])
 
@@ -19,6 +21,27 @@ async def get_publish_history(db: Session = Depends(get_db), current_user = Depe
     """获取发布历史"""
     return publisher_service.get_publish_history(db)
 
+@router.get("/batch-history", response_model=dict)
+@require_permission(Permission.PUBLISHER_READ)
+async def get_batch_publish_history(
+    account_id: int = Query(..., description="账号 ID"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor"),
+    limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """获取账号的批量发布历史（游标分页）"""
+    try:
+        return publisher_service.get_batch_publish_history(db, account_id, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/http-stats", response_model=dict)
+@require_permission(Permission.PUBLISHER_READ)
+async def get_publisher_http_stats(current_user = Depends(get_current_user)):
+    """获取 Publisher API 连接复用统计"""
+    return publisher_service.get_http_stats()
+
 @router.get("/history/{id}", response_model=PublishLogRead)
 @require_permission(Permission.PUBLISHER_READ)
 async def get_publish_detail(id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
@@ -46,7 +69,7 @@ async def retry_publish(id: int, db: Session = Depends(get_db), current_user = D
 @require_permission(Permission.PUBLISHER_EXECUTE)
 async def batch_publish(request: BatchPublishRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     """批量发布"""
-    result = publisher_service.batch_publish(db, request.dict())
+    result = await publisher_service.batch_publish(db, request.dict())
     return result
 
 
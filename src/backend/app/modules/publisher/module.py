@@ -14,7 +14,10 @@ def startup(app):
 # 模块关闭钩子
 def shutdown(app):
     """发布管理模块关闭时执行的代码"""
-    pass
+    from app.services.async_content_publisher_service import async_content_publisher_service
+    from app.services.publisher_http_client import publisher_http_client
+    publisher_http_client.close()
+    async_content_publisher_service.close()
 
 # 模块导出
 MODULE = Module(
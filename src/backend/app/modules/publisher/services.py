@@ -7,7 +7,9 @@ from typing import List, Optional
 from datetime import datetime
 from app.db.database import get_db
 from app.models.publisher import PublishLog, PublishPool
+from app.services.async_content_publisher_service import async_content_publisher_service
 from app.services.content_publisher_service import content_publisher_service
+from app.services.publisher_http_client import publisher_http_client
 from app.services.publish_pool_service import publish_pool_service
 from app.services.batch_publish_service import batch_publish_service
 
@@ -35,7 +37,30 @@ class PublisherService:
                 account_id=request["account_id"],
                 publish_to_draft=request.get("publish_to_draft", True)
             )
+        except Exception as e:
+            return PublisherService._record_publish_failure(db, request, e)
+
+        return PublisherService._record_publish_success(db, request, publish_result)
 
+    @staticmethod
+    async def manual_publish_async(db: Session, request: dict) -> dict:
+        """手动发布（异步，调度执行器在事件循环中等待发布完成）"""
+        try:
+            publish_result = await async_content_publisher_service.publish_to_wechat(
+                content_id=request["content_id"],
+                account_id=request["account_id"],
+                publish_to_draft=request.get("publish_to_draft", True),
+                db=db
+            )
+        except Exception as e:
+            return PublisherService._record_publish_failure(db, request, e)
+
+        return PublisherService._record_publish_success(db, request, publish_result)
+
+    @staticmethod
+    def _record_publish_success(db: Session, request: dict, publish_result: dict) -> dict:
+        """记录发布成功的日志"""
+        try:
             # 查找是否已存在该内容的发布日志
             publish_log = db.query(PublishLog).filter(
                 PublishLog.content_id == request["content_id"]
@@ -75,34 +100,39 @@ class PublisherService:
             }
 
         except Exception as e:
-            # 查找是否已存在该内容的发布日志
-            publish_log = db.query(PublishLog).filter(
-                PublishLog.content_id == request["content_id"]
-            ).first()
+            return PublisherService._record_publish_failure(db, request, e)
 
-            if publish_log:
-                # 更新现有记录
-                publish_log.status = "failed"
-                publish_log.error_message = str(e)
-                publish_log.updated_at = datetime.utcnow()
-            else:
-                # 创建失败日志
-                publish_log = PublishLog(
-                    account_id=request["account_id"],
-                    content_id=request["content_id"],
-                    platform="wechat",
-                    status="failed",
-                    error_message=str(e)
-                )
-                db.add(publish_log)
+    @staticmethod
+    def _record_publish_failure(db: Session, request: dict, error: Exception) -> dict:
+        """记录发布失败的日志"""
+        # 查找是否已存在该内容的发布日志
+        publish_log = db.query(PublishLog).filter(
+            PublishLog.content_id == request["content_id"]
+        ).first()
+
+        if publish_log:
+            # 更新现有记录
+            publish_log.status = "failed"
+            publish_log.error_message = str(error)
+            publish_log.updated_at = datetime.utcnow()
+        else:
+            # 创建失败日志
+            publish_log = PublishLog(
+                account_id=request["account_id"],
+                content_id=request["content_id"],
+                platform="wechat",
+                status="failed",
+                error_message=str(error)
+            )
+            db.add(publish_log)
 
-            db.commit()
+        db.commit()
 
-            return {
-                "success": False,
-                "log_id": publish_log.id,
-                "error": str(e)
-            }
+        return {
+            "success": False,
+            "log_id": publish_log.id,
+            "error": str(error)
+        }
 
     @staticmethod
     def retry_publish(db: Session, log_id: int) -> dict:
@@ -148,19 +178,36 @@ class PublisherService:
             }
 
     @staticmethod
-    def batch_publish(db: Session, request: dict) -> dict:
+    async def batch_publish(db: Session, request: dict) -> dict:
         """批量发布"""
-        return batch_publish_service.process_batch_publish(
+        return await batch_publish_service.process_batch_publish(
             db,
             account_id=request["account_id"],
             content_ids=request["content_ids"]
         )
 
+    @staticmethod
+    def get_batch_publish_history(
+        db: Session,
+        account_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> dict:
+        """获取账号的批量发布历史（游标分页）"""
+        return batch_publish_service.get_batch_publish_history_page(
+            db, account_id, cursor=cursor, limit=limit
+        )
+
     @staticmethod
     def get_publish_pool(db: Session) -> List[PublishPool]:
         """查看发布池"""
         return publish_pool_service.get_publish_pool(db)
 
+    @staticmethod
+    def get_http_stats() -> dict:
+        """获取 Publisher API 连接池的连接复用统计"""
+        return publisher_http_client.get_stats()
+
 
 # 全局服务实例
 publisher_service = PublisherService()
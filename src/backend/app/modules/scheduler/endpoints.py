@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.modules.scheduler.services import scheduler_manager_service
 from app.modules.scheduler.schemas import (
     TaskCreate, TaskUpdate, TaskRead,
-    TaskExecution, SchedulerStatus
+    TaskExecution, SchedulerStatus,
+    WorkflowRunRead, WorkflowRunDetail
 )
 from app.db.database import get_db
 from app.core.permissions import require_permission, Permission
@@ -64,16 +67,54 @@ async def delete_task(id: int, db: Session = Depends(get_db), current_user = Dep
 @require_permission(Permission.SCHEDULER_EXECUTE)
 async def trigger_task(id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     """手动触发任务"""
-    result = scheduler_manager_service.trigger_task(db, id)
+    # 任务在调度器的事件循环线程中执行，这里在线程池中等待，避免阻塞请求事件循环
+    result = await run_in_threadpool(scheduler_manager_service.trigger_task, db, id)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result.get("error"))
     return result
 
 @router.get("/executions", response_model=list[TaskExecution])
 @require_permission(Permission.SCHEDULER_READ)
-async def get_execution_history(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    """获取执行历史"""
-    return scheduler_manager_service.get_execution_history(db)
+async def get_execution_history(
+    task_id: Optional[int] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """获取执行历史（运行中的执行来自调度器内存，排在最前面，id 为空）"""
+    return scheduler_manager_service.list_executions(db, task_id, status, limit)
+
+@router.get("/workflow-runs", response_model=list[WorkflowRunRead])
+@require_permission(Permission.SCHEDULER_READ)
+async def list_workflow_runs(
+    task_id: Optional[int] = None,
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """获取工作流运行记录（可按任务、状态筛选）"""
+    return scheduler_manager_service.list_workflow_runs(db, task_id, status, limit)
+
+@router.get("/workflow-runs/{run_id}", response_model=WorkflowRunDetail)
+@require_permission(Permission.SCHEDULER_READ)
+async def get_workflow_run(run_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """获取工作流运行详情（含各步骤的状态和输出）"""
+    run = scheduler_manager_service.get_workflow_run(db, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="工作流运行不存在")
+    return run
+
+@router.post("/workflow-runs/{run_id}/resume")
+@require_permission(Permission.SCHEDULER_EXECUTE)
+async def resume_workflow_run(run_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """从失败的步骤续跑工作流运行，已成功的步骤不再执行"""
+    result = await run_in_threadpool(scheduler_manager_service.resume_workflow_run, db, run_id)
+    if not result["success"]:
+        status_code = 404 if result.get("error") == "工作流运行不存在" else 400
+        raise HTTPException(status_code=status_code, detail=result.get("error"))
+    return result
 
 @router.post("/start")
 @require_permission(Permission.SCHEDULER_EXECUTE)
@@ -93,6 +134,23 @@ async def get_scheduler_status(db: Session = Depends(get_db), current_user = Dep
     """获取调度器状态"""
     return scheduler_manager_service.get_scheduler_status()
 
+@router.get("/executors")
+@require_permission(Permission.SCHEDULER_READ)
+async def get_scheduler_executors(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """获取执行器线程池状态（并发上限、运行中、排队中）"""
+    return scheduler_manager_service.get_executors()
+
+@router.post("/sync")
+@require_permission(Permission.SCHEDULER_EXECUTE)
+async def sync_scheduler(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """
+    增量同步调度器中的任务
+
+    只重新注册修改过的任务、移除已禁用或删除的任务。调度器也会按
+    SCHEDULER_SYNC_INTERVAL 定时自动同步，直接修改数据库后无需重启。
+    """
+    return scheduler_manager_service.sync_tasks(db)
+
 @router.post("/reload")
 @require_permission(Permission.SCHEDULER_EXECUTE)
 async def reload_scheduler(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
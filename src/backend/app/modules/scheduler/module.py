@@ -18,12 +18,19 @@ def startup(app):
             AddToPoolExecutor,
             ApproveExecutor,
             AsyncContentGenerationExecutor,
-            PublishPoolScannerExecutor
+            PublishPoolScannerExecutor,
+            StatsRollupExecutor,
+            ExecutionHistoryCompactionExecutor
         )
+        from app.core.config import settings
         from app.db.database import SessionLocal
+        from app.services.creator_api_client import get_creator_api_client
 
         log.info("=== 开始初始化调度器模块 ===")
 
+        # 执行器在调度器的事件循环中复用 AsyncClient，事件循环停止前关闭连接
+        scheduler_service.event_loop.add_stop_callback(get_creator_api_client().close_async)
+
         # 注册任务执行器
         executors = [
             ("content_generation", ContentGenerationExecutor()),
@@ -32,7 +39,9 @@ def startup(app):
             ("add_to_pool", AddToPoolExecutor()),
             ("approve", ApproveExecutor()),
             ("async_content_generation", AsyncContentGenerationExecutor()),
-            ("publish_pool_scanner", PublishPoolScannerExecutor())
+            ("publish_pool_scanner", PublishPoolScannerExecutor()),
+            ("stats_rollup", StatsRollupExecutor()),
+            ("execution_history_compaction", ExecutionHistoryCompactionExecutor())
         ]
 
         registered_count = 0
@@ -53,6 +62,13 @@ def startup(app):
         else:
             log.info("调度器已在运行")
 
+        # 生成任务经队列提交时，随调度器启动任务队列 Worker 池
+        if settings.ASYNC_SUBMIT_VIA_QUEUE:
+            from app.services.task_queue_service import start_worker_pool
+
+            start_worker_pool(settings.ASYNC_WORKER_COUNT)
+            log.info(f"✓ 任务队列 Worker 池已启动 ({settings.ASYNC_WORKER_COUNT} 个 Worker)")
+
         # 从数据库加载定时任务
         db = SessionLocal()
         try:
@@ -81,7 +97,13 @@ def startup(app):
 # 模块关闭钩子
 def shutdown(app):
     """定时任务模块关闭时执行的代码"""
+    from app.core.config import settings
     from app.services.scheduler_service import scheduler_service
+
+    if settings.ASYNC_SUBMIT_VIA_QUEUE:
+        from app.services.task_queue_service import stop_worker_pool
+
+        stop_worker_pool()
     scheduler_service.shutdown()
 
 # 模块导出
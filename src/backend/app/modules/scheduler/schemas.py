@@ -85,8 +85,8 @@ class TaskRead(BaseModel):
 
 
 class TaskExecution(BaseModel):
-    """任务执行记录响应模型"""
-    id: int
+    """任务执行记录响应模型（运行中的执行尚未写入数据库，id 为空）"""
+    id: Optional[int]
     task_id: int
     status: str
     start_time: datetime
@@ -121,3 +121,40 @@ class SchedulerStatus(BaseModel):
                 "jobs_count": 5
             }
         }
+
+
+class WorkflowStepRunRead(BaseModel):
+    """工作流步骤检查点响应模型"""
+    step_key: str
+    position: int
+    step_type: Optional[str]
+    status: str
+    attempts: int
+    output: Optional[Dict[str, Any]]
+    completed_items: int = 0  # for_each 中已成功的元素数
+    message: Optional[str]
+    error: Optional[str]
+    duration: Optional[float]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+class WorkflowRunRead(BaseModel):
+    """工作流运行记录响应模型"""
+    id: int
+    task_id: int
+    task_name: Optional[str]
+    status: str  # 状态：running/success/failed
+    mode: Optional[str]
+    attempts: int  # 执行次数（含续跑）
+    failed_step: Optional[str]
+    error_message: Optional[str]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+class WorkflowRunDetail(WorkflowRunRead):
+    """工作流运行详情响应模型（含各步骤检查点）"""
+    params: Optional[Dict[str, Any]]
+    context: Optional[Dict[str, Any]]
+    steps: List[WorkflowStepRunRead] = []
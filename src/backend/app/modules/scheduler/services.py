@@ -6,8 +6,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from app.db.database import get_db
-from app.models.scheduler import ScheduledTask
+from app.models.scheduler import ScheduledTask, TaskExecution
 from app.services.scheduler_service import scheduler_service
+from app.services.workflow_run_service import workflow_run_service
 
 
 class SchedulerManagerService:
@@ -179,7 +180,6 @@ class SchedulerManagerService:
     @staticmethod
     def trigger_task(db: Session, task_id: int) -> dict:
         """手动触发任务"""
-        import asyncio
         from app.utils.custom_logger import log
 
         task = db.query(ScheduledTask).filter(ScheduledTask.id == task_id).first()
@@ -192,8 +192,9 @@ class SchedulerManagerService:
             # 解析任务参数
             task_params = SchedulerManagerService._parse_task_params(task)
 
-            # 执行任务
-            result = asyncio.run(
+            # 在调度器的事件循环中执行任务
+            result = scheduler_service.run_task_coroutine(
+                task.task_type,
                 scheduler_service.execute_task(
                     task_id=task.id,
                     task_type=task.task_type,
@@ -235,6 +236,142 @@ class SchedulerManagerService:
             for task in tasks
         ]
 
+    @staticmethod
+    def list_executions(
+        db: Session,
+        task_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = 50
+    ) -> List[dict]:
+        """
+        获取执行记录（含运行中的执行）
+
+        运行中的执行只保存在调度器进程的内存中，结束后才批量写入 task_executions，
+        这里合并到结果最前面；已结束但尚未写入的记录先写入再查询
+
+        Args:
+            db: 数据库会话
+            task_id: 任务 ID
+            status: 状态过滤（running/success/failed）
+            limit: 返回数量
+        """
+        items = []
+        if status in (None, "running"):
+            now = datetime.now()
+            running = sorted(scheduler_service.history.get_running(), key=lambda run: run.start_time, reverse=True)
+            for run in running:
+                if task_id is not None and run.task_id != task_id:
+                    continue
+                items.append({
+                    "id": None,
+                    "task_id": run.task_id,
+                    "status": "running",
+                    "start_time": run.start_time,
+                    "end_time": None,
+                    "duration": int((now - run.start_time).total_seconds()),
+                    "error_message": None,
+                    "result": None
+                })
+
+        if status != "running" and len(items) < limit:
+            if scheduler_service.history.pending_count:
+                scheduler_service.history.flush()
+            query = db.query(TaskExecution)
+            if task_id is not None:
+                query = query.filter(TaskExecution.task_id == task_id)
+            if status:
+                query = query.filter(TaskExecution.status == status)
+            for execution in query.order_by(TaskExecution.start_time.desc()).limit(limit - len(items)):
+                items.append({
+                    "id": execution.id,
+                    "task_id": execution.task_id,
+                    "status": execution.status,
+                    "start_time": execution.start_time,
+                    "end_time": execution.end_time,
+                    "duration": execution.duration,
+                    "error_message": execution.error_message,
+                    "result": execution.result
+                })
+
+        return items[:limit]
+
+    @staticmethod
+    def list_workflow_runs(
+        db: Session,
+        task_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = 20
+    ) -> List[dict]:
+        """获取工作流运行记录"""
+        runs = workflow_run_service.list_runs(db, task_id=task_id, status=status, limit=limit)
+        return [workflow_run_service.run_to_dict(run) for run in runs]
+
+    @staticmethod
+    def get_workflow_run(db: Session, run_id: int) -> Optional[dict]:
+        """获取工作流运行详情（含各步骤检查点）"""
+        run = workflow_run_service.get_run(db, run_id)
+        if not run:
+            return None
+        return workflow_run_service.run_to_dict(run, include_steps=True)
+
+    @staticmethod
+    def resume_workflow_run(db: Session, run_id: int) -> dict:
+        """
+        续跑失败的工作流运行
+
+        使用该运行保存的参数重新执行工作流，已成功的步骤复用检查点中的输出。
+        执行前以条件更新取得该运行，正在执行（包括定时触发的自动续跑）的运行不能续跑
+        """
+        from app.utils.custom_logger import log
+
+        run = workflow_run_service.get_run(db, run_id)
+        if not run:
+            return {"success": False, "error": "工作流运行不存在"}
+        if run.status == "success":
+            return {"success": False, "error": "工作流运行已成功完成，无需续跑"}
+        if run.status == "running":
+            return {"success": False, "error": "工作流运行正在执行中，无法续跑"}
+
+        task = run.task
+        if not task:
+            return {"success": False, "error": "任务不存在"}
+
+        if not workflow_run_service.claim_for_resume(db, run.id):
+            return {"success": False, "error": "工作流运行正在执行中，无法续跑"}
+
+        try:
+            log.info(f"续跑工作流运行 {run_id} (任务: {task.id})")
+
+            task_params = {**(run.params or {}), "resume_run_id": run.id}
+            result = scheduler_service.run_task_coroutine(
+                task.task_type,
+                scheduler_service.execute_task(
+                    task_id=task.id,
+                    task_type=task.task_type,
+                    task_params=task_params,
+                    db=db
+                )
+            )
+
+            task.last_run_time = datetime.utcnow()
+            db.commit()
+
+            log.info(f"工作流运行 {run_id} 续跑完成: {result.success}")
+
+            return {
+                "success": result.success,
+                "message": result.message,
+                "data": result.data,
+                "error": result.error
+            }
+
+        except Exception as e:
+            log.exception(f"续跑工作流运行 {run_id} 时发生异常")
+            return {"success": False, "error": str(e)}
+
+        finally:
+            workflow_run_service.release_claim(db, run_id)
+
     @staticmethod
     def start_scheduler() -> dict:
         """启动调度器"""
@@ -255,6 +392,35 @@ class SchedulerManagerService:
             "jobs_count": len(scheduler_service.scheduler.get_jobs())
         }
 
+    @staticmethod
+    def get_executors() -> dict:
+        """获取已注册的执行器及其线程池状态（工作线程数、运行中、排队中）"""
+        return scheduler_service.get_registered_executors()
+
+    @staticmethod
+    def sync_tasks(db: Session) -> dict:
+        """
+        增量同步调度器中的任务
+
+        只重新注册 updated_at 发生变化的任务，并移除已禁用或删除的任务
+        """
+        from app.utils.custom_logger import log
+
+        try:
+            result = scheduler_service.sync_tasks(db)
+            return {
+                "success": True,
+                "message": f"新增 {result['added']} 个, 更新 {result['updated']} 个, 移除 {result['removed']} 个任务",
+                **result
+            }
+
+        except Exception as e:
+            log.error(f"同步调度器任务失败: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
     @staticmethod
     def reload_tasks(db: Session) -> dict:
         """
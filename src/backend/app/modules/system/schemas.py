@@ -57,6 +57,11 @@ class MetricsResponse(BaseModel):
     requests_per_minute: float = Field(..., description="每分钟请求数")
     active_users: int = Field(..., description="活跃用户数")
     cache_stats: Dict[str, Any] = Field(..., description="缓存统计信息")
+    db_pool: Dict[str, Any] = Field(default_factory=dict, description="数据库连接池指标")
+    scheduler: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="调度器执行剖析：各执行器和工作流步骤的耗时分布、数据库/外部 API 耗时和排队时间"
+    )
     uptime: float = Field(..., description="运行时间（秒）")
 
     class Config:
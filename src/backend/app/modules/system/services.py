@@ -11,6 +11,8 @@ from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.cache import redis_client, get_cache_stats
+from app.db.sql_db import get_pool_stats
+from app.services.monitoring.scheduler_profiler import scheduler_profiler
 from app.utils.custom_logger import logger
 
 
@@ -102,6 +104,8 @@ class SystemService:
             "requests_per_minute": round(requests_per_minute, 2),
             "active_users": active_users,
             "cache_stats": cache_stats,
+            "db_pool": get_pool_stats(),
+            "scheduler": scheduler_profiler.snapshot(),
             "uptime": time.time() - _app_start_time
         }
 
@@ -25,6 +25,8 @@ class AsyncContentGenerationService:
 
     # 默认超时时间（30分钟）
     DEFAULT_TIMEOUT_MINUTES = 30
+    # 直接提交时任务的领取者标识（提交期间队列 Worker 不会领取该任务）
+    DIRECT_SUBMITTER = "direct"
 
     def __init__(self, db: Optional[Session] = None):
         """
@@ -63,6 +65,10 @@ class AsyncContentGenerationService:
         Returns:
             task_id: 任务ID
 
+        启用 ASYNC_SUBMIT_VIA_QUEUE 时任务只入队（pending）并唤醒 Worker，由 Worker 提交；
+        否则任务以已领取（claimed）状态创建后直接提交，提交期间队列 Worker 不会重复领取，
+        提交进程异常退出时租约到期后由 Worker 接手；未启用队列时由状态轮询器标记为失败
+
         Raises:
             ResourceNotFoundException: 账号不存在
             CreatorException: API调用失败
@@ -74,6 +80,8 @@ class AsyncContentGenerationService:
 
         # 生成任务ID
         task_id = f"task-{uuid.uuid4().hex[:12]}"
+        via_queue = settings.ASYNC_SUBMIT_VIA_QUEUE
+        now = datetime.utcnow()
 
         # 创建任务记录
         task = ContentGenerationTask(
@@ -84,10 +92,13 @@ class AsyncContentGenerationService:
             category=category,
             requirements=requirements,
             tone=tone,
-            status="pending",
+            status="pending" if via_queue else "claimed",
+            claimed_by=None if via_queue else self.DIRECT_SUBMITTER,
+            lease_expires_at=None if via_queue else now + timedelta(seconds=settings.TASK_QUEUE_VISIBILITY_TIMEOUT),
+            delivery_count=0 if via_queue else 1,
             priority=priority,
             auto_approve=auto_approve,
-            timeout_at=datetime.utcnow() + timedelta(minutes=self.DEFAULT_TIMEOUT_MINUTES)
+            timeout_at=now + timedelta(minutes=self.DEFAULT_TIMEOUT_MINUTES)
         )
 
         self.db.add(task)
@@ -96,6 +107,14 @@ class AsyncContentGenerationService:
 
         log.info(f"Created async generation task: {task_id} for account {account_id}")
 
+        if via_queue:
+            from app.services.task_queue_service import task_queue_notifier
+
+            # 任务已作为 pending 入队，唤醒空闲的 Worker 立即领取
+            task_queue_notifier.notify()
+            log.info(f"Task {task_id} queued for workers")
+            return task_id
+
         # 提交任务到 content-creator HTTP API（异步模式）
         try:
             self._submit_to_creator(task)
@@ -103,9 +122,16 @@ class AsyncContentGenerationService:
             # 如果提交失败，更新任务状态
             task.status = "failed"
             task.error_message = f"Failed to submit to creator: {str(e)}"
+            task.claimed_by = None
+            task.lease_expires_at = None
             self.db.commit()
             raise
 
+        # 提交完成，清除领取信息
+        task.claimed_by = None
+        task.lease_expires_at = None
+        self.db.commit()
+
         return task_id
 
     def _submit_to_creator(self, task: ContentGenerationTask):
@@ -289,14 +315,18 @@ class AsyncContentGenerationService:
         if not task:
             return False
 
-        # 只有 pending 或 submitted 状态的任务可以取消
-        if task.status not in ["pending", "submitted"]:
+        # 只有 pending、claimed（提交中）或 submitted 状态的任务可以取消
+        if task.status not in ["pending", "claimed", "submitted"]:
             raise InvalidStateException(
                 message=f"任务状态为 {task.status}，无法取消",
                 current_state=task.status,
-                required_state="pending or submitted"
+                required_state="pending, claimed or submitted"
             )
 
+        # 清除领取信息，队列 Worker 不再领取该任务
+        task.claimed_by = None
+        task.lease_expires_at = None
+
         try:
             # 调用 API 取消任务
             self.api_client.cancel_task(task_id)
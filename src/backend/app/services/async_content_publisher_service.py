@@ -0,0 +1,306 @@
+"""
+异步内容发布服务
+使用 httpx.AsyncClient 调用 content-publisher API，重试退避使用 asyncio.sleep，
+发布慢或重试时不阻塞事件循环，调度器中的其他任务和 Webhook 处理可以继续执行
+"""
+import asyncio
+import json
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.exceptions import (
+    PublisherException,
+    PublisherTimeoutException,
+    PublisherUnauthorizedException,
+    ServiceUnavailableException
+)
+from app.services.content_publisher_service import ContentPublisherService
+from app.services.monitoring.scheduler_profiler import scheduler_profiler
+from app.utils.custom_logger import log
+
+
+class AsyncContentPublisherService:
+    """异步内容发布服务（超时、重试和降级策略与 ContentPublisherService 一致）"""
+
+    def __init__(self, pool_size: Optional[int] = None):
+        """
+        初始化服务
+
+        Args:
+            pool_size: 每个事件循环的最大连接数（默认 PUBLISHER_HTTP_POOL_SIZE）
+        """
+        self.pool_size = pool_size or settings.PUBLISHER_HTTP_POOL_SIZE
+        # AsyncClient 绑定创建它的事件循环，调度器和 Web 服务各用一个
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取当前事件循环的异步 HTTP 客户端（懒加载）"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """关闭当前事件循环的客户端连接"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        """关闭所有事件循环的客户端连接（应用关闭时调用）"""
+        for loop, client in list(self._clients.items()):
+            if loop.is_closed() or client.is_closed:
+                continue
+            try:
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                else:
+                    loop.run_until_complete(client.aclose())
+            except Exception as e:
+                log.warning(f"关闭 Publisher 异步客户端失败: {e}")
+        self._clients.clear()
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        retries: int = 0,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        发送 HTTP 请求并处理错误
+
+        :param method: HTTP 方法
+        :param endpoint: API 端点
+        :param retries: 当前重试次数
+        :param kwargs: httpx 其他参数
+        :return: 解析后的 JSON 响应
+        :raises: PublisherException 及其子类
+        """
+        url = f"{settings.PUBLISHER_API_URL}{endpoint}"
+
+        # 设置默认超时
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = ContentPublisherService.DEFAULT_TIMEOUT
+
+        # 添加认证头
+        headers = kwargs.get('headers', {})
+        if 'Authorization' not in headers:
+            api_key = kwargs.pop('api_key', settings.PUBLISHER_API_KEY)
+            headers['Authorization'] = f"Bearer {api_key}"
+        kwargs['headers'] = headers
+
+        try:
+            log.info(f"Publisher API request (async): {method} {url}")
+
+            with scheduler_profiler.track_api():
+                response = await self._get_client().request(method, url, **kwargs)
+            response.raise_for_status()
+
+            # 解析 JSON 响应
+            try:
+                return response.json()
+            except json.JSONDecodeError as e:
+                log.error(f"Failed to parse Publisher API response: {e}")
+                raise PublisherException(
+                    message="Publisher API 返回了无效的 JSON 响应",
+                    details={
+                        "status_code": response.status_code,
+                        "response_preview": response.text[:200]
+                    },
+                    code="PUBLISHER_INVALID_RESPONSE"
+                )
+
+        except httpx.TimeoutException as e:
+            log.error(f"Publisher API timeout: {str(e)}")
+
+            # 指数退避重试
+            if retries < ContentPublisherService.MAX_RETRIES:
+                wait_time = 2 ** retries  # 1s, 2s, 4s
+                log.warning(
+                    f"Retrying Publisher API request after {wait_time}s "
+                    f"(attempt {retries + 1}/{ContentPublisherService.MAX_RETRIES})"
+                )
+                await asyncio.sleep(wait_time)
+                return await self._make_request(method, endpoint, retries + 1, **kwargs)
+
+            raise PublisherTimeoutException(kwargs.get('timeout', ContentPublisherService.DEFAULT_TIMEOUT))
+
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            error_details = {
+                "status_code": status_code,
+                "response": e.response.text[:500] if e.response.text else "No response body"
+            }
+
+            # 401 未授权
+            if status_code == 401:
+                log.error("Publisher API authentication failed")
+                raise PublisherUnauthorizedException()
+
+            # 403 禁止访问
+            elif status_code == 403:
+                log.error("Publisher API access forbidden")
+                raise PublisherException(
+                    message="Publisher API 访问被拒绝，请检查权限配置",
+                    details=error_details,
+                    code="PUBLISHER_FORBIDDEN"
+                )
+
+            # 404 未找到
+            elif status_code == 404:
+                log.error(f"Publisher API endpoint not found: {endpoint}")
+                raise PublisherException(
+                    message=f"Publisher API 端点不存在: {endpoint}",
+                    details=error_details,
+                    code="PUBLISHER_NOT_FOUND"
+                )
+
+            # 可重试的状态码
+            elif status_code in ContentPublisherService.RETRYABLE_STATUS_CODES:
+                if retries < ContentPublisherService.MAX_RETRIES:
+                    wait_time = 2 ** retries
+                    log.warning(
+                        f"Publisher API returned {status_code}, retrying after {wait_time}s "
+                        f"(attempt {retries + 1}/{ContentPublisherService.MAX_RETRIES})"
+                    )
+                    await asyncio.sleep(wait_time)
+                    return await self._make_request(method, endpoint, retries + 1, **kwargs)
+
+                # 重试次数用尽，检查是否启用降级
+                if ContentPublisherService.DEGRADE_ENABLED:
+                    log.error(
+                        f"Publisher API failed after {ContentPublisherService.MAX_RETRIES} retries, "
+                        f"degrading service (status: {status_code})"
+                    )
+                    return ContentPublisherService._degraded_response(method, endpoint, status_code)
+                else:
+                    log.error(f"Publisher API failed after retries: {status_code}")
+                    raise ServiceUnavailableException(
+                        service_name="Content-Publisher",
+                        details=error_details
+                    )
+
+            # 其他 HTTP 错误
+            else:
+                log.error(f"Publisher API HTTP error: {status_code} - {e.response.text[:200]}")
+                raise PublisherException(
+                    message=f"Publisher API 请求失败 (HTTP {status_code})",
+                    details=error_details
+                )
+
+        except httpx.RequestError as e:
+            log.exception(f"Publisher API request failed: {str(e)}")
+
+            # 网络错误重试
+            if retries < ContentPublisherService.MAX_RETRIES:
+                wait_time = 2 ** retries
+                log.warning(
+                    f"Network error, retrying after {wait_time}s "
+                    f"(attempt {retries + 1}/{ContentPublisherService.MAX_RETRIES})"
+                )
+                await asyncio.sleep(wait_time)
+                return await self._make_request(method, endpoint, retries + 1, **kwargs)
+
+            raise PublisherException(
+                message=f"Publisher API 网络请求失败: {str(e)}",
+                details={"error_type": type(e).__name__}
+            )
+
+        except PublisherException:
+            # 重新抛出已知的 Publisher 异常
+            raise
+        except Exception as e:
+            log.exception(f"Unexpected error calling Publisher API: {str(e)}")
+            raise PublisherException(
+                message=f"调用 Publisher API 时发生意外错误: {str(e)}",
+                details={"error_type": type(e).__name__}
+            )
+
+    async def publish_to_wechat(
+        self,
+        content_id: int,
+        account_id: int,
+        publish_to_draft: bool = True,
+        db=None
+    ) -> dict:
+        """
+        发布到微信公众号
+
+        有本地图片时以流式 multipart/form-data 上传，图片按块从磁盘读取，
+        不会整体读入内存；重试时从文件开头重新发送
+
+        :param content_id: 内容 ID
+        :param account_id: 账号 ID
+        :param publish_to_draft: 是否发布到草稿箱
+        :param db: 数据库会话
+        :return: 发布结果
+        """
+        if not settings.PUBLISHER_API_URL:
+            raise PublisherException(
+                message="PUBLISHER_API_URL 未配置",
+                code="PUBLISHER_NOT_CONFIGURED"
+            )
+
+        if not settings.PUBLISHER_API_KEY:
+            raise PublisherUnauthorizedException()
+
+        # 查询内容、处理图片路径、计算文件摘要和查询/写入媒体缓存都是阻塞操作，放到线程中执行，不阻塞事件循环
+        prepared = await asyncio.to_thread(ContentPublisherService._prepare_publish, content_id, account_id, db)
+        await asyncio.to_thread(ContentPublisherService._apply_media_cache, prepared)
+        image_paths = prepared["image_paths"]
+
+        # 没有本地图片，使用 JSON 格式
+        if not image_paths:
+            log.info("无本地图片，使用 JSON 格式")
+            return await self._make_request(
+                "POST",
+                "/api/publish",
+                json=ContentPublisherService._build_json_payload(prepared),
+                headers={"Content-Type": "application/json"}
+            )
+
+        # 有本地图片，使用 multipart/form-data 格式
+        log.info(f"使用 multipart/form-data 格式，上传 {len(image_paths)} 个图片文件")
+
+        try:
+            body = ContentPublisherService._build_multipart_stream(prepared)
+        except OSError as e:
+            raise PublisherException(
+                message=f"无法读取图片文件: {str(e)}",
+                details={"error_type": type(e).__name__},
+                code="PUBLISHER_FILE_READ_ERROR"
+            )
+
+        log.info(f"  - 标题: {prepared['title']}")
+        log.info(f"  - 封面: {prepared['cover_upload'] or '(无)'}")
+        log.info(f"  - 请求体大小: {len(body)} 字节")
+
+        result = await self._make_request(
+            "POST",
+            "/api/publish",
+            content=body.async_view(),
+            headers=dict(body.headers),
+            timeout=ContentPublisherService.UPLOAD_TIMEOUT
+        )
+
+        # 检查业务状态
+        ContentPublisherService._check_publish_result(result)
+        await asyncio.to_thread(ContentPublisherService._remember_uploaded_media, prepared, result)
+        return result
+
+
+# 全局服务实例
+async_content_publisher_service = AsyncContentPublisherService()
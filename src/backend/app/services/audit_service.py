@@ -4,10 +4,12 @@
 from datetime import datetime, date
 from typing import List, Dict, Any, Optional
 from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select
 
 from app.models.audit_log import AuditLog
+from app.utils.pagination import apply_keyset, build_cursor_page, cached_count, cached_count_async
 from app.utils.custom_logger import log
 
 
@@ -128,7 +130,9 @@ class AuditService:
         db: Session,
         filters: Optional[Dict[str, Any]] = None,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        with_total: bool = True
     ) -> Dict[str, Any]:
         """
         查询审计日志（分页）
@@ -143,43 +147,18 @@ class AuditService:
             - search: 搜索关键字（搜索 details 字段，可选）
         :param page: 页码（从 1 开始）
         :param page_size: 每页数量
+        :param cursor: 游标分页时传入上一页的 next_cursor（首页为空字符串），传入后忽略 page
+        :param with_total: 游标分页时是否返回（带缓存的）总数
         :return: 包含 logs 和 total 的字典
         """
         try:
             # 构建查询
-            query = db.query(AuditLog)
+            query = db.query(AuditLog).filter(*AuditService._build_log_conditions(filters))
 
-            # 应用过滤条件
-            if filters:
-                if filters.get("event_type"):
-                    query = query.filter(AuditLog.event_type == filters["event_type"])
-
-                if filters.get("user_id"):
-                    query = query.filter(AuditLog.user_id == filters["user_id"])
-
-                if filters.get("result"):
-                    query = query.filter(AuditLog.result == filters["result"])
-
-                if filters.get("start_date"):
-                    start_datetime = datetime.combine(filters["start_date"], datetime.min.time())
-                    query = query.filter(AuditLog.timestamp >= start_datetime)
-
-                if filters.get("end_date"):
-                    end_datetime = datetime.combine(filters["end_date"], datetime.max.time())
-                    query = query.filter(AuditLog.timestamp <= end_datetime)
-
-                if filters.get("search"):
-                    # 在 details JSON 字段中搜索
-                    search_term = f"%{filters['search']}%"
-                    # SQLite 的 JSON 搜索可能有限制，这里使用简单的字符串匹配
-                    # 实际生产环境可能需要使用 JSON 函数或全文搜索
-                    query = query.filter(
-                        or_(
-                            AuditLog.details.like(search_term),
-                            AuditLog.ip_address.like(search_term),
-                            AuditLog.user_agent.like(search_term)
-                        )
-                    )
+            if cursor is not None:
+                rows = apply_keyset(query, AuditLog.timestamp, AuditLog.id, cursor, page_size).all()
+                total = cached_count(db, query, "audit_logs") if with_total else None
+                return AuditService._build_cursor_log_page(rows, total, page_size)
 
             # 按时间倒序排序
             query = query.order_by(desc(AuditLog.timestamp))
@@ -191,18 +170,134 @@ class AuditService:
             offset = (page - 1) * page_size
             logs = query.offset(offset).limit(page_size).all()
 
-            return {
-                "logs": logs,
-                "total": total,
-                "page": page,
-                "page_size": page_size,
-                "total_pages": (total + page_size - 1) // page_size
-            }
+            return AuditService._build_log_page(logs, total, page, page_size)
+
+        except Exception as e:
+            log.error(f"Failed to query audit logs: {str(e)}")
+            raise
+
+    @staticmethod
+    async def get_audit_logs_async(
+        db: AsyncSession,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Dict[str, Any]:
+        """
+        查询审计日志（分页，异步会话版本）
+
+        :param db: 异步数据库会话
+        :param filters: 过滤条件，同 get_audit_logs
+        :param page: 页码（从 1 开始）
+        :param page_size: 每页数量
+        :param cursor: 游标，同 get_audit_logs
+        :param with_total: 游标分页时是否返回总数
+        :return: 包含 logs 和 total 的字典
+        """
+        try:
+            conditions = AuditService._build_log_conditions(filters)
+
+            if cursor is not None:
+                query = select(AuditLog).where(*conditions)
+                result = await db.execute(
+                    apply_keyset(query, AuditLog.timestamp, AuditLog.id, cursor, page_size)
+                )
+                total = await cached_count_async(db, query, "audit_logs") if with_total else None
+                return AuditService._build_cursor_log_page(result.scalars().all(), total, page_size)
+
+            # 计算总数
+            total = await db.scalar(
+                select(func.count()).select_from(AuditLog).where(*conditions)
+            )
+
+            # 分页，按时间倒序排序
+            offset = (page - 1) * page_size
+            result = await db.execute(
+                select(AuditLog)
+                .where(*conditions)
+                .order_by(desc(AuditLog.timestamp))
+                .offset(offset)
+                .limit(page_size)
+            )
+            logs = result.scalars().all()
+
+            return AuditService._build_log_page(logs, total or 0, page, page_size)
 
         except Exception as e:
             log.error(f"Failed to query audit logs: {str(e)}")
             raise
 
+    @staticmethod
+    def _build_log_conditions(filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """
+        将过滤条件转换为查询条件列表
+
+        :param filters: 过滤条件
+        :return: SQLAlchemy 条件表达式列表
+        """
+        conditions = []
+        if not filters:
+            return conditions
+
+        if filters.get("event_type"):
+            conditions.append(AuditLog.event_type == filters["event_type"])
+
+        if filters.get("user_id"):
+            conditions.append(AuditLog.user_id == filters["user_id"])
+
+        if filters.get("result"):
+            conditions.append(AuditLog.result == filters["result"])
+
+        if filters.get("start_date"):
+            start_datetime = datetime.combine(filters["start_date"], datetime.min.time())
+            conditions.append(AuditLog.timestamp >= start_datetime)
+
+        if filters.get("end_date"):
+            end_datetime = datetime.combine(filters["end_date"], datetime.max.time())
+            conditions.append(AuditLog.timestamp <= end_datetime)
+
+        if filters.get("search"):
+            # 在 details JSON 字段中搜索
+            search_term = f"%{filters['search']}%"
+            # SQLite 的 JSON 搜索可能有限制，这里使用简单的字符串匹配
+            # 实际生产环境可能需要使用 JSON 函数或全文搜索
+            conditions.append(
+                or_(
+                    AuditLog.details.like(search_term),
+                    AuditLog.ip_address.like(search_term),
+                    AuditLog.user_agent.like(search_term)
+                )
+            )
+
+        return conditions
+
+    @staticmethod
+    def _build_log_page(logs: List[AuditLog], total: int, page: int, page_size: int) -> Dict[str, Any]:
+        """组装分页结果"""
+        return {
+            "logs": logs,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size
+        }
+
+    @staticmethod
+    def _build_cursor_log_page(rows: List[AuditLog], total: Optional[int], page_size: int) -> Dict[str, Any]:
+        """组装游标分页结果"""
+        page_data = build_cursor_page(rows, page_size, created_attr="timestamp")
+        return {
+            "logs": page_data["items"],
+            "total": total,
+            "page": None,
+            "page_size": page_size,
+            "total_pages": None,
+            "next_cursor": page_data["next_cursor"],
+            "has_more": page_data["has_more"]
+        }
+
     @staticmethod
     def get_audit_log_by_id(db: Session, log_id: int) -> Optional[AuditLog]:
         """
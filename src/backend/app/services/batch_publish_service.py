@@ -1,22 +1,24 @@
 """
 批量发布服务
-负责处理批量发布任务
+负责处理批量发布任务，多个账号的内容通过并发发布引擎并行发布
 """
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 from app.db.database import get_db
 from app.models.publisher import PublishPool, PublishLog
 from app.models.content import Content
-from app.services.content_publisher_service import content_publisher_service
+from app.services.async_content_publisher_service import async_content_publisher_service
+from app.services.publish_engine import publish_engine
 from app.services.publish_pool_service import publish_pool_service
+from app.utils.pagination import apply_keyset, build_cursor_page
 
 
 class BatchPublishService:
     """批量发布服务"""
 
     @staticmethod
-    def process_batch_publish(db: Session, account_id: int, content_ids: List[int]) -> dict:
+    async def process_batch_publish(db: Session, account_id: int, content_ids: List[int]) -> dict:
         """
         处理批量发布任务
         :param db: 数据库会话
@@ -24,112 +26,13 @@ class BatchPublishService:
         :param content_ids: 内容 ID 列表
         :return: 发布结果
         """
-        results = []
-        success_count = 0
-        fail_count = 0
-
-        for content_id in content_ids:
-            try:
-                # 获取内容信息
-                content = db.query(Content).filter(
-                    Content.id == content_id,
-                    Content.account_id == account_id
-                ).first()
-
-                if not content:
-                    results.append({
-                        "content_id": content_id,
-                        "success": False,
-                        "error": "内容不存在"
-                    })
-                    fail_count += 1
-                    continue
-
-                # 检查内容状态
-                if content.review_status not in ["approved"]:
-                    results.append({
-                        "content_id": content_id,
-                        "success": False,
-                        "error": f"内容状态不正确：{content.review_status}"
-                    })
-                    fail_count += 1
-                    continue
-
-                # 查找或创建发布日志
-                publish_log = db.query(PublishLog).filter(
-                    PublishLog.content_id == content_id
-                ).first()
-
-                if not publish_log:
-                    # 创建新发布日志
-                    publish_log = PublishLog(
-                        account_id=account_id,
-                        content_id=content_id,
-                        platform="wechat",
-                        status="pending"
-                    )
-                    db.add(publish_log)
-                    db.commit()
-                    db.refresh(publish_log)
-
-                # 添加到发布池
-                pool_entry = publish_pool_service.add_to_pool(
-                    db,
-                    content_id=content_id,
-                    priority=5,
-                    scheduled_at=datetime.utcnow()
-                )
-
-                # 发布到微信公众号
-                publish_result = content_publisher_service.publish_to_wechat(
-                    content_id=content_id,
-                    account_id=account_id,
-                    publish_to_draft=True
-                )
-
-                # 更新发布日志
-                publish_log.status = "success"
-                publish_log.media_id = publish_result.get("media_id")
-                publish_log.result = str(publish_result)
-                db.commit()
-
-                # 更新发布池状态
-                publish_pool_service.complete_publishing(
-                    db,
-                    pool_id=pool_entry.id,
-                    published_log_id=publish_log.id
-                )
-
-                # 更新内容状态
-                content.publish_status = "published"
-                content.published_at = datetime.utcnow()
-                db.commit()
-
-                results.append({
-                    "content_id": content_id,
-                    "success": True,
-                    "media_id": publish_result.get("media_id"),
-                    "published_at": datetime.utcnow().isoformat()
-                })
-                success_count += 1
-
-            except Exception as e:
-                results.append({
-                    "content_id": content_id,
-                    "success": False,
-                    "error": str(e)
-                })
-                fail_count += 1
-
-        return {
-            "total": len(content_ids),
-            "success": success_count,
-            "fail": fail_count,
-            "results": results
-        }
+        return await BatchPublishService.publish_contents(
+            db,
+            [(account_id, content_id) for content_id in content_ids]
+        )
 
     @staticmethod
-    def process_scheduled_batch_publish(db: Session) -> dict:
+    async def process_scheduled_batch_publish(db: Session) -> dict:
         """
         处理定时批量发布任务
         :param db: 数据库会话
@@ -145,33 +48,166 @@ class BatchPublishService:
                 "results": []
             }
 
-        # 按账号分组处理
-        account_entries = {}
+        # 查找每个条目所属账号，所有账号的内容一起并发发布
+        items = []
         for entry in pending_entries:
             content = db.query(Content).filter(Content.id == entry.content_id).first()
             if content:
-                if content.account_id not in account_entries:
-                    account_entries[content.account_id] = []
-                account_entries[content.account_id].append(entry.content_id)
+                items.append((content.account_id, entry.content_id))
 
-        # 处理每个账号的批量发布
-        all_results = []
-        total_success = 0
-        total_fail = 0
+        return await BatchPublishService.publish_contents(db, items)
 
-        for account_id, content_ids in account_entries.items():
-            result = BatchPublishService.process_batch_publish(db, account_id, content_ids)
-            all_results.extend(result["results"])
-            total_success += result["success"]
-            total_fail += result["fail"]
+    @staticmethod
+    async def publish_contents(db: Session, items: List[Tuple[int, int]]) -> dict:
+        """
+        并发发布多个账号的内容并汇总结果
+        :param db: 数据库会话
+        :param items: (账号 ID, 内容 ID) 列表
+        :return: 发布结果（results 按完成顺序排列）
+        """
+        results = []
+        success_count = 0
+        fail_count = 0
+
+        async for result in BatchPublishService.iter_publish_results(db, items):
+            results.append(result)
+            if result["success"]:
+                success_count += 1
+            else:
+                fail_count += 1
 
         return {
-            "total": total_success + total_fail,
-            "success": total_success,
-            "fail": total_fail,
-            "results": all_results
+            "total": len(items),
+            "success": success_count,
+            "fail": fail_count,
+            "results": results
         }
 
+    @staticmethod
+    async def iter_publish_results(db: Session, items: List[Tuple[int, int]]) -> AsyncIterator[dict]:
+        """
+        并发发布，每篇内容发布完成后立即返回其结果
+
+        不同账号并行发布，同一账号依次发布并按账号限速（见 publish_engine）。
+        每篇内容使用绑定同一引擎的独立短会话，一篇内容的数据库异常不会影响其他并发的发布
+        :param db: 数据库会话（只用于获取引擎）
+        :param items: (账号 ID, 内容 ID) 列表，同一账号内按列表顺序发布
+        """
+        session_factory = sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False)
+        async for (account_id, content_id), result, error in publish_engine.run(
+            items,
+            key=lambda item: item[0],
+            publish=lambda item: BatchPublishService._publish_content(session_factory, *item)
+        ):
+            if error is not None:
+                result = {
+                    "content_id": content_id,
+                    "success": False,
+                    "error": str(error)
+                }
+            yield result
+
+    @staticmethod
+    async def _publish_content(session_factory: sessionmaker, account_id: int, content_id: int) -> dict:
+        """
+        发布单篇内容
+        :param session_factory: 数据库会话工厂（本次发布使用独立会话）
+        :param account_id: 账号 ID
+        :param content_id: 内容 ID
+        :return: 发布结果
+        """
+        db = session_factory()
+        try:
+            # 获取内容信息
+            content = db.query(Content).filter(
+                Content.id == content_id,
+                Content.account_id == account_id
+            ).first()
+
+            if not content:
+                return {
+                    "content_id": content_id,
+                    "success": False,
+                    "error": "内容不存在"
+                }
+
+            # 检查内容状态
+            if content.review_status not in ["approved"]:
+                return {
+                    "content_id": content_id,
+                    "success": False,
+                    "error": f"内容状态不正确：{content.review_status}"
+                }
+
+            # 查找或创建发布日志
+            publish_log = db.query(PublishLog).filter(
+                PublishLog.content_id == content_id
+            ).first()
+
+            if not publish_log:
+                # 创建新发布日志
+                publish_log = PublishLog(
+                    account_id=account_id,
+                    content_id=content_id,
+                    platform="wechat",
+                    status="pending"
+                )
+                db.add(publish_log)
+                db.commit()
+                db.refresh(publish_log)
+
+            # 添加到发布池
+            pool_entry = publish_pool_service.add_to_pool(
+                db,
+                content_id=content_id,
+                priority=5,
+                scheduled_at=datetime.utcnow()
+            )
+
+            # 发布到微信公众号（等待期间其他账号的发布继续进行）
+            publish_result = await async_content_publisher_service.publish_to_wechat(
+                content_id=content_id,
+                account_id=account_id,
+                publish_to_draft=True,
+                db=db
+            )
+
+            # 更新发布日志
+            publish_log.status = "success"
+            publish_log.media_id = publish_result.get("media_id")
+            publish_log.result = str(publish_result)
+            db.commit()
+
+            # 更新发布池状态
+            publish_pool_service.complete_publishing(
+                db,
+                pool_id=pool_entry.id,
+                published_log_id=publish_log.id
+            )
+
+            # 更新内容状态
+            content.publish_status = "published"
+            content.published_at = datetime.utcnow()
+            db.commit()
+
+            return {
+                "content_id": content_id,
+                "success": True,
+                "media_id": publish_result.get("media_id"),
+                "published_at": datetime.utcnow().isoformat()
+            }
+
+        except Exception as e:
+            db.rollback()
+            return {
+                "content_id": content_id,
+                "success": False,
+                "error": str(e)
+            }
+
+        finally:
+            db.close()
+
     @staticmethod
     def get_batch_publish_history(db: Session, account_id: int, limit: int = 100) -> List[dict]:
         """
@@ -181,11 +217,28 @@ class BatchPublishService:
         :param limit: 限制数量
         :return: 历史记录
         """
-        logs = db.query(PublishLog).filter(
-            PublishLog.account_id == account_id
-        ).order_by(PublishLog.created_at.desc()).limit(limit).all()
+        return BatchPublishService.get_batch_publish_history_page(db, account_id, limit=limit)["items"]
+
+    @staticmethod
+    def get_batch_publish_history_page(
+        db: Session,
+        account_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> dict:
+        """
+        按 (created_at, id) 游标分页获取批量发布历史记录
+        :param db: 数据库会话
+        :param account_id: 账号 ID
+        :param cursor: 上一页返回的 next_cursor，为空时从最新记录开始
+        :param limit: 每页数量
+        :return: 包含 items、next_cursor、has_more 的字典
+        """
+        query = db.query(PublishLog).filter(PublishLog.account_id == account_id)
+        logs = apply_keyset(query, PublishLog.created_at, PublishLog.id, cursor, limit).all()
+        page = build_cursor_page(logs, limit)
 
-        return [
+        page["items"] = [
             {
                 "id": log.id,
                 "content_id": log.content_id,
@@ -196,8 +249,9 @@ class BatchPublishService:
                 "created_at": log.created_at.isoformat(),
                 "updated_at": log.updated_at.isoformat()
             }
-            for log in logs
+            for log in page["items"]
         ]
+        return page
 
     @staticmethod
     def get_batch_publish_statistics(db: Session, account_id: int) -> dict:
@@ -1,8 +1,9 @@
 """
 内容发布服务
 负责调用 content-publisher API 发布内容到微信公众号
+所有请求通过 publisher_http_client 的共享连接池发送，连接在请求之间复用
+发布时的图片以流式 multipart 请求体从磁盘分块读取上传，内存占用与图片数量和大小无关
 """
-import requests
 import json
 import time
 import re
@@ -17,6 +18,10 @@ from app.core.exceptions import (
     PublisherUnauthorizedException,
     ServiceUnavailableException
 )
+from app.services.media_cache_service import media_cache_service
+from app.services.monitoring.scheduler_profiler import scheduler_profiler
+from app.services.publisher_http_client import publisher_http_client
+from app.utils.multipart_stream import MultipartStream
 from app.utils.custom_logger import log
 
 
@@ -71,7 +76,8 @@ class ContentPublisherService:
         try:
             log.info(f"Publisher API request: {method} {url}")
 
-            response = requests.request(method, url, **kwargs)
+            with scheduler_profiler.track_api():
+                response = publisher_http_client.request(method, url, **kwargs)
             response.raise_for_status()
 
             # 解析 JSON 响应
@@ -285,25 +291,17 @@ class ContentPublisherService:
         return processed_content, image_paths, cover_upload
 
     @staticmethod
-    def publish_to_wechat(content_id: int, account_id: int, publish_to_draft: bool = True, db=None) -> dict:
+    def _prepare_publish(content_id: int, account_id: int, db=None) -> Dict[str, Any]:
         """
-        发布到微信公众号
+        准备发布数据：查询内容和账号，收集本地图片并构造 markdown
+
+        同步和异步发布共用
 
         :param content_id: 内容 ID
         :param account_id: 账号 ID
-        :param publish_to_draft: 是否发布到草稿箱
         :param db: 数据库会话
-        :return: 发布结果
+        :return: 包含 title、markdown、cover_upload、image_paths、account_id、account 的字典
         """
-        if not settings.PUBLISHER_API_URL:
-            raise PublisherException(
-                message="PUBLISHER_API_URL 未配置",
-                code="PUBLISHER_NOT_CONFIGURED"
-            )
-
-        if not settings.PUBLISHER_API_KEY:
-            raise PublisherUnauthorizedException()
-
         # 从数据库获取内容和账号信息
         if not db:
             from app.db.database import get_db
@@ -388,129 +386,284 @@ class ContentPublisherService:
             front_matter += f"cover: {cover_upload}\n"
         front_matter += "---\n\n"
 
-        markdown = front_matter + processed_content
+        return {
+            "title": content.title,
+            "markdown": front_matter + processed_content,
+            "cover_upload": cover_upload,
+            "image_paths": image_paths,
+            "account_id": account_id,
+            "account": {
+                "appId": account.wechat_app_id,
+                "appSecret": account.wechat_app_secret
+            }
+        }
 
-        # 构造请求
-        # 如果没有本地图片，使用 JSON 格式
-        if not image_paths:
-            log.info("无本地图片，使用 JSON 格式")
+    @staticmethod
+    def _apply_media_cache(prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        用媒体缓存替换已上传过的图片
 
-            data = {
-                "markdown": markdown,
-                "title": content.title,
-                "theme": "default",
-                "highlightTheme": "solarized-light",
-                "useMacStyle": True,
-                "addFootnote": True,
-                "account": {
-                    "appId": account.wechat_app_id,
-                    "appSecret": account.wechat_app_secret
-                }
-            }
+        同一账号已上传过、且未过期的文件不再随请求上传：markdown 和封面中的 uploads:文件名
+        替换为缓存的图片 URL，并从 image_paths 中移除。未命中的文件记录在 pending_media 中，
+        发布成功后据此写入缓存。发布接口按文件名引用图片，不同路径的同名文件无法区分，不使用缓存
 
-            if cover_upload:
-                data["cover"] = cover_upload
+        :param prepared: _prepare_publish 返回的字典（原地修改）
+        :return: prepared
+        """
+        prepared["pending_media"] = {}
+        if not media_cache_service.enabled or not prepared["image_paths"]:
+            return prepared
+
+        paths_by_name: Dict[str, set] = {}
+        for img_path in prepared["image_paths"]:
+            paths_by_name.setdefault(os.path.basename(img_path), set()).add(img_path)
+
+        digests = {}
+        for img_path in prepared["image_paths"]:
+            # 同名冲突的文件照常上传，不引用也不写入缓存
+            if len(paths_by_name[os.path.basename(img_path)]) > 1:
+                continue
+            try:
+                digests[img_path] = (media_cache_service.file_digest(img_path), os.path.getsize(img_path))
+            except OSError:
+                # 不可读的文件交给 _build_multipart_stream 跳过
+                continue
 
-            return ContentPublisherService._make_request(
-                "POST",
-                "/api/publish",
-                json=data,
-                headers={"Content-Type": "application/json"}
+        cached = media_cache_service.lookup_many(
+            prepared["account_id"],
+            [digest for digest, _ in digests.values()]
+        )
+
+        remaining = []
+        for img_path in prepared["image_paths"]:
+            filename = os.path.basename(img_path)
+            digest, size = digests.get(img_path, (None, None))
+            hit = cached.get(digest) if digest else None
+            if not hit:
+                remaining.append(img_path)
+                if digest:
+                    prepared["pending_media"][filename] = (digest, size)
+                continue
+
+            reference = re.compile(rf"uploads:{re.escape(filename)}(?=[)\s]|$)")
+            prepared["markdown"] = reference.sub(lambda _: hit["url"], prepared["markdown"])
+            if prepared["cover_upload"] == f"uploads:{filename}":
+                prepared["cover_upload"] = hit["url"]
+            log.info(f"  = {filename} 已上传过，引用缓存: {hit['url']}")
+
+        if len(remaining) < len(prepared["image_paths"]):
+            log.info(f"媒体缓存命中 {len(prepared['image_paths']) - len(remaining)} 个图片，跳过上传")
+        prepared["image_paths"] = remaining
+        return prepared
+
+    @staticmethod
+    def _remember_uploaded_media(prepared: Dict[str, Any], result: Dict[str, Any]):
+        """
+        发布成功后记录本次上传的图片
+
+        发布接口在 data.images / data.uploads 中返回上传结果（filename + mediaId/url）时写入缓存，
+        未返回时不记录
+
+        :param prepared: 经过 _apply_media_cache 处理的字典
+        :param result: 发布接口返回的 JSON
+        """
+        pending = prepared.get("pending_media")
+        data = result.get("data") if isinstance(result, dict) else None
+        if not pending or not isinstance(data, dict):
+            return
+
+        for item in data.get("images") or data.get("uploads") or []:
+            if not isinstance(item, dict):
+                continue
+            filename = item.get("filename") or item.get("name")
+            if filename not in pending:
+                continue
+            digest, size = pending[filename]
+            media_cache_service.store(
+                prepared["account_id"],
+                digest,
+                filename=filename,
+                file_size=size,
+                **media_cache_service.parse_upload_result(item)
             )
 
-        # 有本地图片，使用 multipart/form-data 格式
-        log.info(f"使用 multipart/form-data 格式，上传 {len(image_paths)} 个图片文件")
+    @staticmethod
+    def _build_json_payload(prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """构造无本地图片时的 JSON 请求体"""
+        data = {
+            "markdown": prepared["markdown"],
+            "title": prepared["title"],
+            "theme": "default",
+            "highlightTheme": "solarized-light",
+            "useMacStyle": True,
+            "addFootnote": True,
+            "account": prepared["account"]
+        }
+
+        if prepared["cover_upload"]:
+            data["cover"] = prepared["cover_upload"]
 
-        # 准备 multipart/form-data
-        files = []  # 使用列表格式支持多个文件
+        return data
+
+    @staticmethod
+    def _build_form_fields(prepared: Dict[str, Any]) -> Dict[str, str]:
+        """构造 multipart/form-data 请求的表单字段"""
         data = {
-            "markdown": markdown,
-            "title": content.title,
+            "markdown": prepared["markdown"],
+            "title": prepared["title"],
             "theme": "default",
             "highlightTheme": "solarized-light",
             "useMacStyle": "true",
             "addFootnote": "true",
-            "account": json.dumps({
-                "appId": account.wechat_app_id,
-                "appSecret": account.wechat_app_secret
-            })
+            "account": json.dumps(prepared["account"])
         }
 
-        if cover_upload:
-            data["cover"] = cover_upload
+        if prepared["cover_upload"]:
+            data["cover"] = prepared["cover_upload"]
+
+        return data
+
+    @staticmethod
+    def _guess_mime_type(filename: str) -> str:
+        """根据扩展名确定图片 MIME 类型"""
+        ext = os.path.splitext(filename)[1].lower()
+        mime_types = {
+            '.jpg': 'image/jpeg',
+            '.jpeg': 'image/jpeg',
+            '.png': 'image/png',
+            '.gif': 'image/gif',
+            '.webp': 'image/webp',
+        }
+        return mime_types.get(ext, 'image/jpeg')
 
-        # 添加图片文件
-        for idx, img_path in enumerate(image_paths):
-            if not os.path.exists(img_path):
-                log.warning(f"跳过不存在的文件: {img_path}")
+    @staticmethod
+    def _build_multipart_stream(prepared: Dict[str, Any]) -> MultipartStream:
+        """
+        构造流式 multipart 请求体：表单字段 + 图片文件
+
+        图片发送时按 PUBLISHER_UPLOAD_CHUNK_SIZE 分块从磁盘读取，不整体读入内存
+        """
+        files = []
+        for img_path in prepared["image_paths"]:
+            if not os.path.isfile(img_path) or not os.access(img_path, os.R_OK):
+                log.warning(f"跳过不存在或不可读的文件: {img_path}")
                 continue
 
             filename = os.path.basename(img_path)
+            mime_type = ContentPublisherService._guess_mime_type(filename)
+            files.append(('files', img_path, filename, mime_type))
+            log.info(f"  + {filename} ({mime_type})")
+
+        return MultipartStream(
+            fields=ContentPublisherService._build_form_fields(prepared),
+            files=files,
+            chunk_size=settings.PUBLISHER_UPLOAD_CHUNK_SIZE
+        )
 
-            # 确定 MIME 类型
-            ext = os.path.splitext(filename)[1].lower()
-            mime_types = {
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.png': 'image/png',
-                '.gif': 'image/gif',
-                '.webp': 'image/webp',
-            }
-            mime_type = mime_types.get(ext, 'image/jpeg')
+    @staticmethod
+    def _check_publish_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        检查发布接口的业务状态
 
-            try:
-                with open(img_path, 'rb') as f:
-                    file_content = f.read()
-                    files.append(('files', (filename, file_content, mime_type)))
-                    log.info(f"  + {filename} ({mime_type})")
-            except Exception as e:
-                log.error(f"读取图片失败 {filename}: {e}")
-                continue
+        :param result: 发布接口返回的 JSON
+        :return: 原样返回
+        :raises: PublisherException 业务失败时
+        """
+        if not result.get('success'):
+            error_msg = result.get('message', '发布失败')
+            log.error(f"Publisher API 业务错误: {error_msg}")
+            raise PublisherException(
+                message=error_msg,
+                details={"response": result},
+                code="PUBLISHER_BUSINESS_ERROR"
+            )
+
+        # 提取 media_id（适配两种格式）
+        media_id = None
+        if 'data' in result:
+            media_id = result['data'].get('mediaId') or result['data'].get('media_id')
+        else:
+            media_id = result.get('mediaId') or result.get('media_id')
+
+        log.info(f"发布成功: media_id={media_id}")
+        return result
+
+    @staticmethod
+    def publish_to_wechat(content_id: int, account_id: int, publish_to_draft: bool = True, db=None) -> dict:
+        """
+        发布到微信公众号
+
+        :param content_id: 内容 ID
+        :param account_id: 账号 ID
+        :param publish_to_draft: 是否发布到草稿箱
+        :param db: 数据库会话
+        :return: 发布结果
+        """
+        if not settings.PUBLISHER_API_URL:
+            raise PublisherException(
+                message="PUBLISHER_API_URL 未配置",
+                code="PUBLISHER_NOT_CONFIGURED"
+            )
+
+        if not settings.PUBLISHER_API_KEY:
+            raise PublisherUnauthorizedException()
+
+        prepared = ContentPublisherService._prepare_publish(content_id, account_id, db)
+        ContentPublisherService._apply_media_cache(prepared)
+        image_paths = prepared["image_paths"]
+        cover_upload = prepared["cover_upload"]
+
+        # 构造请求
+        # 如果没有本地图片，使用 JSON 格式
+        if not image_paths:
+            log.info("无本地图片，使用 JSON 格式")
+
+            return ContentPublisherService._make_request(
+                "POST",
+                "/api/publish",
+                json=ContentPublisherService._build_json_payload(prepared),
+                headers={"Content-Type": "application/json"}
+            )
+
+        # 有本地图片，使用 multipart/form-data 格式
+        log.info(f"使用 multipart/form-data 格式，上传 {len(image_paths)} 个图片文件")
+
+        # 准备 multipart/form-data（图片从磁盘流式读取）
+        try:
+            body = ContentPublisherService._build_multipart_stream(prepared)
+        except OSError as e:
+            raise PublisherException(
+                message=f"无法读取图片文件: {str(e)}",
+                details={"error_type": type(e).__name__},
+                code="PUBLISHER_FILE_READ_ERROR"
+            )
 
         url = f"{settings.PUBLISHER_API_URL}/api/publish"
         headers = {
-            'Authorization': f"Bearer {settings.PUBLISHER_API_KEY}"
+            'Authorization': f"Bearer {settings.PUBLISHER_API_KEY}",
+            **body.headers
         }
 
         try:
             log.info(f"Publisher API request: POST {url}")
-            log.info(f"  - 标题: {content.title}")
+            log.info(f"  - 标题: {prepared['title']}")
             log.info(f"  - 图片数量: {len(image_paths)}")
             log.info(f"  - 封面: {cover_upload or '(无)'}")
+            log.info(f"  - 请求体大小: {len(body)} 字节")
 
-            response = requests.post(
-                url,
-                data=data,
-                files=files,
-                headers=headers,
-                timeout=ContentPublisherService.UPLOAD_TIMEOUT
-            )
+            with scheduler_profiler.track_api():
+                response = publisher_http_client.post(
+                    url,
+                    data=body,
+                    headers=headers,
+                    timeout=ContentPublisherService.UPLOAD_TIMEOUT
+                )
 
             response.raise_for_status()
 
             # 解析 JSON 响应
             try:
                 result = response.json()
-
-                # 检查业务状态
-                if not result.get('success'):
-                    error_msg = result.get('message', '发布失败')
-                    log.error(f"Publisher API 业务错误: {error_msg}")
-                    raise PublisherException(
-                        message=error_msg,
-                        details={"response": result},
-                        code="PUBLISHER_BUSINESS_ERROR"
-                    )
-
-                # 提取 media_id（适配两种格式）
-                media_id = None
-                if 'data' in result:
-                    media_id = result['data'].get('mediaId') or result['data'].get('media_id')
-                else:
-                    media_id = result.get('mediaId') or result.get('media_id')
-
-                log.info(f"发布成功: media_id={media_id}")
-                return result
             except json.JSONDecodeError as e:
                 log.error(f"Failed to parse Publisher API response: {e}")
                 raise PublisherException(
@@ -522,6 +675,11 @@ class ContentPublisherService:
                     code="PUBLISHER_INVALID_RESPONSE"
                 )
 
+            # 检查业务状态
+            ContentPublisherService._check_publish_result(result)
+            ContentPublisherService._remember_uploaded_media(prepared, result)
+            return result
+
         except Exception as e:
             log.exception(f"Publisher API request failed: {str(e)}")
             raise PublisherException(
@@ -559,6 +717,8 @@ class ContentPublisherService:
         """
         上传媒体文件到微信
 
+        同一文件已上传到该账号且未过期时直接返回缓存的 media_id / URL（cached 为 True），不重复上传
+
         :param image_path: 图片路径
         :param account_id: 账号 ID
         :return: 媒体信息
@@ -574,10 +734,23 @@ class ContentPublisherService:
 
         try:
             with open(image_path, "rb") as f:
+                digest = None
+                if media_cache_service.enabled:
+                    digest, file_size = media_cache_service.hash_stream(f)
+                    cached = media_cache_service.lookup(account_id, digest, require="media_id")
+                    if cached:
+                        log.info(f"媒体已上传过，引用缓存: {image_path} -> {cached['media_id'] or cached['url']}")
+                        return {
+                            "success": True,
+                            "cached": True,
+                            "data": {"media_id": cached["media_id"], "url": cached["url"]}
+                        }
+                    f.seek(0)
+
                 files = {"media": f}
                 data = {"account_id": account_id}
 
-                return ContentPublisherService._make_request(
+                result = ContentPublisherService._make_request(
                     "POST",
                     "/api/upload-media",
                     files=files,
@@ -585,6 +758,16 @@ class ContentPublisherService:
                     timeout=ContentPublisherService.UPLOAD_TIMEOUT
                 )
 
+            if digest and result.get("success") and isinstance(result.get("data"), dict):
+                media_cache_service.store(
+                    account_id,
+                    digest,
+                    filename=os.path.basename(image_path),
+                    file_size=file_size,
+                    **media_cache_service.parse_upload_result(result["data"])
+                )
+            return result
+
         except FileNotFoundError:
             raise PublisherException(
                 message=f"文件不存在: {image_path}",
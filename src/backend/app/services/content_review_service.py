@@ -6,8 +6,17 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from app.db.database import get_db
+from app.db.projections import projection, register_projection
 from app.models.content import Content
 
+# 待审核列表只展示摘要信息，另需 account_id 以加载关联账号
+register_projection(
+    "content_review_list",
+    Content,
+    columns=("id", "account_id", "title", "category", "publish_status",
+             "review_status", "word_count", "created_at", "updated_at"),
+)
+
 
 class ContentReviewService:
     """内容审核服务"""
@@ -20,7 +29,7 @@ class ContentReviewService:
     @staticmethod
     def get_pending_reviews(db: Session) -> List[Content]:
         """获取待审核内容列表"""
-        return db.query(Content).filter(
+        return db.query(Content).options(projection("content_review_list")).filter(
             Content.review_status == "pending"
         ).order_by(Content.created_at.desc()).all()
 
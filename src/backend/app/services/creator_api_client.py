@@ -13,6 +13,7 @@ from app.core.exceptions import (
     CreatorInvalidResponseException,
     CreatorException,
 )
+from app.services.monitoring.scheduler_profiler import timed_api
 from app.utils.custom_logger import log
 
 
@@ -148,6 +149,7 @@ class CreatorApiClient:
 
     # ==================== 同步 API ====================
 
+    @timed_api
     def create_task_sync(
         self,
         topic: str,
@@ -222,6 +224,7 @@ class CreatorApiClient:
             log.exception(f"Unexpected error in create_task_sync: {str(e)}")
             raise CreatorException(message=f"创建任务时发生意外错误: {str(e)}")
 
+    @timed_api
     def create_task_async(
         self,
         topic: str,
@@ -303,6 +306,7 @@ class CreatorApiClient:
             log.exception(f"Unexpected error in create_task_async: {str(e)}")
             raise CreatorException(message=f"创建异步任务时发生意外错误: {str(e)}")
 
+    @timed_api
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """
         查询任务状态
@@ -326,6 +330,7 @@ class CreatorApiClient:
             log.error(f"Failed to get task status: {str(e)}")
             raise CreatorException(message=f"查询任务状态失败: {str(e)}")
 
+    @timed_api
     def get_task_result(self, task_id: str) -> Dict[str, Any]:
         """
         获取任务结果
@@ -366,6 +371,7 @@ class CreatorApiClient:
             log.error(f"Failed to get task result: {str(e)}")
             raise CreatorException(message=f"获取任务结果失败: {str(e)}")
 
+    @timed_api
     def cancel_task(self, task_id: str) -> Dict[str, Any]:
         """
         取消任务
@@ -389,6 +395,7 @@ class CreatorApiClient:
             log.error(f"Failed to cancel task: {str(e)}")
             raise CreatorException(message=f"取消任务失败: {str(e)}")
 
+    @timed_api
     def retry_task(self, task_id: str) -> Dict[str, Any]:
         """
         重试失败的任务
@@ -412,6 +419,7 @@ class CreatorApiClient:
             log.error(f"Failed to retry task: {str(e)}")
             raise CreatorException(message=f"重试任务失败: {str(e)}")
 
+    @timed_api
     def list_tasks(
         self,
         status: Optional[str] = None,
@@ -448,6 +456,7 @@ class CreatorApiClient:
 
     # ==================== 异步 API ====================
 
+    @timed_api
     async def create_task_async_async(
         self,
         topic: str,
@@ -525,6 +534,7 @@ class CreatorApiClient:
             log.exception(f"Unexpected error in create_task_async_async: {str(e)}")
             raise CreatorException(message=f"创建异步任务时发生意外错误: {str(e)}")
 
+    @timed_api
     async def get_task_status_async(self, task_id: str) -> Dict[str, Any]:
         """
         异步查询任务状态
@@ -548,6 +558,7 @@ class CreatorApiClient:
             log.error(f"Failed to get task status: {str(e)}")
             raise CreatorException(message=f"查询任务状态失败: {str(e)}")
 
+    @timed_api
     async def get_task_result_async(self, task_id: str) -> Dict[str, Any]:
         """
         异步获取任务结果
@@ -0,0 +1,393 @@
+"""
+任务执行历史服务
+
+1. ExecutionHistoryWriter：缓冲定时任务的执行记录，按条数或时间间隔批量写入
+   task_executions，插入记录和更新任务 last_run_time 在同一个事务中完成。
+   运行中的记录只保存在内存中，不再为每次运行单独插入再更新。
+2. summarize_result：执行结果 JSON 过大时只保存摘要（标量字段、列表长度）。
+3. ExecutionHistoryService.compact：超过保留天数的执行明细压缩为按小时
+   汇总的计数（task_execution_hourly_stats）后删除。
+"""
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, case, delete, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.types import timestamp_literal
+from app.db.upsert import upsert
+from app.models.scheduler import ScheduledTask, TaskExecution, TaskExecutionHourlyStat
+from app.utils.custom_logger import log
+
+# 摘要中字符串字段保留的长度
+_PREVIEW_CHARS = 200
+# 写入失败时缓冲区最多保留的批次数，超出后丢弃最早的记录
+_MAX_BUFFERED_BATCHES = 20
+
+
+def _truncate(value: Optional[str], max_chars: int) -> Optional[str]:
+    if value is None or len(value) <= max_chars:
+        return value
+    return f"{value[:max_chars]}...(已截断，原长度 {len(value)})"
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def _summarize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return _truncate(value, _PREVIEW_CHARS)
+    if isinstance(value, (list, tuple)):
+        return {"count": len(value)}
+    if isinstance(value, dict):
+        return {"count": len(value), "keys": sorted(str(key) for key in value)[:20]}
+    return value
+
+
+def summarize_result(result: Optional[Dict[str, Any]], max_chars: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    生成用于保存的执行结果
+
+    结果 JSON 不超过 max_chars 时原样返回；否则只保留顶层和 data 中的标量字段，
+    字符串截断、列表和字典替换为长度，并标记 truncated=True。
+
+    Args:
+        result: TaskExecutionResult.to_dict() 的结果
+        max_chars: JSON 长度上限，默认 SCHEDULER_HISTORY_RESULT_MAX_CHARS
+
+    Returns:
+        原结果或摘要
+    """
+    if result is None:
+        return None
+
+    max_chars = max_chars or settings.SCHEDULER_HISTORY_RESULT_MAX_CHARS
+    if _json_size(result) <= max_chars:
+        return result
+
+    summary = {key: _summarize_value(value) for key, value in result.items() if key != "data"}
+    data = result.get("data")
+    if isinstance(data, dict):
+        summary["data"] = {key: _summarize_value(value) for key, value in data.items()}
+    else:
+        summary["data"] = _summarize_value(data)
+    summary["truncated"] = True
+
+    # 字段过多时只保留 data 的字段名
+    if _json_size(summary) > max_chars:
+        summary["data"] = _summarize_value(data)
+    return summary
+
+
+@dataclass
+class ExecutionRun:
+    """运行中的执行记录（仅保存在内存中）"""
+    run_id: int
+    task_id: int
+    task_type: str
+    start_time: datetime = field(default_factory=datetime.now)
+
+
+def _default_session_factory() -> Session:
+    # 运行时导入，测试中可替换 app.db.database.SessionLocal
+    from app.db.database import SessionLocal
+    return SessionLocal()
+
+
+class ExecutionHistoryWriter:
+    """
+    执行记录批量写入器
+
+    finish() 只把记录放入缓冲区，后台线程每隔 flush_interval 秒或缓冲达到
+    batch_size 条时批量写入。写入失败的记录放回缓冲区，下次写入时重试。
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        self._session_factory = session_factory or _default_session_factory
+        self.batch_size = batch_size or settings.SCHEDULER_HISTORY_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.SCHEDULER_HISTORY_FLUSH_INTERVAL
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._running: Dict[int, ExecutionRun] = {}
+        self._run_ids = count(1)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """后台写入线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending_count(self) -> int:
+        """等待写入的记录数"""
+        with self._lock:
+            return len(self._buffer)
+
+    def get_running(self) -> List[ExecutionRun]:
+        """获取运行中的执行记录"""
+        with self._lock:
+            return list(self._running.values())
+
+    # ==================== 记录执行 ====================
+
+    def begin(self, task_id: int, task_type: str) -> ExecutionRun:
+        """登记一次开始运行的执行"""
+        run = ExecutionRun(run_id=next(self._run_ids), task_id=task_id, task_type=task_type)
+        with self._lock:
+            self._running[run.run_id] = run
+        return run
+
+    def finish(
+        self,
+        run: ExecutionRun,
+        status: str,
+        error_message: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        记录执行结束，放入缓冲区等待批量写入
+
+        Args:
+            run: begin() 返回的执行记录
+            status: success/failed
+            error_message: 错误信息
+            result: 执行结果（过大时只保存摘要）
+        """
+        end_time = datetime.now()
+        row = {
+            "task_id": run.task_id,
+            "status": status,
+            "start_time": run.start_time,
+            "end_time": end_time,
+            "duration": int((end_time - run.start_time).total_seconds()),
+            "error_message": _truncate(error_message, settings.SCHEDULER_HISTORY_RESULT_MAX_CHARS),
+            "result": summarize_result(result),
+        }
+
+        with self._lock:
+            self._running.pop(run.run_id, None)
+            self._buffer.append(row)
+            buffer_full = len(self._buffer) >= self.batch_size
+
+        if buffer_full:
+            if self.is_running:
+                self._wakeup.set()
+            else:
+                self.flush()
+
+    def discard(self, run: ExecutionRun) -> None:
+        """丢弃运行中的执行记录，不写入执行历史（例如运行期间运行锁被其他副本接管）"""
+        with self._lock:
+            self._running.pop(run.run_id, None)
+
+    # ==================== 批量写入 ====================
+
+    def flush(self) -> int:
+        """
+        将缓冲区中的记录批量写入数据库
+
+        Returns:
+            写入的记录数
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            # 每个任务取最近一次成功的结束时间
+            last_runs: Dict[int, datetime] = {}
+            for row in rows:
+                if row["status"] == "success":
+                    last_runs[row["task_id"]] = max(row["end_time"], last_runs.get(row["task_id"], row["end_time"]))
+
+            db = self._session_factory()
+            try:
+                db.execute(insert(TaskExecution), rows)
+                if last_runs:
+                    table = ScheduledTask.__table__
+                    db.execute(
+                        update(table)
+                        .where(table.c.id == bindparam("task_key"))
+                        # 运行状态不属于任务配置变更，保持 updated_at 不变
+                        .values(last_run_time=bindparam("run_time"), updated_at=table.c.updated_at),
+                        [{"task_key": task_id, "run_time": run_time} for task_id, run_time in last_runs.items()]
+                    )
+                db.commit()
+                log.debug(f"批量写入执行记录: {len(rows)} 条")
+                return len(rows)
+
+            except Exception as e:
+                db.rollback()
+                log.error(f"批量写入执行记录失败，稍后重试: {str(e)}")
+                with self._lock:
+                    self._buffer[:0] = rows
+                    overflow = len(self._buffer) - self.batch_size * _MAX_BUFFERED_BATCHES
+                    if overflow > 0:
+                        del self._buffer[:overflow]
+                        log.warning(f"执行记录缓冲区已满，丢弃最早的 {overflow} 条记录")
+                return 0
+
+            finally:
+                db.close()
+
+    def start(self) -> None:
+        """启动后台写入线程"""
+        if self.is_running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="execution-history-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """停止后台写入线程并写入剩余记录"""
+        if self.is_running:
+            self._stopping.set()
+            self._wakeup.set()
+            self._thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                log.error(f"执行记录写入线程异常: {str(e)}")
+
+
+# ==================== 保留与压缩 ====================
+
+class ExecutionHistoryService:
+    """执行历史保留服务"""
+
+    @staticmethod
+    def compact(
+        db: Session,
+        retention_days: Optional[int] = None,
+        chunk_size: int = 5000,
+        vacuum: bool = False
+    ) -> Dict[str, int]:
+        """
+        将超过保留天数的执行明细压缩为小时汇总并删除
+
+        按主键分批处理，每批的汇总累加和明细删除在同一事务中提交，
+        中途失败不会重复计数。
+
+        Args:
+            db: 数据库会话
+            retention_days: 明细保留天数，默认 SCHEDULER_HISTORY_RETENTION_DAYS
+            chunk_size: 每批处理的明细条数
+            vacuum: 压缩后是否对 SQLite 执行 VACUUM 回收文件空间
+
+        Returns:
+            {"compacted": 压缩的明细条数, "hours": 涉及的小时汇总行数}
+        """
+        retention_days = retention_days or settings.SCHEDULER_HISTORY_RETENTION_DAYS
+        cutoff = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=retention_days)
+
+        compacted = 0
+        hours = set()
+        while True:
+            rows = db.execute(
+                select(
+                    TaskExecution.id, TaskExecution.task_id, TaskExecution.status,
+                    TaskExecution.start_time, TaskExecution.duration
+                )
+                .where(TaskExecution.start_time < timestamp_literal(cutoff))
+                .order_by(TaskExecution.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            buckets: Dict[tuple, Dict[str, int]] = {}
+            for row in rows:
+                key = (row.task_id, row.start_time.replace(minute=0, second=0, microsecond=0, tzinfo=None))
+                bucket = buckets.setdefault(key, {
+                    "total_count": 0, "success_count": 0, "failed_count": 0,
+                    "total_duration": 0, "max_duration": 0,
+                })
+                duration = row.duration or 0
+                bucket["total_count"] += 1
+                bucket["success_count"] += row.status == "success"
+                bucket["failed_count"] += row.status == "failed"
+                bucket["total_duration"] += duration
+                bucket["max_duration"] = max(bucket["max_duration"], duration)
+
+            ExecutionHistoryService._merge_hourly(db, buckets)
+            db.execute(delete(TaskExecution).where(TaskExecution.id.in_([row.id for row in rows])))
+            db.commit()
+
+            compacted += len(rows)
+            hours.update(buckets)
+
+        if compacted:
+            log.info(f"执行历史压缩完成: 压缩 {compacted} 条明细, 涉及 {len(hours)} 个小时汇总")
+            if vacuum:
+                ExecutionHistoryService._vacuum(db)
+
+        return {"compacted": compacted, "hours": len(hours)}
+
+    @staticmethod
+    def _merge_hourly(db: Session, buckets: Dict[tuple, Dict[str, int]]) -> None:
+        """将计数累加到小时汇总行，行不存在时插入（INSERT ... ON CONFLICT，与 daily_stats 相同）"""
+        table = TaskExecutionHourlyStat.__table__
+        connection = db.connection()
+        for (task_id, hour), counters in buckets.items():
+            upsert(connection, table, {"task_id": task_id, "hour": hour}, counters, lambda new: {
+                "total_count": table.c.total_count + new["total_count"],
+                "success_count": table.c.success_count + new["success_count"],
+                "failed_count": table.c.failed_count + new["failed_count"],
+                "total_duration": table.c.total_duration + new["total_duration"],
+                "max_duration": case(
+                    (table.c.max_duration < new["max_duration"], new["max_duration"]),
+                    else_=table.c.max_duration
+                ),
+            })
+
+    @staticmethod
+    def _vacuum(db: Session) -> None:
+        bind = db.get_bind()
+        if bind.dialect.name != "sqlite":
+            return
+        # VACUUM 不能在事务中执行
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM"))
+        log.info("SQLite 数据库已 VACUUM")
+
+    @staticmethod
+    def get_hourly_stats(db: Session, task_id: Optional[int] = None, limit: int = 48) -> List[TaskExecutionHourlyStat]:
+        """
+        获取小时汇总（按时间倒序）
+
+        Args:
+            db: 数据库会话
+            task_id: 任务ID，为空时返回所有任务
+            limit: 返回条数
+        """
+        query = db.query(TaskExecutionHourlyStat)
+        if task_id is not None:
+            query = query.filter(TaskExecutionHourlyStat.task_id == task_id)
+        return query.order_by(TaskExecutionHourlyStat.hour.desc()).limit(limit).all()
+
+
+# 全局服务实例
+execution_history_service = ExecutionHistoryService()
@@ -10,6 +10,8 @@ from app.services.executors.add_to_pool_executor import AddToPoolExecutor
 from app.services.executors.approve_executor import ApproveExecutor
 from app.services.executors.async_content_generation_executor import AsyncContentGenerationExecutor
 from app.services.executors.publish_pool_scanner_executor import PublishPoolScannerExecutor
+from app.services.executors.stats_rollup_executor import StatsRollupExecutor
+from app.services.executors.execution_history_compaction_executor import ExecutionHistoryCompactionExecutor
 
 __all__ = [
     "ContentGenerationExecutor",
@@ -19,4 +21,6 @@ __all__ = [
     "ApproveExecutor",
     "AsyncContentGenerationExecutor",
     "PublishPoolScannerExecutor",
+    "StatsRollupExecutor",
+    "ExecutionHistoryCompactionExecutor",
 ]
@@ -27,6 +27,9 @@ class ApproveExecutor(TaskExecutor):
     }
     """
 
+    # execute 全部是同步的数据库操作，在本类型的工作线程中执行，不占用共享事件循环
+    blocking = True
+
     @property
     def executor_type(self) -> str:
         """返回执行器类型标识"""
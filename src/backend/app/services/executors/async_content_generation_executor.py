@@ -3,12 +3,14 @@
 
 负责批量提交异步内容生成任务到调度系统
 """
+import asyncio
 import time
 from typing import Dict, Any, List
 from sqlalchemy.orm import Session
 
 from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
 from app.services.async_content_generation_service import AsyncContentGenerationService
+from app.services.job_lock_service import JobLeaseLostError, ensure_lease_current
 from app.models.account import Account
 from app.utils.custom_logger import log
 
@@ -24,6 +26,9 @@ class AsyncContentGenerationExecutor(TaskExecutor):
     4. 返回提交结果统计
     """
 
+    # 内容生成耗时较长，限制同时运行数，避免占满工作线程和外部 API 配额
+    max_workers = 2
+
     @property
     def executor_type(self) -> str:
         """返回执行器类型标识"""
@@ -144,8 +149,10 @@ class AsyncContentGenerationExecutor(TaskExecutor):
             # 4. 为每个账号生成任务
             for account_id in account_ids:
                 try:
-                    # 获取账号配置
-                    account = db.query(Account).filter_by(id=account_id).first()
+                    # 获取账号配置（同步的数据库查询和任务提交都放到线程中执行，不阻塞调度器共享的事件循环）
+                    account = await asyncio.to_thread(
+                        lambda: db.query(Account).filter_by(id=account_id).first()
+                    )
                     if not account:
                         error_msg = f"账号 {account_id} 不存在"
                         results['errors'].append(error_msg)
@@ -170,8 +177,11 @@ class AsyncContentGenerationExecutor(TaskExecutor):
                     account_failed_count = 0
 
                     for idx, topic_data in enumerate(topics, 1):
+                        # 运行锁已被其他副本接管时停止提交，避免重复生成
+                        await asyncio.to_thread(ensure_lease_current)
                         try:
-                            submitted_task_id = async_service.submit_task(
+                            submitted_task_id = await asyncio.to_thread(
+                                async_service.submit_task,
                                 account_id=account_id,
                                 topic=topic_data['topic'],
                                 keywords=topic_data.get('keywords'),
@@ -212,6 +222,8 @@ class AsyncContentGenerationExecutor(TaskExecutor):
                         'total': account_success_count + account_failed_count
                     }
 
+                except JobLeaseLostError:
+                    raise
                 except Exception as e:
                     error_msg = f"Error processing account {account_id}: {str(e)}"
                     results['errors'].append(error_msg)
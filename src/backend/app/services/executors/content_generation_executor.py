@@ -3,12 +3,14 @@
 
 负责执行内容生成任务，调用 content-creator CLI 生成内容并保存到数据库
 """
+import asyncio
 import time
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 
 from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
 from app.services.content_creator_service import content_creator_service
+from app.services.job_lock_service import ensure_lease_current
 from app.models.content import Content
 from app.utils.custom_logger import log
 
@@ -24,6 +26,9 @@ class ContentGenerationExecutor(TaskExecutor):
     4. 更新任务执行记录
     """
 
+    # 内容生成耗时较长，限制同时运行数，避免占满工作线程和外部 API 配额
+    max_workers = 2
+
     @property
     def executor_type(self) -> str:
         """返回执行器类型标识"""
@@ -105,11 +110,15 @@ class ContentGenerationExecutor(TaskExecutor):
 
             log.info(f"Task params: account_id={account_id}, topic={topic}, tone={tone}")
 
-            # 2. 调用 content-creator CLI 生成内容
+            # 2. 调用 content-creator CLI 生成内容（运行锁已被其他副本接管时不再生成）
+            await asyncio.to_thread(ensure_lease_current)
             log.info(f"Calling content-creator CLI for topic: {topic}")
 
             try:
-                creator_result = content_creator_service.create_content(
+                # 同步 HTTP 调用放到线程中执行，不阻塞调度器的事件循环，
+                # 工作流中并发的多个生成步骤可以同时进行
+                creator_result = await asyncio.to_thread(
+                    content_creator_service.create_content,
                     topic=topic,
                     requirements=requirements,
                     target_audience=target_audience,
@@ -131,7 +140,8 @@ class ContentGenerationExecutor(TaskExecutor):
                     duration=duration
                 )
 
-            # 3. 保存生成的内容到数据库
+            # 3. 保存生成的内容到数据库（生成期间运行锁被接管时不保存）
+            await asyncio.to_thread(ensure_lease_current)
             try:
                 # 提取生成的内容
                 generated_content = creator_result.get("content", "")
@@ -0,0 +1,101 @@
+"""
+执行历史压缩执行器
+负责定期将过期的任务执行明细压缩为小时汇总
+"""
+import asyncio
+import time
+from typing import Dict, Any
+from sqlalchemy.orm import Session
+
+from app.services.execution_history_service import execution_history_service
+from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
+from app.utils.custom_logger import log
+
+
+class ExecutionHistoryCompactionExecutor(TaskExecutor):
+    """
+    执行历史压缩执行器
+
+    超过保留天数的 task_executions 明细按任务和小时汇总到
+    task_execution_hourly_stats 后删除，控制执行历史表和 SQLite 文件的大小。
+
+    示例参数：
+    {
+        "retention_days": 7,   # 明细保留天数（默认 SCHEDULER_HISTORY_RETENTION_DAYS）
+        "vacuum": false        # 压缩后是否对 SQLite 执行 VACUUM
+    }
+    """
+
+    @property
+    def executor_type(self) -> str:
+        """执行器类型"""
+        return "execution_history_compaction"
+
+    def validate_params(self, task_params: Dict[str, Any]) -> bool:
+        """
+        验证任务参数
+
+        可选参数:
+            - retention_days: 明细保留天数（正整数）
+            - vacuum: 是否执行 VACUUM（布尔值）
+        """
+        retention_days = task_params.get("retention_days")
+        if retention_days is not None and (not isinstance(retention_days, int) or retention_days <= 0):
+            log.error(f"Invalid retention_days: {retention_days}")
+            return False
+
+        vacuum = task_params.get("vacuum", False)
+        if not isinstance(vacuum, bool):
+            log.error(f"Invalid vacuum: {vacuum}")
+            return False
+
+        return True
+
+    async def execute(
+        self,
+        task_id: int,
+        task_params: Dict[str, Any],
+        db: Session
+    ) -> TaskExecutionResult:
+        """
+        执行历史压缩
+
+        Args:
+            task_id: 任务ID
+            task_params: 任务参数
+            db: 数据库会话
+
+        Returns:
+            TaskExecutionResult: 执行结果
+        """
+        start_time = time.time()
+        retention_days = task_params.get("retention_days")
+        vacuum = task_params.get("vacuum", False)
+
+        log.info(f"开始压缩执行历史: task_id={task_id}, retention_days={retention_days}")
+
+        try:
+            # 压缩和 VACUUM 是同步的批量 SQL，放到线程中执行，不阻塞调度器共享的事件循环
+            stats = await asyncio.to_thread(
+                execution_history_service.compact, db, retention_days, vacuum=vacuum
+            )
+
+            duration = time.time() - start_time
+            return TaskExecutionResult.success_result(
+                message=f"执行历史压缩完成: 压缩 {stats['compacted']} 条明细",
+                data={
+                    "retention_days": retention_days,
+                    **stats
+                },
+                duration=duration
+            )
+
+        except Exception as e:
+            db.rollback()
+            error_msg = f"执行历史压缩失败: {str(e)}"
+            log.error(error_msg, exc_info=True)
+            return TaskExecutionResult.failure_result(
+                message=error_msg,
+                error=str(e),
+                duration=time.time() - start_time
+            )
@@ -7,6 +7,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
+from app.services.job_lock_service import JobLeaseLostError
+from app.services.publish_engine import publish_engine
 from app.services.publish_pool_service import publish_pool_service
 from app.services.executors.publishing_executor import PublishingExecutor
 from app.models.publisher import PublishPool
@@ -20,7 +22,7 @@ class PublishPoolScannerExecutor(TaskExecutor):
     功能：
     1. 扫描发布池中待发布的内容
     2. 按优先级和计划时间排序
-    3. 批量触发发布任务
+    3. 通过并发发布引擎批量发布（全局并发上限、同一账号同时只发布一篇、按账号限速）
     """
 
     @property
@@ -78,71 +80,42 @@ class PublishPoolScannerExecutor(TaskExecutor):
 
             log.info(f"找到 {len(pending_tasks)} 个待发布任务")
 
-            # 2. 批量发布
+            # 2. 跳过已达到最大重试次数的任务
             publishing_executor = PublishingExecutor()
             published_count = 0
             failed_count = 0
             results = []
+            publishable = []
 
             for pool_entry in pending_tasks:
-                try:
-                    # 检查重试次数
-                    if pool_entry.retry_count >= pool_entry.max_retries:
-                        log.warning(
-                            f"任务 {pool_entry.id} 已达到最大重试次数 "
-                            f"({pool_entry.retry_count}/{pool_entry.max_retries})，跳过"
-                        )
-                        failed_count += 1
-                        results.append({
-                            "pool_id": pool_entry.id,
-                            "content_id": pool_entry.content_id,
-                            "success": False,
-                            "error": "超过最大重试次数"
-                        })
-                        continue
-
-                    # 调用发布执行器
-                    log.info(f"正在发布: pool_id={pool_entry.id}, content_id={pool_entry.content_id}")
-
-                    # 构造发布参数
-                    publish_params = {
-                        "content_id": pool_entry.content_id,
-                        "pool_id": pool_entry.id
-                    }
-
-                    # 执行发布
-                    result = await publishing_executor.execute(
-                        task_id,
-                        publish_params,
-                        db
+                if pool_entry.retry_count >= pool_entry.max_retries:
+                    log.warning(
+                        f"任务 {pool_entry.id} 已达到最大重试次数 "
+                        f"({pool_entry.retry_count}/{pool_entry.max_retries})，跳过"
                     )
-
-                    if result.success:
-                        published_count += 1
-                        results.append({
-                            "pool_id": pool_entry.id,
-                            "content_id": pool_entry.content_id,
-                            "success": True,
-                            "message": result.message
-                        })
-                    else:
-                        failed_count += 1
-                        # 更新重试次数
-                        pool_entry.retry_count += 1
-                        pool_entry.last_error = result.message
-                        db.commit()
-
-                        results.append({
-                            "pool_id": pool_entry.id,
-                            "content_id": pool_entry.content_id,
-                            "success": False,
-                            "error": result.message
-                        })
-
-                except Exception as e:
                     failed_count += 1
-                    error_msg = f"发布任务执行异常: {str(e)}"
-                    log.error(f"{error_msg}", exc_info=True)
+                    results.append({
+                        "pool_id": pool_entry.id,
+                        "content_id": pool_entry.content_id,
+                        "success": False,
+                        "error": "超过最大重试次数"
+                    })
+                    continue
+                publishable.append(pool_entry)
+
+            # 3. 并发发布：不同账号并行，同一账号依次发布并限速，每完成一个立即记录结果
+            async for pool_entry, entry_result, error in publish_engine.run(
+                publishable,
+                key=PublishingExecutor.account_key,
+                publish=lambda entry: publishing_executor.publish_entry(db, entry)
+            ):
+                if isinstance(error, JobLeaseLostError):
+                    # 运行锁已被其他副本接管，停止发布剩余条目，不更新发布池
+                    raise error
+                if error is not None:
+                    failed_count += 1
+                    error_msg = f"发布任务执行异常: {str(error)}"
+                    log.error(error_msg)
 
                     # 更新任务状态
                     try:
@@ -156,10 +129,28 @@ class PublishPoolScannerExecutor(TaskExecutor):
                         "pool_id": pool_entry.id,
                         "content_id": pool_entry.content_id,
                         "success": False,
-                        "error": str(e)
+                        "error": str(error)
+                    })
+                elif entry_result["status"] == "published":
+                    published_count += 1
+                    results.append({
+                        "pool_id": pool_entry.id,
+                        "content_id": pool_entry.content_id,
+                        "success": True,
+                        "log_id": entry_result.get("log_id"),
+                        "media_id": entry_result.get("media_id")
+                    })
+                else:
+                    # 失败计数和重试已由 publish_entry 更新到发布池
+                    failed_count += 1
+                    results.append({
+                        "pool_id": pool_entry.id,
+                        "content_id": pool_entry.content_id,
+                        "success": False,
+                        "error": entry_result.get("error")
                     })
 
-            # 3. 返回执行结果
+            # 4. 返回执行结果
             total_count = len(pending_tasks)
             message = (
                 f"发布池扫描完成: 扫描 {total_count} 个任务, "
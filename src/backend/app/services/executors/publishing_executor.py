@@ -3,11 +3,14 @@
 
 负责批量检查发布池并发布到期内容
 """
+import asyncio
 import time
 from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
+from app.services.job_lock_service import JobLeaseLostError, ensure_lease_current
+from app.services.publish_engine import publish_engine
 from app.services.publish_pool_service import publish_pool_service
 from app.modules.publisher.services import publisher_service
 from app.models.publisher import PublishPool
@@ -23,9 +26,9 @@ class PublishingExecutor(TaskExecutor):
     功能：
     1. 查询发布池中所有待发布且已到期的内容
     2. 按优先级排序（priority 升序，scheduled_at 升序）
-    3. 逐个发布内容：
+    3. 通过并发发布引擎发布内容（不同账号并行，同一账号依次发布并限速）：
        - 更新状态为 "publishing"
-       - 调用发布服务发布内容
+       - 调用发布服务发布内容（异步发布，重试退避期间不阻塞事件循环）
        - 成功后更新状态为 "published"
        - 失败时记录错误并更新重试计数
     4. 返回执行结果（包含成功和失败的统计）
@@ -80,7 +83,7 @@ class PublishingExecutor(TaskExecutor):
         执行流程:
             1. 查询发布池中所有待发布且已到期的内容
             2. 按优先级排序
-            3. 对每个条目执行发布流程
+            3. 按账号并发执行发布流程
             4. 返回统计结果
         """
         start_time = time.time()
@@ -114,106 +117,30 @@ class PublishingExecutor(TaskExecutor):
 
             log.info(f"Found {len(pending_entries)} pending entries in publish pool")
 
-            # 2. 按优先级处理每个条目（已在 get_pending_entries 中排序）
-            for idx, pool_entry in enumerate(pending_entries, 1):
-                pool_id = pool_entry.id
-                content_id = pool_entry.content_id
-
-                log.info(f"Processing entry {idx}/{len(pending_entries)}: pool_id={pool_id}, content_id={content_id}")
-
-                try:
-                    # 获取内容和账号信息
-                    content = db.query(Content).filter(Content.id == content_id).first()
-                    if not content:
-                        error_msg = f"Content not found (ID: {content_id})"
-                        log.error(error_msg)
-                        self._handle_publish_failure(db, pool_id, error_msg)
-                        failed_count += 1
-                        results.append({
-                            "pool_id": pool_id,
-                            "content_id": content_id,
-                            "status": "failed",
-                            "error": error_msg
-                        })
-                        continue
-
-                    account = db.query(Account).filter(Account.id == content.account_id).first()
-                    if not account:
-                        error_msg = f"Account not found (ID: {content.account_id})"
-                        log.error(error_msg)
-                        self._handle_publish_failure(db, pool_id, error_msg)
-                        failed_count += 1
-                        results.append({
-                            "pool_id": pool_id,
-                            "content_id": content_id,
-                            "status": "failed",
-                            "error": error_msg
-                        })
-                        continue
-
-                    # 3a. 更新状态为 "publishing"
-                    log.info(f"Starting publish for content_id={content_id}")
-                    publish_pool_service.start_publishing(db, pool_id)
-
-                    # 3b. 调用发布服务发布内容
-                    publish_request = {
-                        "content_id": content_id,
-                        "account_id": account.id,
-                        "publish_to_draft": True  # 默认发布到草稿箱
+            # 2. 并发发布（已在 get_pending_entries 中排序，同一账号内按顺序发布）
+            async for pool_entry, entry_result, error in publish_engine.run(
+                pending_entries,
+                key=self.account_key,
+                publish=lambda entry: self.publish_entry(db, entry)
+            ):
+                if isinstance(error, JobLeaseLostError):
+                    # 运行锁已被其他副本接管，停止发布剩余条目
+                    raise error
+                if error is not None:
+                    entry_result = {
+                        "pool_id": pool_entry.id,
+                        "content_id": pool_entry.content_id,
+                        "status": "error",
+                        "error": str(error)
                     }
 
-                    publish_result = publisher_service.manual_publish(db, publish_request)
-
-                    # 3c. 检查发布结果
-                    if publish_result.get("success"):
-                        # 发布成功
-                        log.info(f"Successfully published content_id={content_id}, log_id={publish_result.get('log_id')}")
-                        publish_pool_service.complete_publishing(
-                            db,
-                            pool_id,
-                            publish_result.get("log_id")
-                        )
-                        success_count += 1
-                        results.append({
-                            "pool_id": pool_id,
-                            "content_id": content_id,
-                            "status": "published",
-                            "log_id": publish_result.get("log_id"),
-                            "media_id": publish_result.get("media_id")
-                        })
-                    else:
-                        # 发布失败
-                        error_msg = publish_result.get("error", "Unknown error")
-                        log.error(f"Failed to publish content_id={content_id}: {error_msg}")
-                        self._handle_publish_failure(db, pool_id, error_msg)
-                        failed_count += 1
-                        results.append({
-                            "pool_id": pool_id,
-                            "content_id": content_id,
-                            "status": "failed",
-                            "error": error_msg
-                        })
-
-                except Exception as e:
-                    # 捕获单个内容的发布异常，继续处理其他内容
-                    error_msg = f"Error processing content_id={content_id}: {str(e)}"
-                    log.error(error_msg)
-                    log.exception("Exception during publishing")
-
-                    try:
-                        self._handle_publish_failure(db, pool_id, error_msg)
-                    except Exception as inner_e:
-                        log.error(f"Failed to handle publish failure: {str(inner_e)}")
-
+                if entry_result["status"] == "published":
+                    success_count += 1
+                else:
                     failed_count += 1
-                    results.append({
-                        "pool_id": pool_id,
-                        "content_id": content_id,
-                        "status": "error",
-                        "error": error_msg
-                    })
+                results.append(entry_result)
 
-            # 4. 返回执行结果
+            # 3. 返回执行结果
             total_count = len(pending_entries)
             duration = time.time() - start_time
 
@@ -260,6 +187,125 @@ class PublishingExecutor(TaskExecutor):
                 }
             )
 
+    @staticmethod
+    def account_key(pool_entry: PublishPool) -> Any:
+        """发布池条目所属账号（并发引擎按账号限流）"""
+        content = pool_entry.content
+        return content.account_id if content is not None else None
+
+    async def publish_entry(self, db: Session, pool_entry: PublishPool) -> Dict[str, Any]:
+        """
+        发布单个发布池条目
+
+        每个条目使用绑定同一引擎的独立短会话，多个条目并发发布时一个条目的数据库异常
+        （例如提交时数据库被锁）不会让其他条目共用的会话进入需要回滚的状态。
+        定时运行中先校验运行锁，锁已被其他副本接管时抛出 JobLeaseLostError，不更新发布池也不发布
+
+        Args:
+            db: 本次运行的数据库会话（只用于获取引擎）
+            pool_entry: 发布池条目
+
+        Returns:
+            Dict: 发布结果，status 为 published/failed/error
+        """
+        pool_id = pool_entry.id
+        content_id = pool_entry.content_id
+
+        await asyncio.to_thread(ensure_lease_current)
+
+        db = self._entry_session(db)
+        try:
+            # 获取内容和账号信息
+            content = db.query(Content).filter(Content.id == content_id).first()
+            if not content:
+                error_msg = f"Content not found (ID: {content_id})"
+                log.error(error_msg)
+                self._handle_publish_failure(db, pool_id, error_msg)
+                return {
+                    "pool_id": pool_id,
+                    "content_id": content_id,
+                    "status": "failed",
+                    "error": error_msg
+                }
+
+            account = db.query(Account).filter(Account.id == content.account_id).first()
+            if not account:
+                error_msg = f"Account not found (ID: {content.account_id})"
+                log.error(error_msg)
+                self._handle_publish_failure(db, pool_id, error_msg)
+                return {
+                    "pool_id": pool_id,
+                    "content_id": content_id,
+                    "status": "failed",
+                    "error": error_msg
+                }
+
+            # 更新状态为 "publishing"
+            log.info(f"Starting publish for content_id={content_id}")
+            publish_pool_service.start_publishing(db, pool_id)
+
+            # 调用发布服务发布内容
+            publish_request = {
+                "content_id": content_id,
+                "account_id": account.id,
+                "publish_to_draft": True  # 默认发布到草稿箱
+            }
+
+            publish_result = await publisher_service.manual_publish_async(db, publish_request)
+
+            # 检查发布结果
+            if publish_result.get("success"):
+                log.info(f"Successfully published content_id={content_id}, log_id={publish_result.get('log_id')}")
+                publish_pool_service.complete_publishing(
+                    db,
+                    pool_id,
+                    publish_result.get("log_id")
+                )
+                return {
+                    "pool_id": pool_id,
+                    "content_id": content_id,
+                    "status": "published",
+                    "log_id": publish_result.get("log_id"),
+                    "media_id": publish_result.get("media_id")
+                }
+
+            error_msg = publish_result.get("error", "Unknown error")
+            log.error(f"Failed to publish content_id={content_id}: {error_msg}")
+            self._handle_publish_failure(db, pool_id, error_msg)
+            return {
+                "pool_id": pool_id,
+                "content_id": content_id,
+                "status": "failed",
+                "error": error_msg
+            }
+
+        except Exception as e:
+            # 捕获单个内容的发布异常，不影响其他内容
+            error_msg = f"Error processing content_id={content_id}: {str(e)}"
+            log.error(error_msg)
+            log.exception("Exception during publishing")
+
+            try:
+                db.rollback()
+                self._handle_publish_failure(db, pool_id, error_msg)
+            except Exception as inner_e:
+                log.error(f"Failed to handle publish failure: {str(inner_e)}")
+
+            return {
+                "pool_id": pool_id,
+                "content_id": content_id,
+                "status": "error",
+                "error": error_msg
+            }
+
+        finally:
+            db.close()
+
+    @staticmethod
+    def _entry_session(db: Session) -> Session:
+        """为单个条目创建绑定同一引擎的独立会话"""
+        return sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False)()
+
     def _handle_publish_failure(self, db: Session, pool_id: int, error_message: str) -> None:
         """
         处理发布失败
@@ -0,0 +1,103 @@
+"""
+统计汇总执行器
+负责定期重算 daily_stats 每日汇总
+"""
+import asyncio
+import time
+from typing import Dict, Any
+from sqlalchemy.orm import Session
+
+from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
+from app.services.stats_rollup_service import stats_rollup_service
+from app.utils.custom_logger import log
+
+
+class StatsRollupExecutor(TaskExecutor):
+    """
+    统计汇总执行器
+
+    汇总行在写入时已增量维护，本执行器按天重算最近几天的汇总，
+    修正批量更新等绕过 ORM 事件的写入造成的偏差。
+
+    示例参数：
+    {
+        "days": 3,        # 重算最近几天（默认 STATS_ROLLUP_DAYS）
+        "full": false     # 是否从最早的记录开始全量重建
+    }
+    """
+
+    @property
+    def executor_type(self) -> str:
+        """执行器类型"""
+        return "stats_rollup"
+
+    def validate_params(self, task_params: Dict[str, Any]) -> bool:
+        """
+        验证任务参数
+
+        可选参数:
+            - days: 重算天数（正整数）
+            - full: 是否全量重建（布尔值）
+        """
+        days = task_params.get("days")
+        if days is not None and (not isinstance(days, int) or days <= 0):
+            log.error(f"Invalid days: {days}")
+            return False
+
+        full = task_params.get("full", False)
+        if not isinstance(full, bool):
+            log.error(f"Invalid full: {full}")
+            return False
+
+        return True
+
+    async def execute(
+        self,
+        task_id: int,
+        task_params: Dict[str, Any],
+        db: Session
+    ) -> TaskExecutionResult:
+        """
+        执行统计汇总
+
+        Args:
+            task_id: 任务ID
+            task_params: 任务参数
+            db: 数据库会话
+
+        Returns:
+            TaskExecutionResult: 执行结果
+        """
+        start_time = time.time()
+        full = task_params.get("full", False)
+        days = task_params.get("days")
+
+        log.info(f"开始统计汇总: task_id={task_id}, full={full}, days={days}")
+
+        try:
+            # 重算是同步的批量 SQL，放到线程中执行，不阻塞调度器共享的事件循环
+            if full:
+                row_count = await asyncio.to_thread(stats_rollup_service.rebuild, db)
+            else:
+                row_count = await asyncio.to_thread(stats_rollup_service.refresh_recent, db, days)
+
+            duration = time.time() - start_time
+            return TaskExecutionResult.success_result(
+                message=f"统计汇总完成: 写入 {row_count} 行",
+                data={
+                    "full": full,
+                    "days": days,
+                    "row_count": row_count
+                },
+                duration=duration
+            )
+
+        except Exception as e:
+            db.rollback()
+            error_msg = f"统计汇总执行失败: {str(e)}"
+            log.error(error_msg, exc_info=True)
+            return TaskExecutionResult.failure_result(
+                message=error_msg,
+                error=str(e),
+                duration=time.time() - start_time
+            )
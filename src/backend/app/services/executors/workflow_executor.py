@@ -1,14 +1,19 @@
 """
 工作流任务执行器
 
-负责编排多个执行步骤，按顺序执行并传递上下文数据
+负责编排多个执行步骤，按顺序或按依赖关系（DAG）并行执行并传递上下文数据
 """
+import asyncio
 import time
 import re
-from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.config import settings
 from app.services.scheduler_service import TaskExecutor, TaskExecutionResult
+from app.services.job_lock_service import ensure_lease_current
+from app.services.monitoring.scheduler_profiler import scheduler_profiler
+from app.services.workflow_run_service import WorkflowCheckpoint, workflow_run_service
 from app.utils.custom_logger import log
 
 
@@ -31,6 +36,32 @@ class WorkflowExecutor(TaskExecutor):
             {"type": "add_to_pool", "params": {"content_id": "${content_id}", "priority": 5}}
         ]
     }
+
+    DAG 模式（任一步骤声明 id / depends_on / for_each，或 mode 为 "dag" 时启用）：
+    1. 步骤通过 depends_on 声明依赖，互不依赖的分支在 max_concurrency 限制下并发执行
+    2. for_each 对列表扇出，每个元素执行一次步骤，全部完成后汇总为按字段聚合的列表（扇入）
+    3. 步骤输出以步骤 id 为键保存在上下文中，可用 ${step_id.field} 引用；
+       依赖步骤的输出字段也会合并到上下文中，可直接用 ${field} 引用
+    4. timeout（或工作流级的 step_timeout）限制单次步骤执行的秒数
+    5. 并发执行的步骤各自使用独立的数据库会话
+
+    失败续跑：每个步骤（以及 for_each 的每个元素）成功后保存输出，工作流失败后再次触发时
+    （参数未变且在 SCHEDULER_WORKFLOW_RESUME_WINDOW_HOURS 内）从失败的步骤继续执行。
+
+    {
+        "max_concurrency": 5,
+        "context": {"account_ids": [49, 50, 51]},
+        "steps": [
+            {"id": "generate", "type": "content_generation", "for_each": "${account_ids}",
+             "as": "account_id", "timeout": 900, "params": {"account_id": "${account_id}"}},
+            {"id": "approve", "type": "approve", "depends_on": ["generate"],
+             "for_each": "${generate.content_id}", "as": "content_id",
+             "params": {"content_id": "${content_id}"}},
+            {"id": "pool", "type": "add_to_pool", "depends_on": ["approve"],
+             "for_each": "${generate.content_id}", "as": "content_id",
+             "params": {"content_id": "${content_id}", "priority": 5}}
+        ]
+    }
     """
 
     @property
@@ -89,6 +120,14 @@ class WorkflowExecutor(TaskExecutor):
                 log.error(f"Step {idx} params must be a dictionary")
                 return False
 
+            timeout = step.get("timeout")
+            if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+                log.error(f"Step {idx} has invalid timeout: {timeout}")
+                return False
+
+        if self._is_dag(task_params) and not self._validate_dag(task_params):
+            return False
+
         log.info(f"Workflow params validation passed: {len(steps)} steps")
         return True
 
@@ -118,7 +157,50 @@ class WorkflowExecutor(TaskExecutor):
                - 将结果数据合并到上下文
             3. 任何步骤失败则中断流程
             4. 返回包含所有步骤结果的执行结果
+
+        每次执行记录为一次工作流运行（workflow_runs），各步骤的输出保存为检查点。
+        上一次运行失败且参数未变时续跑该运行，跳过已成功的步骤；
+        参数 resume 为 false 时总是重新开始，resume_run_id 指定要续跑的运行。
         """
+        is_dag = self._is_dag(task_params)
+        step_ids = self._get_step_ids(task_params.get("steps", []))
+        # 检查点读写都是同步数据库操作，放到线程池中执行，不阻塞共享事件循环
+        checkpoint = await asyncio.to_thread(
+            workflow_run_service.begin, db, task_id, task_params, "dag" if is_dag else "sequential"
+        )
+
+        if is_dag:
+            result = await self._execute_dag(task_id, task_params, db, checkpoint)
+        else:
+            result = await self._execute_sequential(task_id, task_params, db, checkpoint)
+
+        failed_step = result.metadata.get("failed_step")
+        if isinstance(failed_step, int):
+            failed_step = step_ids[failed_step - 1]
+        await asyncio.to_thread(
+            checkpoint.finish,
+            result.success,
+            context=(result.data or {}).get("context"),
+            failed_step=failed_step,
+            error_message=None if result.success else result.message
+        )
+
+        if checkpoint.run_id is not None:
+            result.metadata["workflow_run_id"] = checkpoint.run_id
+            if checkpoint.resumed:
+                result.metadata["resumed_steps"] = [
+                    step_id for step_id in step_ids if checkpoint.get_output(step_id) is not None
+                ]
+        return result
+
+    async def _execute_sequential(
+        self,
+        task_id: int,
+        task_params: Dict[str, Any],
+        db: Session,
+        checkpoint: WorkflowCheckpoint
+    ) -> TaskExecutionResult:
+        """按顺序执行工作流，跳过检查点中已成功的步骤"""
         start_time = time.time()
         log.info(f"Executing workflow task {task_id}")
 
@@ -126,6 +208,8 @@ class WorkflowExecutor(TaskExecutor):
         context: Dict[str, Any] = task_params.get("context", {})
         steps = task_params.get("steps", [])
 
+        step_keys = self._get_step_ids(steps)
+
         # 存储所有步骤的执行结果
         step_results: List[Dict[str, Any]] = []
 
@@ -134,8 +218,26 @@ class WorkflowExecutor(TaskExecutor):
             for idx, step in enumerate(steps):
                 step_type = step.get("type")
                 step_params = step.get("params", {})
+                step_key = step_keys[idx]
+
+                # 续跑时复用之前已成功步骤的输出
+                cached_output = checkpoint.get_output(step_key)
+                if cached_output is not None:
+                    context.update(cached_output)
+                    step_results.append({
+                        "step": idx + 1,
+                        "type": step_type,
+                        "success": True,
+                        "cached": True,
+                        "message": "Reused output from previous run",
+                        "duration": 0
+                    })
+                    log.info(f"Step {idx + 1}/{len(steps)} reused from checkpoint: type={step_type}")
+                    continue
 
                 log.info(f"Executing step {idx + 1}/{len(steps)}: type={step_type}")
+                await asyncio.to_thread(checkpoint.step_started, step_key, idx + 1, step_type)
+                step_start = time.time()
 
                 try:
                     # 1. 解析变量引用
@@ -149,6 +251,10 @@ class WorkflowExecutor(TaskExecutor):
                     if not executor:
                         error_msg = f"Unknown executor type: {step_type}"
                         log.error(error_msg)
+                        await asyncio.to_thread(
+                            checkpoint.step_failed,
+                            step_key, error_msg, f"ExecutorNotFound: {step_type}", time.time() - step_start
+                        )
                         duration = time.time() - start_time
                         return TaskExecutionResult.failure_result(
                             message=f"Workflow failed at step {idx + 1}: {error_msg}",
@@ -162,7 +268,10 @@ class WorkflowExecutor(TaskExecutor):
                         )
 
                     # 3. 执行步骤
-                    step_result = await executor.execute(task_id, resolved_params, db)
+                    step_result = await self._run_step(
+                        executor, step_type, task_id, resolved_params, db,
+                        self._get_step_timeout(step, task_params)
+                    )
 
                     # 记录步骤执行结果
                     step_result_data = {
@@ -178,6 +287,10 @@ class WorkflowExecutor(TaskExecutor):
                     if not step_result.success:
                         error_msg = f"Step {idx + 1} ({step_type}) failed: {step_result.message}"
                         log.error(error_msg)
+                        await asyncio.to_thread(
+                            checkpoint.step_failed,
+                            step_key, step_result.message, step_result.error, time.time() - step_start
+                        )
                         duration = time.time() - start_time
                         return TaskExecutionResult.failure_result(
                             message=f"Workflow failed at step {idx + 1}: {error_msg}",
@@ -191,6 +304,11 @@ class WorkflowExecutor(TaskExecutor):
                             }
                         )
 
+                    await asyncio.to_thread(
+                        checkpoint.step_succeeded,
+                        step_key, step_result.data or {}, step_result.message, time.time() - step_start
+                    )
+
                     # 5. 将步骤结果数据合并到上下文
                     if step_result.data:
                         context.update(step_result.data)
@@ -204,6 +322,7 @@ class WorkflowExecutor(TaskExecutor):
                     error_msg = f"Exception in step {idx + 1} ({step_type}): {str(e)}"
                     log.error(error_msg)
                     log.exception(f"Step {idx + 1} execution error")
+                    await asyncio.to_thread(checkpoint.step_failed, step_key, error_msg, str(e), time.time() - step_start)
                     duration = time.time() - start_time
 
                     return TaskExecutionResult.failure_result(
@@ -255,6 +374,415 @@ class WorkflowExecutor(TaskExecutor):
                 }
             )
 
+    # ==================== 步骤执行 ====================
+
+    async def _run_step(
+        self,
+        executor: TaskExecutor,
+        step_type: str,
+        task_id: int,
+        params: Dict[str, Any],
+        db: Session,
+        timeout: Optional[float] = None
+    ) -> TaskExecutionResult:
+        """
+        执行单个步骤，按步骤类型统计耗时分布
+
+        超过 timeout 秒时取消步骤并返回失败结果；执行器抛出的异常原样抛出。
+        blocking 执行器与定时运行时一样不在当前事件循环中执行，而是放到线程中、在该线程自己的
+        事件循环中执行，超时后不再等待（线程中的同步代码执行完后自行结束）。
+        定时运行中运行锁已被其他副本接管时不执行步骤，抛出 JobLeaseLostError
+        """
+        await asyncio.to_thread(ensure_lease_current)
+        step_start = time.time()
+        step_success = False
+        with scheduler_profiler.profile() as step_profile:
+            try:
+                if executor.blocking:
+                    from app.services.scheduler_service import scheduler_service
+                    step = asyncio.to_thread(scheduler_service.run_on_worker_loop, executor.execute(task_id, params, db))
+                else:
+                    step = executor.execute(task_id, params, db)
+                if timeout:
+                    step_result = await asyncio.wait_for(step, timeout)
+                else:
+                    step_result = await step
+                step_success = step_result.success
+                return step_result
+            except asyncio.TimeoutError:
+                return TaskExecutionResult.failure_result(
+                    message=f"Step timed out after {timeout}s",
+                    error="StepTimeout",
+                    duration=time.time() - step_start
+                )
+            finally:
+                scheduler_profiler.record_step(
+                    step_type, time.time() - step_start, step_success, step_profile
+                )
+
+    @staticmethod
+    def _get_step_timeout(step: Dict[str, Any], task_params: Dict[str, Any]) -> Optional[float]:
+        """步骤超时：步骤 timeout > 工作流 step_timeout > 配置默认值，0 表示不限制"""
+        timeout = step.get("timeout") or task_params.get("step_timeout") or settings.SCHEDULER_WORKFLOW_STEP_TIMEOUT
+        return timeout if timeout and timeout > 0 else None
+
+    # ==================== DAG 模式 ====================
+
+    @staticmethod
+    def _is_dag(task_params: Dict[str, Any]) -> bool:
+        """是否按 DAG 模式执行"""
+        if task_params.get("mode") == "dag":
+            return True
+        return any(
+            isinstance(step, dict) and ("id" in step or "depends_on" in step or "for_each" in step)
+            for step in task_params.get("steps") or []
+        )
+
+    @staticmethod
+    def _get_step_ids(steps: List[Dict[str, Any]]) -> List[str]:
+        """步骤 id，未声明时为 step1、step2 ..."""
+        return [str(step.get("id") or f"step{idx + 1}") for idx, step in enumerate(steps)]
+
+    def _validate_dag(self, task_params: Dict[str, Any]) -> bool:
+        """验证 DAG 模式参数：id 唯一、依赖存在且无环、for_each 和 max_concurrency 格式正确"""
+        steps = task_params["steps"]
+        step_ids = self._get_step_ids(steps)
+
+        if len(set(step_ids)) != len(step_ids):
+            log.error(f"Step ids must be unique: {step_ids}")
+            return False
+
+        for step_id, step in zip(step_ids, steps):
+            depends_on = step.get("depends_on", [])
+            if not isinstance(depends_on, list) or any(dep not in step_ids for dep in depends_on):
+                log.error(f"Step {step_id} has invalid depends_on: {depends_on}")
+                return False
+
+            for_each = step.get("for_each")
+            if for_each is not None and not isinstance(for_each, (list, str)):
+                log.error(f"Step {step_id} for_each must be a list or a variable reference")
+                return False
+
+        max_concurrency = task_params.get("max_concurrency")
+        if max_concurrency is not None and (not isinstance(max_concurrency, int) or max_concurrency <= 0):
+            log.error(f"Invalid max_concurrency: {max_concurrency}")
+            return False
+
+        if self._topological_order(step_ids, steps) is None:
+            log.error("Workflow steps contain a dependency cycle")
+            return False
+
+        return True
+
+    @staticmethod
+    def _topological_order(step_ids: List[str], steps: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """按依赖关系排序步骤 id，同层保持声明顺序；存在环时返回 None"""
+        remaining = {step_id: set(step.get("depends_on", [])) for step_id, step in zip(step_ids, steps)}
+        ready = [step_id for step_id in step_ids if not remaining[step_id]]
+        order: List[str] = []
+
+        while ready:
+            current = ready.pop(0)
+            order.append(current)
+            for step_id in step_ids:
+                if current in remaining[step_id]:
+                    remaining[step_id].discard(current)
+                    if not remaining[step_id]:
+                        ready.append(step_id)
+
+        return order if len(order) == len(step_ids) else None
+
+    async def _execute_dag(
+        self,
+        task_id: int,
+        task_params: Dict[str, Any],
+        db: Session,
+        checkpoint: WorkflowCheckpoint
+    ) -> TaskExecutionResult:
+        """
+        按 DAG 模式执行工作流
+
+        每个步骤一个协程，等待依赖步骤完成后执行；所有步骤的执行共用一个
+        信号量限制并发数。任一步骤失败时取消其余未完成的步骤。
+        检查点中已成功的步骤直接使用保存的输出，不再执行。
+        """
+        start_time = time.time()
+        steps = task_params.get("steps", [])
+        step_ids = self._get_step_ids(steps)
+        steps_by_id = dict(zip(step_ids, steps))
+        order = self._topological_order(step_ids, steps)
+        initial_context: Dict[str, Any] = task_params.get("context", {})
+        max_concurrency = task_params.get("max_concurrency") or settings.SCHEDULER_WORKFLOW_MAX_CONCURRENCY
+
+        log.info(
+            f"Executing DAG workflow task {task_id}: {len(steps)} steps, "
+            f"max_concurrency={max_concurrency}"
+        )
+
+        # 每个步骤的所有上游步骤（按拓扑序计算）
+        ancestors: Dict[str, set] = {}
+        for step_id in order:
+            ancestors[step_id] = set()
+            for dep in steps_by_id[step_id].get("depends_on", []):
+                ancestors[step_id] |= {dep} | ancestors[dep]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # 并发执行的步骤不能共用一个会话，为每次执行创建绑定同一引擎的独立会话
+        session_factory = sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False)
+        outputs: Dict[str, Dict[str, Any]] = {}
+        step_results: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run(step_id: str) -> None:
+            step = steps_by_id[step_id]
+            cached_output = checkpoint.get_output(step_id)
+            if cached_output is not None:
+                outputs[step_id] = cached_output
+                step_results[step_id] = {
+                    "step": step_ids.index(step_id) + 1, "id": step_id, "type": step.get("type"),
+                    "success": True, "cached": True, "message": "Reused output from previous run", "duration": 0
+                }
+                return
+
+            depends_on = step.get("depends_on", [])
+            if depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in depends_on))
+
+            context = self._build_dag_context(initial_context, outputs, ancestors[step_id], order)
+            outputs[step_id], step_results[step_id] = await self._execute_dag_step(
+                task_id, step_ids.index(step_id) + 1, step_id, step, context,
+                task_params, semaphore, session_factory, checkpoint
+            )
+
+        for step_id in order:
+            tasks[step_id] = asyncio.create_task(run(step_id))
+
+        done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        failure = next((task.exception() for task in tasks.values() if task.done()
+                        and not task.cancelled() and task.exception()), None)
+        completed_steps = [step_results[step_id] for step_id in order if step_id in step_results]
+        duration = time.time() - start_time
+
+        if failure is not None:
+            if isinstance(failure, _StepFailed):
+                failed_step, step_type, error_msg, error = failure.step_id, failure.step_type, failure.message, failure.error
+                completed_steps.append(failure.step_result)
+            else:
+                failed_step, step_type, error_msg, error = None, None, str(failure), str(failure)
+            log.error(f"DAG workflow failed at step {failed_step}: {error_msg}")
+            return TaskExecutionResult.failure_result(
+                message=f"Workflow failed at step {failed_step}: {error_msg}",
+                error=error,
+                duration=duration,
+                metadata={
+                    "failed_step": failed_step,
+                    "step_type": step_type,
+                    "step_error": error_msg,
+                    "completed_steps": completed_steps
+                }
+            )
+
+        log.info(
+            f"DAG workflow completed successfully: {len(steps)} steps, "
+            f"duration={duration:.2f}s"
+        )
+
+        return TaskExecutionResult.success_result(
+            message=f"Workflow executed successfully: {len(steps)} steps completed",
+            data={
+                "total_steps": len(steps),
+                "context": self._build_dag_context(initial_context, outputs, set(order), order),
+                "outputs": outputs,
+                "step_results": completed_steps
+            },
+            duration=duration,
+            metadata={
+                "task_id": task_id,
+                "mode": "dag",
+                "max_concurrency": max_concurrency
+            }
+        )
+
+    async def _execute_dag_step(
+        self,
+        task_id: int,
+        step_number: int,
+        step_id: str,
+        step: Dict[str, Any],
+        context: Dict[str, Any],
+        task_params: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        session_factory: sessionmaker,
+        checkpoint: WorkflowCheckpoint
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        执行 DAG 中的一个步骤（for_each 时对每个元素并发执行）
+
+        for_each 的每个元素成功后单独保存检查点，续跑时只执行之前未成功的元素
+
+        Returns:
+            (步骤输出, 步骤执行结果摘要)
+
+        Raises:
+            _StepFailed: 步骤（或任一元素）执行失败
+        """
+        from app.services.scheduler_service import scheduler_service
+
+        step_type = step.get("type")
+        step_start = time.time()
+        step_result_data: Dict[str, Any] = {"step": step_number, "id": step_id, "type": step_type, "success": False}
+
+        async def fail(message: str, error: Optional[str]) -> _StepFailed:
+            step_result_data["message"] = message
+            step_result_data["duration"] = time.time() - step_start
+            await asyncio.to_thread(checkpoint.step_failed, step_id, message, error, step_result_data["duration"])
+            return _StepFailed(step_id, step_type, message, error, step_result_data)
+
+        await asyncio.to_thread(checkpoint.step_started, step_id, step_number, step_type)
+
+        executor = scheduler_service.get_executor(step_type)
+        if not executor:
+            raise await fail(f"Unknown executor type: {step_type}", f"ExecutorNotFound: {step_type}")
+
+        if "for_each" in step:
+            items = step["for_each"]
+            if isinstance(items, str):
+                match = re.match(r'^\$\{(.+)\}$', items)
+                found, items = self._lookup_variable(context, match.group(1)) if match else (False, None)
+            if not isinstance(items, list):
+                raise await fail(f"for_each of step {step_id} did not resolve to a list", "InvalidForEach")
+            step_result_data["items"] = len(items)
+        else:
+            items = [None]
+
+        log.info(f"Executing step {step_id} ({step_type}): {len(items)} run(s)")
+        timeout = self._get_step_timeout(step, task_params)
+
+        async def invoke(index: int, item: Any) -> TaskExecutionResult:
+            if "for_each" not in step:
+                return await self._invoke_dag_step(
+                    executor, step_type, task_id, self._resolve_variables(step.get("params", {}), context),
+                    timeout, semaphore, session_factory
+                )
+
+            cached_output = checkpoint.get_item_output(step_id, index, item)
+            if cached_output is not None:
+                return TaskExecutionResult.success_result(message="Reused output from previous run", data=cached_output)
+
+            item_context = self._build_item_context(context, step, item)
+            result = await self._invoke_dag_step(
+                executor, step_type, task_id, self._resolve_variables(step.get("params", {}), item_context),
+                timeout, semaphore, session_factory
+            )
+            if result.success:
+                await asyncio.to_thread(checkpoint.item_succeeded, step_id, index, item, result.data or {})
+            return result
+
+        results = await asyncio.gather(*(invoke(index, item) for index, item in enumerate(items)))
+
+        failed = [(index, result) for index, result in enumerate(results) if not result.success]
+        if failed:
+            index, result = failed[0]
+            where = f" (item {index})" if "for_each" in step else ""
+            raise await fail(f"Step {step_id} ({step_type}){where} failed: {result.message}", result.error)
+
+        if "for_each" in step:
+            output = self._fan_in([result.data or {} for result in results])
+        else:
+            output = dict(results[0].data or {})
+
+        step_result_data.update({
+            "success": True,
+            "message": results[0].message if len(results) == 1 else f"{len(results)} runs completed",
+            "duration": time.time() - step_start
+        })
+        await asyncio.to_thread(
+            checkpoint.step_succeeded, step_id, output, step_result_data["message"], step_result_data["duration"]
+        )
+        log.info(f"Step {step_id} completed successfully, outputs: {list(output.keys())}")
+        return output, step_result_data
+
+    async def _invoke_dag_step(
+        self,
+        executor: TaskExecutor,
+        step_type: str,
+        task_id: int,
+        params: Dict[str, Any],
+        timeout: Optional[float],
+        semaphore: asyncio.Semaphore,
+        session_factory: sessionmaker
+    ) -> TaskExecutionResult:
+        """在并发限制内使用独立会话执行一次步骤，异常转换为失败结果"""
+        async with semaphore:
+            step_db = session_factory()
+            try:
+                return await self._run_step(executor, step_type, task_id, params, step_db, timeout)
+            except Exception as e:
+                log.exception(f"Step {step_type} execution error")
+                return TaskExecutionResult.failure_result(message=f"Exception: {str(e)}", error=str(e))
+            finally:
+                step_db.close()
+
+    @staticmethod
+    def _build_dag_context(
+        initial_context: Dict[str, Any],
+        outputs: Dict[str, Dict[str, Any]],
+        step_ids: set,
+        order: List[str]
+    ) -> Dict[str, Any]:
+        """
+        构建步骤的上下文：初始上下文 + 上游步骤输出（按拓扑序合并字段）+ 以步骤 id 为键的输出
+        """
+        context = dict(initial_context)
+        for step_id in order:
+            if step_id in step_ids and step_id in outputs:
+                context.update(outputs[step_id])
+        for step_id in order:
+            if step_id in step_ids and step_id in outputs:
+                context[step_id] = outputs[step_id]
+        return context
+
+    @staticmethod
+    def _build_item_context(context: Dict[str, Any], step: Dict[str, Any], item: Any) -> Dict[str, Any]:
+        """
+        for_each 中单个元素的上下文：元素以 as（默认 item）为变量名；
+        未指定 as 且元素为字典时，其字段也可直接引用
+        """
+        item_context = dict(context)
+        if "as" not in step and isinstance(item, dict):
+            item_context.update(item)
+        item_context[step.get("as", "item")] = item
+        return item_context
+
+    @staticmethod
+    def _fan_in(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """汇总 for_each 各元素的输出：同名字段按元素顺序聚合为列表，完整输出保存在 results 中"""
+        output: Dict[str, Any] = {}
+        for data in items:
+            for key in data:
+                if key not in output:
+                    output[key] = [item.get(key) for item in items]
+        output["results"] = items
+        return output
+
+    @staticmethod
+    def _lookup_variable(context: Dict[str, Any], var_name: str) -> Tuple[bool, Any]:
+        """从上下文中查找变量，支持按点号访问嵌套字典（如 generate.content_id）"""
+        if var_name in context:
+            return True, context[var_name]
+
+        value: Any = context
+        for part in var_name.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return False, None
+            value = value[part]
+        return True, value
+
     def _resolve_variables(
         self,
         params: Dict[str, Any],
@@ -272,6 +800,7 @@ class WorkflowExecutor(TaskExecutor):
 
         支持的变量格式:
             - ${variable_name}: 从上下文中获取值
+            - ${step_id.field}: 按点号逐级取嵌套字典中的值（DAG 模式下引用指定步骤的输出）
 
         示例:
             params = {"content_id": "${content_id}"}
@@ -287,9 +816,10 @@ class WorkflowExecutor(TaskExecutor):
                 if match:
                     var_name = match.group(1)
                     # 从上下文中获取变量值
-                    if var_name in context:
-                        resolved[key] = context[var_name]
-                        log.debug(f"Variable resolved: ${var_name} = {context[var_name]}")
+                    found, var_value = self._lookup_variable(context, var_name)
+                    if found:
+                        resolved[key] = var_value
+                        log.debug(f"Variable resolved: ${var_name} = {var_value}")
                     else:
                         # 变量不存在，保持原样
                         log.warning(f"Variable not found in context: ${var_name}, keeping original value")
@@ -311,3 +841,22 @@ class WorkflowExecutor(TaskExecutor):
                 resolved[key] = value
 
         return resolved
+
+
+class _StepFailed(Exception):
+    """DAG 模式下步骤执行失败"""
+
+    def __init__(
+        self,
+        step_id: str,
+        step_type: Optional[str],
+        message: str,
+        error: Optional[str],
+        step_result: Dict[str, Any]
+    ):
+        super().__init__(message)
+        self.step_id = step_id
+        self.step_type = step_type
+        self.message = message
+        self.error = error
+        self.step_result = step_result
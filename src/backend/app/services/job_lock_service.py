@@ -0,0 +1,285 @@
+"""
+定时任务运行锁服务
+
+多个后端副本都会启动调度器并加载全部定时任务，同一次触发会在每个副本上各执行一次。
+本服务基于数据库（scheduler_job_locks 表）为每个 task_{id} 提供带租期的运行锁：
+
+1. 取得锁时 fencing_token 递增，续期和释放都校验令牌，租期过期被其他副本
+   接管后，旧持有者无法再续期或释放锁
+2. 运行期间后台线程定期续期，进程崩溃时锁在租期结束后自动释放
+3. 运行结束后锁保留到该任务下一次触发前，时钟稍有偏差的其他副本
+   对同一次触发的执行会因取不到锁而跳过
+4. 运行期间锁记录在上下文变量中，执行器在有副作用的写入（发布、提交生成任务、
+   更新发布池等）前调用 ensure_lease_current() 校验令牌，锁已被接管时中止执行
+
+所有副本共享同一个数据库，因此不依赖可选的 Redis。
+"""
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.scheduler import SchedulerJobLock
+from app.utils.custom_logger import log
+
+
+@dataclass
+class JobLease:
+    """已取得的运行锁"""
+    job_id: str
+    owner: str
+    fencing_token: int
+    locked_until: datetime
+    lost: bool = False
+    # 取得该锁的服务，用于校验令牌
+    service: Optional["JobLockService"] = field(default=None, repr=False, compare=False)
+
+
+class JobLeaseLostError(Exception):
+    """运行期间运行锁已被其他副本接管"""
+
+    def __init__(self, lease: JobLease):
+        self.lease = lease
+        super().__init__(f"任务运行锁已被其他副本接管: {lease.job_id} (token={lease.fencing_token})")
+
+
+# 当前运行持有的锁（调度器线程中设置，随上下文复制到事件循环中的协程和 to_thread 线程）
+_current_lease: ContextVar[Optional[JobLease]] = ContextVar("scheduler_job_lease", default=None)
+
+
+@contextmanager
+def lease_context(lease: Optional[JobLease]) -> Iterator[None]:
+    """在该上下文中执行的代码可通过 ensure_lease_current() 校验运行锁"""
+    token = _current_lease.set(lease)
+    try:
+        yield
+    finally:
+        _current_lease.reset(token)
+
+
+def ensure_lease_current() -> None:
+    """
+    校验当前运行仍持有运行锁，在有副作用的写入前调用
+
+    不在持锁运行中（未启用运行锁、手动触发、API 调用）时不做检查
+
+    Raises:
+        JobLeaseLostError: 锁已被其他副本接管
+    """
+    lease = _current_lease.get()
+    if lease is None or lease.service is None:
+        return
+    if lease.lost or not lease.service.is_current(lease):
+        lease.lost = True
+        raise JobLeaseLostError(lease)
+
+
+def _default_session_factory() -> Session:
+    # 运行时导入，测试中可替换 app.db.database.SessionLocal
+    from app.db.database import SessionLocal
+    return SessionLocal()
+
+
+class JobLockService:
+    """定时任务运行锁服务"""
+
+    def __init__(
+        self,
+        owner: Optional[str] = None,
+        ttl: Optional[int] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.owner = owner or settings.SCHEDULER_INSTANCE_ID or f"{socket.gethostname()}:{os.getpid()}"
+        self.ttl = ttl or settings.SCHEDULER_LOCK_TTL
+        self._session_factory = session_factory or _default_session_factory
+
+        self._held: Dict[str, JobLease] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """续期线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_held_leases(self) -> Dict[str, JobLease]:
+        """获取当前副本持有的运行锁"""
+        with self._lock:
+            return dict(self._held)
+
+    # ==================== 取得与释放 ====================
+
+    def acquire(self, job_id: str) -> Optional[JobLease]:
+        """
+        尝试取得运行锁
+
+        Args:
+            job_id: 调度任务ID
+
+        Returns:
+            JobLease: 取得的锁；锁被其他副本持有或数据库异常时返回 None
+        """
+        table = SchedulerJobLock.__table__
+        now = datetime.utcnow()
+        locked_until = now + timedelta(seconds=self.ttl)
+
+        db = self._session_factory()
+        try:
+            result = db.execute(
+                update(table)
+                .where(
+                    table.c.job_id == job_id,
+                    or_(table.c.locked_until.is_(None), table.c.locked_until <= now)
+                )
+                .values(
+                    owner=self.owner,
+                    fencing_token=table.c.fencing_token + 1,
+                    locked_until=locked_until,
+                    acquired_at=now
+                )
+            )
+            if result.rowcount == 0:
+                if db.execute(select(table.c.job_id).where(table.c.job_id == job_id)).first():
+                    db.rollback()
+                    return None
+                db.execute(insert(table).values(
+                    job_id=job_id,
+                    owner=self.owner,
+                    fencing_token=1,
+                    locked_until=locked_until,
+                    acquired_at=now
+                ))
+
+            fencing_token = db.execute(
+                select(table.c.fencing_token).where(table.c.job_id == job_id)
+            ).scalar_one()
+            db.commit()
+
+        except IntegrityError:
+            # 其他副本同时插入了锁记录
+            db.rollback()
+            return None
+        except Exception as e:
+            db.rollback()
+            log.error(f"获取任务运行锁失败: {job_id}, 错误: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+        lease = JobLease(
+            job_id=job_id,
+            owner=self.owner,
+            fencing_token=fencing_token,
+            locked_until=locked_until,
+            service=self
+        )
+        with self._lock:
+            self._held[job_id] = lease
+        log.debug(f"取得任务运行锁: {job_id} (token={fencing_token})")
+        return lease
+
+    def renew(self, lease: JobLease) -> bool:
+        """
+        续期运行锁
+
+        Returns:
+            bool: 是否续期成功；令牌已过期（锁被其他副本接管）时返回 False
+        """
+        locked_until = datetime.utcnow() + timedelta(seconds=self.ttl)
+        if not self._update_lease(lease, locked_until):
+            lease.lost = True
+            log.warning(f"任务运行锁已被其他副本接管: {lease.job_id} (token={lease.fencing_token})")
+            return False
+        lease.locked_until = locked_until
+        return True
+
+    def release(self, lease: JobLease, hold_until: Optional[datetime] = None) -> bool:
+        """
+        释放运行锁
+
+        Args:
+            lease: acquire() 返回的锁
+            hold_until: 锁保留到的时间（UTC），用于屏蔽其他副本对同一次触发的执行；
+                为空或早于当前时间时立即释放
+
+        Returns:
+            bool: 是否释放成功
+        """
+        with self._lock:
+            if self._held.get(lease.job_id) is lease:
+                del self._held[lease.job_id]
+
+        if hold_until is not None and hold_until <= datetime.utcnow():
+            hold_until = None
+        return self._update_lease(lease, hold_until)
+
+    def is_current(self, lease: JobLease) -> bool:
+        """
+        锁是否仍由该令牌持有（有副作用的操作前用于校验）
+
+        数据库异常时无法确认，按已失去锁处理，避免与接管的副本重复执行
+        """
+        table = SchedulerJobLock.__table__
+        db = self._session_factory()
+        try:
+            token = db.execute(
+                select(table.c.fencing_token).where(table.c.job_id == lease.job_id)
+            ).scalar_one_or_none()
+            return token == lease.fencing_token
+        except Exception as e:
+            log.error(f"校验任务运行锁失败: {lease.job_id}, 错误: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+    def _update_lease(self, lease: JobLease, locked_until: Optional[datetime]) -> bool:
+        table = SchedulerJobLock.__table__
+        db = self._session_factory()
+        try:
+            result = db.execute(
+                update(table)
+                .where(table.c.job_id == lease.job_id, table.c.fencing_token == lease.fencing_token)
+                .values(locked_until=locked_until)
+            )
+            db.commit()
+            return result.rowcount == 1
+        except Exception as e:
+            db.rollback()
+            log.error(f"更新任务运行锁失败: {lease.job_id}, 错误: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+    # ==================== 后台续期 ====================
+
+    def start(self) -> None:
+        """启动续期线程"""
+        if self.is_running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="scheduler-lock-renewer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """停止续期线程"""
+        if self.is_running:
+            self._stopping.set()
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        # 每隔租期的三分之一续期一次
+        while not self._stopping.wait(self.ttl / 3):
+            for lease in self.get_held_leases().values():
+                if not lease.lost:
+                    self.renew(lease)
@@ -0,0 +1,300 @@
+"""
+已上传媒体缓存服务
+按 (账号, 文件内容 sha256) 记录图片上传到微信后返回的 media_id / URL 及过期时间（media_assets 表），
+同一文件再次发布到同一账号时直接引用已有的 URL，不再重复上传
+
+缓存只是优化：查询或写入失败（例如尚未执行迁移）时记录警告并按未命中处理，不影响发布
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.publisher import MediaAsset
+from app.utils.custom_logger import log
+
+
+class MediaCacheService:
+    """已上传媒体缓存服务"""
+
+    # 距过期不足该时长的记录视为失效，避免引用在发布过程中过期
+    EXPIRY_MARGIN = timedelta(minutes=10)
+    # 计算摘要时每次读取的字节数
+    HASH_CHUNK_SIZE = 1024 * 1024
+    # 文件摘要的内存缓存条数
+    DIGEST_MEMO_SIZE = 1024
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None, ttl: Optional[int] = None):
+        """
+        初始化服务
+
+        Args:
+            session_factory: 数据库会话工厂（默认 SessionLocal），每次读写使用独立的短会话
+            ttl: 上传结果未返回过期时间时的有效期（秒，默认 PUBLISHER_MEDIA_CACHE_TTL，<= 0 表示永久有效）
+        """
+        self.session_factory = session_factory or SessionLocal
+        self.ttl = settings.PUBLISHER_MEDIA_CACHE_TTL if ttl is None else ttl
+        # (路径, 大小, 修改时间) -> sha256，文件未变化时不重复计算
+        self._digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "errors": 0, "bytes_saved": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.PUBLISHER_MEDIA_CACHE_ENABLED
+
+    @staticmethod
+    def hash_stream(f: BinaryIO) -> Tuple[str, int]:
+        """
+        计算已打开文件的 sha256（从当前位置读到结尾）
+
+        Returns:
+            (sha256, 读取的字节数)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: f.read(MediaCacheService.HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def file_digest(self, path: str) -> str:
+        """
+        计算文件内容的 sha256
+
+        Raises:
+            OSError: 文件不存在或无法读取
+        """
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(memo_key)
+            if digest is not None:
+                self._digests.move_to_end(memo_key)
+                return digest
+
+        with open(path, "rb") as f:
+            digest, _ = self.hash_stream(f)
+
+        with self._lock:
+            self._digests[memo_key] = digest
+            while len(self._digests) > self.DIGEST_MEMO_SIZE:
+                self._digests.popitem(last=False)
+        return digest
+
+    @staticmethod
+    def _is_valid(asset: MediaAsset, now: datetime, require: str = "url") -> bool:
+        """记录有所需的字段（url 或 media_id）且未（即将）过期"""
+        if not getattr(asset, require):
+            return False
+        return asset.expires_at is None or asset.expires_at > now + MediaCacheService.EXPIRY_MARGIN
+
+    def lookup_many(
+        self,
+        account_id: int,
+        digests: Iterable[str],
+        require: str = "url"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        批量查询账号下已上传的文件
+
+        Args:
+            account_id: 账号 ID
+            digests: 文件 sha256 列表
+            require: 命中所需的字段，markdown 引用图片需要 url，上传素材需要 media_id
+
+        Returns:
+            Dict[str, Dict]: 命中的 sha256 -> {media_id, url, expires_at}，未命中的不在结果中
+        """
+        digests = list(dict.fromkeys(digests))
+        if not self.enabled or not digests:
+            return {}
+
+        now = datetime.utcnow()
+        found: Dict[str, Dict[str, Any]] = {}
+        db = self.session_factory()
+        try:
+            assets = db.query(MediaAsset).filter(
+                MediaAsset.account_id == account_id,
+                MediaAsset.sha256.in_(digests)
+            ).all()
+            for asset in assets:
+                if not self._is_valid(asset, now, require):
+                    continue
+                asset.hit_count = (asset.hit_count or 0) + 1
+                asset.last_used_at = now
+                self._stats["bytes_saved"] += asset.file_size or 0
+                found[asset.sha256] = {
+                    "media_id": asset.media_id,
+                    "url": asset.url,
+                    "expires_at": asset.expires_at,
+                }
+            if found:
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            self._stats["errors"] += 1
+            log.warning(f"查询媒体缓存失败，按未命中处理: {e}")
+            found = {}
+        finally:
+            db.close()
+
+        self._stats["hits"] += len(found)
+        self._stats["misses"] += len(digests) - len(found)
+        return found
+
+    def lookup(self, account_id: int, digest: str, require: str = "url") -> Optional[Dict[str, Any]]:
+        """查询单个文件，未命中或已过期时返回 None"""
+        return self.lookup_many(account_id, [digest], require).get(digest)
+
+    def store(
+        self,
+        account_id: int,
+        digest: str,
+        media_id: Optional[str] = None,
+        url: Optional[str] = None,
+        filename: Optional[str] = None,
+        file_size: Optional[int] = None,
+        expires_at: Optional[datetime] = None
+    ) -> bool:
+        """
+        记录上传结果（同一账号、同一文件已有记录时覆盖）
+
+        Args:
+            account_id: 账号 ID
+            digest: 文件 sha256
+            media_id: 微信 media_id
+            url: 微信图片 URL
+            filename: 文件名
+            file_size: 文件大小（字节）
+            expires_at: 过期时间（None 时按 ttl 计算）
+
+        Returns:
+            bool: 是否写入成功
+        """
+        if not self.enabled or not (media_id or url):
+            return False
+
+        if expires_at is None and self.ttl > 0:
+            expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+
+        db = self.session_factory()
+        try:
+            asset = db.query(MediaAsset).filter(
+                MediaAsset.account_id == account_id,
+                MediaAsset.sha256 == digest
+            ).first()
+            if asset is None:
+                asset = MediaAsset(account_id=account_id, sha256=digest, hit_count=0)
+                db.add(asset)
+            asset.media_id = media_id
+            asset.url = url
+            asset.filename = filename
+            asset.file_size = file_size
+            asset.expires_at = expires_at
+            db.commit()
+            self._stats["stores"] += 1
+            return True
+        except Exception as e:
+            db.rollback()
+            self._stats["errors"] += 1
+            log.warning(f"写入媒体缓存失败: {e}")
+            return False
+        finally:
+            db.close()
+
+    def invalidate(self, account_id: int, digest: Optional[str] = None) -> int:
+        """
+        删除缓存记录（微信侧素材被删除或账号更换时调用）
+
+        Args:
+            account_id: 账号 ID
+            digest: 文件 sha256，为 None 时删除该账号的全部记录
+
+        Returns:
+            int: 删除的记录数
+        """
+        db = self.session_factory()
+        try:
+            query = db.query(MediaAsset).filter(MediaAsset.account_id == account_id)
+            if digest is not None:
+                query = query.filter(MediaAsset.sha256 == digest)
+            count = query.delete(synchronize_session=False)
+            db.commit()
+            return count
+        except Exception as e:
+            db.rollback()
+            log.warning(f"删除媒体缓存失败: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """清理已过期的记录，返回删除数"""
+        db = self.session_factory()
+        try:
+            count = db.query(MediaAsset).filter(
+                MediaAsset.expires_at.isnot(None),
+                MediaAsset.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.commit()
+            if count:
+                log.info(f"清理过期媒体缓存 {count} 条")
+            return count
+        except Exception as e:
+            db.rollback()
+            log.warning(f"清理过期媒体缓存失败: {e}")
+            return 0
+        finally:
+            db.close()
+
+    @staticmethod
+    def parse_upload_result(item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        从上传结果中提取 media_id、URL 和过期时间（兼容驼峰和下划线两种字段名）
+
+        过期时间支持 expires_in / expiresIn（秒）和 expires_at / expiresAt（ISO 时间或时间戳）
+
+        Returns:
+            Dict: {media_id, url, expires_at}，缺失的字段为 None
+        """
+        media_id = item.get("mediaId") or item.get("media_id")
+        url = item.get("url")
+
+        expires_at = None
+        expires_in = item.get("expiresIn") or item.get("expires_in")
+        raw_expires_at = item.get("expiresAt") or item.get("expires_at")
+        try:
+            if expires_in:
+                expires_at = datetime.utcnow() + timedelta(seconds=int(expires_in))
+            elif isinstance(raw_expires_at, (int, float)):
+                expires_at = datetime.utcfromtimestamp(raw_expires_at)
+            elif isinstance(raw_expires_at, str):
+                parsed = datetime.fromisoformat(raw_expires_at.replace("Z", "+00:00"))
+                if parsed.tzinfo is not None:
+                    parsed = datetime.utcfromtimestamp(parsed.timestamp())
+                expires_at = parsed
+        except (TypeError, ValueError, OverflowError, OSError):
+            log.warning(f"无法解析媒体过期时间: expires_in={expires_in}, expires_at={raw_expires_at}")
+
+        return {"media_id": media_id, "url": url, "expires_at": expires_at}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+# 全局服务实例
+media_cache_service = MediaCacheService()
@@ -42,7 +42,7 @@ class AsyncTaskMonitor:
 
             # 按状态统计
             status_counts = {}
-            for status in ['pending', 'submitted', 'processing', 'completed', 'failed', 'timeout', 'cancelled']:
+            for status in ['pending', 'claimed', 'submitted', 'processing', 'completed', 'failed', 'timeout', 'cancelled']:
                 count = db.query(func.count(ContentGenerationTask.id)).filter(
                     ContentGenerationTask.status == status
                 ).scalar()
@@ -69,7 +69,9 @@ class AsyncTaskMonitor:
             avg_duration = self._calculate_avg_duration(db, today)
 
             # 队列积压
-            pending_count = status_counts.get('pending', 0) + status_counts.get('submitted', 0)
+            pending_count = (
+                status_counts.get('pending', 0) + status_counts.get('claimed', 0) + status_counts.get('submitted', 0)
+            )
 
             # 失败率
             failed_rate = 0
@@ -135,7 +137,9 @@ class AsyncTaskMonitor:
         Returns:
             健康状态：healthy/warning/unhealthy
         """
-        pending_count = status_counts.get('pending', 0) + status_counts.get('submitted', 0)
+        pending_count = (
+            status_counts.get('pending', 0) + status_counts.get('claimed', 0) + status_counts.get('submitted', 0)
+        )
 
         # 健康判断逻辑
         if failed_rate > 20:
@@ -226,7 +230,7 @@ class AsyncTaskMonitor:
 
         try:
             tasks = db.query(ContentGenerationTask).filter(
-                ContentGenerationTask.status.in_(['pending', 'submitted'])
+                ContentGenerationTask.status.in_(['pending', 'claimed', 'submitted'])
             ).order_by(
                 ContentGenerationTask.priority.desc(),
                 ContentGenerationTask.created_at.asc()
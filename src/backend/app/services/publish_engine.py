@@ -0,0 +1,253 @@
+"""
+并发发布引擎
+多个账号的发布并行执行，同时限制：
+- 全局同时进行的发布数（PUBLISH_MAX_CONCURRENCY）
+- 同一账号同时只有一个发布在进行（微信接口配额按账号计算）
+- 每个账号的发布速率（令牌桶，PUBLISH_ACCOUNT_RATE_PER_MINUTE / PUBLISH_ACCOUNT_BURST）
+三项限制都保存在引擎实例上，对同一进程中的所有运行生效：调度器中的发布任务、发布池扫描
+和 Web 服务的批量发布（分别在不同的事件循环中运行）共用同一个全局引擎。
+每个发布完成后立即返回结果，积压内容的处理时间取决于账号数而不是文章数
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+)
+
+from app.core.config import settings
+from app.utils.custom_logger import log
+
+
+class TokenBucket:
+    """令牌桶（线程安全，调度器和 Web 服务的事件循环可以共用）"""
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        """
+        初始化令牌桶
+
+        Args:
+            rate_per_minute: 每分钟补充的令牌数（<= 0 表示不限速）
+            capacity: 令牌桶容量（允许的突发次数）
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预约一个令牌
+
+        Returns:
+            float: 需要等待的秒数（0 表示立即可用）
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # 令牌不足时预支，等待时间内补充的令牌归本次使用
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class PublishSlots:
+    """
+    发布名额（线程安全，调度器和 Web 服务的事件循环可以共用）
+
+    同时进行的发布数不超过 max_concurrency，同一账号同时只有一个发布。
+    等待名额的协程在各自的事件循环中挂起，名额释放时通过 call_soon_threadsafe 唤醒
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(max_concurrency, 1)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._accounts: Set[Hashable] = set()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self, account_key: Hashable) -> None:
+        """等待全局名额且该账号没有进行中的发布"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_concurrency and account_key not in self._accounts:
+                    self._in_flight += 1
+                    self._accounts.add(account_key)
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._waiters.remove((loop, waiter))
+                    except ValueError:
+                        pass
+                raise
+
+    def release(self, account_key: Hashable) -> None:
+        """释放名额并唤醒所有等待者重新检查"""
+        with self._lock:
+            self._in_flight -= 1
+            self._accounts.discard(account_key)
+            waiters, self._waiters = self._waiters, deque()
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # 等待者所在的事件循环已关闭
+                pass
+
+
+class PublishEngine:
+    """并发发布引擎"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        account_rate_per_minute: Optional[float] = None,
+        account_burst: Optional[int] = None
+    ):
+        """
+        初始化引擎
+
+        Args:
+            max_concurrency: 全局同时进行的发布数（默认 PUBLISH_MAX_CONCURRENCY）
+            account_rate_per_minute: 每个账号每分钟最多发布数（默认 PUBLISH_ACCOUNT_RATE_PER_MINUTE）
+            account_burst: 每个账号允许的突发发布数（默认 PUBLISH_ACCOUNT_BURST）
+        """
+        self.max_concurrency = max_concurrency or settings.PUBLISH_MAX_CONCURRENCY
+        self.account_rate_per_minute = (
+            settings.PUBLISH_ACCOUNT_RATE_PER_MINUTE
+            if account_rate_per_minute is None else account_rate_per_minute
+        )
+        self.account_burst = account_burst or settings.PUBLISH_ACCOUNT_BURST
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._lock = threading.Lock()
+        # 全局并发和账号互斥跨多次运行、跨事件循环共享
+        self._slots = PublishSlots(self.max_concurrency)
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._throttled = 0
+        self._throttle_wait = 0.0
+
+    def _get_bucket(self, account_key: Hashable) -> TokenBucket:
+        """获取账号的令牌桶（跨多次运行保留，限速对整个进程生效）"""
+        with self._lock:
+            bucket = self._buckets.get(account_key)
+            if bucket is None:
+                bucket = TokenBucket(self.account_rate_per_minute, self.account_burst)
+                self._buckets[account_key] = bucket
+            return bucket
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        key: Callable[[Any], Hashable],
+        publish: Callable[[Any], Awaitable[Any]]
+    ) -> AsyncIterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        并发发布，按完成顺序逐个返回结果
+
+        同一账号的条目按传入顺序依次发布，不同账号之间并行；全局并发上限和账号互斥
+        与同时进行的其他运行共同计算
+
+        Args:
+            items: 待发布条目（已按优先级排序）
+            key: 从条目取账号标识
+            publish: 发布单个条目的协程函数
+
+        Yields:
+            (条目, 发布结果, 异常)，发布抛出异常时结果为 None
+        """
+        # 按账号分组，保持每个账号内的顺序
+        groups: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+        for item in items:
+            groups.setdefault(key(item), []).append(item)
+
+        if not groups:
+            return
+
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def account_worker(account_key: Hashable, account_items: List[Any]):
+            bucket = self._get_bucket(account_key)
+            for item in account_items:
+                # 先等令牌再占用全局名额，限速等待不占用并发
+                wait_time = bucket.reserve()
+                if wait_time > 0:
+                    self._throttled += 1
+                    self._throttle_wait += wait_time
+                    log.info(f"账号 {account_key} 发布限速，等待 {wait_time:.1f}s")
+                    await asyncio.sleep(wait_time)
+
+                await self._slots.acquire(account_key)
+                self._peak_in_flight = max(self._peak_in_flight, self._slots.in_flight)
+                try:
+                    result = await publish(item)
+                    error = None
+                except Exception as e:
+                    log.error(f"发布异常 (账号 {account_key}): {str(e)}")
+                    result, error = None, e
+                    self._failed += 1
+                finally:
+                    self._slots.release(account_key)
+                    self._completed += 1
+                await results.put((item, result, error))
+
+        workers = [
+            asyncio.create_task(account_worker(account_key, account_items))
+            for account_key, account_items in groups.items()
+        ]
+        log.info(
+            f"并发发布开始: {sum(len(v) for v in groups.values())} 个条目, {len(groups)} 个账号, "
+            f"并发上限 {self.max_concurrency}"
+        )
+
+        try:
+            for _ in range(sum(len(v) for v in groups.values())):
+                yield await results.get()
+        finally:
+            # 调用方提前停止迭代时取消尚未完成的发布
+            for worker in workers:
+                if not worker.done():
+                    worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取引擎统计"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "account_rate_per_minute": self.account_rate_per_minute,
+            "account_burst": self.account_burst,
+            "accounts": len(self._buckets),
+            "in_flight": self._slots.in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "throttled": self._throttled,
+            "throttle_wait_seconds": round(self._throttle_wait, 2),
+        }
+
+
+# 全局引擎实例
+publish_engine = PublishEngine()
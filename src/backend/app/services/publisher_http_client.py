@@ -0,0 +1,137 @@
+"""
+Content-Publisher HTTP 客户端
+所有到 PUBLISHER_API_URL 的请求共用一个带连接池的 requests.Session，
+连接保持 keep-alive 并在请求之间复用，避免每次发布都重新建立 TCP/TLS 连接
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.utils.custom_logger import log
+
+
+class PublisherHttpClient:
+    """Content-Publisher HTTP 客户端（线程安全，懒加载）"""
+
+    def __init__(self, pool_maxsize: Optional[int] = None, pool_connections: Optional[int] = None):
+        """
+        初始化客户端
+
+        Args:
+            pool_maxsize: 每个主机保持的最大连接数（默认 PUBLISHER_HTTP_POOL_SIZE）
+            pool_connections: 缓存连接池的主机数（默认 PUBLISHER_HTTP_POOL_CONNECTIONS）
+        """
+        self.pool_maxsize = pool_maxsize or settings.PUBLISHER_HTTP_POOL_SIZE
+        self.pool_connections = pool_connections or settings.PUBLISHER_HTTP_POOL_CONNECTIONS
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        # 已关闭的连接池中累计的新建连接数和请求数
+        self._closed_connections = 0
+        self._closed_pool_requests = 0
+
+    @property
+    def session(self) -> requests.Session:
+        """获取共享会话（首次使用时创建）"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        max_retries=0  # 重试由 ContentPublisherService 负责
+                    )
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._adapter = adapter
+                    self._session = session
+                    log.info(f"Publisher HTTP 连接池已创建 (pool_maxsize={self.pool_maxsize})")
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        通过共享会话发送请求
+
+        Args:
+            method: HTTP 方法
+            url: 完整 URL
+            kwargs: requests 其他参数
+
+        Returns:
+            requests.Response
+        """
+        self._requests += 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self._errors += 1
+            raise
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """发送 POST 请求"""
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """关闭会话和池中的所有连接"""
+        with self._lock:
+            if self._session is None:
+                return
+            connections, pool_requests = self._pool_counters()
+            self._closed_connections += connections
+            self._closed_pool_requests += pool_requests
+            self._session.close()
+            self._session = None
+            self._adapter = None
+        log.info("Publisher HTTP 连接池已关闭")
+
+    def _pool_counters(self) -> tuple:
+        """汇总当前连接池的新建连接数和请求数"""
+        if self._adapter is None:
+            return 0, 0
+        connections = 0
+        pool_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, "num_connections", 0)
+            pool_requests += getattr(pool, "num_requests", 0)
+        return connections, pool_requests
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取连接复用统计
+
+        Returns:
+            requests: 发出的请求数
+            connections_opened: 新建的连接数（含 TLS 握手）
+            connections_reused: 复用已有连接的请求数
+            reuse_rate: 连接复用率
+        """
+        with self._lock:
+            connections, pool_requests = self._pool_counters()
+            connections += self._closed_connections
+            pool_requests += self._closed_pool_requests
+            active = self._session is not None
+
+        reused = max(pool_requests - connections, 0)
+        return {
+            "active": active,
+            "pool_maxsize": self.pool_maxsize,
+            "requests": self._requests,
+            "errors": self._errors,
+            "connections_opened": connections,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / pool_requests, 4) if pool_requests else 0.0,
+        }
+
+
+# 全局客户端实例
+publisher_http_client = PublisherHttpClient()
@@ -3,22 +3,37 @@
 
 提供任务执行器接口和任务调度功能
 """
-from typing import Optional, Dict, Any, Type, List
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Type, List, Coroutine, Deque
+from datetime import datetime, timedelta, timezone
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-import asyncio
 from functools import wraps
-
+import asyncio
+import threading
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
+from app.services.execution_history_service import ExecutionHistoryWriter
+from app.services.job_lock_service import JobLockService, lease_context
+from app.services.monitoring.scheduler_profiler import scheduler_profiler
 from app.utils.custom_logger import log
+from app.utils.event_loop import EventLoopThread
 
 
 class TaskStatus(str, Enum):
@@ -100,8 +115,25 @@ class TaskExecutor(ABC):
 
     所有具体的任务执行器（如内容生成执行器、发布执行器）都必须继承此类
     并实现 execute 方法
+
+    execute 在调度器共享的事件循环中运行，其中耗时的同步调用（同步 HTTP、子进程、
+    批量 SQL 等）必须通过 asyncio.to_thread 放到线程中执行，否则会阻塞所有其他任务
+
+    调度并发配置（为 None 时使用全局配置）:
+        max_workers: 该类型任务的工作线程数，即同时运行的上限
+            （SCHEDULER_EXECUTOR_POOLS 中的配置优先）
+        max_instances: 同一定时任务允许同时运行的实例数
+        coalesce: 错过的多次执行是否合并为一次
+        blocking: execute 本身是同步代码（不便逐段放到线程中）时设为 True，
+            此时不进入共享事件循环，而是在该类型线程池的工作线程自己的事件循环中执行，
+            只占用本类型的工作线程
     """
 
+    max_workers: Optional[int] = None
+    max_instances: Optional[int] = None
+    coalesce: Optional[bool] = None
+    blocking: bool = False
+
     @property
     @abstractmethod
     def executor_type(self) -> str:
@@ -159,6 +191,73 @@ class TaskExecutor(ABC):
         }
 
 
+# 增量同步时每次查询的任务数
+_SYNC_CHUNK_SIZE = 500
+# updated_at 精度（SQLite 为秒）及时钟偏差的容差
+_VERSION_SETTLE_SECONDS = 2
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """转换为不带时区的 UTC 时间（SQLite 返回的时间本身即为 UTC）"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class ExecutorPoolStats:
+    """
+    执行器类型对应的工作线程池状态
+
+    Attributes:
+        max_workers: 工作线程数
+        in_flight: 已提交到线程池、尚未结束的运行数
+        running: 正在执行的运行数
+        completed: 累计完成的运行数
+        skipped: 因达到 max_instances 被跳过的运行数
+        missed: 超过宽限时间被错过的运行数
+    """
+    max_workers: int
+    in_flight: int = 0
+    running: int = 0
+    completed: int = 0
+    skipped: int = 0
+    missed: int = 0
+
+    @property
+    def queued(self) -> int:
+        """排队等待工作线程的运行数"""
+        return max(self.in_flight - self.running, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "missed": self.missed
+        }
+
+
+class _TimedThreadPoolExecutor(ThreadPoolExecutor):
+    """记录每次提交的计划触发时间，任务包装器据此统计排队等待时间"""
+
+    def __init__(self, max_workers: int, scheduled_runs: Dict[str, Deque[datetime]]):
+        super().__init__(max_workers)
+        self._scheduled_runs = scheduled_runs
+
+    def submit_job(self, job, run_times):
+        runs = self._scheduled_runs.setdefault(job.id, deque())
+        runs.append(run_times[-1])
+        try:
+            super().submit_job(job, run_times)
+        except Exception:
+            # 达到 max_instances 等原因未能提交
+            runs.pop()
+            raise
+
+
 class SchedulerService:
     """
     任务调度服务
@@ -167,12 +266,46 @@ class SchedulerService:
     1. 管理任务执行器注册
     2. 调度和执行任务
     3. 记录任务执行历史
+
+    APScheduler 在工作线程中调用任务包装器，执行器协程统一提交到
+    一个长期运行的事件循环线程中执行，绑定在事件循环上的资源
+    （AsyncClient 连接池、限流器状态等）在多次运行之间得以复用。
+    声明 blocking 的执行器例外：在工作线程各自的长期事件循环中执行，
+    同步代码只阻塞本类型的工作线程，不会拖慢共享事件循环上的其他任务。
+
+    每种执行器类型使用独立的 APScheduler 线程池（别名即 executor_type），
+    慢任务只会占满自己的线程池，不会挤占其他类型任务的工作线程。
+
+    每次运行的耗时、数据库/外部 API 耗时和排队等待时间由 scheduler_profiler
+    按执行器类型汇总，见 /api/v1/system/metrics 中的 scheduler 字段。
     """
 
     def __init__(self):
         """初始化调度服务"""
         self.scheduler = BackgroundScheduler(timezone=settings.SCHEDULER_TIMEZONE)
         self.executors: Dict[str, TaskExecutor] = {}
+        self.event_loop = EventLoopThread(name="scheduler-event-loop")
+        # blocking 执行器使用的工作线程事件循环（每个线程一个）
+        self._worker_loops = threading.local()
+        self._worker_loop_list: List[asyncio.AbstractEventLoop] = []
+        self.history = ExecutionHistoryWriter()
+        self.job_locks = JobLockService()
+        self._pool_stats: Dict[str, ExecutorPoolStats] = {}
+        self._job_types: Dict[str, str] = {}
+        self._scheduled_runs: Dict[str, Deque[datetime]] = {}
+        self._stats_lock = threading.Lock()
+        self._pools_shutdown = False
+        # 已同步任务的版本（updated_at），用于增量同步
+        self._task_versions: Dict[int, Any] = {}
+        self._last_sync_at: Optional[datetime] = None
+        self._sync_lock = threading.RLock()
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR
+            | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED
+        )
         log.info("调度服务初始化完成")
 
     def register_executor(self, executor: TaskExecutor) -> None:
@@ -187,8 +320,59 @@ class SchedulerService:
             log.warning(f"执行器类型 '{executor_type}' 已存在，将被覆盖")
 
         self.executors[executor_type] = executor
+
+        # 为该类型创建独立的工作线程池（重复注册时沿用已有线程池）
+        if executor_type not in self._pool_stats:
+            max_workers = self._get_pool_size(executor)
+            self.scheduler.add_executor(
+                _TimedThreadPoolExecutor(max_workers, self._scheduled_runs), alias=executor_type
+            )
+            self._pool_stats[executor_type] = ExecutorPoolStats(max_workers=max_workers)
+
         log.info(f"注册任务执行器: {executor.get_executor_info()}")
 
+    def _get_pool_size(self, executor: TaskExecutor) -> int:
+        """执行器类型的工作线程数：配置覆盖 > 执行器声明 > 默认值"""
+        pool_size = settings.SCHEDULER_EXECUTOR_POOLS.get(executor.executor_type)
+        if pool_size is None:
+            pool_size = executor.max_workers or settings.SCHEDULER_POOL_SIZE
+        return max(int(pool_size), 1)
+
+    def _get_job_options(self, executor: TaskExecutor) -> Dict[str, Any]:
+        """生成 add_job 的并发相关参数"""
+        return {
+            "executor": executor.executor_type,
+            "max_instances": executor.max_instances or settings.SCHEDULER_MAX_INSTANCES,
+            "coalesce": settings.SCHEDULER_COALESCE if executor.coalesce is None else executor.coalesce,
+            "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_TIME,
+        }
+
+    def _on_job_event(self, event) -> None:
+        """根据 APScheduler 事件统计各线程池的排队和跳过情况"""
+        executor_type = self._job_types.get(event.job_id)
+        stats = self._pool_stats.get(executor_type)
+        if stats is None:
+            return
+
+        with self._stats_lock:
+            if event.code == EVENT_JOB_SUBMITTED:
+                stats.in_flight += 1
+            elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+                stats.in_flight = max(stats.in_flight - 1, 0)
+                stats.completed += 1
+            elif event.code == EVENT_JOB_MAX_INSTANCES:
+                stats.skipped += 1
+                log.warning(f"任务 {event.job_id} 仍在运行，已达到 max_instances，跳过本次执行")
+            elif event.code == EVENT_JOB_MISSED:
+                stats.missed += 1
+
+    def _track_running(self, executor_type: str, delta: int) -> None:
+        stats = self._pool_stats.get(executor_type)
+        if stats is None:
+            return
+        with self._stats_lock:
+            stats.running = max(stats.running + delta, 0)
+
     def get_executor(self, executor_type: str) -> Optional[TaskExecutor]:
         """
         获取指定类型的执行器
@@ -236,50 +420,127 @@ class SchedulerService:
         log.info(f"开始执行任务 {task_id} (类型: {task_type})")
         log.debug(f"任务参数: {task_params}")
 
-        try:
-            # 验证参数
-            if not executor.validate_params(task_params):
+        success = False
+        # 统计本次运行的数据库和外部 API 耗时，结束时计入该执行器类型的延迟分布
+        with scheduler_profiler.profile() as profile:
+            try:
+                # 验证参数
+                if not executor.validate_params(task_params):
+                    return TaskExecutionResult.failure_result(
+                        message="任务参数验证失败",
+                        error="InvalidParameters"
+                    )
+
+                # 执行任务
+                result = await executor.execute(task_id, task_params, db)
+                success = result.success
+
+                # 计算执行时长
+                duration = (datetime.now() - start_time).total_seconds()
+                result.duration = duration
+
+                # 记录执行结果
+                if result.success:
+                    log.info(f"任务 {task_id} 执行成功，耗时 {duration:.2f}秒")
+                    log.debug(f"执行结果: {result.message}")
+                else:
+                    log.error(f"任务 {task_id} 执行失败，耗时 {duration:.2f}秒")
+                    log.error(f"失败原因: {result.message}")
+                    if result.error:
+                        log.error(f"错误详情: {result.error}")
+
+                return result
+
+            except Exception as e:
+                # 计算执行时长
+                duration = (datetime.now() - start_time).total_seconds()
+
+                # 记录异常
+                error_msg = f"任务执行过程中发生异常: {str(e)}"
+                log.exception(f"任务 {task_id} 执行异常，耗时 {duration:.2f}秒")
+
                 return TaskExecutionResult.failure_result(
-                    message="任务参数验证失败",
-                    error="InvalidParameters"
+                    message=error_msg,
+                    error=str(e),
+                    duration=duration
                 )
 
-            # 执行任务
-            result = await executor.execute(task_id, task_params, db)
+            finally:
+                scheduler_profiler.record_run(
+                    task_type, (datetime.now() - start_time).total_seconds(), success, profile
+                )
 
-            # 计算执行时长
-            duration = (datetime.now() - start_time).total_seconds()
-            result.duration = duration
+    def run_coroutine(self, coro: Coroutine) -> Any:
+        """
+        在调度器的事件循环线程中执行协程并等待结果
 
-            # 记录执行结果
-            if result.success:
-                log.info(f"任务 {task_id} 执行成功，耗时 {duration:.2f}秒")
-                log.debug(f"执行结果: {result.message}")
-            else:
-                log.error(f"任务 {task_id} 执行失败，耗时 {duration:.2f}秒")
-                log.error(f"失败原因: {result.message}")
-                if result.error:
-                    log.error(f"错误详情: {result.error}")
+        供同步代码（任务包装器、手动触发）调用，不能在事件循环线程内部调用。
 
-            return result
+        Args:
+            coro: 协程对象
 
-        except Exception as e:
-            # 计算执行时长
-            duration = (datetime.now() - start_time).total_seconds()
+        Returns:
+            协程的返回值
+        """
+        return self.event_loop.run(coro)
+
+    def _get_worker_loop(self) -> asyncio.AbstractEventLoop:
+        """当前工作线程的事件循环（懒创建，线程存活期间复用）"""
+        loop = getattr(self._worker_loops, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self._worker_loops.loop = loop
+            with self._stats_lock:
+                self._worker_loop_list.append(loop)
+        return loop
+
+    def run_task_coroutine(self, task_type: str, coro: Coroutine) -> Any:
+        """
+        按执行器类型选择事件循环执行协程并等待结果
 
-            # 记录异常
-            error_msg = f"任务执行过程中发生异常: {str(e)}"
-            log.exception(f"任务 {task_id} 执行异常，耗时 {duration:.2f}秒")
+        blocking 执行器在当前线程自己的事件循环中执行，其他执行器提交到共享事件循环。
+        供同步代码（任务包装器、手动触发）调用。
 
-            return TaskExecutionResult.failure_result(
-                message=error_msg,
-                error=str(e),
-                duration=duration
-            )
+        Args:
+            task_type: 任务类型（对应执行器类型）
+            coro: 协程对象
+
+        Returns:
+            协程的返回值
+        """
+        executor = self.get_executor(task_type)
+        if executor is not None and executor.blocking:
+            return self.run_on_worker_loop(coro)
+        return self.run_coroutine(coro)
+
+    def run_on_worker_loop(self, coro: Coroutine) -> Any:
+        """
+        在当前线程自己的事件循环中执行协程（blocking 执行器使用）
+
+        供工作线程调用：调度器线程池的工作线程，或工作流步骤通过 asyncio.to_thread 使用的线程
+        """
+        return self._get_worker_loop().run_until_complete(coro)
+
+    def _close_worker_loops(self) -> None:
+        """关闭工作线程的事件循环（工作线程已退出或空闲时）"""
+        with self._stats_lock:
+            loops, self._worker_loop_list = self._worker_loop_list, []
+        for loop in loops:
+            if loop.is_running():
+                # shutdown(wait=False) 时仍在运行的任务结束后由线程回收
+                continue
+            loop.close()
 
     def start(self) -> None:
         """启动调度器"""
+        self.event_loop.start()
+        self.history.start()
+        if settings.SCHEDULER_LOCK_ENABLED:
+            self.job_locks.start()
+        self._start_sync_loop()
         if not self.scheduler.running:
+            if self._pools_shutdown:
+                self._recreate_pools()
             self.scheduler.start()
             log.info("调度器已启动")
         else:
@@ -292,12 +553,33 @@ class SchedulerService:
         Args:
             wait: 是否等待正在执行的任务完成
         """
+        self._stop_sync_loop()
         if self.scheduler.running:
             self.scheduler.shutdown(wait=wait)
+            self._pools_shutdown = True
             log.info(f"调度器已关闭 (wait={wait})")
         else:
             log.warning("调度器未运行")
 
+        # 调度器停止后再关闭事件循环，未完成的协程会被取消
+        self.event_loop.stop()
+        self._close_worker_loops()
+        # 写入缓冲区中剩余的执行记录
+        self.history.stop()
+        self.job_locks.stop()
+
+    def _recreate_pools(self) -> None:
+        """调度器关闭时线程池随之关闭，重新启动前为每种执行器类型换上新的线程池"""
+        for executor_type, stats in self._pool_stats.items():
+            self.scheduler.remove_executor(executor_type, shutdown=False)
+            self.scheduler.add_executor(
+                _TimedThreadPoolExecutor(stats.max_workers, self._scheduled_runs), alias=executor_type
+            )
+            stats.in_flight = 0
+            stats.running = 0
+        self._scheduled_runs.clear()
+        self._pools_shutdown = False
+
     @property
     def is_running(self) -> bool:
         """检查调度器是否正在运行"""
@@ -308,12 +590,20 @@ class SchedulerService:
         获取所有已注册的执行器信息
 
         Returns:
-            执行器信息字典 {executor_type: executor_info}
+            执行器信息字典 {executor_type: executor_info}，其中 pool 为线程池状态
+            （工作线程数、运行中、排队中、跳过次数等），另附 max_instances 和 coalesce
         """
-        return {
-            executor_type: executor.get_executor_info()
-            for executor_type, executor in self.executors.items()
-        }
+        executors = {}
+        for executor_type, executor in self.executors.items():
+            info = executor.get_executor_info()
+            job_options = self._get_job_options(executor)
+            info["max_instances"] = job_options["max_instances"]
+            info["coalesce"] = job_options["coalesce"]
+            stats = self._pool_stats.get(executor_type)
+            with self._stats_lock:
+                info["pool"] = stats.to_dict() if stats else None
+            executors[executor_type] = info
+        return executors
 
     def load_tasks_from_db(self, db: Session) -> int:
         """
@@ -325,33 +615,18 @@ class SchedulerService:
         Returns:
             int: 成功加载的任务数量
         """
-        from app.models.scheduler import ScheduledTask
-
         try:
-            # 查询所有启用的任务
-            active_tasks = db.query(ScheduledTask).filter(
-                ScheduledTask.is_active == True
-            ).all()
-
-            if not active_tasks:
+            # 清空已同步版本，所有启用的任务都会重新注册
+            with self._sync_lock:
+                self._task_versions.clear()
+                self._last_sync_at = None
+                result = self.sync_tasks(db)
+
+            loaded_count = result["added"] + result["updated"]
+            if loaded_count == 0 and result["failed"] == 0:
                 log.info("没有找到启用的定时任务")
-                return 0
-
-            loaded_count = 0
-            failed_count = 0
-
-            log.info(f"开始加载定时任务，共 {len(active_tasks)} 个任务")
-
-            for task in active_tasks:
-                try:
-                    self.register_scheduled_task(db, task)
-                    loaded_count += 1
-                    log.info(f"✓ 加载任务成功: {task.name} (ID: {task.id}, 类型: {task.task_type})")
-                except Exception as e:
-                    failed_count += 1
-                    log.error(f"✗ 加载任务失败: {task.name} (ID: {task.id}), 错误: {str(e)}")
-
-            log.info(f"定时任务加载完成: 成功 {loaded_count} 个, 失败 {failed_count} 个")
+            else:
+                log.info(f"定时任务加载完成: 成功 {loaded_count} 个, 失败 {result['failed']} 个")
             return loaded_count
 
         except Exception as e:
@@ -359,6 +634,136 @@ class SchedulerService:
             log.exception("Task loading error")
             return 0
 
+    # ==================== 增量同步 ====================
+
+    def sync_tasks(self, db: Session) -> Dict[str, int]:
+        """
+        按 scheduled_tasks.updated_at 增量同步调度器中的任务
+
+        只查询启用任务的 (id, updated_at)，与上次同步时记录的版本比较：
+        新增或变更的任务重新注册，禁用或删除的任务从调度器移除，
+        未变化的任务不做处理。下次运行时间在最后一次批量写回。
+
+        updated_at 在 SQLite 上只精确到秒，上次同步开始前后一秒内修改的任务
+        版本可能与已记录的相同，这些任务在本次同步中也会重新注册。
+
+        Args:
+            db: 数据库会话
+
+        Returns:
+            {"added": 新增数, "updated": 更新数, "removed": 移除数, "failed": 注册失败数}
+        """
+        from app.models.scheduler import ScheduledTask
+
+        with self._sync_lock:
+            sync_started_at = datetime.utcnow()
+            settle_after = None
+            if self._last_sync_at is not None:
+                settle_after = self._last_sync_at - timedelta(seconds=_VERSION_SETTLE_SECONDS)
+
+            rows = db.execute(
+                select(ScheduledTask.id, ScheduledTask.updated_at).where(ScheduledTask.is_active == True)
+            ).all()
+            current = {row.id: row.updated_at for row in rows}
+
+            # 已禁用或删除的任务
+            removed = [task_id for task_id in self._task_versions if task_id not in current]
+            for task_id in removed:
+                self.unregister_task(task_id)
+
+            changed = [
+                task_id for task_id, version in current.items()
+                if task_id not in self._task_versions
+                or self._task_versions[task_id] != version
+                or (settle_after is not None and version is not None and _as_utc(version) >= settle_after)
+            ]
+
+            added = updated = failed = 0
+            next_run_times: Dict[int, Any] = {}
+            for offset in range(0, len(changed), _SYNC_CHUNK_SIZE):
+                chunk = changed[offset:offset + _SYNC_CHUNK_SIZE]
+                for task in db.query(ScheduledTask).filter(ScheduledTask.id.in_(chunk)).all():
+                    is_new = task.id not in self._task_versions
+                    try:
+                        job = self._add_task_job(task)
+                        next_run_times[task.id] = self._job_next_run_time(job)
+                        if is_new:
+                            added += 1
+                        else:
+                            updated += 1
+                    except Exception as e:
+                        failed += 1
+                        log.error(f"✗ 同步任务失败: {task.name} (ID: {task.id}), 错误: {str(e)}")
+                        if not is_new:
+                            self.unregister_task(task.id)
+                    # 注册失败的任务同样记录版本，修改配置后再重试
+                    self._task_versions[task.id] = current[task.id]
+
+            self._write_next_run_times(db, next_run_times)
+            self._last_sync_at = sync_started_at
+
+        if added or updated or removed or failed:
+            log.info(
+                f"定时任务同步完成: 新增 {added} 个, 更新 {updated} 个, "
+                f"移除 {len(removed)} 个, 失败 {failed} 个"
+            )
+        return {"added": added, "updated": updated, "removed": len(removed), "failed": failed}
+
+    def _start_sync_loop(self) -> None:
+        """启动定时增量同步线程（SCHEDULER_SYNC_INTERVAL 为 0 时不启动）"""
+        if settings.SCHEDULER_SYNC_INTERVAL <= 0:
+            return
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return
+        self._sync_stop.clear()
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="scheduler-task-sync", daemon=True)
+        self._sync_thread.start()
+
+    def _stop_sync_loop(self, timeout: float = 10) -> None:
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            self._sync_thread.join(timeout)
+            self._sync_thread = None
+
+    def _sync_loop(self) -> None:
+        from app.db.database import SessionLocal
+
+        while not self._sync_stop.wait(settings.SCHEDULER_SYNC_INTERVAL):
+            db = SessionLocal()
+            try:
+                self.sync_tasks(db)
+            except Exception as e:
+                log.error(f"定时任务增量同步失败: {str(e)}")
+            finally:
+                db.close()
+
+    def _job_next_run_time(self, job) -> Optional[datetime]:
+        # 调度器启动前添加的任务尚未计算 next_run_time，按触发器推算
+        if hasattr(job, "next_run_time"):
+            return job.next_run_time
+        return job.trigger.get_next_fire_time(None, datetime.now(self.scheduler.timezone))
+
+    def _write_next_run_times(self, db: Session, next_run_times: Dict[int, Any]) -> None:
+        """批量写回任务的下次运行时间（不改变 updated_at，避免被当作配置变更）"""
+        from app.models.scheduler import ScheduledTask
+
+        values = [
+            {"task_key": task_id, "run_time": run_time}
+            for task_id, run_time in next_run_times.items()
+            if run_time is not None
+        ]
+        if not values:
+            return
+
+        table = ScheduledTask.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("task_key"))
+            .values(next_run_time=bindparam("run_time"), updated_at=table.c.updated_at),
+            values
+        )
+        db.commit()
+
     def register_scheduled_task(self, db: Session, task) -> bool:
         """
         注册单个定时任务到调度器
@@ -373,8 +778,6 @@ class SchedulerService:
         Raises:
             ValueError: 如果任务配置无效
         """
-        from app.models.scheduler import ScheduledTask
-
         # 验证任务配置
         if not task.cron_expression and not task.interval:
             raise ValueError(
@@ -387,6 +790,25 @@ class SchedulerService:
                 f"将优先使用 cron_expression"
             )
 
+        # 与增量同步互斥，避免同步过程中看到已添加调度但未记录版本的任务
+        with self._sync_lock:
+            job = self._add_task_job(task)
+            self._task_versions[task.id] = task.updated_at
+
+        # 更新任务的下次运行时间
+        next_run_time = self._job_next_run_time(job)
+        self._write_next_run_times(db, {task.id: next_run_time})
+
+        log.info(f"任务已注册到调度器: {task.name} (ID: {task.id}, 下次运行: {next_run_time})")
+        return True
+
+    def _add_task_job(self, task):
+        """
+        根据任务配置创建触发器并添加（或替换）调度任务
+
+        Raises:
+            ValueError: 找不到对应的执行器
+        """
         # 检查执行器是否存在
         executor = self.get_executor(task.task_type)
         if not executor:
@@ -409,26 +831,22 @@ class SchedulerService:
             interval_seconds = self._convert_interval_to_seconds(task.interval, task.interval_unit)
             trigger = IntervalTrigger(seconds=interval_seconds, timezone=settings.SCHEDULER_TIMEZONE)
             log.debug(f"使用间隔调度: {interval_seconds} 秒")
+        else:
+            raise ValueError(f"任务 '{task.name}' 必须配置 cron_expression 或 interval")
 
         # 添加任务到调度器
         try:
-            job = self.scheduler.add_job(
+            job_id = f"task_{task.id}"
+            self._job_types[job_id] = task.task_type
+            return self.scheduler.add_job(
                 task_wrapper,
                 trigger=trigger,
-                id=f"task_{task.id}",
+                id=job_id,
                 name=task.name,
                 replace_existing=True,
-                misfire_grace_time=300  # 错过执行时间的宽限时间（秒）
+                **self._get_job_options(executor)
             )
 
-            # 更新任务的下次运行时间
-            if job.next_run_time:
-                task.next_run_time = job.next_run_time
-                db.commit()
-
-            log.info(f"任务已注册到调度器: {task.name} (ID: {task.id}, 下次运行: {job.next_run_time})")
-            return True
-
         except Exception as e:
             log.error(f"注册任务到调度器失败: {task.name}, 错误: {str(e)}")
             raise
@@ -444,12 +862,15 @@ class SchedulerService:
             bool: 是否移除成功
         """
         job_id = f"task_{task_id}"
-        try:
-            self.scheduler.remove_job(job_id)
-            log.info(f"任务已从调度器移除: task_id={task_id}, job_id={job_id}")
-            return True
-        except Exception as e:
-            log.warning(f"移除任务失败: task_id={task_id}, 错误: {str(e)}")
+        with self._sync_lock:
+            self._task_versions.pop(task_id, None)
+            try:
+                self.scheduler.remove_job(job_id)
+                self._job_types.pop(job_id, None)
+                log.info(f"任务已从调度器移除: task_id={task_id}, job_id={job_id}")
+                return True
+            except Exception as e:
+                log.warning(f"移除任务失败: task_id={task_id}, 错误: {str(e)}")
             return False
 
     def get_scheduled_jobs(self) -> List[Dict[str, Any]]:
@@ -469,14 +890,42 @@ class SchedulerService:
             })
         return jobs
 
+    def _lock_hold_until(self, job_id: str) -> Optional[datetime]:
+        """
+        运行锁释放后保留到的时间（UTC）：该任务下一次触发前 1 秒
+
+        其他副本对本次触发的执行（时钟偏差导致稍晚触发）在此之前都取不到锁
+        """
+        job = self.scheduler.get_job(job_id)
+        if job is None:
+            return None
+        next_fire_time = job.trigger.get_next_fire_time(None, datetime.now(self.scheduler.timezone))
+        if next_fire_time is None:
+            return None
+        return next_fire_time.astimezone(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+
+    def _record_queue_wait(self, job_id: str, executor_type: str) -> None:
+        """统计本次运行从计划触发时间到工作线程开始执行之间的等待时间"""
+        runs = self._scheduled_runs.get(job_id)
+        if not runs:
+            # 直接调用包装器（未经线程池提交）时没有计划触发时间
+            return
+        try:
+            scheduled_at = runs.popleft()
+        except IndexError:
+            return
+        wait = (datetime.now(timezone.utc) - scheduled_at).total_seconds()
+        scheduler_profiler.record_queue_wait(executor_type, wait)
+
     def _create_task_wrapper(self, task_id: int, task_type: str, task_name: str):
         """
         创建任务包装器函数
 
         任务包装器负责：
+        0. 多副本部署时取得该任务的运行锁，取不到时跳过本次执行
         1. 创建独立的数据库会话
-        2. 调用执行器执行任务
-        3. 更新任务执行记录
+        2. 调用执行器执行任务（执行器在有副作用的写入前通过 ensure_lease_current() 校验运行锁）
+        3. 将执行记录交给执行历史写入器批量写入，运行期间锁被其他副本接管时丢弃执行记录
         4. 处理异常并记录日志
 
         Args:
@@ -491,10 +940,21 @@ class SchedulerService:
         def task_wrapper():
             """同步任务包装器（APScheduler 调用）"""
             from app.db.database import SessionLocal
-            from app.models.scheduler import ScheduledTask, TaskExecution
+            from app.models.scheduler import ScheduledTask
+
+            job_id = f"task_{task_id}"
+            self._record_queue_wait(job_id, task_type)
+
+            lease = None
+            if settings.SCHEDULER_LOCK_ENABLED:
+                lease = self.job_locks.acquire(job_id)
+                if lease is None:
+                    log.info(f"任务本次触发已由其他副本执行，跳过: {task_name} (ID: {task_id})")
+                    return
 
             db = None
-            execution_record = None
+            run = None
+            self._track_running(task_type, 1)
 
             try:
                 # 1. 创建数据库会话
@@ -506,88 +966,72 @@ class SchedulerService:
                     log.error(f"任务不存在: task_id={task_id}")
                     return
 
-                # 3. 创建执行记录
-                execution_record = TaskExecution(
-                    task_id=task_id,
-                    status="running",
-                    start_time=datetime.now()
-                )
-                db.add(execution_record)
-                db.commit()
-                db.refresh(execution_record)
+                # 3. 登记执行记录（运行中的记录只保存在内存中，结束后批量写入）
+                run = self.history.begin(task_id, task_type)
 
-                log.info(
-                    f"开始执行定时任务: {task_name} (ID: {task_id}, "
-                    f"执行记录ID: {execution_record.id})"
-                )
+                fencing_token = lease.fencing_token if lease else "-"
+                log.info(f"开始执行定时任务: {task_name} (ID: {task_id}, fencing_token: {fencing_token})")
 
                 # 4. 提取任务参数（从 task_params 或其他配置）
                 task_params = self._extract_task_params(db, task)
 
-                # 5. 调用异步执行器
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-                try:
-                    result = loop.run_until_complete(
-                        self.execute_task(task_id, task_type, task_params, db)
+                # 5. 调用异步执行器（blocking 执行器在本工作线程中执行，其他在共享事件循环中执行），
+                #    运行锁随上下文传入执行器
+                with lease_context(lease):
+                    result = self.run_task_coroutine(
+                        task_type, self.execute_task(task_id, task_type, task_params, db)
                     )
-                finally:
-                    loop.close()
-
-                # 6. 更新执行记录
-                execution_record.end_time = datetime.now()
-                execution_record.duration = int(
-                    (execution_record.end_time - execution_record.start_time).total_seconds()
-                )
-
-                if result.success:
-                    execution_record.status = "success"
-                    execution_record.result = result.to_dict()
-                    # 更新任务的最后运行时间
-                    task.last_run_time = execution_record.end_time
 
+                # 6. 记录执行结果（成功时由写入器一并更新任务的最后运行时间）
+                if self._lease_lost(lease):
+                    # 已由接管的副本执行并记录，本副本的结果不再写入
+                    self.history.discard(run)
+                elif result.success:
+                    self.history.finish(run, "success", result=result.to_dict())
                     log.info(
                         f"任务执行成功: {task_name} (ID: {task_id}, "
                         f"耗时: {result.duration:.2f}秒)"
                     )
                 else:
-                    execution_record.status = "failed"
-                    execution_record.error_message = result.message
-                    execution_record.result = result.to_dict()
-
+                    self.history.finish(run, "failed", error_message=result.message, result=result.to_dict())
                     log.error(
                         f"任务执行失败: {task_name} (ID: {task_id}), "
                         f"原因: {result.message}"
                     )
 
-                db.commit()
-
             except Exception as e:
                 error_msg = f"任务包装器执行异常: {str(e)}"
                 log.error(f"{error_msg}")
                 log.exception("Task wrapper exception")
 
-                # 更新执行记录为失败
-                if execution_record and db:
-                    try:
-                        execution_record.end_time = datetime.now()
-                        execution_record.duration = int(
-                            (execution_record.end_time - execution_record.start_time).total_seconds()
-                        )
-                        execution_record.status = "failed"
-                        execution_record.error_message = error_msg
-                        db.commit()
-                    except Exception as commit_error:
-                        log.error(f"更新执行记录失败: {str(commit_error)}")
+                # 记录执行失败
+                if run:
+                    if self._lease_lost(lease):
+                        self.history.discard(run)
+                    else:
+                        self.history.finish(run, "failed", error_message=error_msg)
 
             finally:
+                self._track_running(task_type, -1)
                 # 关闭数据库会话
                 if db:
                     db.close()
+                if lease:
+                    if lease.lost:
+                        log.warning(f"任务运行期间运行锁被其他副本接管: {task_name} (ID: {task_id})")
+                    else:
+                        self.job_locks.release(lease, self._lock_hold_until(job_id))
 
         return task_wrapper
 
+    def _lease_lost(self, lease) -> bool:
+        """运行锁是否已被其他副本接管（未启用运行锁时为 False）"""
+        if lease is None:
+            return False
+        if not lease.lost and not self.job_locks.is_current(lease):
+            lease.lost = True
+        return lease.lost
+
     def _extract_task_params(self, db: Session, task) -> Dict[str, Any]:
         """
         从任务配置中提取参数
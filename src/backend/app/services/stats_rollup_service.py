@@ -0,0 +1,137 @@
+"""
+统计汇总服务
+负责按天重算 daily_stats 汇总行
+
+汇总行平时由写入时的 ORM 事件增量维护（见 app.models.stats），
+这里的重算用于修正批量 update/delete 等绕过 ORM 事件造成的偏差，
+以及为已有数据库回填历史汇总。
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.types import timestamp_literal
+from app.models.content import Content
+from app.models.publisher import PublishLog
+from app.models.stats import CONTENT_PLATFORM, DailyStat
+from app.utils.custom_logger import log
+
+
+def _as_date(value: Any) -> date:
+    # SQLite 的 date() 返回字符串，其他数据库返回 date
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+class StatsRollupService:
+    """统计汇总服务"""
+
+    @staticmethod
+    def refresh_range(db: Session, start: date, end: date) -> int:
+        """
+        重算 [start, end] 日期范围内的汇总行
+
+        Args:
+            db: 数据库会话
+            start: 起始日期（含）
+            end: 结束日期（含）
+
+        Returns:
+            写入的汇总行数
+        """
+        # 用时间范围过滤而不是 date(created_at)，以便使用 created_at 索引
+        lower = timestamp_literal(datetime.combine(start, time.min))
+        upper = timestamp_literal(datetime.combine(end + timedelta(days=1), time.min))
+
+        rows: Dict[Tuple[date, str], Dict[str, int]] = {}
+
+        def row(stat_date: Any, platform: str) -> Dict[str, int]:
+            key = (_as_date(stat_date), platform)
+            return rows.setdefault(key, {
+                "content_created": 0,
+                "publish_total": 0,
+                "publish_success": 0,
+                "publish_failed": 0,
+            })
+
+        content_day = func.date(Content.created_at)
+        for stat_date, count in db.execute(
+            select(content_day, func.count())
+            .where(Content.created_at >= lower, Content.created_at < upper)
+            .group_by(content_day)
+        ):
+            row(stat_date, CONTENT_PLATFORM)["content_created"] = count
+
+        publish_day = func.date(PublishLog.created_at)
+        for stat_date, platform, total, success, failed in db.execute(
+            select(
+                publish_day,
+                PublishLog.platform,
+                func.count(),
+                func.sum(case((PublishLog.status == "success", 1), else_=0)),
+                func.sum(case((PublishLog.status == "failed", 1), else_=0)),
+            )
+            .where(PublishLog.created_at >= lower, PublishLog.created_at < upper)
+            .group_by(publish_day, PublishLog.platform)
+        ):
+            counters = row(stat_date, platform or CONTENT_PLATFORM)
+            counters["publish_total"] += total
+            counters["publish_success"] += success or 0
+            counters["publish_failed"] += failed or 0
+
+        db.execute(delete(DailyStat).where(DailyStat.stat_date >= start, DailyStat.stat_date <= end))
+        if rows:
+            db.execute(insert(DailyStat), [
+                {"stat_date": stat_date, "platform": platform, **counters}
+                for (stat_date, platform), counters in rows.items()
+            ])
+        db.commit()
+
+        log.info(f"Daily stats refreshed: {start} ~ {end}, {len(rows)} rows")
+        return len(rows)
+
+    @staticmethod
+    def refresh_recent(db: Session, days: Optional[int] = None) -> int:
+        """
+        重算最近几天（含今天）的汇总行
+
+        Args:
+            db: 数据库会话
+            days: 重算天数，默认 STATS_ROLLUP_DAYS
+        """
+        days = days or settings.STATS_ROLLUP_DAYS
+        today = datetime.utcnow().date()
+        return StatsRollupService.refresh_range(db, today - timedelta(days=days - 1), today)
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        从最早的记录开始重建全部汇总行
+        """
+        bounds = [
+            value
+            for model in (Content, PublishLog)
+            for value in db.execute(
+                select(func.min(model.created_at), func.max(model.created_at))
+            ).one()
+            if value is not None
+        ]
+
+        db.execute(delete(DailyStat))
+        db.commit()
+        if not bounds:
+            return 0
+
+        # 只取日期部分，兼容 SQLite 返回的字符串
+        dates = [_as_date(str(value)[:10]) for value in bounds]
+        return StatsRollupService.refresh_range(
+            db, min(dates), max(max(dates), datetime.utcnow().date())
+        )
+
+
+# 全局服务实例
+stats_rollup_service = StatsRollupService()
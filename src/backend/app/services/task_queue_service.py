@@ -1,20 +1,172 @@
 """
 任务队列服务
-提供内存任务队列和多线程 Worker 处理机制
+提供持久化任务队列（基于 content_generation_tasks 表）、内存任务队列和多线程 Worker 处理机制
+
+持久化队列中 status 为 pending 的任务即为排队中的任务。Worker 通过条件更新原子地领取任务
+（pending → claimed），领取后在可见性超时内确认（ack）或退回（nack）；Worker 崩溃未确认的任务
+在租约到期后重新可被领取。所有 Worker（包括其他副本中的 Worker）共享同一个队列，不会重复处理。
+
+空闲的 Worker 阻塞在 TaskQueueNotifier 上，任务入队时立即被唤醒；启用 Redis 时通过 pub/sub
+唤醒其他进程中的 Worker。数据库轮询只作为间隔较长的兜底（TASK_QUEUE_POLL_INTERVAL）。
 """
-import subprocess
+import json
+import os
+import socket
 import threading
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from queue import Queue, Empty
-from typing import Optional
+from typing import Callable, Optional, Union
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session, object_session
 
 from app.core.config import settings
 from app.db.database import SessionLocal
 from app.models import ContentGenerationTask
+from app.services.async_content_generation_service import AsyncContentGenerationService
 from app.utils.custom_logger import log
 
 
+class TaskQueueNotifier:
+    """
+    任务入队通知
+
+    进程内使用条件变量：notify 累加待处理信号并唤醒等待的 Worker，wait 消费一个信号，
+    超时前没有信号时返回 False（Worker 随后做一次兜底轮询）。
+    启用 Redis 时 notify 同时广播到 pub/sub 频道，其他进程的订阅线程收到后唤醒本进程的 Worker。
+    Redis 不可用时只在进程内通知。
+    """
+
+    def __init__(self, client=None, channel: str = "contenthub:task_queue:wakeup"):
+        """
+        Args:
+            client: Redis 客户端，None 时只在进程内通知
+            channel: pub/sub 频道名
+        """
+        self.client = client
+        self.channel = channel
+        self.origin = f"{socket.gethostname()}:{os.getpid()}"
+        self._condition = threading.Condition()
+        self._signals = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = {"notified": 0, "wakeups": 0, "timeouts": 0, "received": 0, "errors": 0}
+
+    def notify(self, count: int = 1, broadcast: bool = True):
+        """
+        通知有 count 个新任务入队
+
+        Args:
+            count: 新任务数
+            broadcast: 是否广播到其他进程
+        """
+        with self._condition:
+            self._signals += count
+            self._stats["notified"] += count
+            self._condition.notify(count)
+
+        if broadcast and self.client is not None:
+            try:
+                self.client.publish(self.channel, json.dumps({"origin": self.origin, "count": count}))
+            except Exception as e:
+                self._stats["errors"] += 1
+                log.warning(f"广播任务入队通知失败: {e}")
+
+    def wait(self, timeout: Optional[float] = None, stopped: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        等待入队通知
+
+        Args:
+            timeout: 最长等待时间（秒）
+            stopped: 持锁检查的停止条件，成立时不再等待（避免错过 wake_all）
+
+        Returns:
+            收到通知返回 True，超时返回 False
+        """
+        with self._condition:
+            if self._signals == 0 and not (stopped and stopped()):
+                self._condition.wait(timeout)
+            if self._signals > 0:
+                self._signals -= 1
+                self._stats["wakeups"] += 1
+                return True
+            self._stats["timeouts"] += 1
+            return False
+
+    def wake_all(self):
+        """唤醒所有等待中的 Worker（停止时使用，不产生信号）"""
+        with self._condition:
+            self._condition.notify_all()
+
+    def start(self):
+        """启动跨进程通知的订阅线程（没有 Redis 客户端时不启动）"""
+        if self.client is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._listen_loop, name="task-queue-notifier", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止订阅线程"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def get_stats(self) -> dict:
+        with self._condition:
+            return {**self._stats, "pending_signals": self._signals, "distributed": self.client is not None}
+
+    def _handle_message(self, data):
+        """处理其他进程的入队通知，忽略本进程发出的消息"""
+        try:
+            message = json.loads(data.decode() if isinstance(data, bytes) else data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin:
+            return
+        self._stats["received"] += 1
+        self.notify(int(message.get("count") or 1), broadcast=False)
+
+    def _listen_loop(self):
+        backoff = 1
+        while not self._stop_event.is_set():
+            pubsub = None
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = 1
+                while not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._handle_message(message.get("data"))
+            except Exception as e:
+                self._stats["errors"] += 1
+                log.warning(f"任务入队通知订阅连接异常，{backoff} 秒后重连: {e}")
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+def _create_notifier() -> TaskQueueNotifier:
+    """创建全局通知器，启用 Redis 时跨进程广播"""
+    client = None
+    if settings.REDIS_ENABLED:
+        from app.core.cache import MockRedisClient, redis_client
+        if redis_client is not None and not isinstance(redis_client, MockRedisClient):
+            client = redis_client
+    return TaskQueueNotifier(client=client)
+
+
+# 全局任务入队通知器
+task_queue_notifier = _create_notifier()
+
+
 class MemoryTaskQueue:
     """内存任务队列（降级方案）"""
 
@@ -27,6 +179,7 @@ class MemoryTaskQueue:
         """
         self.queue = Queue(maxsize=maxsize)
         self._lock = threading.Lock()
+        self.notifier = task_queue_notifier
 
     def put(self, task: ContentGenerationTask, block: bool = False, timeout: Optional[float] = None) -> bool:
         """
@@ -42,9 +195,10 @@ class MemoryTaskQueue:
         """
         try:
             self.queue.put(task, block=block, timeout=timeout)
-            return True
         except:
             return False  # 队列已满
+        self.notifier.notify(broadcast=False)
+        return True
 
     def get(self, block: bool = False, timeout: Optional[float] = None) -> Optional[ContentGenerationTask]:
         """
@@ -78,46 +232,293 @@ class MemoryTaskQueue:
         """等待所有任务完成"""
         self.queue.join()
 
+    def claim(self, worker_id: str) -> Optional[ContentGenerationTask]:
+        """领取一个任务（内存队列中取出即领取，没有可见性超时）"""
+        return self.get(block=False)
+
+    def ack(self, task: ContentGenerationTask, worker_id: str) -> bool:
+        """确认任务处理完成"""
+        self.task_done()
+        return True
+
+    def nack(
+        self,
+        task: ContentGenerationTask,
+        worker_id: str,
+        error: Optional[str] = None,
+        delay: Optional[float] = None
+    ) -> bool:
+        """处理失败，任务放回队列末尾"""
+        self.task_done()
+        return self.put(task, block=False)
+
+
+class DatabaseTaskQueue:
+    """
+    持久化任务队列
+
+    以 content_generation_tasks 表为队列：
+    1. put：任务置为 pending，按 priority 降序、created_at 升序出队
+    2. claim：条件更新 pending（或租约已过期的 claimed）→ claimed，受影响行数为 1 才算领取成功，
+       多个 Worker 并发领取同一任务时只有一个成功
+    3. ack：处理完成，清除领取信息
+    4. nack：处理失败，按领取次数延迟后重新入队；超过 max_retries 次重试后置为 failed
+    """
+
+    # 每次领取时尝试的候选任务数（并发领取冲突时依次尝试下一个）
+    CLAIM_CANDIDATES = 5
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        visibility_timeout: Optional[int] = None,
+        retry_delay: Optional[int] = None,
+        notifier: Optional[TaskQueueNotifier] = None
+    ):
+        """
+        初始化队列
+
+        Args:
+            session_factory: 数据库会话工厂（默认 SessionLocal）
+            visibility_timeout: 领取后未确认的任务重新可见的时间（秒）
+            retry_delay: 处理失败后重新入队的基础延迟（秒）
+            notifier: 入队通知器（默认全局 task_queue_notifier）
+        """
+        self.session_factory = session_factory or SessionLocal
+        self.notifier = notifier or task_queue_notifier
+        self.visibility_timeout = visibility_timeout if visibility_timeout is not None else settings.TASK_QUEUE_VISIBILITY_TIMEOUT
+        self.retry_delay = retry_delay if retry_delay is not None else settings.TASK_QUEUE_RETRY_DELAY
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """可领取的条件：到达可用时间的 pending 任务，或租约已过期的 claimed 任务"""
+        return or_(
+            and_(
+                ContentGenerationTask.status == "pending",
+                or_(ContentGenerationTask.available_at.is_(None), ContentGenerationTask.available_at <= now)
+            ),
+            and_(
+                ContentGenerationTask.status == "claimed",
+                ContentGenerationTask.lease_expires_at < now
+            )
+        )
+
+    def put(self, task: Union[ContentGenerationTask, str], block: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        任务入队（置为 pending）
+
+        Args:
+            task: 任务对象或任务ID
+            block: 兼容内存队列的参数，持久化队列不会满
+            timeout: 同上
+
+        Returns:
+            是否成功入队（任务不存在时返回 False）
+        """
+        task_id = task if isinstance(task, str) else task.task_id
+        db = self.session_factory()
+        try:
+            updated = db.execute(
+                update(ContentGenerationTask)
+                .where(ContentGenerationTask.task_id == task_id)
+                .values(status="pending", claimed_by=None, lease_expires_at=None, available_at=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+
+        if updated == 1:
+            self.notifier.notify()
+        return updated == 1
+
+    def claim(self, worker_id: str) -> Optional[ContentGenerationTask]:
+        """
+        原子地领取优先级最高的任务
+
+        Args:
+            worker_id: Worker 标识（确认/退回时用于校验领取者）
+
+        Returns:
+            已领取的任务（与会话分离），没有可领取的任务时返回 None
+        """
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            candidates = db.query(ContentGenerationTask.id).filter(
+                self._claimable(now)
+            ).order_by(
+                ContentGenerationTask.priority.desc(),
+                ContentGenerationTask.created_at.asc(),
+                ContentGenerationTask.id.asc()
+            ).limit(self.CLAIM_CANDIDATES).all()
+
+            for (candidate_id,) in candidates:
+                claimed = db.execute(
+                    update(ContentGenerationTask)
+                    .where(ContentGenerationTask.id == candidate_id, self._claimable(now))
+                    .values(
+                        status="claimed",
+                        claimed_by=worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.visibility_timeout),
+                        delivery_count=func.coalesce(ContentGenerationTask.delivery_count, 0) + 1
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+
+                if claimed == 1:
+                    task = db.query(ContentGenerationTask).filter(ContentGenerationTask.id == candidate_id).first()
+                    db.expunge(task)
+                    log.debug(f"{worker_id} claimed task {task.task_id} (delivery {task.delivery_count})")
+                    return task
+
+            return None
+        finally:
+            db.close()
+
+    def ack(self, task: ContentGenerationTask, worker_id: str) -> bool:
+        """
+        确认任务处理完成（任务状态由处理过程更新），清除领取信息
+
+        Returns:
+            任务仍由该 Worker 领取时返回 True
+        """
+        db = self.session_factory()
+        try:
+            updated = db.execute(
+                update(ContentGenerationTask)
+                .where(ContentGenerationTask.task_id == task.task_id, ContentGenerationTask.claimed_by == worker_id)
+                .values(claimed_by=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            return updated == 1
+        finally:
+            db.close()
+
+    def nack(
+        self,
+        task: ContentGenerationTask,
+        worker_id: str,
+        error: Optional[str] = None,
+        delay: Optional[float] = None
+    ) -> bool:
+        """
+        任务处理失败：延迟后重新入队，领取次数超过 max_retries + 1 时置为 failed
+
+        Args:
+            task: 任务对象
+            worker_id: Worker 标识
+            error: 错误信息
+            delay: 重新入队的延迟（秒），默认按领取次数指数退避
+
+        Returns:
+            任务仍由该 Worker 领取时返回 True
+        """
+        db = self.session_factory()
+        try:
+            current = db.query(ContentGenerationTask).filter(
+                ContentGenerationTask.task_id == task.task_id,
+                ContentGenerationTask.status == "claimed",
+                ContentGenerationTask.claimed_by == worker_id
+            ).first()
+            if not current:
+                return False
+
+            deliveries = current.delivery_count or 1
+            current.claimed_by = None
+            current.lease_expires_at = None
+            current.error_message = error
+
+            if deliveries > (current.max_retries or 0):
+                current.status = "failed"
+                current.completed_at = datetime.utcnow()
+                log.warning(f"Task {current.task_id} failed after {deliveries} deliveries: {error}")
+            else:
+                if delay is None:
+                    delay = self.retry_delay * (2 ** (deliveries - 1))
+                current.status = "pending"
+                current.available_at = datetime.utcnow() + timedelta(seconds=delay)
+                log.info(f"Task {current.task_id} requeued after {delay}s (delivery {deliveries})")
+
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+    def size(self) -> int:
+        """排队中（pending）的任务数"""
+        db = self.session_factory()
+        try:
+            return db.query(func.count(ContentGenerationTask.id)).filter(
+                ContentGenerationTask.status == "pending"
+            ).scalar()
+        finally:
+            db.close()
+
+    def empty(self) -> bool:
+        """队列是否为空"""
+        return self.size() == 0
+
 
 class TaskQueueFactory:
     """任务队列工厂"""
 
     @staticmethod
-    def create_queue(maxsize: int = 100) -> MemoryTaskQueue:
+    def create_queue(
+        maxsize: int = 100,
+        backend: Optional[str] = None
+    ) -> Union[DatabaseTaskQueue, MemoryTaskQueue]:
         """
-        创建任务队列（当前只实现内存队列）
+        创建任务队列
 
         Args:
-            maxsize: 队列最大容量
+            maxsize: 队列最大容量（仅内存队列）
+            backend: database/memory，默认 TASK_QUEUE_BACKEND
 
         Returns:
-            MemoryTaskQueue 实例
+            DatabaseTaskQueue 或 MemoryTaskQueue 实例
 
         Note:
-            未来可以扩展 Redis 队列实现分布式任务队列
+            内存队列只在单个进程内有效，多个 Worker 需要共享同一个实例
         """
-        return MemoryTaskQueue(maxsize=maxsize)
+        backend = backend or settings.TASK_QUEUE_BACKEND
+        if backend == "memory":
+            return MemoryTaskQueue(maxsize=maxsize)
+        return DatabaseTaskQueue()
 
 
 class TaskWorker:
     """任务执行器（Worker）"""
 
-    def __init__(self, worker_id: int, num_workers: int = 3, poll_interval: int = 5):
+    def __init__(
+        self,
+        worker_id: int,
+        num_workers: int = 3,
+        poll_interval: Optional[int] = None,
+        queue: Optional[Union[DatabaseTaskQueue, MemoryTaskQueue]] = None
+    ):
         """
         初始化 Worker
 
         Args:
             worker_id: Worker ID
             num_workers: Worker 总数
-            poll_interval: 轮询间隔（秒）
+            poll_interval: 没有收到入队通知时兜底轮询的间隔（秒），默认 TASK_QUEUE_POLL_INTERVAL
+            queue: 共享的任务队列（默认按 TASK_QUEUE_BACKEND 创建）
         """
         self.worker_id = worker_id
         self.num_workers = num_workers
-        self.poll_interval = poll_interval
-        self.queue = TaskQueueFactory.create_queue()
+        self.poll_interval = poll_interval or settings.TASK_QUEUE_POLL_INTERVAL
+        self.queue = queue or TaskQueueFactory.create_queue()
+        self.notifier: TaskQueueNotifier = self.queue.notifier
+        # 领取任务时记录的 Worker 标识，多副本部署时也唯一
+        instance_id = settings.SCHEDULER_INSTANCE_ID or f"{socket.gethostname()}:{os.getpid()}"
+        self.consumer_id = f"{instance_id}:worker-{worker_id}"
+        self.current_task: Optional[str] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
-        self.db_session = None
 
     def start(self):
         """启动 Worker"""
@@ -141,6 +542,8 @@ class TaskWorker:
             return
 
         self.running = False
+        # 唤醒阻塞在入队通知上的 Worker
+        self.notifier.wake_all()
 
         if self.thread:
             self.thread.join(timeout=5)
@@ -155,139 +558,79 @@ class TaskWorker:
 
         while self.running:
             try:
-                # 1. 从队列获取任务
-                task = self.queue.get(block=False)
+                # 1. 从共享队列领取任务
+                task = self.queue.claim(self.consumer_id)
 
                 if task:
-                    # 2. 处理任务
+                    # 2. 处理任务（处理结果确认或退回队列），随后立即领取下一个
                     self._process_task(task)
-                    self.queue.task_done()
                 else:
-                    # 3. 队列为空，从数据库拉取待处理任务
-                    self._fetch_pending_tasks()
-
-                    # 4. 休眠一段时间
-                    time.sleep(self.poll_interval)
+                    # 3. 队列为空，等待入队通知；超时后兜底轮询一次数据库
+                    self.notifier.wait(self.poll_interval, stopped=self._stopped)
 
             except Exception as e:
                 log.error(f"Error in TaskWorker-{self.worker_id} loop: {e}", exc_info=True)
-                time.sleep(self.poll_interval)
+                # 出错后退避，停止时可被唤醒
+                self.notifier.wait(min(self.poll_interval, 5), stopped=self._stopped)
 
         log.info(f"TaskWorker-{self.worker_id} exited loop")
 
+    def _stopped(self) -> bool:
+        return not self.running
+
     def _process_task(self, task: ContentGenerationTask):
         """
-        处理单个任务
+        处理单个已领取的任务：成功后确认（ack），失败时退回队列（nack）
 
         Args:
             task: 任务对象
         """
         db = SessionLocal()
+        self.current_task = task.task_id
         try:
             log.info(f"TaskWorker-{self.worker_id} processing task {task.task_id}")
 
             # 重新查询任务（确保是最新的）
-            task = db.query(ContentGenerationTask).filter_by(task_id=task.task_id).first()
-            if not task:
+            current = db.query(ContentGenerationTask).filter_by(task_id=task.task_id).first()
+            if not current:
                 log.warning(f"Task {task.task_id} not found in database")
                 return
 
-            # 检查任务状态
-            if task.status != "pending":
-                log.warning(f"Task {task.task_id} is not in pending status: {task.status}")
+            # 持久化队列中任务必须仍由本 Worker 领取（租约过期后可能已被其他 Worker 领取）
+            if isinstance(self.queue, DatabaseTaskQueue) and current.claimed_by != self.consumer_id:
+                log.warning(f"Task {task.task_id} is no longer claimed by {self.consumer_id}: {current.status}")
                 return
 
-            # 提交到 content-creator CLI
-            self._submit_to_creator(task)
+            # 提交到 content-creator
+            self._submit_to_creator(current)
+            db.commit()
+            self.queue.ack(current, self.consumer_id)
 
             log.info(f"TaskWorker-{self.worker_id} submitted task {task.task_id}")
 
         except Exception as e:
+            db.rollback()
             log.error(f"Error processing task {task.task_id}: {e}", exc_info=True)
-
-            # 更新任务状态为失败
-            task.status = "failed"
-            task.error_message = str(e)
-            db.commit()
+            self.queue.nack(task, self.consumer_id, error=str(e))
 
         finally:
+            self.current_task = None
             db.close()
 
     def _submit_to_creator(self, task: ContentGenerationTask):
         """
-        将任务提交到 content-creator CLI
-
-        Args:
-            task: 任务对象
-        """
-        if not settings.CREATOR_CLI_PATH:
-            raise Exception("CREATOR_CLI_PATH not configured")
-
-        # 构建命令参数
-        command = [
-            settings.CREATOR_CLI_PATH,
-            "create",
-            "--type", "content-creator",
-            "--mode", "async",
-            "--topic", task.topic,
-            "--task-id", task.task_id
-        ]
-
-        # 可选参数
-        if task.requirements:
-            command.extend(["--requirements", task.requirements])
-        if task.tone:
-            command.extend(["--tone", task.tone])
-        if task.keywords:
-            command.extend(["--keywords", task.keywords])
-
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30
-            )
-
-            # 更新任务状态
-            task.status = "submitted"
-            task.submitted_at = datetime.utcnow()
-
-            log.info(f"Task {task.task_id} submitted to CLI successfully")
-
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr or str(e)
-            log.error(f"Failed to submit task {task.task_id}: {error_msg}")
-            raise Exception(f"CLI submission failed: {error_msg}")
-        except subprocess.TimeoutExpired:
-            log.error(f"Timeout submitting task {task.task_id}")
-            raise Exception("CLI submission timeout")
+        将任务提交到 content-creator HTTP API
 
-    def _fetch_pending_tasks(self):
-        """从数据库拉取待处理任务"""
-        db = SessionLocal()
-        try:
-            # 查询待处理任务
-            pending_tasks = db.query(ContentGenerationTask).filter(
-                ContentGenerationTask.status == "pending"
-            ).order_by(
-                ContentGenerationTask.priority.desc(),
-                ContentGenerationTask.created_at.asc()
-            ).limit(10).all()
+        与直接提交（ASYNC_SUBMIT_VIA_QUEUE 关闭时）共用 AsyncContentGenerationService 的提交路径，
+        成功后任务状态更新为 submitted
 
-            # 添加到队列
-            for task in pending_tasks:
-                if not self.queue.full():
-                    self.queue.put(task, block=False)
-                else:
-                    break  # 队列已满
-
-            if pending_tasks:
-                log.info(f"TaskWorker-{self.worker_id} fetched {len(pending_tasks)} pending tasks")
+        Args:
+            task: 任务对象（属于处理过程的数据库会话）
 
-        finally:
-            db.close()
+        Raises:
+            CreatorException: API调用失败
+        """
+        AsyncContentGenerationService(db=object_session(task))._submit_to_creator(task)
 
     def add_task(self, task: ContentGenerationTask) -> bool:
         """
@@ -309,20 +652,33 @@ class TaskWorker:
 class TaskWorkerPool:
     """任务 Worker 池"""
 
-    def __init__(self, num_workers: int = 3):
+    def __init__(
+        self,
+        num_workers: int = 3,
+        queue: Optional[Union[DatabaseTaskQueue, MemoryTaskQueue]] = None
+    ):
         """
         初始化 Worker 池
 
         Args:
             num_workers: Worker 数量
+            queue: 所有 Worker 共享的任务队列（默认按 TASK_QUEUE_BACKEND 创建）
         """
         self.num_workers = num_workers
+        self.queue = queue or TaskQueueFactory.create_queue()
         self.workers: list[TaskWorker] = []
 
     def start(self):
         """启动所有 Worker"""
+        if self.workers:
+            log.warning("TaskWorkerPool is already running")
+            return
+
+        # 订阅其他进程的入队通知
+        self.queue.notifier.start()
+
         for i in range(self.num_workers):
-            worker = TaskWorker(worker_id=i, num_workers=self.num_workers)
+            worker = TaskWorker(worker_id=i, num_workers=self.num_workers, queue=self.queue)
             worker.start()
             self.workers.append(worker)
 
@@ -333,12 +689,13 @@ class TaskWorkerPool:
         for worker in self.workers:
             worker.stop()
 
+        self.queue.notifier.stop()
         self.workers.clear()
         log.info("Stopped TaskWorkerPool")
 
     def add_task(self, task: ContentGenerationTask) -> bool:
         """
-        添加任务到任意 Worker 队列
+        添加任务到共享队列
 
         Args:
             task: 任务对象
@@ -346,16 +703,11 @@ class TaskWorkerPool:
         Returns:
             是否成功添加
         """
-        # 轮询选择 Worker
-        for worker in self.workers:
-            if worker.add_task(task):
-                return True
-
-        return False  # 所有队列都已满
+        return self.queue.put(task, block=False)
 
     def get_total_queue_size(self) -> int:
-        """获取所有 Worker 队列总大小"""
-        return sum(worker.get_queue_size() for worker in self.workers)
+        """获取共享队列中排队的任务数"""
+        return self.queue.size()
 
     def get_status(self) -> dict:
         """
@@ -368,11 +720,12 @@ class TaskWorkerPool:
             "num_workers": self.num_workers,
             "active_workers": sum(1 for w in self.workers if w.running),
             "total_queue_size": self.get_total_queue_size(),
+            "notifier": self.queue.notifier.get_stats(),
             "worker_statuses": [
                 {
                     "worker_id": w.worker_id,
                     "running": w.running,
-                    "queue_size": w.get_queue_size()
+                    "current_task": w.current_task
                 }
                 for w in self.workers
             ]
@@ -7,14 +7,19 @@ import subprocess
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.database import SessionLocal
+from app.db.projections import projection, register_projection
 from app.models import ContentGenerationTask
 from app.services.task_result_handler import TaskResultHandler
 from app.utils.custom_logger import log
 
+# 轮询只需要任务状态相关字段，result（JSON）只写不读，不随轮询加载
+register_projection("task_polling", ContentGenerationTask, exclude=("result",))
+
 
 class TaskStatusPoller:
     """任务状态轮询器"""
@@ -36,10 +41,14 @@ class TaskStatusPoller:
         Returns:
             统计信息字典
         """
+        self.recover_expired_claims()
+
         db = SessionLocal()
         try:
             # 查询进行中的任务
-            running_tasks = db.query(ContentGenerationTask).filter(
+            running_tasks = db.query(ContentGenerationTask).options(
+                projection("task_polling")
+            ).filter(
                 ContentGenerationTask.status.in_(["submitted", "processing"])
             ).all()
 
@@ -217,6 +226,42 @@ class TaskStatusPoller:
 
         return status_info.get("status")
 
+    def recover_expired_claims(self) -> int:
+        """
+        回收租约已过期的直接提交任务
+
+        直接提交的任务以 claimed 状态创建，提交进程在提交完成前退出时任务停留在 claimed。
+        启用 ASYNC_SUBMIT_VIA_QUEUE 时由 Worker 池重新领取；未启用时没有 Worker 接手，
+        标记为失败（提交结果未知），可通过重试重新提交
+
+        Returns:
+            回收的任务数量
+        """
+        if settings.ASYNC_SUBMIT_VIA_QUEUE:
+            return 0
+
+        from app.services.async_content_generation_service import AsyncContentGenerationService
+
+        db = SessionLocal()
+        try:
+            expired_tasks = db.query(ContentGenerationTask).filter(
+                ContentGenerationTask.status == "claimed",
+                ContentGenerationTask.claimed_by == AsyncContentGenerationService.DIRECT_SUBMITTER,
+                ContentGenerationTask.lease_expires_at < datetime.utcnow()
+            ).all()
+
+            for task in expired_tasks:
+                task.claimed_by = None
+                task.lease_expires_at = None
+                self.result_handler.handle_failure(db, task, "Submission interrupted before completion")
+
+            if expired_tasks:
+                log.warning(f"Recovered {len(expired_tasks)} expired direct submissions")
+            return len(expired_tasks)
+
+        finally:
+            db.close()
+
     def get_timeout_tasks(self) -> List[ContentGenerationTask]:
         """
         获取超时的任务
@@ -228,8 +273,15 @@ class TaskStatusPoller:
         try:
             now = datetime.utcnow()
 
+            # 已领取的任务只有租约过期（提交方已退出）时才算超时，租约期内仍在提交中
             timeout_tasks = db.query(ContentGenerationTask).filter(
-                ContentGenerationTask.status.in_(["submitted", "processing"]),
+                or_(
+                    ContentGenerationTask.status.in_(["submitted", "processing"]),
+                    and_(
+                        ContentGenerationTask.status == "claimed",
+                        ContentGenerationTask.lease_expires_at < now
+                    )
+                ),
                 ContentGenerationTask.timeout_at < now
             ).all()
 
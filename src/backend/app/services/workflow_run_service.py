@@ -0,0 +1,380 @@
+"""
+工作流运行检查点服务
+
+WorkflowExecutor 每次运行时在 workflow_runs / workflow_step_runs 中记录各步骤的
+状态和输出。同一任务的上一次运行失败且参数未变时，再次触发会续跑该运行：
+已成功的步骤（以及 for_each 中已成功的元素）直接复用保存的输出，从失败的步骤继续执行。
+
+检查点写入使用独立的短会话，写入失败只记录日志，不影响工作流本身的执行。
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.scheduler import WorkflowRun, WorkflowStepRun
+from app.utils.custom_logger import log
+
+
+# 不参与参数摘要的控制参数
+_CONTROL_PARAMS = ("resume", "resume_run_id")
+
+
+def _to_json(value: Any) -> Any:
+    """转换为可写入 JSON 列的值（与读回时的结构一致）"""
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def compute_params_hash(task_params: Dict[str, Any]) -> str:
+    """工作流参数摘要（忽略 resume 等控制参数）"""
+    params = {key: value for key, value in task_params.items() if key not in _CONTROL_PARAMS}
+    payload = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class WorkflowCheckpoint:
+    """
+    一次工作流运行的检查点
+
+    run_id 为空时（如检查点表写入失败）所有方法都不做任何事，工作流照常执行。
+    写入方法是同步的数据库操作，异步执行器通过 asyncio.to_thread 调用，可能在多个线程中并发执行
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        run_id: Optional[int] = None,
+        cached_steps: Optional[Dict[str, Dict[str, Any]]] = None,
+        resumed: bool = False
+    ):
+        self.run_id = run_id
+        self.resumed = resumed
+        self._session_factory = session_factory
+        # {step_key: {"status", "output", "items"}}，来自之前的执行
+        self._cached = cached_steps or {}
+        # {step_key: {str(index): {"item", "output"}}}，本次运行累计的 for_each 元素输出
+        self._items: Dict[str, Dict[str, Any]] = {
+            key: dict(entry.get("items") or {}) for key, entry in self._cached.items()
+        }
+        # 并发元素的输出快照依次写入，避免较旧的快照覆盖较新的
+        self._items_lock = threading.Lock()
+
+    # ==================== 读取缓存 ====================
+
+    def get_output(self, step_key: str) -> Optional[Dict[str, Any]]:
+        """获取之前已成功步骤的输出，未成功时返回 None"""
+        entry = self._cached.get(step_key)
+        if entry and entry.get("status") == "success":
+            return entry.get("output") or {}
+        return None
+
+    def get_item_output(self, step_key: str, index: int, item: Any) -> Optional[Dict[str, Any]]:
+        """获取 for_each 中之前已成功元素的输出（元素值变化时不复用）"""
+        cached = (self._cached.get(step_key) or {}).get("items") or {}
+        entry = cached.get(str(index))
+        if entry is not None and entry.get("item") == _to_json(item):
+            return entry.get("output") or {}
+        return None
+
+    # ==================== 写入检查点 ====================
+
+    def step_started(self, step_key: str, position: int, step_type: Optional[str]) -> None:
+        """步骤开始执行"""
+        def write(db: Session) -> None:
+            step = self._get_step(db, step_key)
+            if step is None:
+                step = WorkflowStepRun(run_id=self.run_id, step_key=step_key, attempts=0)
+                db.add(step)
+            step.position = position
+            step.step_type = step_type
+            step.status = "running"
+            step.attempts = (step.attempts or 0) + 1
+            step.error = None
+            step.started_at = datetime.now()
+            step.finished_at = None
+
+        self._write(f"步骤 {step_key} 开始", write)
+
+    def step_succeeded(self, step_key: str, output: Dict[str, Any], message: Optional[str], duration: float) -> None:
+        """步骤执行成功，保存输出"""
+        def write(db: Session) -> None:
+            step = self._get_step(db, step_key)
+            if step is None:
+                return
+            step.status = "success"
+            step.output = _to_json(output)
+            step.message = message
+            step.duration = duration
+            step.finished_at = datetime.now()
+
+        self._write(f"步骤 {step_key} 成功", write)
+
+    def step_failed(self, step_key: str, message: str, error: Optional[str], duration: float) -> None:
+        """步骤执行失败"""
+        def write(db: Session) -> None:
+            step = self._get_step(db, step_key)
+            if step is None:
+                return
+            step.status = "failed"
+            step.message = message
+            step.error = error
+            step.duration = duration
+            step.finished_at = datetime.now()
+
+        self._write(f"步骤 {step_key} 失败", write)
+
+    def item_succeeded(self, step_key: str, index: int, item: Any, output: Dict[str, Any]) -> None:
+        """for_each 中的一个元素执行成功，续跑时不再重复执行"""
+        if self.run_id is None:
+            return
+        with self._items_lock:
+            items = self._items.setdefault(step_key, {})
+            items[str(index)] = {"item": _to_json(item), "output": _to_json(output)}
+            snapshot = dict(items)
+
+            def write(db: Session) -> None:
+                step = self._get_step(db, step_key)
+                if step is not None:
+                    step.item_outputs = snapshot
+
+            self._write(f"步骤 {step_key} 元素 {index} 成功", write)
+
+    def finish(
+        self,
+        success: bool,
+        context: Optional[Dict[str, Any]] = None,
+        failed_step: Optional[str] = None,
+        error_message: Optional[str] = None
+    ) -> None:
+        """运行结束"""
+        def write(db: Session) -> None:
+            run = db.get(WorkflowRun, self.run_id)
+            if run is None:
+                return
+            run.status = "success" if success else "failed"
+            run.context = _to_json(context) if context is not None else None
+            run.failed_step = failed_step
+            run.error_message = error_message
+            run.finished_at = datetime.now()
+
+        self._write("运行结束", write)
+
+    def _get_step(self, db: Session, step_key: str) -> Optional[WorkflowStepRun]:
+        return db.query(WorkflowStepRun).filter(
+            WorkflowStepRun.run_id == self.run_id,
+            WorkflowStepRun.step_key == step_key
+        ).first()
+
+    def _write(self, description: str, write: Callable[[Session], None]) -> None:
+        if self.run_id is None:
+            return
+        db = self._session_factory()
+        try:
+            write(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            log.warning(f"工作流检查点写入失败: run_id={self.run_id}, {description}, 错误: {str(e)}")
+        finally:
+            db.close()
+
+
+class WorkflowRunService:
+    """工作流运行记录服务"""
+
+    @staticmethod
+    def begin(
+        db: Session,
+        task_id: int,
+        task_params: Dict[str, Any],
+        mode: str
+    ) -> WorkflowCheckpoint:
+        """
+        开始（或续跑）一次工作流运行
+
+        1. task_params 中指定 resume_run_id 时续跑该运行
+        2. 否则在启用续跑时，续跑该任务最近一次失败、参数未变且未超过续跑时限的运行
+        3. 都不满足时创建新的运行
+
+        Args:
+            db: 数据库会话（检查点使用绑定同一引擎的独立会话写入）
+            task_id: 任务ID
+            task_params: 工作流参数
+            mode: 执行模式（sequential/dag）
+
+        Returns:
+            WorkflowCheckpoint: 运行检查点；写入失败时返回不做记录的检查点
+        """
+        session_factory = sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False)
+        params_hash = compute_params_hash(task_params)
+        resume = task_params.get("resume", settings.SCHEDULER_WORKFLOW_RESUME_ENABLED)
+
+        session = session_factory()
+        try:
+            run = None
+            resume_run_id = task_params.get("resume_run_id")
+            if resume_run_id:
+                run = session.query(WorkflowRun).filter(
+                    WorkflowRun.id == resume_run_id,
+                    WorkflowRun.task_id == task_id
+                ).first()
+                if run is None:
+                    log.warning(f"要续跑的工作流运行不存在: run_id={resume_run_id}, task_id={task_id}")
+            elif resume:
+                run = WorkflowRunService._find_resumable(session, task_id, params_hash)
+                if run is not None and not WorkflowRunService._claim(session, run.id):
+                    # 该运行已被其他执行（例如手动续跑）取得，本次重新开始
+                    run = None
+
+            now = datetime.now()
+            if run is not None:
+                cached_steps = {
+                    step.step_key: {"status": step.status, "output": step.output, "items": step.item_outputs}
+                    for step in run.steps
+                }
+                run.status = "running"
+                run.attempts = (run.attempts or 0) + 1
+                run.failed_step = None
+                run.error_message = None
+                session.commit()
+                done = [key for key, entry in cached_steps.items() if entry["status"] == "success"]
+                log.info(f"续跑工作流运行 {run.id} (第 {run.attempts} 次)，复用已成功的步骤: {done}")
+                return WorkflowCheckpoint(session_factory, run.id, cached_steps, resumed=True)
+
+            run = WorkflowRun(
+                task_id=task_id,
+                status="running",
+                mode=mode,
+                params=_to_json({k: v for k, v in task_params.items() if k not in _CONTROL_PARAMS}),
+                params_hash=params_hash,
+                attempts=1,
+                started_at=now
+            )
+            session.add(run)
+            session.commit()
+            return WorkflowCheckpoint(session_factory, run.id)
+
+        except Exception as e:
+            session.rollback()
+            log.warning(f"创建工作流运行记录失败，本次运行不保存检查点: task_id={task_id}, 错误: {str(e)}")
+            return WorkflowCheckpoint()
+        finally:
+            session.close()
+
+    @staticmethod
+    def _find_resumable(db: Session, task_id: int, params_hash: str) -> Optional[WorkflowRun]:
+        """该任务最近一次运行失败、参数未变且在续跑时限内时返回该运行"""
+        latest = db.query(WorkflowRun).filter(
+            WorkflowRun.task_id == task_id
+        ).order_by(WorkflowRun.id.desc()).first()
+
+        if latest is None or latest.status != "failed" or latest.params_hash != params_hash:
+            return None
+
+        window = timedelta(hours=settings.SCHEDULER_WORKFLOW_RESUME_WINDOW_HOURS)
+        if latest.started_at is not None and latest.started_at.replace(tzinfo=None) < datetime.now() - window:
+            log.info(f"工作流运行 {latest.id} 已超过续跑时限，重新开始")
+            return None
+        return latest
+
+    @staticmethod
+    def _claim(db: Session, run_id: int) -> bool:
+        """条件更新失败的运行为运行中（不提交），保证同一运行只被一次续跑取得"""
+        result = db.execute(
+            update(WorkflowRun)
+            .where(WorkflowRun.id == run_id, WorkflowRun.status == "failed")
+            .values(status="running")
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def claim_for_resume(db: Session, run_id: int) -> bool:
+        """
+        手动续跑前取得失败的运行
+
+        Returns:
+            bool: 是否取得；运行正在执行（包括定时触发的自动续跑）或已成功时返回 False
+        """
+        claimed = WorkflowRunService._claim(db, run_id)
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def release_claim(db: Session, run_id: int) -> None:
+        """续跑结束后仍为运行中（执行器未开始执行或未写入结果）时恢复为失败，以便再次续跑"""
+        db.execute(
+            update(WorkflowRun)
+            .where(WorkflowRun.id == run_id, WorkflowRun.status == "running")
+            .values(status="failed")
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    # ==================== 查询 ====================
+
+    @staticmethod
+    def list_runs(
+        db: Session,
+        task_id: Optional[int] = None,
+        status: Optional[str] = None,
+        limit: int = 20
+    ) -> List[WorkflowRun]:
+        """获取工作流运行记录（按开始时间倒序）"""
+        query = db.query(WorkflowRun)
+        if task_id:
+            query = query.filter(WorkflowRun.task_id == task_id)
+        if status:
+            query = query.filter(WorkflowRun.status == status)
+        return query.order_by(WorkflowRun.id.desc()).limit(limit).all()
+
+    @staticmethod
+    def get_run(db: Session, run_id: int) -> Optional[WorkflowRun]:
+        """获取工作流运行记录（含步骤）"""
+        return db.query(WorkflowRun).filter(WorkflowRun.id == run_id).first()
+
+    @staticmethod
+    def run_to_dict(run: WorkflowRun, include_steps: bool = False) -> Dict[str, Any]:
+        """运行记录转换为字典"""
+        data = {
+            "id": run.id,
+            "task_id": run.task_id,
+            "task_name": run.task.name if run.task else None,
+            "status": run.status,
+            "mode": run.mode,
+            "attempts": run.attempts,
+            "failed_step": run.failed_step,
+            "error_message": run.error_message,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+        }
+        if include_steps:
+            data["params"] = run.params
+            data["context"] = run.context
+            data["steps"] = [
+                {
+                    "step_key": step.step_key,
+                    "position": step.position,
+                    "step_type": step.step_type,
+                    "status": step.status,
+                    "attempts": step.attempts,
+                    "output": step.output,
+                    "completed_items": len(step.item_outputs or {}),
+                    "message": step.message,
+                    "error": step.error,
+                    "duration": step.duration,
+                    "started_at": step.started_at,
+                    "finished_at": step.finished_at,
+                }
+                for step in run.steps
+            ]
+        return data
+
+
+# 全局服务实例
+workflow_run_service = WorkflowRunService()
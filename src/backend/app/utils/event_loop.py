@@ -0,0 +1,136 @@
+"""
+后台事件循环线程
+
+在独立线程中运行一个长期存在的 asyncio 事件循环，供同步代码（如 APScheduler
+的工作线程）提交协程。与每次调用 asyncio.new_event_loop() 相比，绑定在事件循环上的
+资源（httpx.AsyncClient 连接池、asyncio.Lock、aiolimiter 令牌桶等）可以跨调用复用。
+
+用法:
+    loop_thread = EventLoopThread(name="scheduler-loop")
+    result = loop_thread.run(some_coroutine())
+    loop_thread.stop()
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+from app.utils.custom_logger import log
+
+
+class EventLoopThread:
+    """在后台线程中运行的长期事件循环"""
+
+    def __init__(self, name: str = "event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop_callbacks: List[Callable[[], Awaitable[Any]]] = []
+
+    @property
+    def is_running(self) -> bool:
+        """事件循环线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取事件循环（未启动时自动启动）"""
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        启动事件循环线程，已启动时直接返回当前事件循环
+        """
+        with self._lock:
+            if self.is_running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            log.info(f"事件循环线程已启动: {self.name}")
+            return loop
+
+    def add_stop_callback(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """
+        注册停止前执行的异步清理函数（如关闭绑定在该事件循环上的 AsyncClient）
+        """
+        if callback not in self._stop_callbacks:
+            self._stop_callbacks.append(callback)
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        提交协程到事件循环，立即返回 concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在事件循环中执行协程并阻塞等待结果
+
+        Args:
+            coro: 协程对象
+            timeout: 最长等待时间（秒），超时后取消协程并抛出 TimeoutError
+
+        Raises:
+            RuntimeError: 在事件循环线程内部调用（会导致死锁）
+        """
+        if self.is_running and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("不能在事件循环线程内同步等待协程，请直接 await")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        停止事件循环：执行清理函数、取消未完成的任务、关闭异步生成器后退出线程
+
+        Args:
+            timeout: 等待清理完成的最长时间（秒）
+        """
+        with self._lock:
+            if not self.is_running:
+                return
+            loop, thread = self._loop, self._thread
+
+            callbacks = list(self._stop_callbacks)
+
+            async def shutdown():
+                for callback in callbacks:
+                    try:
+                        await callback()
+                    except Exception as e:
+                        log.warning(f"事件循环清理函数执行失败: {callback!r}, 错误: {str(e)}")
+                tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await loop.shutdown_asyncgens()
+
+            try:
+                asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+            except Exception as e:
+                log.warning(f"事件循环清理未完成: {self.name}, 错误: {str(e)}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = None
+            self._thread = None
+            log.info(f"事件循环线程已停止: {self.name}")
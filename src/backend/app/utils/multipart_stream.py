@@ -0,0 +1,135 @@
+"""
+流式 multipart/form-data 编码
+
+按固定大小的块从磁盘读取文件并逐块生成请求体，内存占用只与块大小有关，
+与文件数量和大小无关。请求体长度预先计算，以 Content-Length 发送（不使用分块传输编码）。
+
+- requests: data=stream，headers 使用 stream.headers
+- httpx.AsyncClient: content=stream.async_view()，headers 使用 stream.headers（文件在线程中读取，不阻塞事件循环）
+"""
+import asyncio
+import os
+import uuid
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+
+def _quote(value: str) -> str:
+    """转义 Content-Disposition 参数值（与浏览器的 HTML5 表单编码一致）"""
+    return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class MultipartStream:
+    """可重复迭代的流式 multipart 请求体（每次迭代重新打开文件，可用于重试）"""
+
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        files: List[Tuple[str, str, str, str]],
+        chunk_size: Optional[int] = None,
+        boundary: Optional[str] = None
+    ):
+        """
+        初始化请求体
+
+        Args:
+            fields: 普通表单字段
+            files: 文件字段列表，每项为 (字段名, 文件路径, 文件名, MIME 类型)
+            chunk_size: 每次从文件读取的字节数
+            boundary: multipart 分隔符（默认随机生成）
+
+        Raises:
+            OSError: 文件不存在或无法读取
+        """
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self.boundary = boundary or uuid.uuid4().hex
+        self._fields = [
+            self._part_header(name) + str(value).encode("utf-8") + b"\r\n"
+            for name, value in fields.items()
+        ]
+        # 记录构造时的文件大小，发送时按该长度读取，保证与 Content-Length 一致
+        self._files = [
+            (self._part_header(name, filename, mime_type), path, os.path.getsize(path))
+            for name, path, filename, mime_type in files
+        ]
+        self._closing = f"--{self.boundary}--\r\n".encode("ascii")
+
+    def _part_header(self, name: str, filename: Optional[str] = None, mime_type: Optional[str] = None) -> bytes:
+        """生成单个部分的头"""
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if mime_type:
+            header += f"Content-Type: {mime_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """请求头（Content-Type 和 Content-Length）"""
+        return {"Content-Type": self.content_type, "Content-Length": str(len(self))}
+
+    def __len__(self) -> int:
+        length = sum(len(part) for part in self._fields)
+        length += sum(len(header) + size + 2 for header, _, size in self._files)
+        return length + len(self._closing)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self._fields:
+            yield part
+
+        for header, path, size in self._files:
+            yield header
+            remaining = size
+            with open(path, "rb") as f:
+                while remaining > 0:
+                    chunk = self._read_chunk(f, path, remaining)
+                    remaining -= len(chunk)
+                    yield chunk
+            yield b"\r\n"
+
+        yield self._closing
+
+    def _read_chunk(self, f, path: str, remaining: int) -> bytes:
+        """读取文件的下一块（不超过剩余长度），文件比构造时短时报错"""
+        chunk = f.read(min(self.chunk_size, remaining))
+        if not chunk:
+            raise IOError(f"文件在上传过程中被截断: {path}")
+        return chunk
+
+    def async_view(self) -> "_AsyncMultipartView":
+        """供 httpx.AsyncClient 使用的异步迭代视图（同样可重复迭代）"""
+        return _AsyncMultipartView(self)
+
+
+class _AsyncMultipartView:
+    """只提供异步迭代的视图，httpx 据此按异步流发送"""
+
+    def __init__(self, stream: MultipartStream):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        stream = self._stream
+        for part in stream._fields:
+            yield part
+
+        # 打开和读取文件在线程中执行，慢盘或网络存储不会阻塞事件循环
+        for header, path, size in stream._files:
+            yield header
+            remaining = size
+            f = await asyncio.to_thread(open, path, "rb")
+            try:
+                while remaining > 0:
+                    chunk = await asyncio.to_thread(stream._read_chunk, f, path, remaining)
+                    remaining -= len(chunk)
+                    yield chunk
+            finally:
+                f.close()
+            yield b"\r\n"
+
+        yield stream._closing
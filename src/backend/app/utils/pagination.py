@@ -1,9 +1,18 @@
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
 
 from fastapi import HTTPException, Query, status
 from pydantic import BaseModel
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from app.core.cache import cache_backend, generate_cache_key
 from app.core.config import settings
+from app.db.types import timestamp_literal
 
 T = TypeVar("T")
 
@@ -58,3 +67,177 @@ class PaginatedResponse(BaseModel, Generic[T]):
             page_size=params.page_size,
             pages=pages,
         )
+
+
+# ==================== 游标分页 ====================
+#
+# 按 (created_at, id) 倒序的 keyset 分页：下一页条件为
+# created_at < :t OR (created_at = :t AND id < :id)，
+# 依赖 (created_at, id) 复合索引，翻到多深的页都只扫描 page_size 行。
+
+
+class InvalidCursorError(ValueError):
+    """游标格式错误"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    生成不透明游标
+
+    Args:
+        created_at: 当前页最后一行的时间
+        row_id: 当前页最后一行的 ID
+
+    Returns:
+        URL 安全的 base64 字符串
+    """
+    payload = json.dumps({"t": created_at.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    解析游标
+
+    Args:
+        cursor: encode_cursor 生成的游标
+
+    Returns:
+        (created_at, id)
+
+    Raises:
+        InvalidCursorError: 游标无法解析
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"无效的分页游标: {cursor}") from e
+
+
+def apply_keyset(query, created_col, id_col, cursor: Optional[str], limit: int):
+    """
+    为查询追加游标条件、排序和 limit
+
+    同时支持 ORM Query 和 2.0 风格的 select()。多取一行用于判断是否还有下一页。
+
+    Args:
+        query: Query 或 Select
+        created_col: 排序时间列（如 Content.created_at）
+        id_col: 主键列
+        cursor: 上一页返回的 next_cursor，空值表示第一页
+        limit: 每页数量
+
+    Returns:
+        追加条件后的查询
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        bound = timestamp_literal(created_at)
+        query = query.filter(
+            or_(
+                created_col < bound,
+                and_(created_col == bound, id_col < last_id),
+            )
+        )
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def build_cursor_page(
+    rows: List[Any],
+    limit: int,
+    created_attr: str = "created_at",
+    id_attr: str = "id",
+) -> Dict[str, Any]:
+    """
+    根据 apply_keyset 的查询结果组装一页数据
+
+    Args:
+        rows: 查询结果（最多 limit + 1 行）
+        limit: 每页数量
+        created_attr: 行对象上的时间属性名
+        id_attr: 行对象上的主键属性名
+
+    Returns:
+        包含 items、next_cursor、has_more 的字典
+    """
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, created_attr), getattr(last, id_attr))
+    return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
+
+
+def count_statement(query) -> Select:
+    """
+    构造与查询条件一致的 COUNT 语句（去掉排序和分页）
+    """
+    statement = query.statement if hasattr(query, "statement") else query
+    subquery = statement.order_by(None).limit(None).offset(None).subquery()
+    return select(func.count()).select_from(subquery)
+
+
+def _count_cache_key(key_prefix: str, statement: Select) -> str:
+    compiled = statement.compile()
+    params = sorted((k, str(v)) for k, v in compiled.params.items())
+    return generate_cache_key(f"pagination_count:{key_prefix}", str(compiled), repr(params))
+
+
+def cached_count(db: Session, query, key_prefix: str) -> int:
+    """
+    统计总数，结果缓存 PAGINATION_COUNT_CACHE_TTL 秒
+
+    游标分页的总数只用于展示，允许在缓存时间内略有滞后，
+    避免每翻一页都对大表做一次全量 COUNT。
+
+    Args:
+        db: 数据库会话
+        query: 列表查询（Query 或 Select，不含游标条件）
+        key_prefix: 缓存键前缀，如 "contents"
+
+    Returns:
+        总数
+    """
+    statement = count_statement(query)
+    ttl = settings.PAGINATION_COUNT_CACHE_TTL
+    if ttl <= 0:
+        return db.scalar(statement) or 0
+
+    cache_key = _count_cache_key(key_prefix, statement)
+    total = cache_backend.get(cache_key)
+    if total is None:
+        total = db.scalar(statement) or 0
+        cache_backend.set(cache_key, total, ttl)
+    return total
+
+
+async def cached_count_async(db: AsyncSession, query: Select, key_prefix: str) -> int:
+    """
+    统计总数（异步会话版本），缓存策略同 cached_count
+    """
+    statement = count_statement(query)
+    ttl = settings.PAGINATION_COUNT_CACHE_TTL
+    if ttl <= 0:
+        return await db.scalar(statement) or 0
+
+    cache_key = _count_cache_key(key_prefix, statement)
+    total = cache_backend.get(cache_key)
+    if total is None:
+        total = await db.scalar(statement) or 0
+        cache_backend.set(cache_key, total, ttl)
+    return total
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """
+    游标分页响应
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    page_size: int
+    total: Optional[int] = None
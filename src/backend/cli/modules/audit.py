@@ -26,6 +26,7 @@ from cli.utils import (
 from app.db.sql_db import get_session_local
 from app.models.audit_log import AuditLog
 from app.services.audit_service import AuditService
+from app.utils.pagination import InvalidCursorError
 
 # 创建子应用
 app = typer.Typer(help="审计日志")
@@ -42,7 +43,8 @@ def list_audit_logs(
     search: str = typer.Option(None, "--search", "-s", help="搜索关键字"),
     limit: int = typer.Option(20, "--limit", "-l", help="显示记录数"),
     page: int = typer.Option(1, "--page", help="页码"),
-    page_size: int = typer.Option(20, "--page-size", help="每页数量")
+    page_size: int = typer.Option(20, "--page-size", help="每页数量"),
+    cursor: str = typer.Option(None, "--cursor", help="游标分页：首页传空字符串，之后传上一页输出的游标（忽略 --page）")
 ):
     """列出审计日志（简洁版本）"""
     try:
@@ -67,7 +69,8 @@ def list_audit_logs(
                 db,
                 filters=filters,
                 page=page,
-                page_size=limit or page_size
+                page_size=limit or page_size,
+                cursor=cursor
             )
 
             logs = result_data["logs"]
@@ -116,7 +119,11 @@ def list_audit_logs(
                 return
 
             print_table(data, title=f"审计日志列表 (共 {total} 条)", show_header=True, output_format=output_format)
+            if result_data.get("next_cursor") and output_format == "table":
+                print_info(f"下一页: --cursor {result_data['next_cursor']}")
 
+    except InvalidCursorError as e:
+        print_error(str(e))
     except ValueError as e:
         print_error(f"日期格式错误: {e}")
         print_info("请使用 YYYY-MM-DD 格式")
@@ -133,7 +140,8 @@ def list_logs(
     end_date: str = typer.Option(None, "--end", help="结束日期 (YYYY-MM-DD)"),
     search: str = typer.Option(None, "--search", "-s", help="搜索关键字"),
     page: int = typer.Option(1, "--page", help="页码"),
-    page_size: int = typer.Option(20, "--page-size", help="每页数量")
+    page_size: int = typer.Option(20, "--page-size", help="每页数量"),
+    cursor: str = typer.Option(None, "--cursor", help="游标分页：首页传空字符串，之后传上一页输出的游标（忽略 --page）")
 ):
     """查询审计日志"""
     try:
@@ -158,7 +166,8 @@ def list_logs(
                 db,
                 filters=filters,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                cursor=cursor
             )
 
             logs = result_data["logs"]
@@ -199,8 +208,15 @@ def list_logs(
                     "详情": details_str,
                 })
 
-            print_table(data, title=f"审计日志列表 (第 {page} 页，共 {total} 条)", show_header=True)
+            if cursor is not None:
+                print_table(data, title=f"审计日志列表 (共 {total} 条)", show_header=True)
+            else:
+                print_table(data, title=f"审计日志列表 (第 {page} 页，共 {total} 条)", show_header=True)
+            if result_data.get("next_cursor"):
+                print_info(f"下一页: --cursor {result_data['next_cursor']}")
 
+    except InvalidCursorError as e:
+        print_error(str(e))
     except ValueError as e:
         print_error(f"日期格式错误: {e}")
         print_info("请使用 YYYY-MM-DD 格式")
@@ -31,6 +31,7 @@ from app.modules.content.services import content_service
 from app.services.content_creator_service import content_creator_service
 from app.services.content_review_service import content_review_service
 from app.core.config import settings
+from app.utils.pagination import apply_keyset, build_cursor_page
 
 # 创建子应用
 app = typer.Typer(help="内容管理")
@@ -78,6 +79,36 @@ def list_contents_db(
     return query.order_by(Content.created_at.desc()).offset(skip).limit(limit).all()
 
 
+def list_contents_page_db(
+    db: Session,
+    account_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> dict:
+    """按 (created_at, id) 游标分页查询内容列表
+
+    Args:
+        db: 数据库会话
+        account_id: 账号 ID 筛选
+        status: 状态筛选
+        cursor: 上一页返回的游标，为空时从最新内容开始
+        limit: 每页数量
+
+    Returns:
+        包含 items、next_cursor、has_more 的字典
+    """
+    query = db.query(Content)
+
+    if account_id:
+        query = query.filter(Content.account_id == account_id)
+    if status:
+        query = query.filter(Content.publish_status == status)
+
+    rows = apply_keyset(query, Content.created_at, Content.id, cursor, limit).all()
+    return build_cursor_page(rows, limit)
+
+
 def format_content_info(content: Content, detailed: bool = False) -> dict:
     """格式化内容信息
 
@@ -119,22 +150,36 @@ def list_contents(
     account_id: int = typer.Option(None, "--account-id", "-a", help="按账号 ID 筛选"),
     status: str = typer.Option(None, "--status", "-s", help="按状态筛选"),
     page: int = typer.Option(1, "--page", "-p", help="页码"),
-    page_size: int = typer.Option(20, "--page-size", "--size", help="每页数量")
+    page_size: int = typer.Option(20, "--page-size", "--size", help="每页数量"),
+    cursor: str = typer.Option(None, "--cursor", help="游标分页：首页传空字符串，之后传上一页输出的游标（忽略 --page）")
 ):
     """列出内容"""
     try:
         with get_session_local()() as db:
-            # 计算分页
-            skip = (page - 1) * page_size
-
-            # 查询内容
-            contents = list_contents_db(
-                db,
-                account_id=account_id,
-                status=status,
-                skip=skip,
-                limit=page_size
-            )
+            next_cursor = None
+            if cursor is not None:
+                # 游标分页
+                page_data = list_contents_page_db(
+                    db,
+                    account_id=account_id,
+                    status=status,
+                    cursor=cursor,
+                    limit=page_size
+                )
+                contents = page_data["items"]
+                next_cursor = page_data["next_cursor"]
+            else:
+                # 计算分页
+                skip = (page - 1) * page_size
+
+                # 查询内容
+                contents = list_contents_db(
+                    db,
+                    account_id=account_id,
+                    status=status,
+                    skip=skip,
+                    limit=page_size
+                )
 
             # 格式化输出
             data = []
@@ -161,6 +206,12 @@ def list_contents(
                     print_warning("未找到内容")
                 return
 
+            if cursor is not None:
+                print_table(data, title=f"内容列表 (本页 {len(contents)} 条)", show_header=True, output_format=output_format)
+                if next_cursor and output_format == "table":
+                    print_info(f"下一页: --cursor {next_cursor}")
+                return
+
             print_table(data, title=f"内容列表 (第 {page} 页，共 {len(contents)} 条)", show_header=True, output_format=output_format)
 
     except Exception as e:
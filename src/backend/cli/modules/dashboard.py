@@ -4,7 +4,7 @@
 提供系统统计数据和趋势分析功能。
 """
 
-from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Optional
 
 import typer
@@ -22,10 +22,11 @@ from cli.utils import (
     handle_error,
 )
 from app.db.sql_db import get_session_local
+from app.modules.dashboard.services import dashboard_service
+from app.services.stats_rollup_service import stats_rollup_service
 from app.models.content import Content
 from app.models.publisher import PublishLog
 from app.models.account import Account
-from app.models.scheduler import ScheduledTask
 from app.models.user import User
 from app.models.customer import Customer
 
@@ -40,36 +41,17 @@ def dashboard_stats():
         with get_session_local()() as db:
             print_info("正在获取仪表盘统计数据...")
 
-            # 账号统计
-            account_count = db.query(Account).count()
+            # 账号、内容、发布和定时任务统计（发布相关计数来自每日汇总）
+            stats = dashboard_service.get_dashboard_stats(db)
+            account_count = stats["account_count"]
             active_account_count = db.query(Account).filter(Account.is_active == True).count()
-
-            # 内容统计
-            content_count = db.query(Content).count()
-            pending_review_count = db.query(Content).filter(Content.review_status == "pending").count()
+            content_count = stats["content_count"]
+            pending_review_count = stats["pending_review_count"]
             approved_count = db.query(Content).filter(Content.review_status == "approved").count()
-
-            # 发布统计
-            published_count = db.query(PublishLog).filter(PublishLog.status == "success").count()
-
-            # 今日发布数
-            today = datetime.utcnow().date()
-            today_published_count = db.query(PublishLog).filter(
-                func.date(PublishLog.created_at) == today,
-                PublishLog.status == "success"
-            ).count()
-
-            # 本周发布数
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            week_published_count = db.query(PublishLog).filter(
-                PublishLog.created_at >= week_ago,
-                PublishLog.status == "success"
-            ).count()
-
-            # 定时任务统计
-            scheduled_task_count = db.query(ScheduledTask).filter(
-                ScheduledTask.is_active == True
-            ).count()
+            published_count = stats["published_count"]
+            today_published_count = stats["today_published_count"]
+            week_published_count = stats["week_published_count"]
+            scheduled_task_count = stats["scheduled_task_count"]
 
             # 用户和客户统计
             user_count = db.query(User).count()
@@ -202,20 +184,11 @@ def content_trend(
         with get_session_local()() as db:
             print_info(f"正在分析内容生成趋势 (最近 {days} 天)...")
 
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=days)
-
             # 按天统计内容创建数量
-            content_trend = db.query(
-                func.date(Content.created_at).label("date"),
-                func.count(Content.id).label("count")
-            ).filter(
-                Content.created_at >= start_date
-            ).group_by(
-                func.date(Content.created_at)
-            ).order_by(
-                func.date(Content.created_at)
-            ).all()
+            content_trend = [
+                SimpleNamespace(**item)
+                for item in dashboard_service.get_content_trend(db, days)["trend"]
+            ]
 
             if not content_trend:
                 print_warning(f"最近 {days} 天没有内容生成记录")
@@ -320,6 +293,27 @@ def publish_statistics():
         handle_error(e)
 
 
+@app.command("rollup")
+def rollup_stats(
+    days: int = typer.Option(None, "--days", "-d", help="重算最近几天（默认 STATS_ROLLUP_DAYS）"),
+    full: bool = typer.Option(False, "--full", help="从最早的记录开始全量重建")
+):
+    """重算每日统计汇总"""
+    try:
+        with get_session_local()() as db:
+            if full:
+                print_info("正在全量重建每日统计汇总...")
+                row_count = stats_rollup_service.rebuild(db)
+            else:
+                print_info("正在重算最近的每日统计汇总...")
+                row_count = stats_rollup_service.refresh_recent(db, days)
+
+            print_success(f"统计汇总完成: 写入 {row_count} 行")
+
+    except Exception as e:
+        handle_error(e)
+
+
 @app.command("user-stats")
 def user_statistics(
     limit: int = typer.Option(10, "--limit", "-l", help="显示用户数")
@@ -1,13 +1,17 @@
 """
 监控 CLI 模块
 
-提供异步任务监控和指标查询功能。
+提供异步任务监控、调度器执行剖析和指标查询功能。
 """
+from datetime import datetime
+
+import httpx
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import box
+from app.core.config import settings
 from app.services.monitoring.async_task_monitor import AsyncTaskMonitor
 
 app = typer.Typer(help="监控和管理异步任务")
@@ -241,6 +245,56 @@ def health_check():
         console.print("[green]系统运行正常[/green]")
 
 
+@app.command("scheduler")
+def scheduler_profile(
+    url: str = typer.Option(None, "--url", "-u", help="后端服务地址（默认 http://127.0.0.1:<PORT>）"),
+    timeout: int = typer.Option(10, "--timeout", "-t", help="超时时间（秒）")
+):
+    """
+    显示调度器执行剖析（各执行器和工作流步骤的耗时分布）
+
+    剖析数据保存在运行调度器的后端进程中，通过 /api/v1/system/metrics 获取。
+
+    示例:
+        contenthub monitor scheduler
+        contenthub monitor scheduler --url http://10.0.0.5:8000
+    """
+    base_url = (url or f"http://127.0.0.1:{settings.PORT}").rstrip("/")
+    metrics_url = f"{base_url}{settings.API_V1_PREFIX}/system/metrics"
+
+    try:
+        response = httpx.get(metrics_url, timeout=timeout)
+        response.raise_for_status()
+        profile = response.json()["data"].get("scheduler") or {}
+    except httpx.HTTPError as e:
+        console.print(f"[red]获取调度器指标失败: {metrics_url}, 错误: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+    if not profile.get("enabled"):
+        console.print("[yellow]调度器剖析未启用（SCHEDULER_PROFILING_ENABLED=false）[/yellow]")
+        return
+
+    executors = profile.get("executors") or {}
+    if not executors:
+        console.print(f"[yellow]自 {format_datetime(profile.get('since'))} 以来没有任务运行记录[/yellow]")
+        return
+
+    table = Table(title=f"执行器耗时（统计开始于 {format_datetime(profile.get('since'))}）", box=box.ROUNDED)
+    add_profile_columns(table, "执行器")
+    table.add_column("排队 p95", justify="right")
+    for executor_type, stats in executors.items():
+        table.add_row(*profile_row(executor_type, stats), format_seconds(stats["queue_wait"]["p95"]))
+    console.print(table)
+
+    steps = profile.get("steps") or {}
+    if steps:
+        table = Table(title="工作流步骤耗时", box=box.ROUNDED)
+        add_profile_columns(table, "步骤类型")
+        for step_type, stats in steps.items():
+            table.add_row(*profile_row(step_type, stats))
+        console.print(table)
+
+
 # 辅助函数
 
 
@@ -278,3 +332,40 @@ def format_datetime(dt_str: str) -> str:
         return dt.strftime('%Y-%m-%d %H:%M:%S')
     except:
         return dt_str
+
+
+def add_profile_columns(table: Table, name: str) -> None:
+    """添加剖析表格的公共列"""
+    table.add_column(name)
+    table.add_column("运行/失败", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("数据库", justify="right")
+    table.add_column("外部 API", justify="right")
+    table.add_column("占用", justify="right")
+
+
+def profile_row(name: str, stats: dict) -> list:
+    """剖析表格的公共列数据"""
+    duration = stats["duration"]
+    failures_style = "red" if stats["failures"] else "dim"
+    return [
+        name,
+        f"{stats['runs']}/[{failures_style}]{stats['failures']}[/{failures_style}]",
+        format_seconds(duration["p50"]),
+        format_seconds(duration["p95"]),
+        format_seconds(duration["p99"]),
+        f"{stats['db_share']}%",
+        f"{stats['api_share']}%",
+        f"{stats['capacity_share']}%",
+    ]
+
+
+def format_seconds(value) -> str:
+    """格式化耗时（秒）"""
+    if value is None:
+        return '-'
+    if value < 1:
+        return f"{value * 1000:.0f}ms"
+    return f"{value:.2f}s"
@@ -24,6 +24,7 @@ from cli.utils import (
     get_global_format,
 )
 from app.db.sql_db import get_session_local
+from app.utils.pagination import apply_keyset, build_cursor_page
 from app.models.publisher import PublishLog
 from app.models.content import Content
 from app.modules.publisher.services import publisher_service
@@ -75,6 +76,36 @@ def list_publish_logs_db(
     return query.order_by(PublishLog.created_at.desc()).offset(skip).limit(limit).all()
 
 
+def list_publish_logs_page_db(
+    db: Session,
+    account_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> dict:
+    """按 (created_at, id) 游标分页查询发布日志
+
+    Args:
+        db: 数据库会话
+        account_id: 账号 ID 筛选
+        status: 状态筛选
+        cursor: 上一页返回的游标，为空时从最新记录开始
+        limit: 每页数量
+
+    Returns:
+        包含 items、next_cursor、has_more 的字典
+    """
+    query = db.query(PublishLog)
+
+    if account_id:
+        query = query.filter(PublishLog.account_id == account_id)
+    if status:
+        query = query.filter(PublishLog.status == status)
+
+    rows = apply_keyset(query, PublishLog.created_at, PublishLog.id, cursor, limit).all()
+    return build_cursor_page(rows, limit)
+
+
 def format_publish_log_info(log: PublishLog, detailed: bool = False) -> dict:
     """格式化发布日志信息
 
@@ -114,18 +145,21 @@ def publish_history(
     ctx: typer.Context,
     account_id: int = typer.Option(None, "--account-id", "-a", help="按账号 ID 筛选"),
     status: str = typer.Option(None, "--status", "-s", help="按状态筛选 (pending/success/failed)"),
-    limit: int = typer.Option(20, "--limit", "-n", help="显示数量")
+    limit: int = typer.Option(20, "--limit", "-n", help="显示数量"),
+    cursor: str = typer.Option(None, "--cursor", help="从上一页输出的游标继续查看")
 ):
     """查看发布历史"""
     try:
         with get_session_local()() as db:
-            # 查询发布日志
-            logs = list_publish_logs_db(
+            # 查询发布日志（按 created_at, id 游标分页）
+            page_data = list_publish_logs_page_db(
                 db,
                 account_id=account_id,
                 status=status,
+                cursor=cursor,
                 limit=limit
             )
+            logs = page_data["items"]
 
             # 格式化输出
             data = []
@@ -154,6 +188,8 @@ def publish_history(
                 return
 
             print_table(data, title=f"发布历史 (共 {len(logs)} 条)", show_header=True, output_format=output_format)
+            if page_data["next_cursor"] and output_format == "table":
+                print_info(f"下一页: --cursor {page_data['next_cursor']}")
 
     except Exception as e:
         handle_error(e)
@@ -341,18 +377,21 @@ def publish_records(
     ctx: typer.Context,
     account_id: int = typer.Option(None, "--account-id", "-a", help="按账号 ID 筛选"),
     status: str = typer.Option(None, "--status", "-s", help="按状态筛选"),
-    limit: int = typer.Option(20, "--limit", "-n", help="显示数量")
+    limit: int = typer.Option(20, "--limit", "-n", help="显示数量"),
+    cursor: str = typer.Option(None, "--cursor", help="从上一页输出的游标继续查看")
 ):
     """查看发布记录（与 history 相同）"""
     try:
         with get_session_local()() as db:
-            # 查询发布日志
-            logs = list_publish_logs_db(
+            # 查询发布日志（按 created_at, id 游标分页）
+            page_data = list_publish_logs_page_db(
                 db,
                 account_id=account_id,
                 status=status,
+                cursor=cursor,
                 limit=limit
             )
+            logs = page_data["items"]
 
             # 格式化输出（更详细的格式）
             data = []
@@ -382,6 +421,8 @@ def publish_records(
                 return
 
             print_table(data, title=f"发布记录 (共 {len(logs)} 条)", show_header=True, output_format=output_format)
+            if page_data["next_cursor"] and output_format == "table":
+                print_info(f"下一页: --cursor {page_data['next_cursor']}")
 
     except Exception as e:
         handle_error(e)
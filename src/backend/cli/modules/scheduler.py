@@ -26,6 +26,7 @@ from cli.utils import (
 from app.db.sql_db import get_session_local
 from app.models.scheduler import ScheduledTask, TaskExecution
 from app.modules.scheduler.services import scheduler_manager_service
+from app.services.execution_history_service import execution_history_service
 from app.services.scheduler_service import scheduler_service
 
 # 创建子应用
@@ -412,12 +413,24 @@ def trigger(
 @app.command("history")
 def execution_history(
     task_id: int = typer.Option(None, "--task-id", "-t", help="任务 ID"),
+    status: str = typer.Option(None, "--status", "-s", help="状态过滤 (success/failed)"),
     limit: int = typer.Option(20, "--limit", "-n", help="显示数量")
 ):
-    """查看任务执行历史"""
+    """
+    查看任务执行历史
+
+    执行结束后才批量写入数据库，运行中的执行只保存在调度器进程的内存中，
+    不会出现在这里，请通过 GET /api/v1/scheduler/executions?status=running 查看
+    """
     try:
+        if status == "running":
+            print_warning("运行中的执行只保存在调度器进程内存中，请通过 GET /api/v1/scheduler/executions?status=running 查看")
+            return
+
         with get_session_local()() as db:
             query = db.query(TaskExecution)
+            if status:
+                query = query.filter(TaskExecution.status == status)
 
             if task_id:
                 # 检查任务是否存在
@@ -452,6 +465,149 @@ def execution_history(
         handle_error(e)
 
 
+@app.command("history-stats")
+def execution_hourly_stats(
+    task_id: int = typer.Option(None, "--task-id", "-t", help="任务 ID"),
+    limit: int = typer.Option(48, "--limit", "-n", help="显示小时数")
+):
+    """查看已压缩的执行历史小时汇总"""
+    try:
+        with get_session_local()() as db:
+            stats = execution_history_service.get_hourly_stats(db, task_id, limit)
+
+            if not stats:
+                print_warning("未找到小时汇总记录")
+                return
+
+            data = []
+            for stat in stats:
+                data.append({
+                    "任务": stat.task.name if stat.task else stat.task_id,
+                    "小时": format_datetime(stat.hour),
+                    "执行次数": stat.total_count,
+                    "成功": stat.success_count,
+                    "失败": stat.failed_count,
+                    "平均耗时": f"{stat.total_duration / stat.total_count:.1f}s" if stat.total_count else "-",
+                    "最长耗时": f"{stat.max_duration}s",
+                })
+
+            print_table(data, title=f"执行历史小时汇总 (共 {len(stats)} 条)", show_header=True)
+
+    except Exception as e:
+        handle_error(e)
+
+
+@app.command("compact-history")
+def compact_history(
+    retention_days: int = typer.Option(None, "--days", "-d", help="明细保留天数（默认 SCHEDULER_HISTORY_RETENTION_DAYS）"),
+    vacuum: bool = typer.Option(False, "--vacuum", help="压缩后对 SQLite 执行 VACUUM 回收空间")
+):
+    """将过期的执行明细压缩为小时汇总"""
+    try:
+        with get_session_local()() as db:
+            print_info("正在压缩执行历史...")
+            stats = execution_history_service.compact(db, retention_days, vacuum=vacuum)
+            print_success(f"执行历史压缩完成: 压缩 {stats['compacted']} 条明细, 涉及 {stats['hours']} 个小时汇总")
+
+    except Exception as e:
+        handle_error(e)
+
+
+@app.command("workflow-runs")
+def list_workflow_runs(
+    task_id: int = typer.Option(None, "--task-id", "-t", help="任务 ID"),
+    status: str = typer.Option(None, "--status", "-s", help="状态过滤 (running/success/failed)"),
+    limit: int = typer.Option(20, "--limit", "-n", help="显示数量")
+):
+    """查看工作流运行记录"""
+    try:
+        with get_session_local()() as db:
+            runs = scheduler_manager_service.list_workflow_runs(db, task_id, status, limit)
+
+            if not runs:
+                print_warning("未找到工作流运行记录")
+                return
+
+            data = []
+            for run in runs:
+                data.append({
+                    "运行ID": run["id"],
+                    "任务": run["task_name"] or run["task_id"],
+                    "状态": run["status"],
+                    "模式": run["mode"] or "-",
+                    "执行次数": run["attempts"],
+                    "失败步骤": run["failed_step"] or "-",
+                    "开始时间": format_datetime(run["started_at"]),
+                    "结束时间": format_datetime(run["finished_at"]),
+                })
+
+            print_table(data, title=f"工作流运行记录 (共 {len(runs)} 条)", show_header=True)
+
+    except Exception as e:
+        handle_error(e)
+
+
+@app.command("workflow-run")
+def workflow_run_info(
+    run_id: int = typer.Argument(..., help="工作流运行 ID")
+):
+    """查看工作流运行详情（各步骤的状态和检查点）"""
+    try:
+        with get_session_local()() as db:
+            run = scheduler_manager_service.get_workflow_run(db, run_id)
+            if not run:
+                print_error(f"工作流运行不存在: ID {run_id}")
+                raise typer.Exit(1)
+
+            print_info(
+                f"运行 {run['id']} | 任务: {run['task_name'] or run['task_id']} | 状态: {run['status']} | "
+                f"执行次数: {run['attempts']}"
+            )
+            if run["error_message"]:
+                print_warning(f"失败步骤: {run['failed_step']} - {run['error_message']}")
+
+            data = []
+            for step in run["steps"]:
+                data.append({
+                    "步骤": step["step_key"],
+                    "类型": step["step_type"] or "-",
+                    "状态": step["status"],
+                    "执行次数": step["attempts"],
+                    "已完成元素": step["completed_items"] or "-",
+                    "耗时": f"{step['duration']:.1f}s" if step["duration"] is not None else "-",
+                    "错误": step["error"] or "-",
+                })
+
+            if data:
+                print_table(data, title="步骤检查点", show_header=True)
+            else:
+                print_warning("该运行还没有步骤记录")
+
+    except Exception as e:
+        handle_error(e)
+
+
+@app.command("resume-run")
+def resume_workflow_run(
+    run_id: int = typer.Argument(..., help="工作流运行 ID")
+):
+    """从失败的步骤续跑工作流运行"""
+    try:
+        with get_session_local()() as db:
+            print_info(f"正在续跑工作流运行 (ID: {run_id})...")
+
+            result = scheduler_manager_service.resume_workflow_run(db, run_id)
+
+            if result.get("success"):
+                print_success("工作流续跑成功")
+                print_info(f"消息: {result.get('message', '')}")
+            else:
+                print_error(f"工作流续跑失败: {result.get('error') or result.get('message', '未知错误')}")
+
+    except Exception as e:
+        handle_error(e)
+
+
 @app.command("start")
 def start_scheduler():
     """启动调度器"""
@@ -521,6 +677,46 @@ def scheduler_status():
         handle_error(e)
 
 
+@app.command("executors")
+def list_executors():
+    """查看执行器线程池状态"""
+    try:
+        executors = scheduler_manager_service.get_executors()
+        if not executors:
+            print_warning("暂无已注册的执行器")
+            return
+
+        table = Table(title="执行器线程池", show_header=True)
+        table.add_column("执行器类型", style="cyan")
+        table.add_column("工作线程", justify="right")
+        table.add_column("运行中", justify="right", style="green")
+        table.add_column("排队中", justify="right", style="yellow")
+        table.add_column("已完成", justify="right")
+        table.add_column("跳过", justify="right", style="red")
+        table.add_column("max_instances", justify="right")
+        table.add_column("合并执行")
+
+        for executor_type, info in executors.items():
+            pool = info.get("pool") or {}
+            table.add_row(
+                executor_type,
+                str(pool.get("max_workers", "-")),
+                str(pool.get("running", 0)),
+                str(pool.get("queued", 0)),
+                str(pool.get("completed", 0)),
+                str(pool.get("skipped", 0)),
+                str(info["max_instances"]),
+                format_bool(info["coalesce"])
+            )
+
+        from rich.console import Console
+        console = Console()
+        console.print(table)
+
+    except Exception as e:
+        handle_error(e)
+
+
 @app.command("pause")
 def pause_task(
     task_id: int = typer.Argument(..., help="任务 ID")
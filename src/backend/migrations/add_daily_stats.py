@@ -0,0 +1,81 @@
+"""
+数据库迁移脚本：添加 daily_stats 每日统计汇总表
+
+1. 创建 daily_stats 表和 contents.review_status 索引
+2. 根据已有的内容和发布记录回填全部汇总
+3. 添加每小时执行一次的统计汇总定时任务
+
+运行方式：
+    python -m migrations.add_daily_stats
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal, engine
+from app.models.scheduler import ScheduledTask
+from app.models.stats import DailyStat
+from app.services.stats_rollup_service import stats_rollup_service
+
+ROLLUP_TASK_NAME = "每日统计汇总"
+
+
+def migrate():
+    """执行迁移"""
+    session = SessionLocal()
+
+    try:
+        print("正在创建 daily_stats 表...")
+        DailyStat.__table__.create(bind=engine, checkfirst=True)
+
+        print("正在创建索引 ix_contents_review_status...")
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_contents_review_status ON contents (review_status)"
+        ))
+        session.commit()
+
+        print("正在回填历史汇总...")
+        row_count = stats_rollup_service.rebuild(session)
+        print(f"✓ 写入 {row_count} 行汇总")
+
+        if not session.query(ScheduledTask).filter(ScheduledTask.name == ROLLUP_TASK_NAME).first():
+            session.add(ScheduledTask(
+                name=ROLLUP_TASK_NAME,
+                description="每小时重算最近几天的统计汇总",
+                task_type="stats_rollup",
+                params={},
+                cron_expression="5 * * * *",
+                is_active=True
+            ))
+            session.commit()
+            print(f"✓ 已添加定时任务: {ROLLUP_TASK_NAME}")
+
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加每日统计汇总表")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
@@ -0,0 +1,67 @@
+"""
+数据库迁移脚本：添加任务执行历史小时汇总表
+
+1. 创建 task_execution_hourly_stats 表
+2. 添加每天执行一次的执行历史压缩定时任务
+
+运行方式：
+    python -m migrations.add_execution_history_compaction
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, engine
+from app.models.scheduler import ScheduledTask, TaskExecutionHourlyStat
+
+COMPACTION_TASK_NAME = "执行历史压缩"
+
+
+def migrate():
+    """执行迁移"""
+    session = SessionLocal()
+
+    try:
+        print("正在创建 task_execution_hourly_stats 表...")
+        TaskExecutionHourlyStat.__table__.create(bind=engine, checkfirst=True)
+
+        if not session.query(ScheduledTask).filter(ScheduledTask.name == COMPACTION_TASK_NAME).first():
+            session.add(ScheduledTask(
+                name=COMPACTION_TASK_NAME,
+                description="每天将过期的任务执行明细压缩为小时汇总",
+                task_type="execution_history_compaction",
+                params={"vacuum": True},
+                cron_expression="30 3 * * *",
+                is_active=True
+            ))
+            session.commit()
+            print(f"✓ 已添加定时任务: {COMPACTION_TASK_NAME}")
+
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加执行历史小时汇总表")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
@@ -0,0 +1,67 @@
+"""
+数据库迁移脚本：为游标分页添加 (created_at, id) 复合索引
+
+新建数据库由模型定义自动创建这些索引，已有数据库需要运行本脚本。
+
+运行方式：
+    python -m migrations.add_keyset_pagination_indexes
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+
+
+# (索引名, 表名, 列)
+INDEXES = [
+    ("ix_contents_created_at_id", "contents", "created_at, id"),
+    ("ix_contents_account_id_created_at_id", "contents", "account_id, created_at, id"),
+    ("ix_audit_logs_timestamp_id", "audit_logs", "timestamp, id"),
+    ("ix_publish_logs_created_at_id", "publish_logs", "created_at, id"),
+    ("ix_publish_logs_account_id_created_at_id", "publish_logs", "account_id, created_at, id"),
+]
+
+
+def migrate():
+    """执行迁移"""
+    session = SessionLocal()
+
+    try:
+        for index_name, table_name, columns in INDEXES:
+            print(f"正在创建索引 {index_name}...")
+            session.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"
+            ))
+
+        session.commit()
+        print(f"✓ 成功创建 {len(INDEXES)} 个索引")
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加游标分页索引")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
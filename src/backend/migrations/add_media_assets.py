@@ -0,0 +1,48 @@
+"""
+数据库迁移脚本：添加已上传媒体缓存表
+
+media_assets 按 (账号, 文件 sha256) 保存上传到微信后返回的 media_id / URL 及过期时间，
+相同文件再次发布到同一账号时直接引用，不再重复上传。
+
+运行方式：
+    python -m migrations.add_media_assets
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine
+from app.models.publisher import MediaAsset
+
+
+def migrate():
+    """执行迁移"""
+    try:
+        print("正在创建 media_assets 表...")
+        MediaAsset.__table__.create(bind=engine, checkfirst=True)
+        print("✓ media_assets 表已就绪")
+        return True
+
+    except Exception as e:
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加已上传媒体缓存表")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
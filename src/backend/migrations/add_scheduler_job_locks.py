@@ -0,0 +1,48 @@
+"""
+数据库迁移脚本：添加定时任务运行锁表
+
+多副本部署时，各副本通过 scheduler_job_locks 表竞争每个定时任务的运行锁，
+保证每次触发只在一个副本执行。
+
+运行方式：
+    python -m migrations.add_scheduler_job_locks
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine
+from app.models.scheduler import SchedulerJobLock
+
+
+def migrate():
+    """执行迁移"""
+    try:
+        print("正在创建 scheduler_job_locks 表...")
+        SchedulerJobLock.__table__.create(bind=engine, checkfirst=True)
+        print("✓ scheduler_job_locks 表已就绪")
+        return True
+
+    except Exception as e:
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加定时任务运行锁表")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
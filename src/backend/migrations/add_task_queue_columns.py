@@ -0,0 +1,78 @@
+"""
+数据库迁移脚本：为 content_generation_tasks 表添加任务队列字段
+
+1. 添加 claimed_by / lease_expires_at / available_at / delivery_count 列
+2. 添加按 status、priority、created_at 领取任务的索引
+
+运行方式：
+    python -m migrations.add_task_queue_columns
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.database import SessionLocal
+
+QUEUE_COLUMNS = {
+    "claimed_by": "VARCHAR(100)",
+    "lease_expires_at": "DATETIME",
+    "available_at": "DATETIME",
+    "delivery_count": "INTEGER DEFAULT 0",
+}
+
+
+def migrate():
+    """执行迁移"""
+    session = SessionLocal()
+
+    try:
+        existing = {
+            row[0] for row in session.execute(text(
+                "SELECT name FROM pragma_table_info('content_generation_tasks')"
+            )).fetchall()
+        }
+
+        for column, column_type in QUEUE_COLUMNS.items():
+            if column in existing:
+                print(f"✓ {column} 列已存在")
+                continue
+            print(f"正在添加 {column} 列...")
+            session.execute(text(f"ALTER TABLE content_generation_tasks ADD COLUMN {column} {column_type}"))
+
+        print("正在创建 idx_task_queue 索引...")
+        session.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_task_queue "
+            "ON content_generation_tasks (status, priority, created_at)"
+        ))
+        session.commit()
+
+        print("✓ 任务队列字段已就绪")
+        return True
+
+    except Exception as e:
+        session.rollback()
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加任务队列字段")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
@@ -0,0 +1,49 @@
+"""
+数据库迁移脚本：添加工作流运行记录表
+
+workflow_runs 保存工作流的每次运行，workflow_step_runs 保存各步骤的状态和输出，
+工作流失败后再次触发时从失败的步骤续跑。
+
+运行方式：
+    python -m migrations.add_workflow_runs
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine
+from app.models.scheduler import WorkflowRun, WorkflowStepRun
+
+
+def migrate():
+    """执行迁移"""
+    try:
+        for table in (WorkflowRun.__table__, WorkflowStepRun.__table__):
+            print(f"正在创建 {table.name} 表...")
+            table.create(bind=engine, checkfirst=True)
+            print(f"✓ {table.name} 表已就绪")
+        return True
+
+    except Exception as e:
+        print(f"✗ 迁移失败: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("数据库迁移：添加工作流运行记录表")
+    print("=" * 60)
+    print()
+
+    success = migrate()
+
+    print()
+    print("=" * 60)
+    if success:
+        print("迁移完成！")
+        sys.exit(0)
+    else:
+        print("迁移失败！")
+        sys.exit(1)
@@ -13,7 +13,9 @@ from app.services.executors import (
     AddToPoolExecutor,
     ApproveExecutor,
     AsyncContentGenerationExecutor,
-    PublishPoolScannerExecutor
+    PublishPoolScannerExecutor,
+    StatsRollupExecutor,
+    ExecutionHistoryCompactionExecutor
 )
 from app.db.database import SessionLocal
 from app.utils.custom_logger import log
@@ -32,7 +34,9 @@ def init_scheduler():
         ("add_to_pool", AddToPoolExecutor()),
         ("approve", ApproveExecutor()),
         ("async_content_generation", AsyncContentGenerationExecutor()),
-        ("publish_pool_scanner", PublishPoolScannerExecutor())
+        ("publish_pool_scanner", PublishPoolScannerExecutor()),
+        ("stats_rollup", StatsRollupExecutor()),
+        ("execution_history_compaction", ExecutionHistoryCompactionExecutor())
     ]
 
     registered_count = 0
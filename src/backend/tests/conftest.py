@@ -5,9 +5,10 @@ import sys
 from pathlib import Path
 from typing import Generator
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 # 添加项目根目录到 Python 路径
 sys.path.append(str(Path(__file__).parent.parent))
@@ -15,13 +16,16 @@ sys.path.append(str(Path(__file__).parent.parent))
 from app.db.sql_db import Base
 from app.db.database import get_db as database_get_db
 from app.db.sql_db import get_db as sql_db_get_db
+from app.db.sql_db import get_async_db
 import main
 from app.models.user import User
 from app.core.security import create_salt, get_password_hash
 
-# 使用内存 SQLite 作为测试数据库
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# 使用共享缓存的内存 SQLite 作为测试数据库，同步和异步引擎看到同一份数据
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:contenthub_test?mode=memory&cache=shared&uri=true"
+SQLALCHEMY_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///file:contenthub_test?mode=memory&cache=shared&uri=true"
 
+# StaticPool 持有唯一连接，保证内存数据库在整个测试过程中存在
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
@@ -29,6 +33,18 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步连接不跨事件循环复用，每个会话单独建立连接
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _read_uncommitted(dbapi_connection, connection_record):
+    # 与同步会话共享的数据可能尚未提交，允许读取以避免共享缓存的表锁
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA read_uncommitted = 1")
+    cursor.close()
+
 
 @pytest.fixture(scope="function")
 def test_db() -> None:
@@ -52,6 +68,13 @@ def db_session(test_db) -> Generator:
         session.close()
 
 
+@pytest.fixture(scope="function")
+async def async_db_session(test_db):
+    """创建测试异步数据库会话（与 db_session 共享同一内存数据库）。"""
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
+
 @pytest.fixture(scope="function")
 def client(db_session) -> Generator:
     """创建 FastAPI 测试客户端。"""
@@ -66,6 +89,12 @@ def client(db_session) -> Generator:
     main.app.dependency_overrides[database_get_db] = override_get_db
     main.app.dependency_overrides[sql_db_get_db] = override_get_db
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_session:
+            yield async_session
+
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+
     with TestClient(main.app) as test_client:
         yield test_client
 
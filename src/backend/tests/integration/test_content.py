@@ -290,6 +290,42 @@ class TestContentEndpoints:
         assert "pageSize" in data
         assert data["pageSize"] == 10
 
+    def test_content_cursor_pagination(self, client: TestClient, admin_auth_headers, test_customer, db_session: Session):
+        """测试内容游标分页"""
+        from app.models.platform import Platform
+
+        platform = Platform(name="游标分页测试平台", code="cursor_test_platform", type="social_media", is_active=True)
+        db_session.add(platform)
+        db_session.commit()
+
+        account = self._create_test_account(db_session, test_customer, platform.id, "游标分页测试账号")
+        for i in range(5):
+            self._create_test_content(db_session, account.id, f"游标测试文章{i+1}")
+
+        # 首页传空游标
+        response = client.get("/api/v1/content/?cursor=&page_size=2&with_total=true", headers=admin_auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        assert data["page"] is None
+        assert data["hasMore"] is True
+
+        ids = [item["id"] for item in data["items"]]
+        while data["hasMore"]:
+            response = client.get(
+                f"/api/v1/content/?cursor={data['nextCursor']}&page_size=2",
+                headers=admin_auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            ids.extend(item["id"] for item in data["items"])
+
+        assert len(ids) == len(set(ids)) == 5
+
+        # 无效游标
+        response = client.get("/api/v1/content/?cursor=invalid", headers=admin_auth_headers)
+        assert response.status_code == 400
+
     def test_unauthorized_access(self, client: TestClient):
         """测试未授权访问"""
         response = client.get("/api/v1/content/")
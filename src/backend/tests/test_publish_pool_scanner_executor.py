@@ -4,17 +4,28 @@
 测试 PublishPoolScannerExecutor 的各项功能
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from app.services.executors.publish_pool_scanner_executor import PublishPoolScannerExecutor
+from app.services.publish_engine import PublishEngine
 from app.services.scheduler_service import TaskExecutionResult
 from app.models.publisher import PublishPool
 from app.models.content import Content
 from app.models.account import Account
 
 
+@pytest.fixture(autouse=True)
+def unthrottled_engine():
+    """测试中不限速"""
+    with patch(
+        'app.services.executors.publish_pool_scanner_executor.publish_engine',
+        PublishEngine(account_rate_per_minute=0)
+    ):
+        yield
+
+
 @pytest.fixture
 def scanner_executor():
     """创建 PublishPoolScannerExecutor 实例"""
@@ -249,10 +260,7 @@ class TestPublishPoolScannerExecutor:
 
             # Mock 发布执行器
             mock_executor = Mock()
-            mock_executor.execute.return_value = TaskExecutionResult.success_result(
-                message="发布成功",
-                data={"log_id": 100}
-            )
+            mock_executor.publish_entry = AsyncMock(return_value={"status": "published", "log_id": 100})
             mock_executor_class.return_value = mock_executor
 
             # 执行任务
@@ -281,11 +289,11 @@ class TestPublishPoolScannerExecutor:
 
             # Mock 发布执行器：第一个成功，第二个失败，第三个成功
             mock_executor = Mock()
-            mock_executor.execute.side_effect = [
-                TaskExecutionResult.success_result(message="发布成功"),
-                TaskExecutionResult.failure_result(message="发布失败", error="API错误"),
-                TaskExecutionResult.success_result(message="发布成功")
-            ]
+            mock_executor.publish_entry = AsyncMock(side_effect=[
+                {"status": "published", "log_id": 100},
+                {"status": "failed", "error": "发布失败"},
+                {"status": "published", "log_id": 101}
+            ])
             mock_executor_class.return_value = mock_executor
 
             # 执行任务
@@ -301,9 +309,9 @@ class TestPublishPoolScannerExecutor:
             assert result.data["published_count"] == 2
             assert result.data["failed_count"] == 1
 
-            # 验证重试次数被更新
-            assert sample_pending_tasks[1].retry_count == 1
-            assert sample_pending_tasks[1].last_error == "发布失败"
+            # 验证失败原因（重试次数由 publish_entry 更新到发布池）
+            failed = [item for item in result.data["results"] if not item["success"]]
+            assert failed == [{"pool_id": 2, "content_id": 102, "success": False, "error": "发布失败"}]
 
     @pytest.mark.asyncio
     async def test_execute_all_failed(self, scanner_executor, mock_db, sample_pending_tasks):
@@ -313,10 +321,7 @@ class TestPublishPoolScannerExecutor:
 
             # Mock 发布执行器：所有都失败
             mock_executor = Mock()
-            mock_executor.execute.return_value = TaskExecutionResult.failure_result(
-                message="发布失败",
-                error="网络错误"
-            )
+            mock_executor.publish_entry = AsyncMock(return_value={"status": "failed", "error": "网络错误"})
             mock_executor_class.return_value = mock_executor
 
             # 执行任务
@@ -376,7 +381,7 @@ class TestPublishPoolScannerExecutor:
 
             # Mock 发布执行器：抛出异常
             mock_executor = Mock()
-            mock_executor.execute.side_effect = Exception("数据库连接断开")
+            mock_executor.publish_entry = AsyncMock(side_effect=Exception("数据库连接断开"))
             mock_executor_class.return_value = mock_executor
 
             # 执行任务
@@ -408,14 +413,13 @@ class TestPublishPoolScannerExecutor:
                 task.max_retries = 3
                 task.priority = 5
 
-            mock_get_tasks.return_value = tasks
+            # 模拟查询按 max_batch_size 限制返回数量
+            mock_get_tasks.side_effect = lambda db, max_batch_size, check_future_tasks: tasks[:max_batch_size]
 
             with patch('app.services.executors.publish_pool_scanner_executor.PublishingExecutor') as mock_executor_class:
                 # Mock 所有发布都成功
                 mock_executor = Mock()
-                mock_executor.execute.return_value = TaskExecutionResult.success_result(
-                    message="发布成功"
-                )
+                mock_executor.publish_entry = AsyncMock(return_value={"status": "published"})
                 mock_executor_class.return_value = mock_executor
 
                 # 执行任务，批量大小为5
@@ -4,7 +4,7 @@
 测试 PublishingExecutor 的各项功能
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
@@ -15,18 +15,20 @@ from app.models.content import Content
 from app.models.account import Account
 
 
-@pytest.fixture
-def publishing_executor():
-    """创建 PublishingExecutor 实例"""
-    return PublishingExecutor()
-
-
 @pytest.fixture
 def mock_db():
     """创建模拟数据库会话"""
     return Mock(spec=Session)
 
 
+@pytest.fixture
+def publishing_executor(mock_db):
+    """创建 PublishingExecutor 实例（每个条目的独立会话使用同一个模拟会话）"""
+    executor = PublishingExecutor()
+    executor._entry_session = lambda db: mock_db
+    return executor
+
+
 @pytest.fixture
 def sample_pool_entries():
     """创建示例发布池条目"""
@@ -115,6 +117,9 @@ class TestPublishingExecutor:
         with patch('app.services.executors.publishing_executor.publish_pool_service') as mock_pool_service, \
              patch('app.services.executors.publishing_executor.publisher_service') as mock_publisher_service:
 
+            # 发布服务为异步接口
+            mock_publisher_service.manual_publish_async = AsyncMock()
+
             # 模拟查询返回待发布内容
             mock_pool_service.get_pending_entries.return_value = sample_pool_entries
 
@@ -125,7 +130,7 @@ class TestPublishingExecutor:
             ]
 
             # 模拟发布成功（调用两次）
-            mock_publisher_service.manual_publish.side_effect = [
+            mock_publisher_service.manual_publish_async.side_effect = [
                 {"success": True, "log_id": 100, "media_id": "test_media_id"},
                 {"success": True, "log_id": 101, "media_id": "test_media_id_2"}
             ]
@@ -146,7 +151,7 @@ class TestPublishingExecutor:
 
             # 验证调用
             assert mock_pool_service.start_publishing.call_count == 2
-            assert mock_publisher_service.manual_publish.call_count == 2
+            assert mock_publisher_service.manual_publish_async.call_count == 2
             assert mock_pool_service.complete_publishing.call_count == 2
 
     @pytest.mark.asyncio
@@ -155,6 +160,9 @@ class TestPublishingExecutor:
         with patch('app.services.executors.publishing_executor.publish_pool_service') as mock_pool_service, \
              patch('app.services.executors.publishing_executor.publisher_service') as mock_publisher_service:
 
+            # 发布服务为异步接口
+            mock_publisher_service.manual_publish_async = AsyncMock()
+
             # 模拟查询返回待发布内容
             mock_pool_service.get_pending_entries.return_value = sample_pool_entries
 
@@ -165,7 +173,7 @@ class TestPublishingExecutor:
             ]
 
             # 模拟第一次成功，第二次失败
-            mock_publisher_service.manual_publish.side_effect = [
+            mock_publisher_service.manual_publish_async.side_effect = [
                 {"success": True, "log_id": 100, "media_id": "test_media_id"},
                 {"success": False, "error": "Publish failed"}
             ]
@@ -192,7 +200,7 @@ class TestPublishingExecutor:
 
             # 验证调用
             assert mock_pool_service.start_publishing.call_count == 2
-            assert mock_publisher_service.manual_publish.call_count == 2
+            assert mock_publisher_service.manual_publish_async.call_count == 2
             assert mock_pool_service.complete_publishing.call_count == 1
             assert mock_pool_service.fail_publishing.call_count == 1
 
@@ -235,6 +243,9 @@ class TestPublishingExecutor:
         with patch('app.services.executors.publishing_executor.publish_pool_service') as mock_pool_service, \
              patch('app.services.executors.publishing_executor.publisher_service') as mock_publisher_service:
 
+            # 发布服务为异步接口
+            mock_publisher_service.manual_publish_async = AsyncMock()
+
             # 模拟查询返回待发布内容
             mock_pool_service.get_pending_entries.return_value = sample_pool_entries
 
@@ -245,7 +256,7 @@ class TestPublishingExecutor:
             ]
 
             # 模拟发布失败（调用两次）
-            mock_publisher_service.manual_publish.side_effect = [
+            mock_publisher_service.manual_publish_async.side_effect = [
                 {"success": False, "error": "Publish failed"},
                 {"success": False, "error": "Publish failed"}
             ]
@@ -277,6 +288,9 @@ class TestPublishingExecutor:
         with patch('app.services.executors.publishing_executor.publish_pool_service') as mock_pool_service, \
              patch('app.services.executors.publishing_executor.publisher_service') as mock_publisher_service:
 
+            # 发布服务为异步接口
+            mock_publisher_service.manual_publish_async = AsyncMock()
+
             # 模拟查询返回待发布内容
             mock_pool_service.get_pending_entries.return_value = sample_pool_entries
 
@@ -287,7 +301,7 @@ class TestPublishingExecutor:
             ]
 
             # 模拟发布失败（调用两次）
-            mock_publisher_service.manual_publish.side_effect = [
+            mock_publisher_service.manual_publish_async.side_effect = [
                 {"success": False, "error": "Publish failed"},
                 {"success": False, "error": "Publish failed"}
             ]
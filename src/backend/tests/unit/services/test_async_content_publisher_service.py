@@ -0,0 +1,174 @@
+"""
+异步内容发布服务单元测试
+测试重试退避期间事件循环不被阻塞，以及 multipart 发布流式上传图片
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.core.exceptions import PublisherException
+from app.services.async_content_publisher_service import AsyncContentPublisherService
+
+
+def make_service(handler) -> AsyncContentPublisherService:
+    service = AsyncContentPublisherService()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service._get_client = lambda: client
+    return service
+
+
+def make_db(content, account) -> MagicMock:
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.side_effect = [content, account]
+    return db
+
+
+@pytest.fixture(autouse=True)
+def publisher_settings():
+    with patch('app.services.async_content_publisher_service.settings') as mock_settings:
+        mock_settings.PUBLISHER_API_URL = "http://publisher.test"
+        mock_settings.PUBLISHER_API_KEY = "test-key"
+        yield mock_settings
+
+
+@pytest.fixture(autouse=True)
+def disable_media_cache():
+    """这里只测试请求发送，媒体缓存见 test_media_cache_service"""
+    with patch('app.services.media_cache_service.settings.PUBLISHER_MEDIA_CACHE_ENABLED', False):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_retry_backoff_does_not_block_event_loop():
+    calls = []
+
+    def handler(request):
+        calls.append(time.time())
+        if len(calls) == 1:
+            return httpx.Response(503, text="busy")
+        return httpx.Response(200, json={"success": True, "data": {"mediaId": "m1"}})
+
+    service = make_service(handler)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.05)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        result = await service._make_request("POST", "/api/publish", json={"title": "t"})
+    finally:
+        ticker_task.cancel()
+
+    assert result["success"] is True
+    assert len(calls) == 2
+    # 第一次重试等待 1 秒，期间其他协程持续运行
+    assert calls[1] - calls[0] >= 1
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_publish_with_images_streams_files(tmp_path):
+    image = tmp_path / "cover.png"
+    image.write_bytes(b"\x89PNG" + b"x" * 4096)
+    received = {}
+
+    def handler(request):
+        body = request.read()
+        received["content_type"] = request.headers["Content-Type"]
+        received["has_image"] = b"x" * 4096 in body
+        received["auth"] = request.headers["Authorization"]
+        return httpx.Response(200, json={"success": True, "data": {"mediaId": "m2"}})
+
+    content = SimpleNamespace(
+        title="标题", content="正文", cover_image=str(image), images=None
+    )
+    account = SimpleNamespace(wechat_app_id="app", wechat_app_secret="secret")
+
+    service = make_service(handler)
+    opened = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        handle = real_open(*args, **kwargs)
+        opened.append(handle)
+        return handle
+
+    with patch('app.utils.multipart_stream.open', tracking_open, create=True):
+        result = await service.publish_to_wechat(1, 1, db=make_db(content, account))
+
+    assert result["data"]["mediaId"] == "m2"
+    assert received["content_type"].startswith("multipart/form-data")
+    assert received["has_image"] is True
+    assert received["auth"] == "Bearer test-key"
+    # 图片从磁盘分块读取，发送完成后关闭
+    assert len(opened) == 1 and opened[0].closed
+
+
+@pytest.mark.asyncio
+async def test_publish_with_images_business_error_raises(tmp_path):
+    image = tmp_path / "cover.png"
+    image.write_bytes(b"\x89PNG")
+
+    def handler(request):
+        return httpx.Response(200, json={"success": False, "message": "草稿箱已满"})
+
+    content = SimpleNamespace(title="t", content="正文", cover_image=str(image), images=None)
+    account = SimpleNamespace(wechat_app_id="app", wechat_app_secret="secret")
+    service = make_service(handler)
+
+    with pytest.raises(PublisherException) as exc_info:
+        await service.publish_to_wechat(1, 1, db=make_db(content, account))
+
+    assert exc_info.value.code == "PUBLISHER_BUSINESS_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_media_cache_runs_off_event_loop(tmp_path):
+    import threading
+
+    from app.services.content_publisher_service import ContentPublisherService
+
+    image = tmp_path / "cover.png"
+    image.write_bytes(b"\x89PNG")
+
+    def handler(request):
+        return httpx.Response(200, json={"success": True, "data": {"mediaId": "m3"}})
+
+    content = SimpleNamespace(title="t", content="正文", cover_image=str(image), images=None)
+    account = SimpleNamespace(wechat_app_id="app", wechat_app_secret="secret")
+    service = make_service(handler)
+    loop_thread = threading.get_ident()
+    threads = {}
+
+    real_prepare = ContentPublisherService._prepare_publish
+    real_apply = ContentPublisherService._apply_media_cache
+    real_remember = ContentPublisherService._remember_uploaded_media
+
+    def tracking_prepare(content_id, account_id, db):
+        threads["prepare"] = threading.get_ident()
+        return real_prepare(content_id, account_id, db)
+
+    def tracking_apply(prepared):
+        threads["apply"] = threading.get_ident()
+        return real_apply(prepared)
+
+    def tracking_remember(prepared, result):
+        threads["remember"] = threading.get_ident()
+        return real_remember(prepared, result)
+
+    with patch.object(ContentPublisherService, "_prepare_publish", staticmethod(tracking_prepare)), \
+            patch.object(ContentPublisherService, "_apply_media_cache", staticmethod(tracking_apply)), \
+            patch.object(ContentPublisherService, "_remember_uploaded_media", staticmethod(tracking_remember)):
+        await service.publish_to_wechat(1, 1, db=make_db(content, account))
+
+    # 查询内容、文件摘要和缓存读写不在事件循环线程中执行
+    assert set(threads) == {"prepare", "apply", "remember"}
+    assert loop_thread not in threads.values()
@@ -2,7 +2,7 @@
 批量发布服务单元测试
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -11,12 +11,21 @@ from app.models.publisher import PublishLog, PublishPool
 from app.models.content import Content
 from app.models.account import Account
 from app.models.platform import Platform
+from app.services.publish_engine import PublishEngine
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_engine():
+    """测试中不限速"""
+    with patch('app.services.batch_publish_service.publish_engine', PublishEngine(account_rate_per_minute=0)):
+        yield
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.content_publisher_service')
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
 @patch('app.services.batch_publish_service.publish_pool_service')
-def test_process_batch_publish_success(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+async def test_process_batch_publish_success(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
     """测试批量发布成功"""
     # 创建测试平台和账号
     platform = Platform(
@@ -75,7 +84,7 @@ def test_process_batch_publish_success(mock_publish_pool_service, mock_content_p
 
     # 执行批量发布
     content_ids = [content.id for content in contents]
-    result = batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
+    result = await batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
 
     # 验证结果
     assert result["total"] == 3
@@ -111,9 +120,10 @@ def test_process_batch_publish_success(mock_publish_pool_service, mock_content_p
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.content_publisher_service')
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
 @patch('app.services.batch_publish_service.publish_pool_service')
-def test_process_batch_publish_content_not_found(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+async def test_process_batch_publish_content_not_found(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
     """测试批量发布时内容不存在"""
     # 创建测试平台和账号
     platform = Platform(
@@ -143,7 +153,7 @@ def test_process_batch_publish_content_not_found(mock_publish_pool_service, mock
     non_existent_content_ids = [99999, 99998, 99997]
 
     # 执行批量发布
-    result = batch_publish_service.process_batch_publish(db_session, account.id, non_existent_content_ids)
+    result = await batch_publish_service.process_batch_publish(db_session, account.id, non_existent_content_ids)
 
     # 验证结果
     assert result["total"] == 3
@@ -164,9 +174,10 @@ def test_process_batch_publish_content_not_found(mock_publish_pool_service, mock
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.content_publisher_service')
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
 @patch('app.services.batch_publish_service.publish_pool_service')
-def test_process_batch_publish_invalid_status(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+async def test_process_batch_publish_invalid_status(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
     """测试批量发布时内容状态不正确"""
     # 创建测试平台和账号
     platform = Platform(
@@ -213,7 +224,7 @@ def test_process_batch_publish_invalid_status(mock_publish_pool_service, mock_co
 
     # 执行批量发布
     content_ids = [content.id for content in contents]
-    result = batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
+    result = await batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
 
     # 验证结果
     assert result["total"] == 3
@@ -235,9 +246,10 @@ def test_process_batch_publish_invalid_status(mock_publish_pool_service, mock_co
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.content_publisher_service')
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
 @patch('app.services.batch_publish_service.publish_pool_service')
-def test_process_batch_publish_partial_success(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+async def test_process_batch_publish_partial_success(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
     """测试批量发布部分成功"""
     # 创建测试平台和账号
     platform = Platform(
@@ -309,7 +321,7 @@ def test_process_batch_publish_partial_success(mock_publish_pool_service, mock_c
 
     # 执行批量发布（包含不存在的内容ID）
     content_ids = [contents[0].id, contents[1].id, invalid_content.id, 99999]
-    result = batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
+    result = await batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
 
     # 验证结果
     assert result["total"] == 4
@@ -333,9 +345,10 @@ def test_process_batch_publish_partial_success(mock_publish_pool_service, mock_c
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.content_publisher_service')
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
 @patch('app.services.batch_publish_service.publish_pool_service')
-def test_process_batch_publish_exception_handling(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+async def test_process_batch_publish_exception_handling(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
     """测试批量发布异常处理"""
     # 创建测试平台和账号
     platform = Platform(
@@ -389,7 +402,7 @@ def test_process_batch_publish_exception_handling(mock_publish_pool_service, moc
 
     # 执行批量发布
     content_ids = [content.id for content in contents]
-    result = batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
+    result = await batch_publish_service.process_batch_publish(db_session, account.id, content_ids)
 
     # 验证结果
     assert result["total"] == 3
@@ -406,15 +419,16 @@ def test_process_batch_publish_exception_handling(mock_publish_pool_service, moc
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.BatchPublishService.process_batch_publish')
-def test_process_scheduled_batch_publish_no_pending(mock_process_batch_publish, db_session: Session, test_customer: object):
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.BatchPublishService.publish_contents', new_callable=AsyncMock)
+async def test_process_scheduled_batch_publish_no_pending(mock_publish_contents, db_session: Session, test_customer: object):
     """测试处理定时批量发布任务（无待发布内容）"""
     # 模拟发布池服务返回空列表
     with patch('app.services.batch_publish_service.publish_pool_service') as mock_publish_pool_service:
         mock_publish_pool_service.get_pending_entries.return_value = []
 
         # 执行定时批量发布
-        result = batch_publish_service.process_scheduled_batch_publish(db_session)
+        result = await batch_publish_service.process_scheduled_batch_publish(db_session)
 
         # 验证结果
         assert result["total"] == 0
@@ -423,14 +437,15 @@ def test_process_scheduled_batch_publish_no_pending(mock_process_batch_publish,
         assert len(result["results"]) == 0
 
         # 验证未被调用
-        assert mock_process_batch_publish.call_count == 0
+        assert mock_publish_contents.call_count == 0
 
     print("✓ 处理定时批量发布任务（无待发布内容）测试通过")
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.BatchPublishService.process_batch_publish')
-def test_process_scheduled_batch_publish_with_pending(mock_process_batch_publish, db_session: Session, test_customer: object):
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.BatchPublishService.publish_contents', new_callable=AsyncMock)
+async def test_process_scheduled_batch_publish_with_pending(mock_publish_contents, db_session: Session, test_customer: object):
     """测试处理定时批量发布任务（有待发布内容）"""
     # 创建测试平台和账号
     platform = Platform(
@@ -487,7 +502,7 @@ def test_process_scheduled_batch_publish_with_pending(mock_process_batch_publish
     db_session.commit()
 
     # 模拟批量发布结果
-    mock_process_batch_publish.return_value = {
+    mock_publish_contents.return_value = {
         "total": 3,
         "success": 3,
         "fail": 0,
@@ -503,7 +518,7 @@ def test_process_scheduled_batch_publish_with_pending(mock_process_batch_publish
     }
 
     # 执行定时批量发布
-    result = batch_publish_service.process_scheduled_batch_publish(db_session)
+    result = await batch_publish_service.process_scheduled_batch_publish(db_session)
 
     # 验证结果
     assert result["total"] == 3
@@ -512,7 +527,7 @@ def test_process_scheduled_batch_publish_with_pending(mock_process_batch_publish
     assert len(result["results"]) == 3
 
     # 验证被调用
-    assert mock_process_batch_publish.call_count == 1
+    assert mock_publish_contents.call_count == 1
 
     print("✓ 处理定时批量发布任务（有待发布内容）测试通过")
 
@@ -784,9 +799,10 @@ def test_get_batch_publish_statistics_no_logs(db_session: Session, test_customer
 
 
 @pytest.mark.unit
-@patch('app.services.batch_publish_service.content_publisher_service')
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
 @patch('app.services.batch_publish_service.publish_pool_service')
-def test_process_batch_publish_mixed_accounts(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+async def test_process_batch_publish_mixed_accounts(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
     """测试批量发布混合账号内容"""
     # 创建测试平台和账号
     platform = Platform(
@@ -864,7 +880,7 @@ def test_process_batch_publish_mixed_accounts(mock_publish_pool_service, mock_co
     mock_content_publisher_service.publish_to_wechat.return_value = mock_publish_result
 
     # 使用账号1发布content2（不匹配）- 应该失败
-    result = batch_publish_service.process_batch_publish(db_session, account1.id, [content2.id])
+    result = await batch_publish_service.process_batch_publish(db_session, account1.id, [content2.id])
 
     # 验证结果
     assert result["total"] == 1
@@ -874,3 +890,45 @@ def test_process_batch_publish_mixed_accounts(mock_publish_pool_service, mock_co
     assert result["results"][0]["error"] == "内容不存在"
 
     print("✓ 批量发布混合账号内容测试通过")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@patch('app.services.batch_publish_service.async_content_publisher_service', new_callable=AsyncMock)
+@patch('app.services.batch_publish_service.publish_pool_service')
+async def test_failed_flush_does_not_break_other_publishes(mock_publish_pool_service, mock_content_publisher_service, db_session: Session, test_customer: object):
+    """一篇内容写入数据库失败后，其他内容的发布不受影响"""
+    platform = Platform(name="会话隔离测试平台", code="session_isolation_platform", type="social_media", is_active=True)
+    db_session.add(platform)
+    db_session.commit()
+    account = Account(customer_id=test_customer.id, platform_id=platform.id, name="会话隔离测试账号",
+                      directory_name="session_isolation_account", is_active=True)
+    db_session.add(account)
+    db_session.commit()
+
+    contents = []
+    for i in range(2):
+        content = Content(account_id=account.id, title=f"会话隔离{i}", content="正文", publish_status="draft",
+                          review_status="approved")
+        db_session.add(content)
+        contents.append(content)
+    db_session.commit()
+    failing_id = contents[0].id
+
+    def add_to_pool(db, content_id, **kwargs):
+        if content_id == failing_id:
+            # 违反非空约束，会话进入需要回滚的状态
+            db.add(PublishPool(content_id=None))
+            db.flush()
+        entry = MagicMock()
+        entry.id = content_id
+        return entry
+
+    mock_publish_pool_service.add_to_pool.side_effect = add_to_pool
+    mock_content_publisher_service.publish_to_wechat.return_value = {"media_id": "m1"}
+
+    result = await batch_publish_service.process_batch_publish(db_session, account.id, [c.id for c in contents])
+
+    assert [r["success"] for r in result["results"]] == [False, True]
+    db_session.refresh(contents[1])
+    assert contents[1].publish_status == "published"
@@ -16,8 +16,15 @@ from app.core.exceptions import (
 )
 
 
+@pytest.fixture(autouse=True)
+def disable_media_cache():
+    """这里只测试请求发送，媒体缓存见 test_media_cache_service"""
+    with patch('app.services.media_cache_service.settings.PUBLISHER_MEDIA_CACHE_ENABLED', False):
+        yield
+
+
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_success(mock_request):
     """测试成功发布到微信公众号"""
     # 模拟成功响应
@@ -50,7 +57,7 @@ def test_publish_to_wechat_success(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_timeout_with_retry(mock_request):
     """测试发布超时后重试"""
     # 模拟前两次超时，第三次成功
@@ -78,7 +85,7 @@ def test_publish_to_wechat_timeout_with_retry(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_max_retries_exceeded(mock_request):
     """测试超过最大重试次数"""
     # 模拟所有请求都超时
@@ -95,7 +102,7 @@ def test_publish_to_wechat_max_retries_exceeded(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_unauthorized(mock_request):
     """测试认证失败"""
     # 模拟401响应
@@ -112,7 +119,7 @@ def test_publish_to_wechat_unauthorized(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_403_forbidden(mock_request):
     """测试403禁止访问"""
     # 模拟403响应
@@ -132,7 +139,7 @@ def test_publish_to_wechat_403_forbidden(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_404_not_found(mock_request):
     """测试404端点不存在"""
     # 模拟404响应
@@ -152,7 +159,7 @@ def test_publish_to_wechat_404_not_found(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_to_wechat_500_with_degraded_mode(mock_request):
     """测试500错误触发降级模式"""
     # 模拟连续500错误
@@ -177,7 +184,7 @@ def test_publish_to_wechat_500_with_degraded_mode(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_get_publish_status_success(mock_request):
     """测试成功获取发布状态"""
     # 模拟成功响应
@@ -205,7 +212,7 @@ def test_get_publish_status_success(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_get_publish_status_503_with_degraded_mode(mock_request):
     """测试503错误触发降级模式（获取状态）"""
     # 模拟503响应
@@ -227,7 +234,7 @@ def test_get_publish_status_503_with_degraded_mode(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_upload_media_success(mock_request):
     """测试成功上传媒体文件"""
     # 模拟成功响应
@@ -285,7 +292,7 @@ def test_upload_media_io_error():
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_upload_media_503_with_degraded_mode(mock_request):
     """测试上传媒体503错误触发降级模式"""
     # 模拟503响应
@@ -309,7 +316,7 @@ def test_upload_media_503_with_degraded_mode(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_get_access_token_success(mock_request):
     """测试成功获取访问令牌"""
     # 模拟成功响应
@@ -333,7 +340,7 @@ def test_get_access_token_success(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_get_access_token_invalid_response(mock_request):
     """测试获取访问令牌返回无效响应"""
     # 模拟成功响应但缺少access_token
@@ -355,7 +362,7 @@ def test_get_access_token_invalid_response(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_create_menu_success(mock_request):
     """测试成功创建微信公众号菜单"""
     # 模拟成功响应
@@ -391,7 +398,7 @@ def test_create_menu_success(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_create_menu_429_rate_limit_with_retry(mock_request):
     """测试创建菜单429限流后重试"""
     # 模拟前两次429，第三次成功
@@ -425,7 +432,7 @@ def test_create_menu_429_rate_limit_with_retry(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_publish_invalid_json_response(mock_request):
     """测试发布返回无效JSON"""
     # 模拟成功响应但JSON解析失败
@@ -445,7 +452,7 @@ def test_publish_invalid_json_response(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_network_error_with_retry(mock_request):
     """测试网络错误重试"""
     # 模拟网络错误
@@ -470,7 +477,7 @@ def test_network_error_with_retry(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_http_400_bad_request(mock_request):
     """测试400错误请求"""
     # 模拟400响应
@@ -523,7 +530,7 @@ def test_missing_publisher_api_key(mock_settings):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_custom_timeout_value(mock_request):
     """测试自定义超时值"""
     mock_response = MagicMock()
@@ -543,7 +550,7 @@ def test_custom_timeout_value(mock_request):
 
 
 @pytest.mark.unit
-@patch('app.services.content_publisher_service.requests.request')
+@patch('app.services.content_publisher_service.publisher_http_client.request')
 def test_exponential_backoff_retry(mock_request):
     """测试指数退避重试策略"""
     import time
@@ -183,6 +183,41 @@ def test_get_content_list(db_session: Session, test_customer: Customer):
     print(f"✓ 内容列表查询测试通过 (共 {len(content_list)} 篇内容)")
 
 
+@pytest.mark.unit
+async def test_get_content_list_async(db_session: Session, async_db_session, test_customer: Customer):
+    """测试异步会话获取内容列表"""
+    platform = Platform(name="异步列表测试平台", code="async_list_platform", type="social_media", is_active=True)
+    db_session.add(platform)
+    db_session.commit()
+
+    account = Account(
+        customer_id=test_customer.id,
+        platform_id=platform.id,
+        name="异步列表测试账号",
+        directory_name="async_list_test_account",
+        is_active=True
+    )
+    db_session.add(account)
+    db_session.commit()
+
+    for i in range(3):
+        db_session.add(Content(
+            account_id=account.id,
+            title=f"异步文章{i}",
+            content=f"# 异步文章{i}",
+            publish_status="draft",
+            review_status="pending"
+        ))
+    db_session.commit()
+
+    result = await content_service.get_content_list_async(async_db_session, page=1, page_size=2)
+
+    assert result["total"] == 3
+    assert result["page"] == 1
+    assert result["pageSize"] == 2
+    assert len(result["items"]) == 2
+
+
 @pytest.mark.unit
 def test_update_content(db_session: Session, test_customer: Customer):
     """测试更新内容"""
@@ -365,3 +365,52 @@ def test_dashboard_service_operations(db_session: Session, test_customer: object
     assert publish_stats["total_publish"] >= 1
 
     print("✓ 仪表盘服务综合测试通过")
+
+
+@pytest.mark.unit
+async def test_async_stats_match_sync(db_session: Session, async_db_session, test_customer: object):
+    """测试异步会话版本与同步版本的统计结果一致"""
+    platform = Platform(
+        name="异步统计测试平台",
+        code="async_stats_test_platform",
+        type="social_media",
+        is_active=True
+    )
+    db_session.add(platform)
+    db_session.commit()
+
+    account = Account(
+        customer_id=test_customer.id,
+        platform_id=platform.id,
+        name="异步统计测试账号",
+        directory_name="async_stats_test_account",
+        is_active=True
+    )
+    db_session.add(account)
+    db_session.commit()
+
+    content = Content(
+        account_id=account.id,
+        title="异步统计文章",
+        content="# 异步统计\n内容",
+        publish_status="published",
+        review_status="pending"
+    )
+    db_session.add(content)
+    db_session.commit()
+
+    db_session.add(PublishLog(
+        account_id=account.id,
+        content_id=content.id,
+        platform="wechat",
+        status="success",
+        created_at=datetime.now()
+    ))
+    db_session.commit()
+
+    assert await dashboard_service.get_dashboard_stats_async(async_db_session) == \
+        dashboard_service.get_dashboard_stats(db_session)
+    assert await dashboard_service.get_content_trend_async(async_db_session, 7) == \
+        dashboard_service.get_content_trend(db_session, 7)
+    assert await dashboard_service.get_publish_stats_async(async_db_session) == \
+        dashboard_service.get_publish_stats(db_session)
@@ -0,0 +1,159 @@
+"""
+任务执行历史服务单元测试
+测试执行记录批量写入、结果摘要和过期明细压缩
+"""
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.scheduler import ScheduledTask, TaskExecution, TaskExecutionHourlyStat
+from app.services.execution_history_service import (
+    ExecutionHistoryWriter,
+    execution_history_service,
+    summarize_result,
+)
+
+
+@pytest.fixture
+def task(db_session: Session) -> ScheduledTask:
+    task = ScheduledTask(name="执行历史测试", task_type="publish_pool_scanner", interval=1, interval_unit="minutes")
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+@pytest.fixture
+def writer() -> ExecutionHistoryWriter:
+    from tests.conftest import TestingSessionLocal
+    return ExecutionHistoryWriter(session_factory=TestingSessionLocal, batch_size=3, flush_interval=60)
+
+
+@pytest.mark.unit
+def test_summarize_result():
+    """结果过大时只保存摘要"""
+    small = {"success": True, "message": "ok", "data": {"count": 1}}
+    assert summarize_result(small, max_chars=1000) is small
+
+    large = {
+        "success": True,
+        "message": "扫描完成",
+        "data": {"published": 3, "items": [{"id": i, "title": "x" * 50} for i in range(100)], "note": "y" * 500},
+    }
+    summary = summarize_result(large, max_chars=1000)
+
+    assert summary["truncated"] is True
+    assert summary["message"] == "扫描完成"
+    assert summary["data"]["published"] == 3
+    assert summary["data"]["items"] == {"count": 100}
+    assert len(summary["data"]["note"]) < 500
+
+
+@pytest.mark.unit
+def test_writer_batches_rows(db_session: Session, task: ScheduledTask, writer: ExecutionHistoryWriter):
+    """缓冲达到批量大小时一次写入，并更新任务最后运行时间"""
+    updated_at = task.updated_at
+
+    first = writer.begin(task.id, task.task_type)
+    assert [run.task_id for run in writer.get_running()] == [task.id]
+    writer.finish(first, "success", result={"success": True})
+    writer.finish(writer.begin(task.id, task.task_type), "failed", error_message="失败")
+
+    # 未达到批量大小，尚未写入
+    assert writer.pending_count == 2
+    assert db_session.query(TaskExecution).count() == 0
+
+    writer.finish(writer.begin(task.id, task.task_type), "success")
+
+    assert writer.pending_count == 0
+    assert writer.get_running() == []
+    assert db_session.query(TaskExecution).filter(TaskExecution.task_id == task.id).count() == 3
+
+    db_session.expire_all()
+    assert task.last_run_time is not None
+    # 运行状态的写入不改变任务的 updated_at
+    assert task.updated_at == updated_at
+
+
+@pytest.mark.unit
+def test_list_executions_includes_running(db_session: Session, task: ScheduledTask, writer: ExecutionHistoryWriter, monkeypatch):
+    """执行历史接口合并内存中运行中的执行和尚未写入的已结束记录"""
+    from app.modules.scheduler.services import scheduler_manager_service
+    from app.services.scheduler_service import scheduler_service
+
+    monkeypatch.setattr(scheduler_service, "history", writer)
+    finished = writer.begin(task.id, task.task_type)
+    writer.finish(finished, "failed", error_message="boom")
+    running = writer.begin(task.id, task.task_type)
+
+    executions = scheduler_manager_service.list_executions(db_session, task_id=task.id)
+    assert [(item["id"] is None, item["status"]) for item in executions] == [(True, "running"), (False, "failed")]
+
+    assert [item["status"] for item in scheduler_manager_service.list_executions(db_session, status="running")] == ["running"]
+    assert scheduler_manager_service.list_executions(db_session, status="success") == []
+
+    writer.finish(running, "success")
+    assert [item["status"] for item in scheduler_manager_service.list_executions(db_session, task_id=task.id)] == ["success", "failed"]
+
+
+@pytest.mark.unit
+def test_writer_requeues_on_failure(db_session: Session, task: ScheduledTask):
+    """写入失败的记录保留在缓冲区中，下次写入时重试"""
+    from tests.conftest import TestingSessionLocal
+
+    failing = {"fail": True}
+
+    def session_factory():
+        session = TestingSessionLocal()
+        if failing["fail"]:
+            session.execute = Mock(side_effect=RuntimeError("db down"))
+        return session
+
+    writer = ExecutionHistoryWriter(session_factory=session_factory, batch_size=10, flush_interval=60)
+    writer.finish(writer.begin(task.id, task.task_type), "success")
+
+    assert writer.flush() == 0
+    assert writer.pending_count == 1
+
+    failing["fail"] = False
+    assert writer.flush() == 1
+    assert db_session.query(TaskExecution).count() == 1
+
+
+@pytest.mark.unit
+def test_compact_rolls_up_expired_rows(db_session: Session, task: ScheduledTask):
+    """过期明细压缩为小时汇总，保留期内的明细不受影响"""
+    old_hour = (datetime.now() - timedelta(days=10)).replace(minute=0, second=0, microsecond=0)
+
+    def add_executions(count: int, status: str, start_time: datetime, duration: int):
+        db_session.add_all([
+            TaskExecution(task_id=task.id, status=status, start_time=start_time + timedelta(minutes=i),
+                          duration=duration)
+            for i in range(count)
+        ])
+
+    add_executions(3, "success", old_hour, 2)
+    add_executions(1, "failed", old_hour + timedelta(minutes=30), 5)
+    add_executions(2, "success", datetime.now() - timedelta(hours=1), 1)
+    db_session.commit()
+
+    result = execution_history_service.compact(db_session, retention_days=7, chunk_size=2)
+
+    assert result == {"compacted": 4, "hours": 1}
+    assert db_session.query(TaskExecution).count() == 2
+
+    stat = db_session.query(TaskExecutionHourlyStat).one()
+    assert stat.hour == old_hour
+    assert (stat.total_count, stat.success_count, stat.failed_count) == (4, 3, 1)
+    assert (stat.total_duration, stat.max_duration) == (11, 5)
+
+    # 再次压缩同一小时的明细时累加到已有汇总行
+    add_executions(1, "success", old_hour + timedelta(minutes=45), 7)
+    db_session.commit()
+    execution_history_service.compact(db_session, retention_days=7)
+
+    db_session.expire_all()
+    stat = db_session.query(TaskExecutionHourlyStat).one()
+    assert (stat.total_count, stat.success_count, stat.max_duration) == (5, 4, 7)
+    assert execution_history_service.get_hourly_stats(db_session, task.id) == [stat]
@@ -0,0 +1,206 @@
+"""
+定时任务运行锁单元测试
+测试多副本之间的锁竞争、防护令牌和同一次触发只执行一次
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.scheduler import ScheduledTask, SchedulerJobLock, TaskExecution
+from app.services.job_lock_service import JobLeaseLostError, JobLockService, ensure_lease_current
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+
+
+def _lock_service(owner: str, ttl: int = 60) -> JobLockService:
+    from tests.conftest import TestingSessionLocal
+    return JobLockService(owner=owner, ttl=ttl, session_factory=TestingSessionLocal)
+
+
+class CountingExecutor(TaskExecutor):
+    """记录执行次数的执行器"""
+
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def executor_type(self) -> str:
+        return "lock_counting"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        self.calls += 1
+        return TaskExecutionResult.success_result()
+
+
+class TakenOverExecutor(TaskExecutor):
+    """执行中锁被其他副本接管，之后才尝试有副作用的写入"""
+
+    def __init__(self):
+        self.side_effects = 0
+        self.takeover_lease = None
+
+    @property
+    def executor_type(self) -> str:
+        return "lock_taken_over"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        from tests.conftest import TestingSessionLocal
+
+        def take_over():
+            session = TestingSessionLocal()
+            try:
+                session.query(SchedulerJobLock).filter(SchedulerJobLock.job_id == f"task_{task_id}").update(
+                    {"locked_until": datetime.utcnow() - timedelta(seconds=1)}
+                )
+                session.commit()
+            finally:
+                session.close()
+            self.takeover_lease = _lock_service("replica-b").acquire(f"task_{task_id}")
+
+        await asyncio.to_thread(take_over)
+        await asyncio.to_thread(ensure_lease_current)
+        self.side_effects += 1
+        return TaskExecutionResult.success_result()
+
+
+@pytest.mark.unit
+def test_only_one_replica_holds_lock(db_session: Session):
+    """锁被持有时其他副本取不到，释放后令牌递增"""
+    replica_a, replica_b = _lock_service("replica-a"), _lock_service("replica-b")
+
+    lease_a = replica_a.acquire("task_1")
+    assert lease_a is not None and lease_a.fencing_token == 1
+    assert replica_b.acquire("task_1") is None
+    assert replica_a.is_current(lease_a)
+
+    assert replica_a.release(lease_a)
+    lease_b = replica_b.acquire("task_1")
+    assert lease_b.fencing_token == 2
+    assert replica_a.get_held_leases() == {}
+    assert list(replica_b.get_held_leases()) == ["task_1"]
+
+    # 持有旧令牌的副本不能续期或释放新锁
+    assert not replica_a.renew(lease_a)
+    assert lease_a.lost
+    assert not replica_a.release(lease_a)
+    assert replica_b.renew(lease_b)
+
+
+@pytest.mark.unit
+def test_expired_lease_is_taken_over(db_session: Session):
+    """租期过期后锁可被其他副本接管"""
+    replica_a, replica_b = _lock_service("replica-a"), _lock_service("replica-b")
+    lease_a = replica_a.acquire("task_2")
+
+    db_session.query(SchedulerJobLock).filter(SchedulerJobLock.job_id == "task_2").update(
+        {"locked_until": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+
+    lease_b = replica_b.acquire("task_2")
+    assert lease_b is not None and lease_b.fencing_token == lease_a.fencing_token + 1
+    assert not replica_a.is_current(lease_a)
+
+
+@pytest.mark.unit
+def test_release_holds_until_given_time(db_session: Session):
+    """释放时保留到指定时间，期间其他副本取不到锁"""
+    replica_a, replica_b = _lock_service("replica-a"), _lock_service("replica-b")
+
+    replica_a.release(replica_a.acquire("task_3"), datetime.utcnow() + timedelta(minutes=1))
+    assert replica_b.acquire("task_3") is None
+
+    lease = replica_a.acquire("task_4")
+    replica_a.release(lease, datetime.utcnow() - timedelta(minutes=1))
+    assert replica_b.acquire("task_4") is not None
+
+
+@pytest.mark.unit
+def test_trigger_runs_once_across_replicas(db_session: Session, monkeypatch):
+    """两个副本同时触发同一任务时只执行一次"""
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr("app.db.database.SessionLocal", TestingSessionLocal)
+
+    task = ScheduledTask(name="多副本锁测试", task_type="lock_counting", interval=1, interval_unit="hours")
+    db_session.add(task)
+    db_session.commit()
+
+    executor = CountingExecutor()
+    replicas = []
+    for owner in ("replica-a", "replica-b"):
+        service = SchedulerService()
+        service.job_locks = _lock_service(owner)
+        service.register_executor(executor)
+        service.start()
+        service.register_scheduled_task(db_session, task)
+        replicas.append(service)
+
+    try:
+        for service in replicas:
+            service._create_task_wrapper(task.id, task.task_type, task.name)()
+    finally:
+        for service in replicas:
+            service.shutdown()
+
+    assert executor.calls == 1
+
+
+@pytest.mark.unit
+def test_ensure_lease_current_outside_locked_run(db_session: Session):
+    """不在持锁运行中时不做检查"""
+    ensure_lease_current()
+
+
+@pytest.mark.unit
+def test_lost_lease_skips_side_effects_and_history(db_session: Session, monkeypatch):
+    """运行期间锁被其他副本接管后不再执行有副作用的写入，也不写入执行历史"""
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr("app.db.database.SessionLocal", TestingSessionLocal)
+
+    task = ScheduledTask(name="锁接管测试", task_type="lock_taken_over", interval=1, interval_unit="hours")
+    db_session.add(task)
+    db_session.commit()
+
+    executor = TakenOverExecutor()
+    service = SchedulerService()
+    service.job_locks = _lock_service("replica-a")
+    service.register_executor(executor)
+    service.start()
+    try:
+        service._create_task_wrapper(task.id, task.task_type, task.name)()
+        service.history.flush()
+        assert service.history.get_running() == []
+    finally:
+        service.shutdown()
+
+    assert executor.takeover_lease is not None
+    assert executor.side_effects == 0
+    assert db_session.query(TaskExecution).filter(TaskExecution.task_id == task.id).count() == 0
+
+    # 旧持有者没有释放接管副本的锁
+    db_session.expire_all()
+    lock = db_session.query(SchedulerJobLock).filter(SchedulerJobLock.job_id == f"task_{task.id}").one()
+    assert lock.owner == "replica-b"
+    assert lock.fencing_token == executor.takeover_lease.fencing_token
+
+
+@pytest.mark.unit
+def test_ensure_lease_current_raises_for_stale_token(db_session: Session):
+    """令牌已过期时抛出 JobLeaseLostError 并标记锁已失去"""
+    from app.services.job_lock_service import lease_context
+
+    replica_a, replica_b = _lock_service("replica-a"), _lock_service("replica-b")
+    lease_a = replica_a.acquire("task_5")
+    with lease_context(lease_a):
+        ensure_lease_current()
+
+    replica_a.release(lease_a)
+    replica_b.acquire("task_5")
+    with lease_context(lease_a):
+        with pytest.raises(JobLeaseLostError):
+            ensure_lease_current()
+    assert lease_a.lost
@@ -0,0 +1,174 @@
+"""
+已上传媒体缓存服务单元测试
+测试按账号和文件内容命中、过期失效、发布时用缓存 URL 替换已上传的图片（同名图片不使用缓存），
+以及 upload_media 命中（包括只有 media_id 的记录）时不重复上传
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.publisher import MediaAsset
+from app.services.content_publisher_service import ContentPublisherService
+from app.services.media_cache_service import MediaCacheService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'media.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def cache(session_factory):
+    service = MediaCacheService(session_factory=session_factory, ttl=3600)
+    with patch('app.services.content_publisher_service.media_cache_service', service), \
+            patch('app.services.media_cache_service.settings.PUBLISHER_MEDIA_CACHE_ENABLED', True):
+        yield service
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"\x89PNG" + b"p" * 2048)
+    return path
+
+
+def test_lookup_by_account_and_content(cache, image, tmp_path):
+    digest = cache.file_digest(str(image))
+    assert cache.store(1, digest, media_id="m1", url="https://mmbiz.test/1", filename=image.name, file_size=2052)
+
+    assert cache.lookup(1, digest)["url"] == "https://mmbiz.test/1"
+    # 其他账号未上传过
+    assert cache.lookup(2, digest) is None
+    # 内容相同、路径不同的文件同样命中
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(image.read_bytes())
+    assert cache.lookup(1, cache.file_digest(str(copy))) is not None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["bytes_saved"] == 2052 * 2
+
+
+def test_expired_entries_are_misses(cache, session_factory):
+    cache.store(1, "a" * 64, url="https://mmbiz.test/a", expires_at=datetime.utcnow() + timedelta(minutes=5))
+    cache.store(1, "b" * 64, url="https://mmbiz.test/b", expires_at=datetime.utcnow() - timedelta(days=1))
+    cache.store(1, "c" * 64, url="https://mmbiz.test/c")
+
+    # 即将过期（在安全余量内）和已过期的记录都不再引用
+    assert cache.lookup(1, "a" * 64) is None
+    assert cache.lookup(1, "b" * 64) is None
+    assert cache.lookup(1, "c" * 64) is not None
+
+    assert cache.purge_expired() == 1
+    db = session_factory()
+    assert db.query(MediaAsset).count() == 2
+    db.close()
+
+
+def test_parse_upload_result():
+    result = MediaCacheService.parse_upload_result({"mediaId": "m1", "url": "u", "expiresIn": 600})
+    assert result["media_id"] == "m1"
+    assert abs((result["expires_at"] - datetime.utcnow()).total_seconds() - 600) < 5
+
+    result = MediaCacheService.parse_upload_result({"media_id": "m2", "expires_at": "2030-01-01T08:00:00+08:00"})
+    assert result["expires_at"] == datetime(2030, 1, 1)
+
+
+def test_publish_references_cached_images(cache, image, tmp_path):
+    other = tmp_path / "other.jpg"
+    other.write_bytes(b"\xff\xd8" + b"o" * 100)
+    cache.store(7, cache.file_digest(str(image)), url="https://mmbiz.test/photo")
+
+    prepared = {
+        "markdown": f"---\ntitle: t\ncover: uploads:{image.name}\n---\n\n![a](uploads:{image.name}) ![b](uploads:{other.name})",
+        "cover_upload": f"uploads:{image.name}",
+        "image_paths": [str(image), str(other)],
+        "account_id": 7,
+    }
+
+    ContentPublisherService._apply_media_cache(prepared)
+
+    assert prepared["image_paths"] == [str(other)]
+    assert prepared["cover_upload"] == "https://mmbiz.test/photo"
+    assert prepared["markdown"] == (
+        "---\ntitle: t\ncover: https://mmbiz.test/photo\n---\n\n"
+        f"![a](https://mmbiz.test/photo) ![b](uploads:{other.name})"
+    )
+
+    # 发布接口返回本次上传的图片时写入缓存，下次发布不再上传
+    ContentPublisherService._remember_uploaded_media(prepared, {
+        "success": True,
+        "data": {"images": [{"filename": other.name, "url": "https://mmbiz.test/other"}]}
+    })
+    assert cache.lookup(7, cache.file_digest(str(other)))["url"] == "https://mmbiz.test/other"
+
+
+@patch('app.services.content_publisher_service.ContentPublisherService._make_request')
+def test_upload_media_uses_media_id_only_records(mock_request, cache, image):
+    cache.store(3, cache.file_digest(str(image)), media_id="m-only")
+
+    with patch('app.services.content_publisher_service.settings') as mock_settings:
+        mock_settings.PUBLISHER_API_URL = "http://publisher.test"
+        mock_settings.PUBLISHER_API_KEY = "test-key"
+        result = ContentPublisherService.upload_media(str(image), 3)
+
+    assert result == {"success": True, "cached": True, "data": {"media_id": "m-only", "url": None}}
+    mock_request.assert_not_called()
+
+
+@patch('app.services.content_publisher_service.ContentPublisherService._make_request')
+def test_upload_media_skips_known_files(mock_request, cache, image):
+    mock_request.return_value = {
+        "success": True,
+        "data": {"media_id": "m9", "url": "https://mmbiz.test/9", "type": "image"}
+    }
+
+    with patch('app.services.content_publisher_service.settings') as mock_settings:
+        mock_settings.PUBLISHER_API_URL = "http://publisher.test"
+        mock_settings.PUBLISHER_API_KEY = "test-key"
+        first = ContentPublisherService.upload_media(str(image), 3)
+        second = ContentPublisherService.upload_media(str(image), 3)
+
+    assert first["data"]["media_id"] == "m9"
+    assert "cached" not in first
+    assert second == {"success": True, "cached": True, "data": {"media_id": "m9", "url": "https://mmbiz.test/9"}}
+    assert mock_request.call_count == 1
+
+
+def test_lookup_requires_field_for_use(cache):
+    cache.store(1, "d" * 64, media_id="m-only")
+
+    # 只有 media_id 的记录不能用于 markdown 引用，但可以用于上传素材
+    assert cache.lookup(1, "d" * 64) is None
+    assert cache.lookup(1, "d" * 64, require="media_id")["media_id"] == "m-only"
+
+
+def test_same_name_images_are_not_cached(cache, tmp_path):
+    first = tmp_path / "a" / "photo.png"
+    second = tmp_path / "b" / "photo.png"
+    for path, body in ((first, b"first"), (second, b"second")):
+        path.parent.mkdir()
+        path.write_bytes(body)
+    cache.store(7, cache.file_digest(str(first)), url="https://mmbiz.test/first")
+
+    prepared = {
+        "markdown": "![a](uploads:photo.png) ![b](uploads:photo.png)",
+        "cover_upload": None,
+        "image_paths": [str(first), str(second)],
+        "account_id": 7,
+    }
+
+    ContentPublisherService._apply_media_cache(prepared)
+
+    # 发布接口按文件名区分图片，同名文件无法对应到各自的摘要，照常上传且不写入缓存
+    assert prepared["image_paths"] == [str(first), str(second)]
+    assert prepared["markdown"] == "![a](uploads:photo.png) ![b](uploads:photo.png)"
+    assert prepared["pending_media"] == {}
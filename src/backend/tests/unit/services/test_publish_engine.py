@@ -0,0 +1,143 @@
+"""
+并发发布引擎单元测试
+测试全局并发上限、同一账号同时只有一个发布、按账号限速以及按完成顺序返回结果
+"""
+import asyncio
+import time
+from collections import defaultdict
+
+import pytest
+
+from app.services.publish_engine import PublishEngine, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # 令牌用完后按每秒 1 个补充，后续预约依次排队
+    assert bucket.reserve() == pytest.approx(1, abs=0.05)
+    assert bucket.reserve() == pytest.approx(2, abs=0.05)
+
+
+def test_token_bucket_unlimited():
+    bucket = TokenBucket(rate_per_minute=0, capacity=1)
+    assert all(bucket.reserve() == 0 for _ in range(10))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limits():
+    engine = PublishEngine(max_concurrency=3, account_rate_per_minute=0)
+    in_flight = defaultdict(int)
+    peak_per_account = defaultdict(int)
+    peak_total = 0
+
+    async def publish(item):
+        nonlocal peak_total
+        account_id, _ = item
+        in_flight[account_id] += 1
+        peak_per_account[account_id] = max(peak_per_account[account_id], in_flight[account_id])
+        peak_total = max(peak_total, sum(in_flight.values()))
+        await asyncio.sleep(0.05)
+        in_flight[account_id] -= 1
+        return item
+
+    items = [(account_id, n) for n in range(3) for account_id in range(5)]
+    start = time.time()
+    results = [result async for _, result, _ in engine.run(items, key=lambda item: item[0], publish=publish)]
+    elapsed = time.time() - start
+
+    assert sorted(results) == sorted(items)
+    assert max(peak_per_account.values()) == 1
+    assert peak_total == 3
+    # 15 个条目、并发 3：约 5 轮，而不是逐个发布的 15 轮
+    assert elapsed < 0.05 * 15 * 0.7
+    # 同一账号内保持传入顺序
+    for account_id in range(5):
+        assert [n for a, n in results if a == account_id] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_results_stream_in_completion_order():
+    engine = PublishEngine(max_concurrency=4, account_rate_per_minute=0)
+
+    async def publish(item):
+        await asyncio.sleep(item[1])
+        if item[0] == "bad":
+            raise RuntimeError("boom")
+        return item[0]
+
+    items = [("slow", 0.2), ("fast", 0.01), ("bad", 0.05)]
+    received = []
+    async for item, result, error in engine.run(items, key=lambda item: item[0], publish=publish):
+        received.append((item[0], result, type(error).__name__ if error else None))
+
+    assert received == [("fast", "fast", None), ("bad", None, "RuntimeError"), ("slow", "slow", None)]
+    stats = engine.get_stats()
+    assert stats["completed"] == 3
+    assert stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_account_rate_limit():
+    # 每分钟 600 次、突发 1 次：同一账号的发布间隔 0.1 秒
+    engine = PublishEngine(max_concurrency=4, account_rate_per_minute=600, account_burst=1)
+    started = defaultdict(list)
+
+    async def publish(item):
+        started[item[0]].append(time.monotonic())
+        return item
+
+    items = [("a", n) for n in range(3)] + [("b", 0)]
+    async for _ in engine.run(items, key=lambda item: item[0], publish=publish):
+        pass
+
+    gaps = [b - a for a, b in zip(started["a"], started["a"][1:])]
+    assert all(gap >= 0.09 for gap in gaps)
+    # 其他账号不受影响
+    assert started["b"][0] - started["a"][0] < 0.05
+    assert engine.get_stats()["throttled"] == 2
+
+
+def test_limits_are_shared_across_runs_on_different_loops():
+    """调度器和 Web 服务在不同事件循环中同时发布时，全局并发和账号互斥仍然生效"""
+    import threading
+
+    engine = PublishEngine(max_concurrency=2, account_rate_per_minute=0)
+    lock = threading.Lock()
+    in_flight = defaultdict(int)
+    peaks = {"total": 0, "account": 0}
+
+    async def publish(item):
+        account_id, _ = item
+        with lock:
+            in_flight[account_id] += 1
+            peaks["total"] = max(peaks["total"], sum(in_flight.values()))
+            peaks["account"] = max(peaks["account"], in_flight[account_id])
+        await asyncio.sleep(0.05)
+        with lock:
+            in_flight[account_id] -= 1
+        return item
+
+    results = []
+
+    def run_on_own_loop(items):
+        async def drain():
+            return [result async for _, result, _ in engine.run(items, key=lambda item: item[0], publish=publish)]
+        results.extend(asyncio.run(drain()))
+
+    # 两次运行都包含账号 0 和 1，各自只会为每个账号开一个发布
+    threads = [
+        threading.Thread(target=run_on_own_loop, args=([(account_id, run) for account_id in range(3)],))
+        for run in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 6
+    assert peaks["account"] == 1
+    assert peaks["total"] == 2
+    assert engine.get_stats()["in_flight"] == 0
@@ -0,0 +1,74 @@
+"""
+Publisher HTTP 客户端单元测试
+测试 keep-alive 连接复用、复用统计以及关闭后重新建立连接池
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.publisher_http_client import PublisherHttpClient
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """返回 JSON 并保持连接的测试服务端"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = json.dumps({"success": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_keep_alive_connection(server_url):
+    client = PublisherHttpClient(pool_maxsize=2)
+    try:
+        for _ in range(5):
+            response = client.post(f"{server_url}/api/publish", json={"title": "t"}, timeout=5)
+            assert response.json() == {"success": True}
+
+        stats = client.get_stats()
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+        assert stats["reuse_rate"] == 0.8
+    finally:
+        client.close()
+
+
+def test_close_keeps_stats_and_reopens_pool(server_url):
+    client = PublisherHttpClient()
+    client.post(f"{server_url}/api/publish", timeout=5)
+    client.close()
+
+    stats = client.get_stats()
+    assert stats["active"] is False
+    assert stats["connections_opened"] == 1
+
+    # 关闭后再次使用时重新创建连接池
+    client.post(f"{server_url}/api/publish", timeout=5)
+    stats = client.get_stats()
+    assert stats["active"] is True
+    assert stats["requests"] == 2
+    assert stats["connections_opened"] == 2
+    client.close()
@@ -0,0 +1,140 @@
+"""
+调度器执行剖析单元测试
+测试延迟直方图、数据库/外部 API 耗时统计、执行器和工作流步骤的记录
+"""
+import asyncio
+import importlib
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import text
+
+from app.services.executors.workflow_executor import WorkflowExecutor
+from app.services.monitoring.scheduler_profiler import LatencyHistogram, SchedulerProfiler, timed_api
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """替换各模块引用的全局剖析器"""
+    profiler = SchedulerProfiler(enabled=True)
+    monkeypatch.setattr(importlib.import_module("app.services.scheduler_service"), "scheduler_profiler", profiler)
+    monkeypatch.setattr("app.services.executors.workflow_executor.scheduler_profiler", profiler)
+    monkeypatch.setattr("app.services.monitoring.scheduler_profiler.scheduler_profiler", profiler)
+    return profiler
+
+
+class QueryingExecutor(TaskExecutor):
+    """执行一次查询和一次外部 API 调用的执行器"""
+
+    def __init__(self, success: bool = True):
+        self.success = success
+
+    @property
+    def executor_type(self) -> str:
+        return "querying"
+
+    @timed_api
+    async def call_api(self):
+        await asyncio.sleep(0.01)
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        db.execute(text("SELECT 1"))
+        await self.call_api()
+        if not self.success:
+            return TaskExecutionResult.failure_result(message="失败")
+        return TaskExecutionResult.success_result(data={"value": 1})
+
+
+class TestLatencyHistogram:
+    """测试延迟直方图"""
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.01)
+        for _ in range(10):
+            histogram.record(2.0)
+
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["p50"] == pytest.approx(0.01, rel=0.25)
+        assert summary["p95"] == pytest.approx(2.0, rel=0.25)
+        assert summary["p99"] == 2.0
+        assert summary["max"] == 2.0
+
+    def test_empty(self):
+        summary = LatencyHistogram().summary()
+        assert summary["count"] == 0
+        assert summary["p95"] is None
+
+
+def test_execute_task_records_db_and_api_time(profiler, db_session):
+    service = SchedulerService()
+    service.register_executor(QueryingExecutor())
+
+    result = asyncio.run(service.execute_task(1, "querying", {}, db_session))
+
+    assert result.success
+    stats = profiler.snapshot()["executors"]["querying"]
+    assert stats["runs"] == 1
+    assert stats["failures"] == 0
+    assert stats["db_queries"] == 1
+    assert stats["api_calls"] == 1
+    assert stats["api_time"]["total"] >= 0.01
+    assert stats["capacity_share"] == 100.0
+
+
+def test_failed_runs_are_counted(profiler, db_session):
+    service = SchedulerService()
+    service.register_executor(QueryingExecutor(success=False))
+
+    asyncio.run(service.execute_task(1, "querying", {}, db_session))
+
+    assert profiler.snapshot()["executors"]["querying"]["failures"] == 1
+
+
+def test_workflow_steps_are_recorded(profiler, db_session, monkeypatch):
+    service = SchedulerService()
+    service.register_executor(QueryingExecutor())
+    workflow = WorkflowExecutor()
+    service.register_executor(workflow)
+    monkeypatch.setattr(importlib.import_module("app.services.scheduler_service"), "scheduler_service", service)
+
+    params = {"steps": [{"type": "querying"}, {"type": "querying"}]}
+    result = asyncio.run(service.execute_task(1, "workflow", params, db_session))
+
+    assert result.success
+    snapshot = profiler.snapshot()
+    assert snapshot["steps"]["querying"]["runs"] == 2
+    # 步骤中的数据库和 API 耗时同时计入工作流本身（工作流另有检查点的读写）
+    assert snapshot["steps"]["querying"]["db_queries"] == 2
+    assert snapshot["executors"]["workflow"]["db_queries"] > 2
+    assert snapshot["executors"]["workflow"]["api_calls"] == 2
+    assert "querying" not in snapshot["executors"]
+
+
+def test_queue_wait_from_scheduled_run_time(profiler):
+    service = SchedulerService()
+    service._scheduled_runs["task_1"] = deque([datetime.now(timezone.utc) - timedelta(seconds=3)])
+
+    service._record_queue_wait("task_1", "querying")
+    # 没有计划触发时间（直接调用包装器）时不记录
+    service._record_queue_wait("task_1", "querying")
+
+    queue_wait = profiler.snapshot()["executors"]["querying"]["queue_wait"]
+    assert queue_wait["count"] == 1
+    assert queue_wait["max"] >= 3
+
+
+def test_disabled_profiler_records_nothing(db_session):
+    profiler = SchedulerProfiler(enabled=False)
+
+    with profiler.profile() as profile:
+        db_session.execute(text("SELECT 1"))
+    profiler.record_run("querying", 1.0, True, profile)
+
+    assert profile.db_queries == 0
+    assert profiler.snapshot()["executors"] == {}
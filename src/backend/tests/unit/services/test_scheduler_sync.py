@@ -0,0 +1,149 @@
+"""
+定时任务增量同步单元测试
+测试按 updated_at 新增、更新、移除调度任务以及批量写回下次运行时间
+"""
+import importlib
+import threading
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.scheduler import ScheduledTask
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+
+# app.services 包导出了同名的 scheduler_service 实例，按模块路径导入
+scheduler_module = importlib.import_module("app.services.scheduler_service")
+
+
+class NoopExecutor(TaskExecutor):
+    """不做任何处理的执行器"""
+
+    @property
+    def executor_type(self) -> str:
+        return "sync_noop"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        return TaskExecutionResult.success_result()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_SYNC_INTERVAL", 0)
+    service = SchedulerService()
+    service.register_executor(NoopExecutor())
+    service.start()
+    yield service
+    service.shutdown(wait=False)
+
+
+def _add_tasks(db_session: Session, count: int):
+    tasks = [
+        ScheduledTask(name=f"同步测试任务{i}", task_type="sync_noop", cron_expression="0 * * * *")
+        for i in range(count)
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    return tasks
+
+
+def _job_ids(service: SchedulerService):
+    return {job.id for job in service.scheduler.get_jobs()}
+
+
+@pytest.mark.unit
+def test_sync_registers_new_tasks_and_writes_next_run_time(db_session: Session, service: SchedulerService):
+    """首次同步注册所有启用的任务，下次运行时间批量写回且不改变 updated_at"""
+    tasks = _add_tasks(db_session, 3)
+    updated_at = {task.id: task.updated_at for task in tasks}
+
+    result = service.sync_tasks(db_session)
+
+    assert result == {"added": 3, "updated": 0, "removed": 0, "failed": 0}
+    assert _job_ids(service) == {f"task_{task.id}" for task in tasks}
+
+    db_session.expire_all()
+    for task in tasks:
+        assert task.next_run_time is not None
+        assert task.updated_at == updated_at[task.id]
+
+
+@pytest.mark.unit
+def test_sync_applies_only_changes(db_session: Session, service: SchedulerService, monkeypatch):
+    """再次同步时只处理变更、禁用和删除的任务"""
+    monkeypatch.setattr(scheduler_module, "_VERSION_SETTLE_SECONDS", 0)
+    tasks = _add_tasks(db_session, 3)
+    service.sync_tasks(db_session)
+
+    # 未修改时不重新注册
+    assert service.sync_tasks(db_session) == {"added": 0, "updated": 0, "removed": 0, "failed": 0}
+
+    # 通过其他进程（如 CLI）直接修改数据库
+    db_session.query(ScheduledTask).filter(ScheduledTask.id == tasks[0].id).update({
+        "cron_expression": "30 * * * *",
+        "updated_at": tasks[0].updated_at.replace(year=tasks[0].updated_at.year + 1),
+    })
+    db_session.query(ScheduledTask).filter(ScheduledTask.id == tasks[1].id).update({"is_active": False})
+    db_session.delete(tasks[2])
+    new_task = ScheduledTask(name="同步测试新任务", task_type="sync_noop", interval=5, interval_unit="minutes")
+    db_session.add(new_task)
+    db_session.commit()
+
+    result = service.sync_tasks(db_session)
+
+    assert result == {"added": 1, "updated": 1, "removed": 2, "failed": 0}
+    assert _job_ids(service) == {f"task_{tasks[0].id}", f"task_{new_task.id}"}
+    assert "minute='30'" in str(service.scheduler.get_job(f"task_{tasks[0].id}").trigger)
+
+
+@pytest.mark.unit
+def test_sync_rechecks_edits_within_timestamp_resolution(db_session: Session, service: SchedulerService):
+    """同一秒内的修改 updated_at 不变，下一次同步仍会重新注册"""
+    tasks = _add_tasks(db_session, 1)
+    service.sync_tasks(db_session)
+
+    db_session.query(ScheduledTask).filter(ScheduledTask.id == tasks[0].id).update({
+        "cron_expression": "45 * * * *",
+        "updated_at": tasks[0].updated_at,
+    })
+    db_session.commit()
+
+    assert service.sync_tasks(db_session)["updated"] == 1
+    assert "minute='45'" in str(service.scheduler.get_job(f"task_{tasks[0].id}").trigger)
+
+
+@pytest.mark.unit
+def test_invalid_task_is_not_retried_until_changed(db_session: Session, service: SchedulerService, monkeypatch):
+    """找不到执行器的任务记录为失败，修改前不会在每次同步时重试"""
+    monkeypatch.setattr(scheduler_module, "_VERSION_SETTLE_SECONDS", 0)
+    db_session.add(ScheduledTask(name="未知类型任务", task_type="unknown_type", cron_expression="0 * * * *"))
+    db_session.commit()
+
+    assert service.load_tasks_from_db(db_session) == 0
+    assert service.sync_tasks(db_session)["failed"] == 0
+
+
+@pytest.mark.unit
+def test_register_and_unregister_wait_for_running_sync(db_session: Session, service: SchedulerService):
+    """单个任务的注册和移除与增量同步互斥，不会在同步过程中修改任务版本"""
+    task = _add_tasks(db_session, 1)[0]
+    done = []
+
+    def register_then_unregister():
+        service.register_scheduled_task(db_session, task)
+        done.append("registered")
+        service.unregister_task(task.id)
+        done.append("unregistered")
+
+    with service._sync_lock:
+        worker = threading.Thread(target=register_then_unregister)
+        worker.start()
+        worker.join(0.2)
+        # 同步持有锁期间注册被阻塞
+        assert done == []
+        assert task.id not in service._task_versions
+
+    worker.join(5)
+    assert done == ["registered", "unregistered"]
+    assert task.id not in service._task_versions
@@ -0,0 +1,155 @@
+"""
+每日统计汇总单元测试
+测试写入时的增量维护和按天重算
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.content import Content
+from app.models.publisher import PublishLog
+from app.models.stats import CONTENT_PLATFORM, DailyStat, apply_deltas
+from app.modules.dashboard.services import dashboard_service
+from app.services.executors import StatsRollupExecutor
+from app.services.stats_rollup_service import stats_rollup_service
+
+
+def _snapshot(db_session: Session) -> dict:
+    """以 {(日期, 平台): (内容数, 发布数, 成功数, 失败数)} 形式返回非零汇总行"""
+    db_session.expire_all()
+    return {
+        (row.stat_date, row.platform): (
+            row.content_created, row.publish_total, row.publish_success, row.publish_failed
+        )
+        for row in db_session.query(DailyStat).all()
+        if any((row.content_created, row.publish_total, row.publish_success, row.publish_failed))
+    }
+
+
+def _seed(db_session: Session):
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    contents = [
+        Content(account_id=1, title="今天的文章", content="正文"),
+        Content(account_id=1, title="昨天的文章", content="正文", created_at=yesterday),
+        Content(account_id=1, title="昨天的另一篇文章", content="正文", created_at=yesterday),
+    ]
+    db_session.add_all(contents)
+    db_session.commit()
+
+    logs = [
+        PublishLog(account_id=1, content_id=contents[0].id, platform="wechat", status="success"),
+        PublishLog(account_id=1, content_id=contents[1].id, platform="wechat", status="failed",
+                   created_at=yesterday),
+        PublishLog(account_id=1, content_id=contents[2].id, platform="qq", created_at=yesterday),
+    ]
+    db_session.add_all(logs)
+    db_session.commit()
+    return contents, logs
+
+
+@pytest.mark.unit
+def test_rollup_maintained_on_write(db_session: Session):
+    """新增、状态变更和删除时同步更新汇总行"""
+    contents, logs = _seed(db_session)
+    today = datetime.utcnow().date()
+    yesterday = today - timedelta(days=1)
+
+    assert _snapshot(db_session) == {
+        (today, CONTENT_PLATFORM): (1, 0, 0, 0),
+        (yesterday, CONTENT_PLATFORM): (2, 0, 0, 0),
+        (today, "wechat"): (0, 1, 1, 0),
+        (yesterday, "wechat"): (0, 1, 0, 1),
+        (yesterday, "qq"): (0, 1, 0, 0),
+    }
+
+    # 待发布 -> 成功
+    logs[2].status = "success"
+    db_session.commit()
+    assert _snapshot(db_session)[(yesterday, "qq")] == (0, 1, 1, 0)
+
+    db_session.delete(logs[0])
+    db_session.delete(contents[0])
+    db_session.commit()
+    snapshot = _snapshot(db_session)
+    assert (today, "wechat") not in snapshot
+    assert (today, CONTENT_PLATFORM) not in snapshot
+
+
+@pytest.mark.unit
+def test_apply_deltas_upserts_existing_row(db_session: Session):
+    """并发事务已插入同一汇总行时累加而不是违反唯一约束"""
+    today = datetime.utcnow().date()
+    connection = db_session.connection()
+
+    apply_deltas(connection, {(today, "wechat"): {"publish_total": 1, "publish_success": 1}})
+    apply_deltas(connection, {(today, "wechat"): {"publish_total": 1, "publish_failed": 1}})
+    db_session.commit()
+
+    assert _snapshot(db_session) == {(today, "wechat"): (0, 2, 1, 1)}
+
+
+@pytest.mark.unit
+def test_refresh_corrects_bulk_updates(db_session: Session):
+    """批量更新绕过 ORM 事件，重算后汇总恢复一致"""
+    _seed(db_session)
+    expected = _snapshot(db_session)
+
+    db_session.query(PublishLog).filter(PublishLog.status == "failed").update({"status": "success"})
+    db_session.commit()
+    assert _snapshot(db_session) == expected
+
+    stats_rollup_service.refresh_recent(db_session, days=2)
+
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    assert _snapshot(db_session)[(yesterday, "wechat")] == (0, 1, 1, 0)
+
+
+@pytest.mark.unit
+def test_rebuild_matches_incremental(db_session: Session):
+    """全量重建结果与增量维护结果一致"""
+    _seed(db_session)
+    expected = _snapshot(db_session)
+
+    db_session.query(DailyStat).delete()
+    db_session.commit()
+    stats_rollup_service.rebuild(db_session)
+
+    assert _snapshot(db_session) == expected
+
+
+@pytest.mark.unit
+def test_dashboard_reads_rollup(db_session: Session):
+    """仪表盘统计来自汇总表"""
+    _seed(db_session)
+
+    stats = dashboard_service.get_dashboard_stats(db_session)
+    assert stats["content_count"] == 3
+    assert stats["published_count"] == 1
+    assert stats["today_published_count"] == 1
+    assert stats["week_published_count"] == 1
+
+    publish_stats = dashboard_service.get_publish_stats(db_session)
+    assert (publish_stats["total_publish"], publish_stats["success_publish"],
+            publish_stats["failed_publish"]) == (3, 1, 1)
+    assert {item["platform"]: item["count"] for item in publish_stats["platform_stats"]} == \
+        {"wechat": 2, "qq": 1}
+
+    trend = dashboard_service.get_content_trend(db_session, days=7)
+    assert [item["count"] for item in trend["trend"]] == [2, 1]
+
+
+@pytest.mark.unit
+async def test_stats_rollup_executor(db_session: Session):
+    """统计汇总执行器"""
+    _seed(db_session)
+    executor = StatsRollupExecutor()
+
+    assert executor.validate_params({"days": 3})
+    assert not executor.validate_params({"days": 0})
+    assert not executor.validate_params({"full": "yes"})
+
+    result = await executor.execute(1, {"full": True}, db_session)
+
+    assert result.success
+    assert result.data["row_count"] == 5
@@ -0,0 +1,323 @@
+"""
+持久化任务队列单元测试
+测试优先级出队、多 Worker 并发领取不重复、租约过期重新可见、ack/nack 以及入队通知唤醒 Worker
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.db.sql_db import Base
+from app.models import ContentGenerationTask
+from app.services.task_queue_service import DatabaseTaskQueue, TaskQueueNotifier, TaskWorkerPool
+from tests.conftest import TestingSessionLocal
+
+
+def add_task(db, task_id: str, priority: int = 5, **fields) -> ContentGenerationTask:
+    fields.setdefault("status", "pending")
+    task = ContentGenerationTask(task_id=task_id, account_id=1, topic=task_id, priority=priority, **fields)
+    db.add(task)
+    db.commit()
+    return task
+
+
+@pytest.fixture
+def queue(db_session):
+    return DatabaseTaskQueue(session_factory=TestingSessionLocal, visibility_timeout=60, retry_delay=10)
+
+
+@pytest.fixture
+def file_session_factory(tmp_path):
+    """基于文件的 SQLite，多个线程使用各自的连接"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+def test_claim_by_priority(queue, db_session):
+    add_task(db_session, "low", priority=1)
+    add_task(db_session, "high", priority=9)
+    add_task(db_session, "mid", priority=5)
+
+    claimed = [queue.claim("worker-a").task_id for _ in range(3)]
+
+    assert claimed == ["high", "mid", "low"]
+    assert queue.claim("worker-a") is None
+    assert queue.size() == 0
+
+
+def test_claimed_task_is_invisible_until_lease_expires(queue, db_session):
+    add_task(db_session, "task-1")
+
+    task = queue.claim("worker-a")
+    assert task.status == "claimed"
+    assert task.claimed_by == "worker-a"
+    assert queue.claim("worker-b") is None
+
+    # worker-a 未确认即崩溃，租约到期后其他 Worker 可以领取
+    db_session.query(ContentGenerationTask).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db_session.commit()
+
+    task = queue.claim("worker-b")
+    assert task.claimed_by == "worker-b"
+    assert task.delivery_count == 2
+    # 过期的领取者不能再确认
+    assert queue.ack(task, "worker-a") is False
+    assert queue.ack(task, "worker-b") is True
+
+
+def test_nack_requeues_with_delay_then_fails(queue, db_session):
+    add_task(db_session, "task-1", max_retries=1)
+
+    task = queue.claim("worker-a")
+    assert queue.nack(task, "worker-a", error="boom")
+
+    db_session.expire_all()
+    row = db_session.query(ContentGenerationTask).one()
+    assert row.status == "pending"
+    assert row.available_at > datetime.utcnow()
+    # 重试延迟内不可领取
+    assert queue.claim("worker-a") is None
+
+    row.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    task = queue.claim("worker-a")
+    assert queue.nack(task, "worker-a", error="boom again")
+
+    db_session.expire_all()
+    row = db_session.query(ContentGenerationTask).one()
+    assert row.status == "failed"
+    assert row.error_message == "boom again"
+
+
+def test_concurrent_workers_claim_each_task_once(file_session_factory):
+    db = file_session_factory()
+    for i in range(40):
+        add_task(db, f"task-{i}", priority=i % 10)
+    db.close()
+
+    queue = DatabaseTaskQueue(session_factory=file_session_factory)
+    claimed = []
+    lock = threading.Lock()
+
+    def drain(worker_id: str):
+        while True:
+            task = queue.claim(worker_id)
+            if task is None:
+                return
+            with lock:
+                claimed.append(task.task_id)
+
+    threads = [threading.Thread(target=drain, args=(f"worker-{i}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(f"task-{i}" for i in range(40))
+
+
+def test_worker_pool_drains_shared_queue(file_session_factory, monkeypatch):
+    db = file_session_factory()
+    for i in range(10):
+        add_task(db, f"task-{i}")
+    db.close()
+
+    submitted = []
+    lock = threading.Lock()
+
+    def fake_submit(self, task):
+        with lock:
+            submitted.append(task.task_id)
+        task.status = "submitted"
+
+    monkeypatch.setattr("app.services.task_queue_service.SessionLocal", file_session_factory)
+    monkeypatch.setattr("app.services.task_queue_service.TaskWorker._submit_to_creator", fake_submit)
+
+    queue = DatabaseTaskQueue(session_factory=file_session_factory, notifier=TaskQueueNotifier())
+    pool = TaskWorkerPool(num_workers=3, queue=queue)
+    pool.start()
+    try:
+        deadline = time.time() + 10
+        while len(submitted) < 10 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        pool.stop()
+
+    assert sorted(submitted) == sorted(f"task-{i}" for i in range(10))
+    db = file_session_factory()
+    rows = db.query(ContentGenerationTask).all()
+    assert {row.status for row in rows} == {"submitted"}
+    assert all(row.claimed_by is None for row in rows)
+    db.close()
+
+
+class TestTaskQueueNotifier:
+    """测试入队通知"""
+
+    def test_wait_consumes_signals(self):
+        notifier = TaskQueueNotifier()
+        notifier.notify(count=2)
+
+        assert notifier.wait(0.01) is True
+        assert notifier.wait(0.01) is True
+        assert notifier.wait(0.01) is False
+        assert notifier.get_stats()["timeouts"] == 1
+
+    def test_message_from_other_process_wakes_workers(self):
+        notifier = TaskQueueNotifier()
+
+        notifier._handle_message('{"origin": "%s", "count": 1}' % notifier.origin)
+        assert notifier.wait(0.01) is False
+
+        notifier._handle_message('{"origin": "other-host:1", "count": 1}')
+        assert notifier.wait(0.01) is True
+
+
+def test_idle_workers_wake_on_enqueue(file_session_factory, monkeypatch):
+    submitted = {}
+
+    def fake_submit(self, task):
+        submitted[task.task_id] = time.time()
+        task.status = "submitted"
+
+    monkeypatch.setattr("app.services.task_queue_service.SessionLocal", file_session_factory)
+    monkeypatch.setattr("app.services.task_queue_service.TaskWorker._submit_to_creator", fake_submit)
+
+    queue = DatabaseTaskQueue(session_factory=file_session_factory, notifier=TaskQueueNotifier())
+    claims = []
+    original_claim = queue.claim
+
+    def counting_claim(worker_id):
+        claims.append(worker_id)
+        return original_claim(worker_id)
+
+    queue.claim = counting_claim
+    pool = TaskWorkerPool(num_workers=3, queue=queue)
+    pool.start()
+    try:
+        # 空闲时 Worker 阻塞等待通知，只在启动时各查询一次数据库
+        time.sleep(0.5)
+        assert len(claims) == 3
+
+        db = file_session_factory()
+        add_task(db, "task-new", status="failed")
+        db.close()
+        enqueued_at = time.time()
+        queue.put("task-new")
+
+        deadline = time.time() + 5
+        while "task-new" not in submitted and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop_start = time.time()
+        pool.stop()
+
+    assert submitted["task-new"] - enqueued_at < 0.5
+    # 停止时唤醒阻塞的 Worker，无需等到兜底轮询超时
+    assert time.time() - stop_start < 2
+
+
+def test_direct_submission_is_not_claimable(queue, db_session, monkeypatch):
+    from app.models import Account
+    from app.services.async_content_generation_service import AsyncContentGenerationService
+
+    account = Account(customer_id=1, platform_id=1, name="直接提交测试", directory_name="direct_submit")
+    db_session.add(account)
+    db_session.commit()
+
+    claims_during_submit = []
+
+    def fake_submit(self, task):
+        # 提交到 content-creator 期间 Worker 尝试领取
+        claims_during_submit.append(queue.claim("worker-a"))
+        task.status = "submitted"
+        self.db.commit()
+
+    monkeypatch.setattr("app.core.config.settings.ASYNC_SUBMIT_VIA_QUEUE", False)
+    monkeypatch.setattr(AsyncContentGenerationService, "_submit_to_creator", fake_submit)
+
+    task_id = AsyncContentGenerationService(db=db_session).submit_task(account_id=account.id, topic="直接提交")
+
+    assert claims_during_submit == [None]
+    db_session.expire_all()
+    row = db_session.query(ContentGenerationTask).filter_by(task_id=task_id).one()
+    assert row.status == "submitted"
+    assert row.claimed_by is None and row.lease_expires_at is None
+    assert queue.claim("worker-a") is None
+
+
+def test_worker_submits_through_http_api(queue, db_session, monkeypatch):
+    from app.services.async_content_generation_service import AsyncContentGenerationService
+    from app.services.task_queue_service import TaskWorker
+
+    add_task(db_session, "task-1")
+    submitted = []
+
+    def fake_submit(self, task):
+        # Worker 与直接提交共用 HTTP API 提交路径
+        submitted.append(task.task_id)
+        task.status = "submitted"
+        self.db.commit()
+
+    monkeypatch.setattr("app.services.task_queue_service.SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(AsyncContentGenerationService, "_submit_to_creator", fake_submit)
+
+    worker = TaskWorker(worker_id=0, queue=queue)
+    worker._process_task(queue.claim(worker.consumer_id))
+
+    assert submitted == ["task-1"]
+    db_session.expire_all()
+    row = db_session.query(ContentGenerationTask).one()
+    assert row.status == "submitted"
+    assert row.claimed_by is None
+
+
+def test_expired_direct_claim_is_recovered_without_pool(db_session, monkeypatch):
+    from app.services.async_content_generation_service import AsyncContentGenerationService
+    from app.services.task_status_poller import TaskStatusPoller
+
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    direct = AsyncContentGenerationService.DIRECT_SUBMITTER
+    add_task(db_session, "interrupted", status="claimed", claimed_by=direct, lease_expires_at=expired)
+    add_task(db_session, "submitting", status="claimed", claimed_by=direct,
+             lease_expires_at=datetime.utcnow() + timedelta(seconds=60))
+
+    monkeypatch.setattr("app.services.task_status_poller.SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr("app.core.config.settings.ASYNC_SUBMIT_VIA_QUEUE", False)
+
+    # 提交进程退出且没有 Worker 池接手，租约过期的直接提交被标记为失败；租约期内的仍在提交中
+    assert TaskStatusPoller().recover_expired_claims() == 1
+    db_session.expire_all()
+    rows = {row.task_id: row for row in db_session.query(ContentGenerationTask).all()}
+    assert rows["interrupted"].status == "failed"
+    assert rows["interrupted"].claimed_by is None
+    assert rows["submitting"].status == "claimed"
+
+
+def test_claimed_task_times_out_and_can_be_cancelled(db_session, monkeypatch):
+    from app.services.async_content_generation_service import AsyncContentGenerationService
+    from app.services.task_status_poller import TaskStatusPoller
+
+    past = datetime.utcnow() - timedelta(seconds=1)
+    add_task(db_session, "abandoned", status="claimed", claimed_by="worker-a", lease_expires_at=past, timeout_at=past)
+    add_task(db_session, "leased", status="claimed", claimed_by="worker-b",
+             lease_expires_at=datetime.utcnow() + timedelta(seconds=60), timeout_at=past)
+
+    monkeypatch.setattr("app.services.task_status_poller.SessionLocal", TestingSessionLocal)
+
+    assert [task.task_id for task in TaskStatusPoller().get_timeout_tasks()] == ["abandoned"]
+
+    service = AsyncContentGenerationService(db=db_session)
+    service.api_client = MagicMock()
+    assert service.cancel_task("leased") is True
+    db_session.expire_all()
+    row = db_session.query(ContentGenerationTask).filter_by(task_id="leased").one()
+    assert row.status == "cancelled"
+    assert row.claimed_by is None and row.lease_expires_at is None
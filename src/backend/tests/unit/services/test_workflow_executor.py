@@ -0,0 +1,258 @@
+"""
+工作流执行器单元测试
+测试顺序模式的变量传递，以及 DAG 模式的并发分支、for_each 扇出/扇入、并发上限和步骤超时
+"""
+import asyncio
+import importlib
+import threading
+import time
+from typing import Any, Dict
+
+import pytest
+
+from app.services.executors.workflow_executor import WorkflowExecutor
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+from app.services.workflow_run_service import WorkflowCheckpoint
+
+
+class SleepExecutor(TaskExecutor):
+    """等待指定秒数后返回 value 的执行器，记录最大并发数"""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.calls = []
+
+    @property
+    def executor_type(self) -> str:
+        return "sleep"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        self.calls.append(task_params)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(task_params.get("seconds", 0))
+        finally:
+            self.running -= 1
+        if task_params.get("fail"):
+            return TaskExecutionResult.failure_result(message="步骤失败", error="StepError")
+        return TaskExecutionResult.success_result(data={"value": task_params.get("value")})
+
+
+class BlockingSleepExecutor(TaskExecutor):
+    """execute 中同步等待的 blocking 执行器，记录执行所在线程"""
+
+    blocking = True
+
+    def __init__(self):
+        self.threads = []
+
+    @property
+    def executor_type(self) -> str:
+        return "blocking_sleep"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        self.threads.append(threading.get_ident())
+        time.sleep(task_params.get("seconds", 0))
+        return TaskExecutionResult.success_result(data={"value": task_params.get("value")})
+
+
+@pytest.fixture
+def sleep_executor(monkeypatch):
+    service = SchedulerService()
+    executor = SleepExecutor()
+    service.register_executor(executor)
+    service.register_executor(BlockingSleepExecutor())
+    service.register_executor(WorkflowExecutor())
+    monkeypatch.setattr(importlib.import_module("app.services.scheduler_service"), "scheduler_service", service)
+    return executor
+
+
+def run_workflow(task_params: Dict[str, Any], db) -> TaskExecutionResult:
+    workflow = WorkflowExecutor()
+    assert workflow.validate_params(task_params)
+    return asyncio.run(workflow.execute(1, task_params, db))
+
+
+def test_sequential_mode_passes_context(sleep_executor, db_session):
+    result = run_workflow({
+        "steps": [
+            {"type": "sleep", "params": {"value": 42}},
+            {"type": "sleep", "params": {"value": "${value}"}},
+        ]
+    }, db_session)
+
+    assert result.success
+    assert sleep_executor.calls[1]["value"] == 42
+    assert "mode" not in result.metadata
+
+
+def test_independent_branches_run_concurrently(sleep_executor, db_session):
+    start = time.time()
+    result = run_workflow({
+        "max_concurrency": 3,
+        "steps": [
+            {"id": "a", "type": "sleep", "params": {"seconds": 0.3, "value": 1}},
+            {"id": "b", "type": "sleep", "params": {"seconds": 0.3, "value": 2}},
+            {"id": "c", "type": "sleep", "params": {"seconds": 0.3, "value": 3}},
+            {"id": "join", "type": "sleep", "depends_on": ["a", "b"],
+             "params": {"value": "${a.value}", "other": "${b.value}"}},
+        ]
+    }, db_session)
+
+    assert result.success
+    # 三个独立分支同时执行，总耗时接近最慢的分支
+    assert time.time() - start < 0.6
+    assert sleep_executor.max_running == 3
+    assert sleep_executor.calls[-1] == {"value": 1, "other": 2}
+    assert [step["id"] for step in result.data["step_results"]][-1] == "join"
+
+
+def test_dependent_step_sees_upstream_outputs(sleep_executor, db_session):
+    result = run_workflow({
+        "steps": [
+            {"id": "first", "type": "sleep", "params": {"value": 7}},
+            {"id": "second", "type": "sleep", "depends_on": ["first"],
+             "params": {"value": "${first.value}", "flat": "${value}"}},
+        ]
+    }, db_session)
+
+    assert result.success
+    assert sleep_executor.calls[1] == {"value": 7, "flat": 7}
+
+
+def test_for_each_fans_out_and_in(sleep_executor, db_session):
+    result = run_workflow({
+        "context": {"accounts": [1, 2, 3]},
+        "steps": [
+            {"id": "generate", "type": "sleep", "for_each": "${accounts}", "as": "account_id",
+             "params": {"seconds": 0.2, "value": "${account_id}"}},
+            {"id": "approve", "type": "sleep", "depends_on": ["generate"],
+             "for_each": "${generate.value}", "params": {"value": "${item}"}},
+        ]
+    }, db_session)
+
+    assert result.success
+    outputs = result.data["outputs"]
+    assert outputs["generate"]["value"] == [1, 2, 3]
+    assert outputs["approve"]["value"] == [1, 2, 3]
+    assert len(outputs["approve"]["results"]) == 3
+    assert sleep_executor.max_running == 3
+
+
+def test_max_concurrency_limits_parallel_runs(sleep_executor, db_session):
+    result = run_workflow({
+        "max_concurrency": 2,
+        "steps": [
+            {"id": "fan", "type": "sleep", "for_each": [1, 2, 3, 4, 5], "params": {"seconds": 0.05}},
+        ]
+    }, db_session)
+
+    assert result.success
+    assert sleep_executor.max_running == 2
+
+
+def test_step_timeout_fails_workflow(sleep_executor, db_session):
+    result = run_workflow({
+        "steps": [
+            {"id": "slow", "type": "sleep", "timeout": 0.1, "params": {"seconds": 2}},
+            {"id": "after", "type": "sleep", "depends_on": ["slow"]},
+        ]
+    }, db_session)
+
+    assert not result.success
+    assert result.error == "StepTimeout"
+    assert result.metadata["failed_step"] == "slow"
+    assert len(sleep_executor.calls) == 1
+
+
+def test_blocking_step_runs_off_event_loop(sleep_executor, db_session):
+    from app.services.scheduler_service import scheduler_service
+
+    blocking = scheduler_service.get_executor("blocking_sleep")
+    loop_threads = []
+
+    async def run():
+        loop_threads.append(threading.get_ident())
+        workflow = WorkflowExecutor()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            result = await workflow.execute(1, {
+                "steps": [
+                    {"id": "sync", "type": "blocking_sleep", "params": {"seconds": 0.3, "value": 1}},
+                    {"id": "slow", "type": "blocking_sleep", "depends_on": ["sync"], "timeout": 0.1,
+                     "params": {"seconds": 0.5}},
+                ]
+            }, db_session)
+        finally:
+            ticker_task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+
+    # 同步代码在线程中执行，期间事件循环上的其他协程持续运行；步骤超时可以生效
+    assert blocking.threads and loop_threads[0] not in blocking.threads
+    assert ticks >= 5
+    assert not result.success
+    assert result.error == "StepTimeout"
+    assert result.metadata["failed_step"] == "slow"
+
+
+def test_checkpoint_writes_run_off_event_loop(sleep_executor, db_session, monkeypatch):
+    write = WorkflowCheckpoint._write
+    write_threads = []
+
+    def recording_write(self, description, fn):
+        write_threads.append(threading.get_ident())
+        write(self, description, fn)
+
+    monkeypatch.setattr(WorkflowCheckpoint, "_write", recording_write)
+
+    async def run():
+        result = await WorkflowExecutor().execute(1, {
+            "steps": [
+                {"id": "a", "type": "sleep", "params": {"value": 1}},
+                {"id": "b", "type": "sleep", "depends_on": ["a"], "for_each": [1, 2],
+                 "params": {"value": "${item}"}},
+            ]
+        }, db_session)
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+
+    assert result.success
+    assert result.metadata.get("workflow_run_id") is not None
+    assert write_threads and loop_thread not in write_threads
+
+
+def test_failure_cancels_other_branches(sleep_executor, db_session):
+    start = time.time()
+    result = run_workflow({
+        "steps": [
+            {"id": "bad", "type": "sleep", "params": {"fail": True}},
+            {"id": "long", "type": "sleep", "params": {"seconds": 5}},
+        ]
+    }, db_session)
+
+    assert not result.success
+    assert result.metadata["failed_step"] == "bad"
+    assert time.time() - start < 2
+
+
+@pytest.mark.parametrize("steps", [
+    [{"id": "a", "type": "sleep", "depends_on": ["b"]}, {"id": "b", "type": "sleep", "depends_on": ["a"]}],
+    [{"id": "a", "type": "sleep", "depends_on": ["missing"]}],
+    [{"id": "a", "type": "sleep"}, {"id": "a", "type": "sleep"}],
+    [{"id": "a", "type": "sleep", "for_each": 3}],
+])
+def test_invalid_dag_is_rejected(steps):
+    assert WorkflowExecutor().validate_params({"steps": steps}) is False
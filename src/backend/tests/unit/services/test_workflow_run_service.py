@@ -0,0 +1,226 @@
+"""
+工作流运行检查点单元测试
+测试失败后从失败的步骤续跑、参数变化时重新开始、for_each 元素级续跑以及手动续跑
+"""
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import pytest
+
+from app.models.scheduler import ScheduledTask, WorkflowRun
+from app.modules.scheduler.services import scheduler_manager_service
+from app.services.executors.workflow_executor import WorkflowExecutor
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+
+
+class FlakyExecutor(TaskExecutor):
+    """记录调用参数的执行器，params 中的值在 failing 集合里时返回失败"""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+
+    @property
+    def executor_type(self) -> str:
+        return "flaky"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        self.calls.append(task_params)
+        if any(task_params.get("value") == value for value in self.failing):
+            return TaskExecutionResult.failure_result(message="步骤失败", error="StepError")
+        return TaskExecutionResult.success_result(data={"value": task_params.get("value"), "seen": task_params.get("seen")})
+
+
+@pytest.fixture
+def flaky_executor(monkeypatch):
+    service = SchedulerService()
+    executor = FlakyExecutor()
+    service.register_executor(executor)
+    service.register_executor(WorkflowExecutor())
+    monkeypatch.setattr(importlib.import_module("app.services.scheduler_service"), "scheduler_service", service)
+    monkeypatch.setattr("app.modules.scheduler.services.scheduler_service", service)
+    yield executor
+    service.event_loop.stop()
+
+
+@pytest.fixture
+def workflow_task(db_session):
+    task = ScheduledTask(name="工作流续跑测试", task_type="workflow", params={})
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def run_workflow(task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+    return asyncio.run(WorkflowExecutor().execute(task_id, task_params, db))
+
+
+SEQUENTIAL_PARAMS = {
+    "steps": [
+        {"type": "flaky", "params": {"value": 1}},
+        {"type": "flaky", "params": {"value": 2, "seen": "${value}"}},
+        {"type": "flaky", "params": {"value": 3}},
+    ]
+}
+
+
+def test_resume_skips_completed_steps(flaky_executor, workflow_task, db_session):
+    flaky_executor.failing = {2}
+    result = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session)
+    assert not result.success
+    run_id = result.metadata["workflow_run_id"]
+
+    run = db_session.get(WorkflowRun, run_id)
+    assert run.status == "failed"
+    assert run.failed_step == "step2"
+    assert [step.status for step in run.steps] == ["success", "failed"]
+
+    flaky_executor.failing = set()
+    flaky_executor.calls.clear()
+    result = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session)
+
+    assert result.success
+    assert result.metadata["workflow_run_id"] == run_id
+    assert result.metadata["resumed_steps"] == ["step1"]
+    # 第一步不再执行，其输出仍传递给第二步
+    assert [call["value"] for call in flaky_executor.calls] == [2, 3]
+    assert flaky_executor.calls[0]["seen"] == 1
+    assert result.data["step_results"][0]["cached"] is True
+
+    db_session.expire_all()
+    run = db_session.get(WorkflowRun, run_id)
+    assert run.status == "success"
+    assert run.attempts == 2
+    assert [step.attempts for step in run.steps] == [1, 2, 1]
+
+
+def test_changed_params_start_new_run(flaky_executor, workflow_task, db_session):
+    flaky_executor.failing = {2}
+    first = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session)
+
+    flaky_executor.failing = set()
+    flaky_executor.calls.clear()
+    params = {"steps": SEQUENTIAL_PARAMS["steps"][:2]}
+    second = run_workflow(workflow_task.id, params, db_session)
+
+    assert second.success
+    assert second.metadata["workflow_run_id"] != first.metadata["workflow_run_id"]
+    assert "resumed_steps" not in second.metadata
+    assert [call["value"] for call in flaky_executor.calls] == [1, 2]
+
+
+def test_resume_disabled_or_expired_starts_new_run(flaky_executor, workflow_task, db_session):
+    flaky_executor.failing = {2}
+    first = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session)
+
+    second = run_workflow(workflow_task.id, {**SEQUENTIAL_PARAMS, "resume": False}, db_session)
+    assert second.metadata["workflow_run_id"] != first.metadata["workflow_run_id"]
+
+    run = db_session.get(WorkflowRun, second.metadata["workflow_run_id"])
+    run.started_at = datetime.now() - timedelta(days=2)
+    db_session.commit()
+
+    third = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session)
+    assert third.metadata["workflow_run_id"] not in (
+        first.metadata["workflow_run_id"], second.metadata["workflow_run_id"]
+    )
+
+
+def test_for_each_resumes_failed_items_only(flaky_executor, workflow_task, db_session):
+    params = {
+        "steps": [
+            {"id": "fan", "type": "flaky", "for_each": [1, 2, 3], "params": {"value": "${item}"}},
+            {"id": "after", "type": "flaky", "depends_on": ["fan"], "params": {"value": "${fan.value}"}},
+        ]
+    }
+    flaky_executor.failing = {2}
+    result = run_workflow(workflow_task.id, params, db_session)
+    assert not result.success
+    assert result.metadata["failed_step"] == "fan"
+
+    flaky_executor.failing = set()
+    flaky_executor.calls.clear()
+    result = run_workflow(workflow_task.id, params, db_session)
+
+    assert result.success
+    # 只有失败的元素和后续步骤重新执行，扇入结果仍包含全部元素
+    assert [call["value"] for call in flaky_executor.calls] == [2, [1, 2, 3]]
+    assert result.data["outputs"]["fan"]["value"] == [1, 2, 3]
+
+
+def test_manual_resume(flaky_executor, workflow_task, db_session):
+    flaky_executor.failing = {3}
+    result = run_workflow(workflow_task.id, {**SEQUENTIAL_PARAMS, "resume": False}, db_session)
+    run_id = result.metadata["workflow_run_id"]
+
+    detail = scheduler_manager_service.get_workflow_run(db_session, run_id)
+    assert [step["status"] for step in detail["steps"]] == ["success", "success", "failed"]
+    assert [run["id"] for run in scheduler_manager_service.list_workflow_runs(db_session, status="failed")] == [run_id]
+
+    flaky_executor.failing = set()
+    flaky_executor.calls.clear()
+    resumed = scheduler_manager_service.resume_workflow_run(db_session, run_id)
+
+    assert resumed["success"]
+    assert [call["value"] for call in flaky_executor.calls] == [3]
+    assert scheduler_manager_service.resume_workflow_run(db_session, run_id)["success"] is False
+    assert scheduler_manager_service.resume_workflow_run(db_session, 99999)["error"] == "工作流运行不存在"
+
+
+def test_manual_resume_rejects_running_run(flaky_executor, workflow_task, db_session):
+    flaky_executor.failing = {3}
+    run_id = run_workflow(workflow_task.id, {**SEQUENTIAL_PARAMS, "resume": False}, db_session).metadata["workflow_run_id"]
+
+    # 定时触发的自动续跑已取得该运行
+    flaky_executor.failing = set()
+    flaky_executor.calls.clear()
+    db_session.query(WorkflowRun).filter(WorkflowRun.id == run_id).update({"status": "running"})
+    db_session.commit()
+
+    resumed = scheduler_manager_service.resume_workflow_run(db_session, run_id)
+    assert resumed == {"success": False, "error": "工作流运行正在执行中，无法续跑"}
+    assert flaky_executor.calls == []
+
+
+def test_claimed_run_is_not_auto_resumed(flaky_executor, workflow_task, db_session):
+    from app.services.workflow_run_service import workflow_run_service
+
+    flaky_executor.failing = {3}
+    run_id = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session).metadata["workflow_run_id"]
+
+    # 手动续跑取得运行后，同时触发的定时执行重新开始而不是续跑同一运行
+    assert workflow_run_service.claim_for_resume(db_session, run_id)
+    assert not workflow_run_service.claim_for_resume(db_session, run_id)
+
+    flaky_executor.failing = set()
+    result = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session)
+    assert result.success
+    assert result.metadata["workflow_run_id"] != run_id
+
+    # 续跑未开始执行时恢复为失败，可再次续跑
+    workflow_run_service.release_claim(db_session, run_id)
+    db_session.expire_all()
+    assert db_session.get(WorkflowRun, run_id).status == "failed"
+
+
+def test_workflow_run_endpoints(flaky_executor, workflow_task, db_session, client, admin_auth_headers):
+    flaky_executor.failing = {2}
+    run_id = run_workflow(workflow_task.id, SEQUENTIAL_PARAMS, db_session).metadata["workflow_run_id"]
+
+    response = client.get(f"/api/v1/scheduler/workflow-runs?task_id={workflow_task.id}", headers=admin_auth_headers)
+    assert response.status_code == 200
+    assert response.json()[0]["failed_step"] == "step2"
+
+    response = client.get(f"/api/v1/scheduler/workflow-runs/{run_id}", headers=admin_auth_headers)
+    assert response.status_code == 200
+    assert [step["step_key"] for step in response.json()["steps"]] == ["step1", "step2"]
+
+    flaky_executor.failing = set()
+    response = client.post(f"/api/v1/scheduler/workflow-runs/{run_id}/resume", headers=admin_auth_headers)
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+
+    response = client.post("/api/v1/scheduler/workflow-runs/99999/resume", headers=admin_auth_headers)
+    assert response.status_code == 404
@@ -0,0 +1,545 @@
+"""
+缓存系统单元测试
+测试有界 LRU/TTL 内存缓存和缓存装饰器
+"""
+import asyncio
+import threading
+import time
+import pytest
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+from app.core import cache as cache_module
+from app.core.cache import (
+    CacheCodec,
+    CacheInvalidationBus,
+    MemoryCache,
+    MockRedisClient,
+    SingleFlight,
+    TieredCache,
+    cache_query,
+    invalidate_cache_pattern,
+    memory_cache,
+    resolve_cache_ttl,
+)
+from app.core.config import settings
+
+
+class TestMemoryCache:
+    """测试 MemoryCache 类"""
+
+    def test_set_and_get(self):
+        """测试基本读写"""
+        cache = MemoryCache()
+        cache.set("k", {"a": 1}, ttl=60)
+        assert cache.get("k") == {"a": 1}
+        assert cache.get("missing") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+        assert stats["bytes"] > 0
+
+    def test_ttl_expiry(self):
+        """测试过期键在读取时被删除"""
+        cache = MemoryCache()
+        cache.set("k", "v", ttl=0.05)
+        time.sleep(0.1)
+        assert cache.get("k") is None
+        stats = cache.get_stats()
+        assert stats["size"] == 0
+        assert stats["bytes"] == 0
+        assert stats["expirations"] == 1
+
+    def test_lru_eviction_by_entries(self):
+        """测试超出条目数上限时淘汰最久未使用的键"""
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        # 访问 a，使 b 成为最久未使用
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self):
+        """测试超出字节数上限时淘汰"""
+        cache = MemoryCache(max_bytes=4096)
+        for i in range(20):
+            cache.set(f"k{i}", "x" * 500)
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 4096
+        assert stats["evictions"] > 0
+        assert cache.get("k19") is not None
+
+    def test_oversized_value_not_cached(self):
+        """测试单个值超过字节上限时不写入"""
+        cache = MemoryCache(max_bytes=100)
+        cache.set("big", "x" * 1000)
+        assert cache.get("big") is None
+        assert cache.get_stats()["size"] == 0
+
+    def test_oversized_value_drops_existing_entry(self):
+        """测试过大的新值跳过写入时删除旧值，不再返回过时数据"""
+        cache = MemoryCache(max_bytes=100)
+        cache.set("k", "small")
+        cache.set("k", "x" * 1000)
+        assert cache.get("k") is None
+        assert cache.get_stats()["bytes"] == 0
+
+    def test_overwrite_keeps_byte_count(self):
+        """测试覆盖写入时字节数不重复累计"""
+        cache = MemoryCache()
+        cache.set("k", "x" * 100, ttl=60)
+        first = cache.get_stats()["bytes"]
+        cache.set("k", "x" * 100, ttl=60)
+        assert cache.get_stats()["bytes"] == first
+
+    def test_cleanup_expired_uses_heap(self):
+        """测试主动清理只删除已过期的键"""
+        cache = MemoryCache()
+        cache.set("short", 1, ttl=0.05)
+        cache.set("long", 2, ttl=60)
+        cache.set("forever", 3)
+        # 覆盖 short，堆中旧记录应被忽略
+        cache.set("short", 4, ttl=60)
+        cache.set("gone", 5, ttl=0.05)
+        time.sleep(0.1)
+
+        assert cache.cleanup_expired() == 1
+        assert cache.get("short") == 4
+        assert cache.get("long") == 2
+        assert cache.get("forever") == 3
+
+    def test_background_sweeper(self):
+        """测试后台线程清扫过期键"""
+        cache = MemoryCache(sweep_interval=0.05)
+        try:
+            cache.set("k", "v", ttl=0.05)
+            time.sleep(0.3)
+            assert cache.get_stats()["size"] == 0
+        finally:
+            cache.stop_sweeper()
+
+    def test_reset_stats(self):
+        """测试重置统计不影响缓存内容"""
+        cache = MemoryCache()
+        cache.set("k", "v")
+        cache.get("k")
+        cache.reset_stats()
+        assert cache.get_stats()["hits"] == 0
+        assert cache.get("k") == "v"
+
+
+class FakeL2:
+    """模拟 Redis 二级缓存（共享存储）"""
+
+    def __init__(self):
+        self.store = {}
+        self.codec = CacheCodec()
+
+    def get_with_ttl(self, key):
+        if key not in self.store:
+            return None, None
+        data, ttl = self.store[key]
+        return self.codec.loads(data), ttl
+
+    def set(self, key, value, ttl=None):
+        self.store[key] = (self.codec.dumps(value), ttl)
+        return True
+
+    def delete(self, *keys):
+        return sum(1 for k in keys if self.store.pop(k, None) is not None)
+
+    def delete_prefix(self, prefix):
+        return self.delete(*[k for k in list(self.store) if k.startswith(prefix)])
+
+    def get_stats(self):
+        return {"hits": 0, "misses": 0, "sets": len(self.store), "deletes": 0, "errors": 0, "hit_rate": 0}
+
+    def reset_stats(self):
+        pass
+
+
+class TestCacheCodec:
+    """测试缓存编解码器"""
+
+    def test_roundtrip_small(self):
+        codec = CacheCodec()
+        data = codec.dumps({"a": [1, 2, 3]})
+        assert data[:1] == CacheCodec.RAW
+        assert codec.loads(data) == {"a": [1, 2, 3]}
+
+    def test_roundtrip_compressed(self):
+        codec = CacheCodec(compress_threshold=64)
+        value = [{"name": "account", "description": "x" * 200}] * 10
+        data = codec.dumps(value)
+        assert data[:1] == CacheCodec.COMPRESSED
+        assert codec.loads(data) == value
+
+    def test_unknown_marker(self):
+        with pytest.raises(ValueError):
+            CacheCodec().loads(b"?abc")
+
+
+class TestTieredCache:
+    """测试两级缓存"""
+
+    def test_l2_hit_fills_l1(self):
+        """测试其他 worker 写入的 L2 数据被回填到本地 L1"""
+        shared = FakeL2()
+        worker_a = TieredCache(MemoryCache(), shared, l1_max_ttl=30)
+        worker_b = TieredCache(MemoryCache(), shared, l1_max_ttl=30)
+
+        worker_a.set("accounts", [1, 2], ttl=300)
+        assert worker_b.l1.get("accounts") is None
+        assert worker_b.get("accounts") == [1, 2]
+        assert worker_b.l1.get("accounts") == [1, 2]
+
+    def test_delete_prefix_clears_both_tiers(self):
+        shared = FakeL2()
+        cache = TieredCache(MemoryCache(), shared)
+        cache.set("platform_by_id:1", "p1", ttl=60)
+        cache.set("platforms:0:20", ["p1"], ttl=60)
+        cache.set("accounts", [], ttl=60)
+
+        assert cache.delete_prefix("platform") == 2
+        assert cache.get("platform_by_id:1") is None
+        assert cache.get("accounts") == []
+        assert list(shared.store) == ["accounts"]
+
+    def test_stats_include_tiers(self):
+        cache = TieredCache(MemoryCache(), FakeL2())
+        stats = cache.get_stats()
+        assert "hits" in stats and "misses" in stats and "hit_rate" in stats
+        assert set(stats["tiers"]) == {"l1", "l2"}
+
+    def test_l1_only_without_l2(self):
+        cache = TieredCache(MemoryCache())
+        cache.set("k", "v", ttl=60)
+        assert cache.get("k") == "v"
+        assert set(cache.get_stats()["tiers"]) == {"l1"}
+
+
+class FakePubSubClient:
+    """模拟 Redis publish，记录广播的消息"""
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, channel, message):
+        self.messages.append((channel, message))
+        return 1
+
+
+class TestCacheInvalidationBus:
+    """测试跨 worker 缓存失效广播"""
+
+    def _make_worker(self, client):
+        bus = CacheInvalidationBus(client)
+        cache = TieredCache(MemoryCache(), bus=bus)
+        bus._handler = cache.apply_invalidation
+        return cache, bus
+
+    def _deliver(self, client, bus):
+        for _, message in client.messages:
+            bus._handle_message(message)
+
+    def test_prefix_invalidation_reaches_other_worker(self):
+        """测试一个 worker 的失效操作清理其他 worker 的 L1"""
+        client = FakePubSubClient()
+        worker_a, bus_a = self._make_worker(client)
+        worker_b, bus_b = self._make_worker(client)
+        worker_a.set("writing_style_by_id:1", "a", ttl=3600)
+        worker_b.set("writing_style_by_id:1", "b", ttl=3600)
+        worker_b.set("platforms", "p", ttl=3600)
+
+        worker_a.delete_prefix("writing_style")
+        self._deliver(client, bus_b)
+
+        assert worker_b.get("writing_style_by_id:1") is None
+        assert worker_b.get("platforms") == "p"
+        assert bus_b.get_stats()["received"] == 1
+
+    def test_own_messages_are_ignored(self):
+        client = FakePubSubClient()
+        worker, bus = self._make_worker(client)
+        worker.delete("k")
+        worker.set("k", "v", ttl=60)
+        self._deliver(client, bus)
+        assert worker.get("k") == "v"
+        assert bus.get_stats()["received"] == 0
+
+    def test_clear_and_key_delete(self):
+        client = FakePubSubClient()
+        worker_a, _ = self._make_worker(client)
+        worker_b, bus_b = self._make_worker(client)
+        worker_b.set("k1", 1, ttl=60)
+        worker_b.set("k2", 2, ttl=60)
+
+        worker_a.delete("k1")
+        self._deliver(client, bus_b)
+        assert worker_b.get("k1") is None
+        assert worker_b.get("k2") == 2
+
+        client.messages.clear()
+        worker_a.clear()
+        self._deliver(client, bus_b)
+        assert worker_b.get("k2") is None
+
+    def test_mock_redis_is_noop(self):
+        """测试 Redis 不可用时退化为空操作"""
+        bus = CacheInvalidationBus(MockRedisClient())
+        assert bus.enabled is False
+        bus.publish("delete", ["k"])
+        bus.start(lambda op, keys: None)
+        assert bus._thread is None
+        assert bus.get_stats()["published"] == 0
+
+
+class TestSingleFlight:
+    """测试请求合并"""
+
+    def test_concurrent_calls_execute_once(self):
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        leader.start()
+        started.wait()
+        waiters = [
+            threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+            for _ in range(5)
+        ]
+        for t in waiters:
+            t.start()
+        for t in [leader] + waiters:
+            t.join()
+
+        assert calls == [1]
+        assert results == ["result"] * 6
+        assert flight.get_stats()["coalesced"] == 5
+
+    def test_error_shared_with_waiters(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def boom():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("db down")
+
+        def run():
+            try:
+                flight.do("k", boom)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=run)
+        leader.start()
+        started.wait()
+        waiter = threading.Thread(target=run)
+        waiter.start()
+        leader.join()
+        waiter.join()
+        assert errors == ["db down", "db down"]
+
+    def test_stale_value_returned_while_refreshing(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def refresh():
+            started.set()
+            release.wait()
+            return "new"
+
+        leader_result = []
+        leader = threading.Thread(target=lambda: leader_result.append(flight.do("k", refresh, stale="old")))
+        leader.start()
+        started.wait()
+        assert flight.do("k", refresh, stale="old") == "old"
+        release.set()
+        leader.join()
+        assert leader_result == ["new"]
+        assert flight.get_stats()["stale_served"] == 1
+
+
+class TestCacheDecorator:
+    """测试缓存装饰器"""
+
+    def setup_method(self):
+        memory_cache.clear()
+
+    def test_cache_query_and_invalidate_pattern(self):
+        """测试装饰器缓存结果并可按前缀失效"""
+        calls = []
+
+        @cache_query(ttl=60, key_prefix="unit_test_items")
+        def get_items(db, page):
+            calls.append(page)
+            return [page]
+
+        assert get_items(None, 1) == [1]
+        assert get_items(None, 1) == [1]
+        assert calls == [1]
+
+        invalidate_cache_pattern("unit_test_items")
+        assert get_items(None, 1) == [1]
+        assert calls == [1, 1]
+
+    def test_prefix_ttl_override(self, monkeypatch):
+        """测试按前缀覆盖 TTL"""
+        monkeypatch.setattr(settings, "CACHE_PREFIX_TTLS", {"unit_test_ttl": 5})
+        assert resolve_cache_ttl("unit_test_ttl", 300) == 5
+        assert resolve_cache_ttl("other", 300) == 300
+
+    def test_decorator_uses_shared_tier(self, monkeypatch):
+        """测试装饰器结果写入二级缓存，其他 worker 可直接命中"""
+        shared = FakeL2()
+        monkeypatch.setattr(cache_module, "cache_backend", TieredCache(MemoryCache(), shared))
+        calls = []
+
+        @cache_query(ttl=60, key_prefix="unit_test_shared")
+        def get_items(db):
+            calls.append(1)
+            return ["item"]
+
+        assert get_items(None) == ["item"]
+        # 模拟另一个 worker：L1 为空，共享同一个 L2
+        monkeypatch.setattr(cache_module, "cache_backend", TieredCache(MemoryCache(), shared))
+        assert get_items(None) == ["item"]
+        assert calls == [1]
+
+    def test_decorator_coalesces_threads(self):
+        """测试热点键过期时并发请求只查询一次"""
+        calls = []
+
+        @cache_query(ttl=60, key_prefix="unit_test_stampede")
+        def get_items(db):
+            calls.append(1)
+            time.sleep(0.1)
+            return ["item"]
+
+        threads = [threading.Thread(target=get_items, args=(None,)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert calls == [1]
+
+    def test_decorator_coalesces_async_tasks(self):
+        """测试协程函数的并发未命中只执行一次"""
+        calls = []
+
+        @cache_query(ttl=60, key_prefix="unit_test_async")
+        async def get_items(db):
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return ["item"]
+
+        async def main():
+            return await asyncio.gather(*[get_items(None) for _ in range(5)])
+
+        assert asyncio.run(main()) == [["item"]] * 5
+        assert calls == [1]
+
+    def test_stale_while_revalidate(self):
+        """测试过期后返回旧值并由一个调用方刷新"""
+        values = iter(["v1", "v2"])
+
+        @cache_query(ttl=0.1, key_prefix="unit_test_swr", stale_ttl=60)
+        def get_value(db):
+            return next(values)
+
+        assert get_value(None) == "v1"
+        time.sleep(0.15)
+        # 没有其他刷新者时，调用方自己刷新并拿到新值
+        assert get_value(None) == "v2"
+        assert get_value(None) == "v2"
+
+
+class PlatformSnapshot(BaseModel):
+    """测试用快照 schema"""
+    id: int
+    name: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FakeOrmPlatform:
+    """模拟 ORM 对象（只通过属性访问）"""
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+        self.created_at = datetime(2026, 1, 1)
+
+
+class TestSnapshotMode:
+    """测试快照缓存模式"""
+
+    def setup_method(self):
+        memory_cache.clear()
+
+    def test_snapshot_returns_fresh_schema_instances(self):
+        calls = []
+
+        @cache_query(ttl=60, key_prefix="unit_test_snapshot", snapshot=PlatformSnapshot)
+        def get_platform(db, platform_id):
+            calls.append(platform_id)
+            return FakeOrmPlatform(platform_id, "微信公众号")
+
+        first = get_platform(None, 1)
+        second = get_platform(None, 1)
+        assert calls == [1]
+        assert isinstance(first, PlatformSnapshot)
+        assert first == second
+        assert first is not second
+
+        # 修改返回值不影响缓存内容
+        first.name = "changed"
+        assert get_platform(None, 1).name == "微信公众号"
+
+        # 缓存中保存的是纯数据，可以直接序列化到 Redis
+        cached = memory_cache.get("unit_test_snapshot:1")
+        assert isinstance(cached, dict)
+        assert CacheCodec().loads(CacheCodec().dumps(cached)) == cached
+
+    def test_snapshot_list_and_total_tuple(self):
+        @cache_query(ttl=60, key_prefix="unit_test_snapshot_list", snapshot=PlatformSnapshot)
+        def get_all(db):
+            return [FakeOrmPlatform(1, "a"), FakeOrmPlatform(2, "b")], 2
+
+        get_all(None)
+        items, total = get_all(None)
+        assert total == 2
+        assert [item.name for item in items] == ["a", "b"]
+        assert all(isinstance(item, PlatformSnapshot) for item in items)
+
+    def test_snapshot_failure_falls_back_to_raw_result(self):
+        calls = []
+
+        @cache_query(ttl=60, key_prefix="unit_test_snapshot_bad", snapshot=PlatformSnapshot)
+        def get_bad(db):
+            calls.append(1)
+            return {"id": "not-an-int"}
+
+        assert get_bad(None) == {"id": "not-an-int"}
+        assert get_bad(None) == {"id": "not-an-int"}
+        assert calls == [1, 1]
@@ -0,0 +1,154 @@
+"""
+后台事件循环线程单元测试
+测试协程提交、事件循环复用和调度器任务包装器
+"""
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from app.models.scheduler import ScheduledTask
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+from app.utils.event_loop import EventLoopThread
+
+
+@pytest.fixture
+def loop_thread():
+    thread = EventLoopThread(name="test-event-loop")
+    yield thread
+    thread.stop()
+
+
+class LoopRecordingExecutor(TaskExecutor):
+    """记录每次运行所在事件循环的执行器"""
+
+    def __init__(self):
+        self.loops = []
+
+    @property
+    def executor_type(self) -> str:
+        return "loop_recording"
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        self.loops.append(asyncio.get_running_loop())
+        return TaskExecutionResult.success_result()
+
+
+class TestEventLoopThread:
+    """测试事件循环线程"""
+
+    def test_runs_on_same_loop(self, loop_thread):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = loop_thread.run(current_loop())
+        second = loop_thread.run(current_loop())
+
+        assert first is second is loop_thread.loop
+        assert first.is_running()
+
+    def test_loop_bound_lock_survives_between_runs(self, loop_thread):
+        async def make_lock():
+            return asyncio.Lock()
+
+        lock = loop_thread.run(make_lock())
+
+        async def use_lock():
+            async with lock:
+                return True
+
+        # 绑定在事件循环上的锁在后续调用中仍然可用
+        assert loop_thread.run(use_lock())
+        assert loop_thread.run(use_lock())
+
+    def test_exception_propagates(self, loop_thread):
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            loop_thread.run(fail())
+
+    def test_stop_runs_callbacks_and_restarts(self, loop_thread):
+        closed = []
+
+        async def close_client():
+            closed.append(asyncio.get_running_loop())
+
+        first_loop = loop_thread.loop
+        loop_thread.add_stop_callback(close_client)
+        loop_thread.add_stop_callback(close_client)
+        loop_thread.stop()
+
+        assert closed == [first_loop]
+        assert not loop_thread.is_running
+        assert first_loop.is_closed()
+
+        # 停止后再次使用会启动新的事件循环
+        assert loop_thread.loop is not first_loop
+
+    def test_run_inside_loop_thread_is_rejected(self, loop_thread):
+        async def nested():
+            async def inner():
+                return 1
+            loop_thread.run(inner())
+
+        with pytest.raises(RuntimeError):
+            loop_thread.run(nested())
+
+
+def test_task_wrapper_reuses_scheduler_loop(db_session, monkeypatch):
+    """多次调度运行共用调度器的事件循环"""
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr("app.db.database.SessionLocal", TestingSessionLocal)
+
+    task = ScheduledTask(name="事件循环复用测试", task_type="loop_recording", interval=1, interval_unit="minutes")
+    db_session.add(task)
+    db_session.commit()
+
+    service = SchedulerService()
+    executor = LoopRecordingExecutor()
+    service.register_executor(executor)
+    try:
+        wrapper = service._create_task_wrapper(task.id, task.task_type, task.name)
+        wrapper()
+        wrapper()
+    finally:
+        service.shutdown()
+
+    assert len(executor.loops) == 2
+    assert executor.loops[0] is executor.loops[1]
+
+
+def test_blocking_submits_do_not_stall_shared_loop(loop_thread):
+    """批量提交生成任务时同步调用在线程中执行，共享事件循环上的其他协程不被阻塞"""
+    import time
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock, patch
+
+    from app.services.executors import AsyncContentGenerationExecutor
+
+    db = MagicMock()
+    db.query.return_value.filter_by.return_value.first.return_value = SimpleNamespace(
+        id=1, name="账号", description=None
+    )
+
+    def slow_submit(self, **kwargs):
+        time.sleep(0.3)
+        return "task-1"
+
+    async def ready():
+        return time.monotonic()
+
+    with patch("app.services.async_content_generation_service.AsyncContentGenerationService.submit_task", slow_submit):
+        future = loop_thread.submit(
+            AsyncContentGenerationExecutor().execute(1, {"account_ids": [1, 2], "count_per_account": 2}, db)
+        )
+        time.sleep(0.05)
+        submitted_at = time.monotonic()
+        waited = loop_thread.run(ready(), timeout=5) - submitted_at
+        result = future.result(5)
+
+    assert result.success
+    assert result.data["total_submitted"] == 4
+    assert waited < 0.1
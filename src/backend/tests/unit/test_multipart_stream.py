@@ -0,0 +1,123 @@
+"""
+流式 multipart 编码测试
+测试请求体格式、Content-Length 与实际长度一致、按块读取文件、可重复迭代以及异步迭代时在线程中读取文件
+"""
+import asyncio
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import pytest
+import requests
+
+from app.utils.multipart_stream import MultipartStream
+
+
+def parse(stream: MultipartStream, body: bytes):
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {stream.content_type}\r\n\r\n".encode() + body
+    )
+    return [
+        (part.get_param("name", header="content-disposition"), part.get_filename(),
+         part.get_content_type(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    ]
+
+
+@pytest.fixture
+def images(tmp_path):
+    cover = tmp_path / "封面.png"
+    cover.write_bytes(b"\x89PNG" + bytes(range(256)) * 1000)
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(b"\xff\xd8" + b"j" * 5000)
+    return cover, photo
+
+
+def test_body_is_valid_multipart(images):
+    cover, photo = images
+    stream = MultipartStream(
+        fields={"title": "标题", "useMacStyle": "true"},
+        files=[
+            ("files", str(cover), cover.name, "image/png"),
+            ("files", str(photo), photo.name, "image/jpeg"),
+        ],
+        chunk_size=1024
+    )
+
+    body = b"".join(stream)
+
+    assert len(body) == len(stream)
+    assert parse(stream, body) == [
+        ("title", None, "text/plain", "标题".encode()),
+        ("useMacStyle", None, "text/plain", b"true"),
+        ("files", cover.name, "image/png", cover.read_bytes()),
+        ("files", photo.name, "image/jpeg", photo.read_bytes()),
+    ]
+
+
+def test_files_are_read_in_bounded_chunks(images):
+    cover, _ = images
+    stream = MultipartStream(fields={}, files=[("files", str(cover), cover.name, "image/png")], chunk_size=4096)
+
+    chunks = list(stream)
+
+    assert max(len(chunk) for chunk in chunks) <= 4096
+    # 可重复迭代（重试时重新读取文件）
+    assert b"".join(stream) == b"".join(chunks)
+
+
+def test_async_view_matches_sync_body(images):
+    cover, photo = images
+    stream = MultipartStream(
+        fields={"title": "t"},
+        files=[("files", str(photo), photo.name, "image/jpeg")]
+    )
+
+    async def collect():
+        return b"".join([chunk async for chunk in stream.async_view()])
+
+    assert asyncio.run(collect()) == b"".join(stream)
+
+
+def test_async_view_reads_files_off_event_loop(images, monkeypatch):
+    _, photo = images
+    stream = MultipartStream(fields={}, files=[("files", str(photo), photo.name, "image/jpeg")], chunk_size=4096)
+    expected = b"".join(stream)
+    read_chunk = MultipartStream._read_chunk
+    read_threads = []
+
+    def recording_read_chunk(self, f, path, remaining):
+        read_threads.append(threading.get_ident())
+        return read_chunk(self, f, path, remaining)
+
+    monkeypatch.setattr(MultipartStream, "_read_chunk", recording_read_chunk)
+
+    async def collect():
+        body = b"".join([chunk async for chunk in stream.async_view()])
+        return body, threading.get_ident()
+
+    body, loop_thread = asyncio.run(collect())
+
+    assert body == expected
+    assert read_threads and loop_thread not in read_threads
+
+
+def test_requests_sends_content_length_without_chunking(images):
+    cover, _ = images
+    stream = MultipartStream(fields={"title": "t"}, files=[("files", str(cover), cover.name, "image/png")])
+
+    prepared = requests.Request("POST", "http://publisher.test/api/publish", data=stream, headers=stream.headers).prepare()
+
+    assert prepared.headers["Content-Length"] == str(len(stream))
+    assert prepared.headers["Content-Type"] == stream.content_type
+    assert "Transfer-Encoding" not in prepared.headers
+    assert prepared.body is stream
+
+
+def test_truncated_file_raises(images):
+    cover, _ = images
+    stream = MultipartStream(fields={}, files=[("files", str(cover), cover.name, "image/png")])
+    cover.write_bytes(b"short")
+
+    with pytest.raises(IOError):
+        b"".join(stream)
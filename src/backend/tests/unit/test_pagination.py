@@ -0,0 +1,100 @@
+"""
+游标分页单元测试
+测试游标编解码、keyset 翻页和总数缓存
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.cache import cache_backend
+from app.models.audit_log import AuditLog
+from app.utils.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    build_cursor_page,
+    cached_count,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def _collect_ids(db_session, page_size):
+    """从第一页翻到最后一页，返回所有 ID"""
+    ids = []
+    cursor = ""
+    while True:
+        query = db_session.query(AuditLog)
+        rows = apply_keyset(query, AuditLog.timestamp, AuditLog.id, cursor, page_size).all()
+        page = build_cursor_page(rows, page_size, created_attr="timestamp")
+        ids.extend(log.id for log in page["items"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            return ids
+        cursor = page["next_cursor"]
+
+
+class TestCursorCodec:
+    """测试游标编解码"""
+
+    def test_round_trip(self):
+        created_at = datetime(2024, 5, 1, 12, 30, 45, 123456)
+        cursor = encode_cursor(created_at, 42)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!!"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestKeysetPagination:
+    """测试 keyset 翻页"""
+
+    def test_pages_through_server_default_timestamps(self, db_session):
+        """server_default 写入的时间戳相同（无微秒）时，翻页不重复也不遗漏"""
+        for _ in range(7):
+            db_session.add(AuditLog(event_type="user_login", result="success"))
+        db_session.commit()
+
+        ids = _collect_ids(db_session, page_size=3)
+
+        assert ids == sorted(ids, reverse=True)
+        assert len(ids) == len(set(ids)) == 7
+
+    def test_orders_by_timestamp_then_id(self, db_session):
+        """按时间倒序，时间相同时按 ID 倒序"""
+        base = datetime(2024, 1, 1, 8, 0, 0, 500000)
+        logs = [
+            AuditLog(event_type="a", result="success", timestamp=base),
+            AuditLog(event_type="b", result="success", timestamp=base + timedelta(hours=1)),
+            AuditLog(event_type="c", result="success", timestamp=base),
+            AuditLog(event_type="d", result="success", timestamp=base - timedelta(hours=1)),
+        ]
+        db_session.add_all(logs)
+        db_session.commit()
+
+        ids = _collect_ids(db_session, page_size=1)
+
+        assert ids == [logs[1].id, logs[2].id, logs[0].id, logs[3].id]
+
+
+class TestCachedCount:
+    """测试总数缓存"""
+
+    def test_count_is_cached(self, db_session):
+        cache_backend.clear()
+        db_session.add(AuditLog(event_type="user_login", result="success"))
+        db_session.commit()
+
+        query = db_session.query(AuditLog).filter(AuditLog.event_type == "user_login")
+        assert cached_count(db_session, query, "audit_logs") == 1
+
+        db_session.add(AuditLog(event_type="user_login", result="success"))
+        db_session.commit()
+
+        # 缓存有效期内返回旧值，不同过滤条件使用不同的缓存键
+        assert cached_count(db_session, query, "audit_logs") == 1
+        other = db_session.query(AuditLog).filter(AuditLog.result == "success")
+        assert cached_count(db_session, other, "audit_logs") == 2
+        cache_backend.clear()
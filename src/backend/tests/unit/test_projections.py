@@ -0,0 +1,100 @@
+"""
+列投影注册表单元测试
+测试列推导规则以及列表查询是否延迟加载大字段
+"""
+import pytest
+from sqlalchemy import inspect, select
+
+from app.db.projections import get_projection, projection, register_projection
+from app.models import ContentGenerationTask
+from app.models.content import Content
+from app.modules.content.schemas import ContentListRead
+from app.modules.content.services import content_service
+from app.services.content_review_service import content_review_service
+from app.services import task_status_poller  # noqa: F401  注册 task_polling
+
+
+def _add_content(db_session, **kwargs):
+    content = Content(
+        account_id=1,
+        title=kwargs.pop("title", "测试文章"),
+        content="正文" * 1000,
+        summary="摘要",
+        **kwargs
+    )
+    db_session.add(content)
+    db_session.commit()
+    db_session.expunge_all()
+    return content
+
+
+class TestRegistry:
+    """测试注册规则"""
+
+    def test_schema_columns_derived_from_fields(self):
+        columns = get_projection(ContentListRead, Content)
+        assert set(columns) == {
+            "id", "title", "category", "publish_status", "review_status",
+            "word_count", "created_at", "updated_at",
+        }
+
+    def test_primary_key_always_included(self):
+        columns = register_projection("test_title_only", Content, columns=["title", "unknown"])
+        assert columns == ("id", "title")
+
+    def test_exclude_profile(self):
+        columns = get_projection("task_polling")
+        assert "result" not in columns
+        assert {"id", "task_id", "status"} <= set(columns)
+
+    def test_unknown_profile(self):
+        with pytest.raises(KeyError):
+            projection("no_such_profile")
+        with pytest.raises(ValueError):
+            register_projection("no_columns", Content)
+
+
+class TestDeferredLoading:
+    """测试列表查询只加载登记的列"""
+
+    def test_content_list_defers_body(self, db_session):
+        _add_content(db_session)
+
+        items = content_service.get_content_list(db_session)["items"]
+
+        state = inspect(items[0])
+        assert {"content", "summary", "review_comment"} <= state.unloaded
+        assert "title" not in state.unloaded
+        # 访问时按需加载
+        assert items[0].content.startswith("正文")
+
+    async def test_content_list_async_defers_body(self, db_session, async_db_session):
+        _add_content(db_session)
+
+        data = await content_service.get_content_list_async(async_db_session, cursor="")
+
+        assert "content" in inspect(data["items"][0]).unloaded
+
+    def test_pending_reviews_keep_account_id(self, db_session):
+        _add_content(db_session, review_status="pending")
+
+        contents = content_review_service.get_pending_reviews(db_session)
+
+        state = inspect(contents[0])
+        assert "content" in state.unloaded
+        assert "account_id" not in state.unloaded
+
+    def test_select_statement_options(self, db_session):
+        db_session.add(ContentGenerationTask(
+            task_id="projection-task", account_id=1, topic="选题",
+            status="processing", result={"content": "x" * 1000},
+        ))
+        db_session.commit()
+        db_session.expunge_all()
+
+        task = db_session.execute(
+            select(ContentGenerationTask).options(projection("task_polling"))
+        ).scalar_one()
+
+        assert "result" in inspect(task).unloaded
+        assert task.status == "processing"
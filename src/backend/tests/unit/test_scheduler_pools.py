@@ -0,0 +1,169 @@
+"""
+调度器执行器线程池单元测试
+测试按执行器类型隔离的线程池、max_instances 跳过和排队统计
+"""
+import threading
+import time
+from typing import Any, Dict
+
+import pytest
+
+from app.core.config import settings
+from app.services.scheduler_service import SchedulerService, TaskExecutionResult, TaskExecutor
+
+
+class NamedExecutor(TaskExecutor):
+    """可指定类型和线程数的测试执行器"""
+
+    def __init__(self, executor_type: str, max_workers=None, max_instances=None):
+        self._executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_instances = max_instances
+
+    @property
+    def executor_type(self) -> str:
+        return self._executor_type
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        return TaskExecutionResult.success_result()
+
+
+def _wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def service():
+    service = SchedulerService()
+    yield service
+    service.shutdown(wait=False)
+
+
+def test_pool_size_precedence(service, monkeypatch):
+    """线程数优先级：配置覆盖 > 执行器声明 > 默认值"""
+    monkeypatch.setattr(settings, "SCHEDULER_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "SCHEDULER_EXECUTOR_POOLS", {"configured": 3})
+
+    service.register_executor(NamedExecutor("default"))
+    service.register_executor(NamedExecutor("declared", max_workers=2))
+    service.register_executor(NamedExecutor("configured", max_workers=2))
+
+    executors = service.get_registered_executors()
+    assert executors["default"]["pool"]["max_workers"] == 5
+    assert executors["declared"]["pool"]["max_workers"] == 2
+    assert executors["configured"]["pool"]["max_workers"] == 3
+    assert executors["default"]["max_instances"] == settings.SCHEDULER_MAX_INSTANCES
+    assert service.scheduler._lookup_executor("declared")._pool._max_workers == 2
+
+
+def test_slow_type_does_not_block_other_types(service):
+    """慢任务只占用自身线程池，其他类型的任务照常运行，超出并发的运行计入排队"""
+    service.register_executor(NamedExecutor("slow", max_workers=1, max_instances=3))
+    service.register_executor(NamedExecutor("fast", max_workers=1))
+    service.start()
+
+    release = threading.Event()
+    fast_done = threading.Event()
+
+    for index in range(3):
+        job_id = f"slow_{index}"
+        service._job_types[job_id] = "slow"
+        service.scheduler.add_job(release.wait, id=job_id, args=[5], executor="slow")
+    service._job_types["fast_0"] = "fast"
+    service.scheduler.add_job(fast_done.set, id="fast_0", executor="fast")
+
+    try:
+        assert fast_done.wait(5)
+        assert _wait_until(lambda: service.get_registered_executors()["slow"]["pool"]["queued"] >= 2)
+    finally:
+        release.set()
+
+    assert _wait_until(lambda: service.get_registered_executors()["slow"]["pool"]["completed"] == 3)
+    assert service.get_registered_executors()["slow"]["pool"]["queued"] == 0
+
+
+def test_max_instances_skips_overlapping_runs(service):
+    """上一次运行未结束时，同一任务的新运行被跳过并计数"""
+    service.register_executor(NamedExecutor("overlap", max_workers=2, max_instances=1))
+    service.start()
+
+    release = threading.Event()
+    service._job_types["overlap_job"] = "overlap"
+    service.scheduler.add_job(
+        release.wait, "interval", seconds=0.2, id="overlap_job", args=[5],
+        executor="overlap", max_instances=1
+    )
+
+    try:
+        assert _wait_until(lambda: service.get_registered_executors()["overlap"]["pool"]["skipped"] >= 1)
+    finally:
+        release.set()
+
+
+def test_restart_recreates_pools(service):
+    """调度器关闭后重新启动，线程池可继续使用"""
+    service.register_executor(NamedExecutor("restart", max_workers=1))
+    service.start()
+    service.shutdown()
+    service.start()
+
+    done = threading.Event()
+    service._job_types["restart_job"] = "restart"
+    service.scheduler.add_job(done.set, id="restart_job", executor="restart")
+
+    assert done.wait(5)
+
+
+class SleepingExecutor(NamedExecutor):
+    """在 execute 中同步等待的执行器，记录每次运行的开始和结束时间"""
+
+    def __init__(self, executor_type: str, delay: float, blocking: bool = False, max_workers=None):
+        super().__init__(executor_type, max_workers=max_workers)
+        self.delay = delay
+        self.blocking = blocking
+        self.runs = []
+
+    async def execute(self, task_id: int, task_params: Dict[str, Any], db) -> TaskExecutionResult:
+        started_at = time.monotonic()
+        time.sleep(self.delay)
+        self.runs.append((started_at, time.monotonic()))
+        return TaskExecutionResult.success_result()
+
+
+def test_slow_job_does_not_delay_other_pool(service, db_session, monkeypatch):
+    """blocking 执行器的慢运行只占用自身线程池的工作线程，其他线程池的任务不被推迟"""
+    from app.models.scheduler import ScheduledTask
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr("app.db.database.SessionLocal", TestingSessionLocal)
+
+    slow = SleepingExecutor("slow_blocking", delay=1.0, blocking=True, max_workers=1)
+    fast = SleepingExecutor("fast", delay=0, max_workers=1)
+    service.register_executor(slow)
+    service.register_executor(fast)
+
+    tasks = [
+        ScheduledTask(name="慢任务", task_type="slow_blocking", interval=1, interval_unit="hours"),
+        ScheduledTask(name="快任务", task_type="fast", interval=1, interval_unit="hours"),
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    service.start()
+
+    for task in tasks:
+        service.scheduler.add_job(
+            service._create_task_wrapper(task.id, task.task_type, task.name),
+            id=f"task_{task.id}", executor=task.task_type
+        )
+        time.sleep(0.2)
+
+    assert _wait_until(lambda: fast.runs and slow.runs)
+    slow_started, slow_finished = slow.runs[0]
+    fast_started, _ = fast.runs[0]
+    # 快任务在慢任务运行期间开始，而不是等慢任务结束
+    assert slow_started < fast_started < slow_finished - 0.5
@@ -52,6 +52,8 @@ class TestSystemService:
         assert isinstance(metrics["requests_per_minute"], (int, float))
         assert isinstance(metrics["active_users"], int)
         assert isinstance(metrics["cache_stats"], dict)
+        assert "executors" in metrics["scheduler"]
+        assert "steps" in metrics["scheduler"]
 
     def test_check_database_connected(self, db_session: Session):
         """测试数据库连接检查"""
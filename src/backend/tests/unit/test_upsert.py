@@ -0,0 +1,46 @@
+"""
+汇总行插入或更新单元测试
+测试 ON CONFLICT 路径和不支持 ON CONFLICT 的数据库的回退路径都能插入新行、累加已有行
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import case
+
+from app.db import upsert as upsert_module
+from app.db.upsert import upsert
+from app.models.scheduler import ScheduledTask, TaskExecutionHourlyStat
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("on_conflict", [True, False])
+def test_upsert_inserts_then_merges(db_session, monkeypatch, on_conflict):
+    if not on_conflict:
+        monkeypatch.setattr(upsert_module, "dialect_insert", lambda connection: None)
+
+    task = ScheduledTask(name="汇总测试", task_type="noop", interval=1)
+    db_session.add(task)
+    db_session.commit()
+
+    table = TaskExecutionHourlyStat.__table__
+    hour = datetime(2026, 1, 1, 8)
+
+    def merge(total_count, max_duration):
+        upsert(
+            db_session.connection(), table, {"task_id": task.id, "hour": hour},
+            {"total_count": total_count, "max_duration": max_duration},
+            lambda new: {
+                "total_count": table.c.total_count + new["total_count"],
+                "max_duration": case(
+                    (table.c.max_duration < new["max_duration"], new["max_duration"]),
+                    else_=table.c.max_duration
+                ),
+            }
+        )
+
+    merge(2, 5)
+    merge(3, 4)
+    db_session.commit()
+
+    stat = db_session.query(TaskExecutionHourlyStat).one()
+    assert (stat.total_count, stat.max_duration) == (5, 5)